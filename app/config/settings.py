@@ -77,3 +77,69 @@ APP_NAME = "CRM - Sistema de Gestion"
 # constantes solo aplican a las ventanas de autenticacion.
 WINDOW_WIDTH = 400
 WINDOW_HEIGHT = 500
+
+# CACHE_REPORTES_MB: memoria maxima (aproximada) para los resultados de
+# reportes que ReporteService guarda en cache. Al pasarse se descartan los
+# menos usados recientemente.
+CACHE_REPORTES_MB = 64
+
+# SECCIONES_MAX_VIVAS: secciones de la ventana principal (Clientes, Ventas,
+# ...) construidas a la vez. Se construyen al abrirlas por primera vez; al
+# pasarse del limite se libera la que lleva mas tiempo sin usarse.
+SECCIONES_MAX_VIVAS = 5
+
+# SECCIONES_INACTIVAS_MIN: minutos sin abrir una seccion para liberarla
+# aunque no se haya llegado al limite.
+SECCIONES_INACTIVAS_MIN = 20
+
+# SECCIONES_PRECARGA: secciones que se importan y construyen en segundo
+# plano poco despues de mostrar la ventana, para que abrirlas sea inmediato.
+# () desactiva la precarga.
+SECCIONES_PRECARGA = ("clientes", "ventas", "actividades")
+
+# REPORTE_ARRANQUE_PATH: JSON con los tiempos del ultimo arranque (fases,
+# vistas e importaciones), escrito al pintarse la ventana principal.
+REPORTE_ARRANQUE_PATH = os.path.join(BASE_DIR, "logs", "arranque.json")
+
+# TRAZA_IMPORTS_ARRANQUE: medir cada importacion durante el arranque (como
+# python -X importtime). Agrega algo de costo a cada import; tambien se
+# activa con la variable de entorno CRM_TRAZA_IMPORTS=1.
+TRAZA_IMPORTS_ARRANQUE = False
+
+# PRESUPUESTO_IMPORTS_ARRANQUE_MS: tiempo maximo de importacion de los
+# modulos que main.py carga antes del primer pintado. Lo verifica
+# tests/test_utils/test_arranque.py (CRM_PRESUPUESTO_IMPORTS_MS lo cambia).
+PRESUPUESTO_IMPORTS_ARRANQUE_MS = 800
+
+# SMTP_SESIONES: conexiones SMTP simultaneas al enviar una campana. Cada
+# una corre en su hilo; mas sesiones reparten la espera del servidor.
+SMTP_SESIONES = 4
+
+# SMTP_MENSAJES_POR_SEGUNDO: tope de correos por segundo entre todas las
+# sesiones (los proveedores bloquean cuentas que envian de golpe). 0 = sin tope.
+SMTP_MENSAJES_POR_SEGUNDO = 10
+
+# SMTP_REINTENTOS: reconexiones por correo cuando una sesion se cae antes de
+# darla por perdida.
+SMTP_REINTENTOS = 2
+
+# SMTP_TIMEOUT: segundos de espera de cada operacion SMTP.
+SMTP_TIMEOUT = 15
+
+# ENVIO_LOTE: destinatarios por lote en los trabajos de envio de campanas.
+# Al terminar cada lote se guardan los estados y el punto de control; si la
+# app se cierra a la mitad, a lo mas se repite el lote en curso.
+ENVIO_LOTE = 50
+
+# ENVIO_ESCRITURA_FILAS / ENVIO_ESCRITURA_MS: el estado de los destinatarios
+# (Enviado / Fallido) se guarda en bloque, en una transaccion, cada tantos
+# resultados o cada tantos milisegundos (lo que pase primero), en lugar de
+# un UPDATE con commit por correo.
+ENVIO_ESCRITURA_FILAS = 200
+ENVIO_ESCRITURA_MS = 500
+
+# ENVIO_HILOS: trabajos de envio que corren a la vez. Tienen su propio pool
+# de hilos (ver cola_envios.py): una campana ocupa un hilo de principio a
+# fin y no debe dejar sin hilos a las cargas del dashboard o los reportes.
+# Los demas trabajos esperan en cola.
+ENVIO_HILOS = 1
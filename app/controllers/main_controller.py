@@ -42,7 +42,8 @@ class MainController:
                 y para asignar el ID del usuario como 'propietario' en nuevos registros.
         """
         # Crear la ventana principal con el usuario autenticado.
-        # MainView construye todos los tabs y sub-vistas en su __init__.
+        # MainView construye el dashboard en su __init__; las demas secciones
+        # se construyen al abrirlas (ver app/utils/secciones.py).
         self._view = MainView(usuario)
 
     def show(self):
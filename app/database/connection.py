@@ -26,10 +26,58 @@ Uso tipico:
     cursor = conn.execute("SELECT * FROM Clientes")
     ...
     close_connection()  # al cerrar la ventana o al terminar el hilo
+
+Lectores y escritor:
+    Ademas de la conexion thread-local, el modulo ofrece un pool con N
+    conexiones de solo lectura. Se configuran para consultas pesadas (mmap,
+    cache grande, temporales en memoria) y no pueden escribir por accidente
+    gracias a PRAGMA query_only.
+
+    Para escribir, get_writer() presta la conexion del hilo (la misma que
+    usan los repositorios y transaction(), asi los commit diferidos siguen
+    funcionando) con un candado del modulo: solo un hilo escribe a la vez
+    y los demas esperan en Python en lugar de competir por el bloqueo del
+    archivo y terminar en "database is locked".
+
+    from app.database.connection import get_reader, get_writer
+
+    with get_reader() as conn:
+        filas = conn.execute("SELECT * FROM vw_PipelineVentas").fetchall()
+
+    with get_writer() as conn:
+        conn.execute("UPDATE ...")
+        conn.commit()
+
+Unidad de trabajo (transaction):
+    Cada metodo de repositorio hace conn.commit() al terminar, lo que en una
+    operacion masiva significa un fsync por fila. transaction() abre un
+    BEGIN IMMEDIATE sobre la conexion del hilo y, mientras esta activo, los
+    commit() de los repositorios se difieren: solo se confirma una vez al
+    salir del bloque. Los bloques anidados usan SAVEPOINT, asi un error en
+    un sub-bloque deshace solo su parte.
+
+    from app.database.connection import transaction
+
+    with transaction():
+        for contacto in contactos:
+            repo.create(contacto)   # su commit() no hace nada aqui
+    # <- un solo COMMIT para todo el lote
+
+Consultas cancelables (cancelable):
+    Las cargas en segundo plano (app/utils/ejecutor.py) envuelven su trabajo
+    en cancelable(debe_abortar). Si el usuario cambia de filtro o cierra la
+    vista, la consulta que sigue corriendo se aborta en lugar de terminar
+    para nada.
+
+    with cancelable(lambda: tarea.cancelada):
+        datos = repo.find_all()     # falla con "interrupted" si se cancela
 """
 
+import queue
 import sqlite3
 import threading
+import time
+from contextlib import contextmanager
 
 # Importamos la ruta absoluta al archivo .db desde la configuracion central.
 # Esto evita duplicar la ruta en varios lugares del proyecto.
@@ -44,6 +92,28 @@ from app.config.settings import DB_PATH
 # nombre de atributo. Python gestiona esta separacion de forma transparente.
 _local = threading.local()
 
+# Candado de escritura compartido por todos los hilos (ver get_writer).
+# Reentrante: un bloque de escritura puede anidar otro o un transaction().
+_escritura_lock = threading.RLock()
+
+
+class _CRMConnection(sqlite3.Connection):
+    """
+    Conexion SQLite que permite diferir los commit() de los repositorios.
+
+    _tx_depth cuenta los bloques transaction() activos. Mientras sea mayor
+    que cero, commit() no hace nada: quien confirma es el bloque externo.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._tx_depth = 0
+
+    def commit(self):
+        if self._tx_depth:
+            return
+        super().commit()
+
 
 def get_connection():
     """
@@ -53,8 +123,10 @@ def get_connection():
       1. Abre una nueva conexion al archivo de base de datos indicado en DB_PATH.
       2. Activa las restricciones de clave foranea (PRAGMA foreign_keys).
       3. Configura el modo de journal WAL para mejor rendimiento (PRAGMA journal_mode).
-      4. Configura row_factory para acceder a columnas por nombre en lugar de indice.
-      5. Guarda la conexion en el almacenamiento thread-local (_local.connection).
+      4. Espera hasta busy_timeout si otra conexion escribe y sincroniza el
+         disco solo en los checkpoints (PRAGMA synchronous = NORMAL).
+      5. Configura row_factory para acceder a columnas por nombre en lugar de indice.
+      6. Guarda la conexion en el almacenamiento thread-local (_local.connection).
 
     En llamadas posteriores del mismo hilo, simplemente devuelve la conexion
     que ya fue creada, sin abrir una nueva. Esto evita el costo de reconectarse
@@ -71,7 +143,8 @@ def get_connection():
 
         # Primera vez en este hilo: abrimos la conexion al archivo SQLite.
         # Si el archivo no existe, SQLite lo crea automaticamente.
-        _local.connection = sqlite3.connect(DB_PATH)
+        # factory=_CRMConnection permite que transaction() difiera los commit().
+        _local.connection = sqlite3.connect(DB_PATH, factory=_CRMConnection)
 
         # --- PRAGMA foreign_keys = ON ---
         # Por defecto, SQLite NO valida las restricciones de clave foranea (FK).
@@ -95,6 +168,18 @@ def get_connection():
         # lanza operaciones en hilos separados.
         _local.connection.execute("PRAGMA journal_mode = WAL")
 
+        # --- PRAGMA busy_timeout ---
+        # Si otra conexion (por ejemplo la de otro hilo) tiene el bloqueo
+        # de escritura, SQLite espera hasta este limite en lugar de fallar de
+        # inmediato con "database is locked".
+        _local.connection.execute(f"PRAGMA busy_timeout = {DEFAULT_BUSY_TIMEOUT_MS}")
+
+        # --- PRAGMA synchronous = NORMAL ---
+        # Con WAL, NORMAL solo sincroniza el disco en los checkpoints y no en
+        # cada commit. Sigue siendo seguro ante un cierre inesperado de la
+        # app; solo un corte de energia puede perder la ultima transaccion.
+        _local.connection.execute("PRAGMA synchronous = NORMAL")
+
         # --- row_factory = sqlite3.Row ---
         # Por defecto, cada fila que devuelve SQLite es una tupla simple.
         # Para acceder a la columna "Nombre" habria que escribir fila[0],
@@ -130,3 +215,436 @@ def close_connection():
     if hasattr(_local, "connection") and _local.connection:
         _local.connection.close()    # Cierra el archivo y libera recursos del SO.
         _local.connection = None     # Marca la conexion como inexistente para este hilo.
+
+
+@contextmanager
+def transaction():
+    """
+    Agrupa varias escrituras de repositorios en una sola transaccion.
+
+    Nivel externo:
+        Confirma lo que hubiera pendiente, ejecuta BEGIN IMMEDIATE (toma el
+        bloqueo de escritura desde el inicio para no fallar a mitad del lote)
+        y hace un unico COMMIT al salir. Si el bloque lanza una excepcion se
+        hace ROLLBACK de todo y la excepcion se propaga.
+
+    Niveles anidados:
+        Se crea un SAVEPOINT. Si el sub-bloque falla se vuelve al savepoint
+        y la excepcion se propaga; el llamador decide si la captura y sigue
+        con el resto del lote.
+
+    El nivel externo toma el candado de get_writer(): un lote no se
+    intercala con las escrituras de otro hilo.
+
+    Yields:
+        sqlite3.Connection: la conexion del hilo actual.
+    """
+    conn = get_connection()
+
+    if conn._tx_depth == 0:
+        with _escritura_lock:
+            if conn.in_transaction:
+                sqlite3.Connection.commit(conn)
+            conn.execute("BEGIN IMMEDIATE")
+            conn._tx_depth = 1
+            try:
+                yield conn
+            except BaseException:
+                conn._tx_depth = 0
+                conn.rollback()
+                raise
+            conn._tx_depth = 0
+            try:
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+        return
+
+    nombre = f"sp_crm_{conn._tx_depth}"
+    conn.execute(f"SAVEPOINT {nombre}")
+    conn._tx_depth += 1
+    try:
+        yield conn
+    except BaseException:
+        conn.execute(f"ROLLBACK TO {nombre}")
+        conn.execute(f"RELEASE {nombre}")
+        raise
+    else:
+        conn.execute(f"RELEASE {nombre}")
+    finally:
+        conn._tx_depth -= 1
+
+
+# ---------------------------------------------------------------------------
+# Consultas cancelables
+# ---------------------------------------------------------------------------
+# SQLite llama al progress handler cada N instrucciones de su maquina virtual;
+# si devuelve True, la sentencia en curso se aborta con
+# sqlite3.OperationalError("interrupted"). Cada 1000 instrucciones el costo es
+# despreciable y una consulta larga se corta en milisegundos.
+_INSTRUCCIONES_ENTRE_CHEQUEOS = 1000
+
+
+def _instalar_abortar(conn, debe_abortar):
+    if debe_abortar is None:
+        conn.set_progress_handler(None, 0)
+    else:
+        conn.set_progress_handler(debe_abortar, _INSTRUCCIONES_ENTRE_CHEQUEOS)
+
+
+@contextmanager
+def cancelable(debe_abortar):
+    """
+    Permite abortar desde otro hilo las consultas que este hilo ejecute
+    dentro del bloque.
+
+    Mientras el bloque esta activo, la conexion thread-local y los lectores
+    del pool que tome este hilo revisan debe_abortar() durante cada consulta;
+    en cuanto devuelve True, la consulta falla con "interrupted". Lo usa el
+    ejecutor de tareas en segundo plano para cancelar cargas que ya no se
+    necesitan.
+
+    Args:
+        debe_abortar: funcion sin argumentos; se llama desde el hilo que
+                      ejecuta la consulta, asi que debe ser barata y segura.
+    """
+    anterior = getattr(_local, "abortar", None)
+    _local.abortar = debe_abortar
+    conn = get_connection()
+    _instalar_abortar(conn, debe_abortar)
+    try:
+        yield
+    finally:
+        _local.abortar = anterior
+        _instalar_abortar(conn, anterior)
+
+
+# ---------------------------------------------------------------------------
+# Pool de conexiones de solo lectura
+# ---------------------------------------------------------------------------
+
+# Valores por defecto del pool. Se eligieron pensando en una app de escritorio:
+# pocos hilos concurrentes (GUI + algunos workers), pero consultas de reportes
+# que recorren tablas completas y se benefician de cache y mmap grandes.
+DEFAULT_POOL_SIZE = 4
+DEFAULT_CHECKOUT_TIMEOUT = 10.0     # segundos maximos esperando un lector libre
+DEFAULT_BUSY_TIMEOUT_MS = 5000      # espera interna de SQLite ante bloqueos
+DEFAULT_MMAP_SIZE = 256 * 1024 * 1024
+DEFAULT_CACHE_SIZE_KB = 32 * 1024   # cache_size negativo = KiB, no paginas
+DEFAULT_HEALTH_CHECK_INTERVAL = 30.0
+
+
+class PoolTimeoutError(sqlite3.OperationalError):
+    """
+    Se lanza cuando no hay un lector libre dentro del tiempo de espera.
+
+    Hereda de sqlite3.OperationalError y su mensaje contiene "busy" para que
+    retry_on_db_error lo trate igual que un bloqueo transitorio de SQLite.
+    """
+
+
+class ConnectionPool:
+    """
+    Pool de conexiones SQLite de solo lectura.
+
+    Lectores:
+        Se crean de forma perezosa hasta 'size' conexiones. Cada checkout
+        saca una conexion de la cola y el return la devuelve; si todas estan
+        ocupadas el hilo espera hasta 'checkout_timeout' segundos.
+        Configuracion: query_only, mmap_size, cache_size y temp_store=MEMORY.
+
+    Health check:
+        Antes de entregar una conexion que lleva mas de
+        'health_check_interval' segundos sin usarse se ejecuta "SELECT 1".
+        Si falla, la conexion se descarta y se abre una nueva.
+
+    Las conexiones se abren con check_same_thread=False porque viajan entre
+    hilos; el pool garantiza que nunca las usen dos hilos al mismo tiempo.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        size=DEFAULT_POOL_SIZE,
+        checkout_timeout=DEFAULT_CHECKOUT_TIMEOUT,
+        busy_timeout_ms=DEFAULT_BUSY_TIMEOUT_MS,
+        mmap_size=DEFAULT_MMAP_SIZE,
+        cache_size_kb=DEFAULT_CACHE_SIZE_KB,
+        health_check_interval=DEFAULT_HEALTH_CHECK_INTERVAL,
+    ):
+        if size < 1:
+            raise ValueError("El pool necesita al menos un lector")
+        self._db_path = db_path
+        self._size = size
+        self._checkout_timeout = checkout_timeout
+        self._busy_timeout_ms = busy_timeout_ms
+        self._mmap_size = mmap_size
+        self._cache_size_kb = cache_size_kb
+        self._health_check_interval = health_check_interval
+
+        # Cola de lectores libres: (conexion, instante del ultimo uso)
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+        self._closed = False
+        self._metrics = {
+            "lectores_creados": 0,
+            "checkouts_lector": 0,
+            "esperas_lector": 0,
+            "tiempo_espera_lector": 0.0,
+            "timeouts": 0,
+            "health_checks": 0,
+            "conexiones_reemplazadas": 0,
+        }
+
+    # ---- Creacion de conexiones ----
+
+    def _open_reader(self):
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
+        conn.execute(f"PRAGMA busy_timeout = {int(self._busy_timeout_ms)}")
+        conn.execute(f"PRAGMA mmap_size = {int(self._mmap_size)}")
+        conn.execute(f"PRAGMA cache_size = -{int(self._cache_size_kb)}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA query_only = ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _is_healthy(self, conn, last_used):
+        # Solo se verifica si la conexion estuvo ociosa el tiempo suficiente;
+        # hacer SELECT 1 en cada checkout costaria mas que el beneficio.
+        if time.monotonic() - last_used < self._health_check_interval:
+            return True
+        self._metrics["health_checks"] += 1
+        try:
+            conn.execute("SELECT 1").fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    @staticmethod
+    def _discard(conn):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    # ---- Lectores ----
+
+    def acquire_reader(self):
+        """
+        Saca un lector del pool. Debe devolverse con release_reader().
+
+        Preferir el context manager reader(), que garantiza la devolucion.
+        """
+        if self._closed:
+            raise sqlite3.ProgrammingError("El pool de conexiones esta cerrado")
+
+        try:
+            conn, last_used = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+            with self._lock:
+                if self._created < self._size:
+                    self._created += 1
+                    crear = True
+                else:
+                    crear = False
+            if crear:
+                try:
+                    conn = self._open_reader()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                self._metrics["lectores_creados"] += 1
+                last_used = time.monotonic()
+            else:
+                # Pool agotado: esperar a que otro hilo devuelva un lector
+                self._metrics["esperas_lector"] += 1
+                inicio = time.monotonic()
+                try:
+                    conn, last_used = self._idle.get(timeout=self._checkout_timeout)
+                except queue.Empty:
+                    self._metrics["timeouts"] += 1
+                    raise PoolTimeoutError(
+                        "database is busy: no hay lectores disponibles en el pool"
+                    )
+                finally:
+                    self._metrics["tiempo_espera_lector"] += time.monotonic() - inicio
+
+        if not self._is_healthy(conn, last_used):
+            self._discard(conn)
+            conn = self._open_reader()
+            self._metrics["conexiones_reemplazadas"] += 1
+
+        self._metrics["checkouts_lector"] += 1
+        return conn
+
+    def release_reader(self, conn):
+        """Devuelve un lector al pool (o lo cierra si el pool ya se cerro)."""
+        # Una transaccion de lectura abierta fija un snapshot del WAL e impide
+        # que el checkpoint avance; se cierra antes de devolver la conexion.
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            self._discard(conn)
+            with self._lock:
+                self._created -= 1
+            return
+
+        if self._closed:
+            self._discard(conn)
+            return
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def reader(self):
+        conn = self.acquire_reader()
+        # dentro de un bloque cancelable() el lector hereda el chequeo del hilo
+        debe_abortar = getattr(_local, "abortar", None)
+        if debe_abortar is not None:
+            _instalar_abortar(conn, debe_abortar)
+        try:
+            yield conn
+        finally:
+            if debe_abortar is not None:
+                _instalar_abortar(conn, None)
+            self.release_reader(conn)
+
+    # ---- Mantenimiento ----
+
+    def health_check(self):
+        """
+        Verifica todas las conexiones ociosas y reemplaza las que fallen.
+
+        Returns:
+            dict: {"lectores_ok": int, "lectores_reemplazados": int}
+        """
+        ok, reemplazados = 0, 0
+        revisadas = []
+        while True:
+            try:
+                revisadas.append(self._idle.get_nowait())
+            except queue.Empty:
+                break
+        for conn, _ in revisadas:
+            try:
+                conn.execute("SELECT 1").fetchone()
+                ok += 1
+            except sqlite3.Error:
+                self._discard(conn)
+                conn = self._open_reader()
+                reemplazados += 1
+                self._metrics["conexiones_reemplazadas"] += 1
+            self._idle.put((conn, time.monotonic()))
+        return {
+            "lectores_ok": ok,
+            "lectores_reemplazados": reemplazados,
+        }
+
+    def metrics(self):
+        """Copia de las metricas acumuladas mas el estado actual del pool."""
+        datos = dict(self._metrics)
+        datos["tamano"] = self._size
+        datos["lectores_abiertos"] = self._created
+        datos["lectores_libres"] = self._idle.qsize()
+        datos["lectores_en_uso"] = self._created - self._idle.qsize()
+        return datos
+
+    def close(self):
+        """Cierra todas las conexiones ociosas."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+            with self._lock:
+                self._created -= 1
+
+
+# Pool global de la aplicacion. Se crea la primera vez que se pide un lector,
+# asi importar este modulo no abre ningun archivo.
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    """Devuelve el pool global, creandolo con DB_PATH si aun no existe."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(DB_PATH)
+    return _pool
+
+
+def get_reader():
+    """
+    Context manager que presta una conexion de solo lectura del pool global.
+
+        with get_reader() as conn:
+            filas = conn.execute("SELECT ...").fetchall()
+    """
+    return get_pool().reader()
+
+
+@contextmanager
+def read_transaction():
+    """
+    Lector del pool dentro de una transaccion de lectura.
+
+    Todas las consultas del bloque ven la misma foto de la BD (snapshot del
+    WAL), aunque otro hilo confirme escrituras mientras tanto. Al devolver
+    el lector, el pool cierra la transaccion.
+
+        with read_transaction() as conn:
+            a = conn.execute("SELECT ...").fetchall()
+            b = conn.execute("SELECT ...").fetchall()   # mismo snapshot que a
+    """
+    with get_reader() as conn:
+        conn.execute("BEGIN")
+        yield conn
+
+
+@contextmanager
+def get_writer():
+    """
+    Conexion de escritura: la del hilo actual, con acceso exclusivo.
+
+    Mientras el bloque esta activo ningun otro hilo entra a get_writer()
+    ni a un transaction(). El llamador hace commit dentro del bloque (o lo
+    deja al transaction() que lo envuelve). Si el bloque falla fuera de un
+    transaction() y quedo una transaccion abierta, se hace rollback para
+    no dejar cambios a medias.
+
+        with get_writer() as conn:
+            conn.execute("UPDATE ...")
+            conn.commit()
+    """
+    with _escritura_lock:
+        conn = get_connection()
+        try:
+            yield conn
+        except BaseException:
+            if not conn._tx_depth and conn.in_transaction:
+                conn.rollback()
+            raise
+
+
+def pool_metrics():
+    """Metricas del pool global (dict vacio si aun no se ha creado)."""
+    return _pool.metrics() if _pool is not None else {}
+
+
+def close_pool():
+    """Cierra el pool global. La siguiente llamada a get_pool() crea uno nuevo."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -17,6 +17,14 @@ Cuando se llama initialize_database():
       luego se ejecuta el script SQL completo para construir el esquema y
       cargar datos iniciales (catálogos, configuraciones, etc.).
 
+Migraciones incrementales:
+    El script completo solo corre al crear la BD. Los cambios de esquema
+    posteriores (indices, tablas nuevas, triggers) se agregan al final de
+    database_query.sql para instalaciones nuevas Y a la lista _MIGRACIONES
+    de este modulo para las BD que ya existen. Todas las sentencias son
+    idempotentes (IF NOT EXISTS), por lo que apply_migrations() se ejecuta
+    en cada arranque sin efectos secundarios.
+
 Cuando se llama has_users():
     - Se consulta cuantos registros hay en la tabla Usuarios.
     - Devuelve True si hay al menos uno, False si la tabla esta vacia.
@@ -41,7 +49,615 @@ from app.config.settings import DB_PATH, SCHEMA_PATH
 
 # get_connection devuelve la conexion thread-local ya configurada con los
 # PRAGMAs necesarios (foreign_keys, WAL, row_factory). Ver connection.py.
-from app.database.connection import get_connection
+from app.database.connection import get_connection, transaction
+
+# El repositorio de busqueda sabe llenar el indice FTS5 desde las tablas
+from app.repositories.busqueda_repository import BusquedaRepository
+
+# ... el del dashboard, la tabla de KPIs, y el de reportes, el resumen de actividad
+from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.reporte_repository import ReporteRepository
+
+# ---------------------------------------------------------------------------
+# Migraciones idempotentes para BD creadas con versiones anteriores
+# ---------------------------------------------------------------------------
+# Cada sentencia debe poder ejecutarse muchas veces sin error ni cambios
+# repetidos. Mantener sincronizado con el final de database_query.sql.
+_MIGRACIONES = [
+    # Paginacion por cursor (FechaCreacion, ID)
+    "CREATE INDEX IF NOT EXISTS idx_contactos_fecha_id ON Contactos(FechaCreacion, ContactoID)",
+    "CREATE INDEX IF NOT EXISTS idx_empresas_fecha_id ON Empresas(FechaCreacion, EmpresaID)",
+    "CREATE INDEX IF NOT EXISTS idx_actividades_fecha_id ON Actividades(FechaCreacion, ActividadID)",
+    "CREATE INDEX IF NOT EXISTS idx_cotizaciones_fecha_id ON Cotizaciones(FechaCreacion, CotizacionID)",
+    # Busqueda de texto completo (FTS5); ver rowid = ID * 4 + tipo en el .sql
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS BusquedaGlobal USING fts5(
+        Titulo, Detalle, Contenido,
+        PadreID UNINDEXED,
+        tokenize = 'unicode61 remove_diacritics 2',
+        prefix = '2 3'
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_notascontacto_privadas ON NotasContacto(CreadoPor) WHERE EsPrivada = 1",
+    "CREATE INDEX IF NOT EXISTS idx_notasempresa_privadas ON NotasEmpresa(CreadoPor) WHERE EsPrivada = 1",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaInsert
+    AFTER INSERT ON Contactos
+    BEGIN
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.ContactoID * 4,
+            NEW.Nombre || ' ' || NEW.ApellidoPaterno || ' ' || IFNULL(NEW.ApellidoMaterno, ''),
+            IFNULL(NEW.Email, '') || ' ' || IFNULL(NEW.EmailSecundario, '') || ' ' ||
+            IFNULL(NEW.TelefonoOficina, '') || ' ' || IFNULL(NEW.TelefonoCelular, '') || ' ' ||
+            IFNULL(NEW.Puesto, '') || ' ' || IFNULL(NEW.Departamento, ''),
+            '', NEW.EmpresaID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaUpdate
+    AFTER UPDATE OF Nombre, ApellidoPaterno, ApellidoMaterno, Email, EmailSecundario,
+                    TelefonoOficina, TelefonoCelular, Puesto, Departamento, EmpresaID ON Contactos
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.ContactoID * 4;
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.ContactoID * 4,
+            NEW.Nombre || ' ' || NEW.ApellidoPaterno || ' ' || IFNULL(NEW.ApellidoMaterno, ''),
+            IFNULL(NEW.Email, '') || ' ' || IFNULL(NEW.EmailSecundario, '') || ' ' ||
+            IFNULL(NEW.TelefonoOficina, '') || ' ' || IFNULL(NEW.TelefonoCelular, '') || ' ' ||
+            IFNULL(NEW.Puesto, '') || ' ' || IFNULL(NEW.Departamento, ''),
+            '', NEW.EmpresaID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaDelete
+    AFTER DELETE ON Contactos
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.ContactoID * 4;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaInsert
+    AFTER INSERT ON Empresas
+    BEGIN
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.EmpresaID * 4 + 1,
+            NEW.RazonSocial || ' ' || IFNULL(NEW.NombreComercial, ''),
+            IFNULL(NEW.RFC, '') || ' ' || IFNULL(NEW.Email, '') || ' ' ||
+            IFNULL(NEW.Telefono, '') || ' ' || IFNULL(NEW.SitioWeb, ''),
+            IFNULL(NEW.Descripcion, ''), NULL
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaUpdate
+    AFTER UPDATE OF RazonSocial, NombreComercial, RFC, Email, Telefono, SitioWeb, Descripcion ON Empresas
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.EmpresaID * 4 + 1;
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.EmpresaID * 4 + 1,
+            NEW.RazonSocial || ' ' || IFNULL(NEW.NombreComercial, ''),
+            IFNULL(NEW.RFC, '') || ' ' || IFNULL(NEW.Email, '') || ' ' ||
+            IFNULL(NEW.Telefono, '') || ' ' || IFNULL(NEW.SitioWeb, ''),
+            IFNULL(NEW.Descripcion, ''), NULL
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaDelete
+    AFTER DELETE ON Empresas
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.EmpresaID * 4 + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaInsert
+    AFTER INSERT ON NotasContacto
+    BEGIN
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.NotaID * 4 + 2, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.ContactoID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaUpdate
+    AFTER UPDATE OF Titulo, Contenido, ContactoID ON NotasContacto
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 2;
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.NotaID * 4 + 2, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.ContactoID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaDelete
+    AFTER DELETE ON NotasContacto
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 2;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaInsert
+    AFTER INSERT ON NotasEmpresa
+    BEGIN
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.NotaID * 4 + 3, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.EmpresaID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaUpdate
+    AFTER UPDATE OF Titulo, Contenido, EmpresaID ON NotasEmpresa
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 3;
+        INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+        VALUES (
+            NEW.NotaID * 4 + 3, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.EmpresaID
+        );
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaDelete
+    AFTER DELETE ON NotasEmpresa
+    BEGIN
+        DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 3;
+    END
+    """,
+    # Versiones de catalogos para CatalogCache
+    """
+    CREATE TABLE IF NOT EXISTS VersionCatalogos (
+        Tabla           TEXT PRIMARY KEY,
+        Version         INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    # Resumen de KPIs del dashboard (ResumenKPI + RevenueMensual y sus triggers)
+    """
+    CREATE TABLE IF NOT EXISTS ResumenKPI (
+        ResumenID               INTEGER PRIMARY KEY CHECK (ResumenID = 1),
+        ContactosActivos        INTEGER NOT NULL DEFAULT 0,
+        EmpresasActivas         INTEGER NOT NULL DEFAULT 0,
+        OportunidadesAbiertas   INTEGER NOT NULL DEFAULT 0,
+        ValorPipeline           REAL NOT NULL DEFAULT 0,
+        OportunidadesGanadas    INTEGER NOT NULL DEFAULT 0,
+        OportunidadesCerradas   INTEGER NOT NULL DEFAULT 0,
+        ActividadesPendientes   INTEGER NOT NULL DEFAULT 0,
+        CampanasEnviadas        INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS RevenueMensual (
+        Mes             TEXT PRIMARY KEY,
+        Monto           REAL NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIInsert
+    AFTER INSERT ON Contactos
+    BEGIN
+        UPDATE ResumenKPI SET ContactosActivos = ContactosActivos + (NEW.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIUpdate
+    AFTER UPDATE OF Activo ON Contactos
+    BEGIN
+        UPDATE ResumenKPI
+        SET ContactosActivos = ContactosActivos + (NEW.Activo IS 1) - (OLD.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIDelete
+    AFTER DELETE ON Contactos
+    BEGIN
+        UPDATE ResumenKPI SET ContactosActivos = ContactosActivos - (OLD.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIInsert
+    AFTER INSERT ON Empresas
+    BEGIN
+        UPDATE ResumenKPI SET EmpresasActivas = EmpresasActivas + (NEW.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIUpdate
+    AFTER UPDATE OF Activo ON Empresas
+    BEGIN
+        UPDATE ResumenKPI
+        SET EmpresasActivas = EmpresasActivas + (NEW.Activo IS 1) - (OLD.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIDelete
+    AFTER DELETE ON Empresas
+    BEGIN
+        UPDATE ResumenKPI SET EmpresasActivas = EmpresasActivas - (OLD.Activo IS 1)
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIInsert
+    AFTER INSERT ON Oportunidades
+    BEGIN
+        UPDATE ResumenKPI
+        SET OportunidadesAbiertas = OportunidadesAbiertas + (NEW.EsGanada IS NULL),
+            ValorPipeline = ValorPipeline + (NEW.EsGanada IS NULL) * IFNULL(NEW.MontoEstimado, 0),
+            OportunidadesGanadas = OportunidadesGanadas + (NEW.EsGanada IS 1),
+            OportunidadesCerradas = OportunidadesCerradas + (NEW.EsGanada IS NOT NULL)
+        WHERE ResumenID = 1;
+        INSERT INTO RevenueMensual (Mes, Monto)
+        SELECT substr(NEW.FechaCierreReal, 1, 7), IFNULL(NEW.MontoEstimado, 0)
+        WHERE NEW.EsGanada IS 1 AND NEW.FechaCierreReal IS NOT NULL
+        ON CONFLICT (Mes) DO UPDATE SET Monto = Monto + excluded.Monto;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIUpdate
+    AFTER UPDATE OF EsGanada, MontoEstimado, FechaCierreReal ON Oportunidades
+    BEGIN
+        UPDATE ResumenKPI
+        SET OportunidadesAbiertas = OportunidadesAbiertas
+                + (NEW.EsGanada IS NULL) - (OLD.EsGanada IS NULL),
+            ValorPipeline = ValorPipeline
+                + (NEW.EsGanada IS NULL) * IFNULL(NEW.MontoEstimado, 0)
+                - (OLD.EsGanada IS NULL) * IFNULL(OLD.MontoEstimado, 0),
+            OportunidadesGanadas = OportunidadesGanadas
+                + (NEW.EsGanada IS 1) - (OLD.EsGanada IS 1),
+            OportunidadesCerradas = OportunidadesCerradas
+                + (NEW.EsGanada IS NOT NULL) - (OLD.EsGanada IS NOT NULL)
+        WHERE ResumenID = 1;
+        UPDATE RevenueMensual SET Monto = Monto - IFNULL(OLD.MontoEstimado, 0)
+        WHERE OLD.EsGanada IS 1 AND Mes = substr(OLD.FechaCierreReal, 1, 7);
+        INSERT INTO RevenueMensual (Mes, Monto)
+        SELECT substr(NEW.FechaCierreReal, 1, 7), IFNULL(NEW.MontoEstimado, 0)
+        WHERE NEW.EsGanada IS 1 AND NEW.FechaCierreReal IS NOT NULL
+        ON CONFLICT (Mes) DO UPDATE SET Monto = Monto + excluded.Monto;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIDelete
+    AFTER DELETE ON Oportunidades
+    BEGIN
+        UPDATE ResumenKPI
+        SET OportunidadesAbiertas = OportunidadesAbiertas - (OLD.EsGanada IS NULL),
+            ValorPipeline = ValorPipeline - (OLD.EsGanada IS NULL) * IFNULL(OLD.MontoEstimado, 0),
+            OportunidadesGanadas = OportunidadesGanadas - (OLD.EsGanada IS 1),
+            OportunidadesCerradas = OportunidadesCerradas - (OLD.EsGanada IS NOT NULL)
+        WHERE ResumenID = 1;
+        UPDATE RevenueMensual SET Monto = Monto - IFNULL(OLD.MontoEstimado, 0)
+        WHERE OLD.EsGanada IS 1 AND Mes = substr(OLD.FechaCierreReal, 1, 7);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIInsert
+    AFTER INSERT ON Actividades
+    BEGIN
+        UPDATE ResumenKPI
+        SET ActividadesPendientes = ActividadesPendientes + (NEW.EstadoActividadID IN (1, 2))
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIUpdate
+    AFTER UPDATE OF EstadoActividadID ON Actividades
+    BEGIN
+        UPDATE ResumenKPI
+        SET ActividadesPendientes = ActividadesPendientes
+            + (NEW.EstadoActividadID IN (1, 2)) - (OLD.EstadoActividadID IN (1, 2))
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIDelete
+    AFTER DELETE ON Actividades
+    BEGIN
+        UPDATE ResumenKPI
+        SET ActividadesPendientes = ActividadesPendientes - (OLD.EstadoActividadID IN (1, 2))
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIInsert
+    AFTER INSERT ON Campanas
+    BEGIN
+        UPDATE ResumenKPI SET CampanasEnviadas = CampanasEnviadas + (NEW.Estado IS 'Enviada')
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIUpdate
+    AFTER UPDATE OF Estado ON Campanas
+    BEGIN
+        UPDATE ResumenKPI
+        SET CampanasEnviadas = CampanasEnviadas + (NEW.Estado IS 'Enviada') - (OLD.Estado IS 'Enviada')
+        WHERE ResumenID = 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIDelete
+    AFTER DELETE ON Campanas
+    BEGIN
+        UPDATE ResumenKPI SET CampanasEnviadas = CampanasEnviadas - (OLD.Estado IS 'Enviada')
+        WHERE ResumenID = 1;
+    END
+    """,
+    # Resumen de actividad por contacto (vw_ActividadRecienteContacto)
+    """
+    CREATE TABLE IF NOT EXISTS ResumenActividadContacto (
+        ContactoID          INTEGER PRIMARY KEY,
+        TotalActividades    INTEGER NOT NULL DEFAULT 0,
+        UltimaActividad     TEXT
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS ResumenActividadContactoTipo (
+        ContactoID          INTEGER NOT NULL,
+        TipoActividadID     INTEGER NOT NULL,
+        Total               INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (ContactoID, TipoActividadID)
+    ) WITHOUT ROWID
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_resumen_actividad_ultima ON ResumenActividadContacto(UltimaActividad)",
+    "CREATE INDEX IF NOT EXISTS idx_actividades_contacto_fecha ON Actividades(ContactoID, FechaCreacion)",
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_ResumenActividadInsert
+    AFTER INSERT ON Contactos
+    BEGIN
+        INSERT OR IGNORE INTO ResumenActividadContacto (ContactoID) VALUES (NEW.ContactoID);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Contactos_ResumenActividadDelete
+    AFTER DELETE ON Contactos
+    BEGIN
+        DELETE FROM ResumenActividadContacto WHERE ContactoID = OLD.ContactoID;
+        DELETE FROM ResumenActividadContactoTipo WHERE ContactoID = OLD.ContactoID;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoInsert
+    AFTER INSERT ON Actividades
+    WHEN NEW.ContactoID IS NOT NULL
+    BEGIN
+        UPDATE ResumenActividadContacto
+        SET TotalActividades = TotalActividades + 1,
+            UltimaActividad = CASE
+                WHEN UltimaActividad IS NULL OR NEW.FechaCreacion > UltimaActividad
+                THEN NEW.FechaCreacion ELSE UltimaActividad
+            END
+        WHERE ContactoID = NEW.ContactoID;
+        INSERT INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+        VALUES (NEW.ContactoID, NEW.TipoActividadID, 1)
+        ON CONFLICT (ContactoID, TipoActividadID) DO UPDATE SET Total = Total + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoUpdate
+    AFTER UPDATE OF ContactoID, TipoActividadID, FechaCreacion ON Actividades
+    BEGIN
+        UPDATE ResumenActividadContacto SET TotalActividades = TotalActividades - 1
+        WHERE ContactoID = OLD.ContactoID;
+        UPDATE ResumenActividadContacto SET TotalActividades = TotalActividades + 1
+        WHERE ContactoID = NEW.ContactoID;
+        UPDATE ResumenActividadContacto
+        SET UltimaActividad = (
+            SELECT MAX(a.FechaCreacion) FROM Actividades a
+            WHERE a.ContactoID = ResumenActividadContacto.ContactoID
+        )
+        WHERE ContactoID IN (OLD.ContactoID, NEW.ContactoID);
+        UPDATE ResumenActividadContactoTipo SET Total = Total - 1
+        WHERE ContactoID = OLD.ContactoID AND TipoActividadID = OLD.TipoActividadID;
+        INSERT INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+        SELECT NEW.ContactoID, NEW.TipoActividadID, 1
+        WHERE NEW.ContactoID IS NOT NULL
+        ON CONFLICT (ContactoID, TipoActividadID) DO UPDATE SET Total = Total + 1;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoDelete
+    AFTER DELETE ON Actividades
+    WHEN OLD.ContactoID IS NOT NULL
+    BEGIN
+        UPDATE ResumenActividadContacto
+        SET TotalActividades = TotalActividades - 1,
+            UltimaActividad = (
+                SELECT MAX(FechaCreacion) FROM Actividades WHERE ContactoID = OLD.ContactoID
+            )
+        WHERE ContactoID = OLD.ContactoID;
+        UPDATE ResumenActividadContactoTipo SET Total = Total - 1
+        WHERE ContactoID = OLD.ContactoID AND TipoActividadID = OLD.TipoActividadID;
+    END
+    """,
+]
+
+# vw_ResumenEjecutivo lee ResumenKPI. En BD anteriores la vista ya existe
+# con las subconsultas sobre las tablas completas: se reemplaza una sola vez,
+# al crear ResumenKPI (ver apply_migrations).
+_VISTA_RESUMEN_KPI = """
+CREATE VIEW IF NOT EXISTS vw_ResumenEjecutivo AS
+SELECT
+    r.ContactosActivos,
+    r.EmpresasActivas,
+    r.OportunidadesAbiertas,
+    r.ValorPipeline,
+    IFNULL(m.Monto, 0)                                                   AS RevenueEsteMes,
+    r.ActividadesPendientes,
+    r.CampanasEnviadas,
+    CASE
+        WHEN r.OportunidadesCerradas > 0
+        THEN ROUND(CAST(r.OportunidadesGanadas AS REAL) / r.OportunidadesCerradas * 100, 1)
+        ELSE 0
+    END AS TasaConversionGlobal
+FROM ResumenKPI r
+LEFT JOIN RevenueMensual m ON m.Mes = strftime('%Y-%m', 'now', 'localtime')
+WHERE r.ResumenID = 1
+"""
+
+
+# Igual que la anterior para vw_ActividadRecienteContacto (antes agrupaba
+# todas las Actividades); se reemplaza al crear ResumenActividadContacto.
+_VISTA_ACTIVIDAD_CONTACTO = """
+CREATE VIEW IF NOT EXISTS vw_ActividadRecienteContacto AS
+SELECT
+    co.ContactoID,
+    (co.Nombre || ' ' || co.ApellidoPaterno) AS NombreContacto,
+    e.RazonSocial AS Empresa,
+    r.TotalActividades,
+    r.UltimaActividad,
+    CAST(julianday('now', 'localtime') - julianday(r.UltimaActividad) AS INTEGER) AS DiasSinContacto,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Llamada')), 0) AS TotalLlamadas,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Reunión')), 0) AS TotalReuniones,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Correo')), 0) AS TotalCorreos
+FROM ResumenActividadContacto r
+    CROSS JOIN Contactos co ON co.ContactoID = r.ContactoID
+    LEFT JOIN Empresas e ON co.EmpresaID = e.EmpresaID
+WHERE co.Activo = 1
+"""
+
+# Tablas que guarda CatalogCache. Cada cambio en ellas incrementa su fila de
+# VersionCatalogos mediante tres triggers identicos (insert/update/delete);
+# se generan aqui en lugar de escribir 42 sentencias a mano.
+_TABLAS_CATALOGO = (
+    "Industrias", "TamanosEmpresa", "OrigenesContacto", "Monedas", "Paises",
+    "Estados", "Ciudades", "Usuarios", "EtapasVenta", "MotivosPerdida",
+    "TiposActividad", "EstadosActividad", "Etiquetas", "Prioridades",
+)
+
+# Tablas que leen los reportes; su version en VersionTablas invalida el
+# cache de resultados de ReporteService. Algunos catalogos se repiten aqui
+# para que el cache dependa de una sola tabla de versiones.
+_TABLAS_VERSIONADAS = (
+    "Oportunidades", "Contactos", "Empresas", "Actividades", "Campanas",
+    "Usuarios", "Roles", "EtapasVenta", "TiposActividad",
+)
+
+
+def _sentencias_version(tabla_versiones, tablas, prefijo, columnas_usuarios):
+    sentencias = [
+        f"INSERT OR IGNORE INTO {tabla_versiones} (Tabla) VALUES "
+        + ", ".join(f"('{tabla}')" for tabla in tablas)
+    ]
+    for tabla in tablas:
+        for evento in ("INSERT", "UPDATE", "DELETE"):
+            if tabla == "Usuarios" and evento == "UPDATE":
+                # UltimoAcceso cambia en cada login; solo cuentan las columnas que se muestran
+                disparo = f"AFTER UPDATE OF {columnas_usuarios} ON {tabla}"
+            else:
+                disparo = f"AFTER {evento} ON {tabla}"
+            sentencias.append(
+                f"CREATE TRIGGER IF NOT EXISTS trg_{tabla}_{prefijo}{evento.title()} {disparo} "
+                f"BEGIN UPDATE {tabla_versiones} SET Version = Version + 1 WHERE Tabla = '{tabla}'; END"
+            )
+    return sentencias
+
+
+def _sentencias_version_catalogos():
+    return _sentencias_version(
+        "VersionCatalogos", _TABLAS_CATALOGO, "Version", "Nombre, ApellidoPaterno, Activo"
+    )
+
+
+def _sentencias_version_tablas():
+    return [
+        """
+    CREATE TABLE IF NOT EXISTS VersionTablas (
+        Tabla           TEXT PRIMARY KEY,
+        Version         INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID
+    """
+    ] + _sentencias_version(
+        "VersionTablas", _TABLAS_VERSIONADAS, "VersionTabla",
+        "Nombre, ApellidoPaterno, RolID, Activo",
+    )
+
+
+_MIGRACIONES += _sentencias_version_catalogos()
+_MIGRACIONES += _sentencias_version_tablas()
+
+# Indices para filtros por rango de fechas y listados por entidad
+_MIGRACIONES += [
+    "CREATE INDEX IF NOT EXISTS idx_oportunidades_abiertas_fecha ON Oportunidades(EsGanada, FechaCreacion)",
+    "CREATE INDEX IF NOT EXISTS idx_campanas_fecha_envio ON Campanas(FechaEnvio)",
+    "CREATE INDEX IF NOT EXISTS idx_campanas_fecha ON Campanas(FechaCreacion)",
+    "CREATE INDEX IF NOT EXISTS idx_notascontacto_contacto_fecha ON NotasContacto(ContactoID, FechaCreacion)",
+    "CREATE INDEX IF NOT EXISTS idx_notasempresa_empresa_fecha ON NotasEmpresa(EmpresaID, FechaCreacion)",
+    "CREATE INDEX IF NOT EXISTS idx_historial_etapas_oportunidad ON HistorialEtapas(OportunidadID, FechaCambio)",
+]
+
+# Trabajos de envio de campanas (envio en segundo plano con punto de control)
+_MIGRACIONES += [
+    """
+    CREATE TABLE IF NOT EXISTS TrabajosEnvio (
+        TrabajoID            INTEGER PRIMARY KEY AUTOINCREMENT,
+        CampanaID            INTEGER NOT NULL,
+        Estado               TEXT NOT NULL DEFAULT 'Pendiente',
+        TotalDestinatarios   INTEGER NOT NULL DEFAULT 0,
+        Enviados             INTEGER NOT NULL DEFAULT 0,
+        Fallidos             INTEGER NOT NULL DEFAULT 0,
+        UltimoDestinatarioID INTEGER NOT NULL DEFAULT 0,
+        Error                TEXT,
+        CreadoPor            INTEGER,
+        FechaCreacion        TEXT DEFAULT (datetime('now', 'localtime')),
+        FechaInicio          TEXT,
+        FechaActualizacion   TEXT DEFAULT (datetime('now', 'localtime')),
+        FechaFin             TEXT,
+        FOREIGN KEY (CampanaID) REFERENCES Campanas(CampanaID),
+        FOREIGN KEY (CreadoPor) REFERENCES Usuarios(UsuarioID)
+    )
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_trabajos_envio_campana_vivo ON TrabajosEnvio(CampanaID) "
+    "WHERE Estado IN ('Pendiente', 'En Curso', 'Pausado')",
+    "CREATE INDEX IF NOT EXISTS idx_trabajos_envio_estado ON TrabajosEnvio(Estado)",
+    "CREATE INDEX IF NOT EXISTS idx_campana_dest_estado ON CampanaDestinatarios(CampanaID, EstadoEnvio, DestinatarioID)",
+]
+
+# Lista de supresion de correos y carga de destinatarios desde segmento
+_MIGRACIONES += [
+    """
+    CREATE TABLE IF NOT EXISTS CorreosSuprimidos (
+        Email               TEXT PRIMARY KEY COLLATE NOCASE,
+        Motivo              TEXT,
+        FechaAlta           TEXT DEFAULT (datetime('now', 'localtime'))
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS trg_CampanaDestinatarios_Desuscripcion
+    AFTER UPDATE OF SeDesuscribio ON CampanaDestinatarios
+    WHEN NEW.SeDesuscribio = 1 AND TRIM(COALESCE(NEW.EmailDestino, '')) != ''
+    BEGIN
+        INSERT OR IGNORE INTO CorreosSuprimidos (Email, Motivo)
+        VALUES (TRIM(NEW.EmailDestino), 'Desuscrito');
+    END
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_campana_dest_email ON CampanaDestinatarios(CampanaID, EmailDestino COLLATE NOCASE)",
+]
+
+# llena la lista de supresion con las bajas anteriores a ella (solo al crearla;
+# despues la mantiene trg_CampanaDestinatarios_Desuscripcion)
+_LLENAR_CORREOS_SUPRIMIDOS = """
+INSERT OR IGNORE INTO CorreosSuprimidos (Email, Motivo)
+SELECT TRIM(EmailDestino), 'Desuscrito' FROM CampanaDestinatarios
+WHERE SeDesuscribio = 1 AND TRIM(COALESCE(EmailDestino, '')) != ''
+"""
 
 
 def initialize_database():
@@ -71,7 +687,10 @@ def initialize_database():
     # os.path.exists devuelve True si la ruta apunta a un archivo o directorio
     # que existe en el sistema de archivos, independientemente del SO.
     if os.path.exists(DB_PATH):
-        return  # La base de datos ya fue inicializada anteriormente; no hacemos nada.
+        # La base de datos ya fue inicializada anteriormente; solo se aplican
+        # los cambios de esquema que se hayan agregado desde entonces.
+        apply_migrations()
+        return
 
     # Obtenemos (o creamos) la conexion para el hilo actual.
     # Como DB_PATH no existe aun, sqlite3.connect lo creara en disco.
@@ -97,6 +716,60 @@ def initialize_database():
     conn.commit()
 
 
+def apply_migrations(conn=None):
+    """
+    Aplica las sentencias de _MIGRACIONES sobre una BD existente.
+
+    Todas son idempotentes, asi que ejecutarlas en cada arranque es seguro
+    y barato (SQLite solo verifica que el objeto ya existe).
+
+    Las tablas derivadas nuevas (BusquedaGlobal, ResumenKPI, ...) se llenan
+    solo si no existian antes. Por eso migraciones y llenados corren en una
+    sola transaccion: si la app se cierra a la mitad no queda una tabla
+    creada pero vacia que el siguiente arranque ya no llenaria; se deshace
+    todo y se repite completo.
+
+    Args:
+        conn: conexion a usar; por defecto la del hilo actual. Debe ser la
+              del hilo, que es la que usa transaction().
+    """
+    conn = conn or get_connection()
+    indice_existia = _existe(conn, "BusquedaGlobal")
+    resumen_existia = _existe(conn, "ResumenKPI")
+    actividad_existia = _existe(conn, "ResumenActividadContacto")
+    suprimidos_existia = _existe(conn, "CorreosSuprimidos")
+
+    # los commit de los repositorios quedan diferidos hasta el final del bloque
+    with transaction():
+        for sentencia in _MIGRACIONES:
+            conn.execute(sentencia)
+
+        # El indice de busqueda recien creado esta vacio: se llena una sola vez
+        # con los datos que ya existian (despues lo mantienen los triggers).
+        if not indice_existia:
+            BusquedaRepository().reconstruir(conn)
+
+        # Igual con los KPIs; ademas la vista vieja se cambia por la que lee ResumenKPI
+        if not resumen_existia:
+            conn.execute("DROP VIEW IF EXISTS vw_ResumenEjecutivo")
+            conn.execute(_VISTA_RESUMEN_KPI)
+            DashboardRepository().reconstruir_resumen_kpi(conn)
+
+        if not actividad_existia:
+            conn.execute("DROP VIEW IF EXISTS vw_ActividadRecienteContacto")
+            conn.execute(_VISTA_ACTIVIDAD_CONTACTO)
+            ReporteRepository().reconstruir_actividad_contactos(conn)
+
+        if not suprimidos_existia:
+            conn.execute(_LLENAR_CORREOS_SUPRIMIDOS)
+
+
+def _existe(conn, nombre):
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE name = ?", (nombre,)
+    ).fetchone() is not None
+
+
 def has_users():
     """
     Verifica si existe al menos un usuario registrado en la base de datos.
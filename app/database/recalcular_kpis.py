@@ -0,0 +1,39 @@
+"""
+Comando de mantenimiento de los KPIs del dashboard (ResumenKPI) y del
+resumen de actividad por contacto (ResumenActividadContacto).
+
+Los triggers mantienen ambos al dia, asi que normalmente no hace
+falta correrlo. Sirve si se restauro un respaldo, se cargaron datos con los
+triggers desactivados o se edito la BD a mano.
+
+Uso:
+    python -m app.database.recalcular_kpis
+"""
+
+import argparse
+import time
+
+from app.database.initializer import initialize_database
+from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.reporte_repository import ReporteRepository
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Recalcula los KPIs del dashboard")
+    parser.parse_args(argv)
+
+    # asegura que las tablas de resumen existan en BD antiguas
+    initialize_database()
+    repo = DashboardRepository()
+
+    inicio = time.perf_counter()
+    repo.reconstruir_resumen_kpi()
+    ReporteRepository().reconstruir_actividad_contactos()
+    kpis = repo.get_kpis()
+    print(f"KPIs y actividad por contacto recalculados en {time.perf_counter() - inicio:.2f} s")
+    for clave, valor in kpis.items():
+        print(f"  {clave:<24} {valor}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Comando de mantenimiento del indice de busqueda (FTS5).
+
+Los triggers mantienen el indice al dia, asi que normalmente no hace falta
+correrlo. Sirve para:
+    - reconstruir el indice si se restauro un respaldo o se cargaron datos
+      con los triggers desactivados;
+    - optimizarlo despues de muchas ediciones (fusiona sus segmentos).
+
+Uso:
+    python -m app.database.reindexar_busqueda              # reconstruir + optimizar
+    python -m app.database.reindexar_busqueda --optimizar  # solo optimizar
+"""
+
+import argparse
+import time
+
+from app.database.initializer import initialize_database
+from app.repositories.busqueda_repository import BusquedaRepository
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mantenimiento del indice de busqueda")
+    parser.add_argument(
+        "--optimizar", action="store_true",
+        help="solo fusionar segmentos, sin reconstruir",
+    )
+    args = parser.parse_args(argv)
+
+    # asegura que la tabla BusquedaGlobal exista en BD antiguas
+    initialize_database()
+    repo = BusquedaRepository()
+
+    inicio = time.perf_counter()
+    if not args.optimizar:
+        total = repo.reconstruir()
+        print(f"Indice reconstruido: {total} registros")
+    repo.optimizar()
+    print(f"Indice optimizado en {time.perf_counter() - inicio:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
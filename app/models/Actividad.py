@@ -4,6 +4,15 @@ from datetime import datetime
 
 
 class Actividad:
+    __slots__ = (
+        "actividad_id", "tipo_actividad_id", "asunto", "descripcion", "contacto_id",
+        "empresa_id", "oportunidad_id", "propietario_id", "prioridad_id", "estado_actividad_id",
+        "fecha_inicio", "fecha_fin", "fecha_vencimiento", "duracion_minutos", "ubicacion",
+        "resultado", "fecha_creacion", "fecha_modificacion", "creado_por", "modificado_por",
+        "nombre_tipo_actividad", "nombre_contacto", "nombre_empresa", "nombre_oportunidad",
+        "nombre_propietario", "nombre_prioridad", "nombre_estado_actividad"
+    )
+
     def __init__(
         self,
         actividad_id=None,
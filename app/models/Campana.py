@@ -4,6 +4,15 @@ from datetime import datetime
 
 
 class Campana:
+    __slots__ = (
+        "campana_id", "nombre", "descripcion", "tipo", "estado", "plantilla_id", "segmento_id",
+        "fecha_programada", "fecha_envio", "fecha_finalizacion", "total_destinatarios",
+        "total_enviados", "total_entregados", "total_abiertos", "total_clics",
+        "total_rebotados", "total_desuscripciones", "presupuesto", "moneda_id",
+        "propietario_id", "fecha_creacion", "fecha_modificacion", "nombre_plantilla",
+        "nombre_segmento", "nombre_propietario"
+    )
+
     def __init__(
         self,
         campana_id=None,
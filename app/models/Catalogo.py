@@ -1,4 +1,5 @@
 # Modelo generico de catalogo - representa un registro de cualquier tabla de catalogo
+# Sin __slots__: las columnas cambian segun la tabla y se asignan con setattr.
 
 
 class Catalogo:
@@ -4,6 +4,12 @@ from datetime import datetime
 
 
 class ConfiguracionCorreo:
+    __slots__ = (
+        "config_id", "nombre", "proveedor", "host", "puerto", "usar_tls", "usar_ssl",
+        "email_remitente", "nombre_remitente", "usuario", "contrasena", "api_key", "activa",
+        "notas", "fecha_creacion", "fecha_modificacion"
+    )
+
     def __init__(
         self,
         config_id=None,
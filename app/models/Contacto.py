@@ -22,6 +22,16 @@ from datetime import datetime
 
 
 class Contacto:
+    __slots__ = (
+        "contacto_id", "nombre", "apellido_paterno", "apellido_materno", "email",
+        "email_secundario", "telefono_oficina", "telefono_celular", "puesto", "departamento",
+        "empresa_id", "direccion", "ciudad_id", "codigo_postal", "fecha_nacimiento",
+        "linkedin_url", "origen_id", "propietario_id", "es_contacto_principal", "no_contactar",
+        "activo", "foto_url", "fecha_creacion", "fecha_modificacion", "creado_por",
+        "modificado_por", "nombre_empresa", "nombre_ciudad", "nombre_origen",
+        "nombre_propietario"
+    )
+
     def __init__(
         self,
         # Identificador unico del contacto en la base de datos (PRIMARY KEY).
@@ -4,6 +4,13 @@ from datetime import datetime
 
 
 class Cotizacion:
+    __slots__ = (
+        "cotizacion_id", "numero_cotizacion", "oportunidad_id", "contacto_id", "fecha_emision",
+        "fecha_vigencia", "subtotal", "iva", "total", "moneda_id", "estado", "notas",
+        "terminos_condiciones", "creado_por", "fecha_creacion", "nombre_oportunidad",
+        "nombre_contacto", "nombre_moneda"
+    )
+
     def __init__(
         self,
         cotizacion_id=None,
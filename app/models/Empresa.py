@@ -4,6 +4,15 @@ from datetime import datetime
 
 
 class Empresa:
+    __slots__ = (
+        "empresa_id", "razon_social", "nombre_comercial", "rfc", "industria_id", "tamano_id",
+        "sitio_web", "telefono", "email", "direccion", "ciudad_id", "codigo_postal",
+        "ingreso_anual_estimado", "moneda_id", "num_empleados", "descripcion", "logo_url",
+        "origen_id", "propietario_id", "activo", "fecha_creacion", "fecha_modificacion",
+        "creado_por", "modificado_por", "nombre_industria", "nombre_tamano", "nombre_ciudad",
+        "nombre_moneda", "nombre_origen", "nombre_propietario"
+    )
+
     def __init__(
         self,
         empresa_id=None,
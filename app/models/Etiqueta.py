@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class Etiqueta:
+    __slots__ = (
+        "etiqueta_id", "nombre", "color", "categoria", "fecha_creacion", "num_contactos",
+        "num_empresas"
+    )
+
     def __init__(
         self,
         etiqueta_id=None,
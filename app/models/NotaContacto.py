@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class NotaContacto:
+    __slots__ = (
+        "nota_id", "contacto_id", "titulo", "contenido", "es_privada", "fecha_creacion",
+        "creado_por", "nombre_contacto", "nombre_creador"
+    )
+
     def __init__(
         self,
         nota_id=None,
@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class NotaEmpresa:
+    __slots__ = (
+        "nota_id", "empresa_id", "titulo", "contenido", "es_privada", "fecha_creacion",
+        "creado_por", "nombre_empresa", "nombre_creador"
+    )
+
     def __init__(
         self,
         nota_id=None,
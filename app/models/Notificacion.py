@@ -2,6 +2,11 @@
 
 
 class Notificacion:
+    __slots__ = (
+        "notificacion_id", "usuario_id", "tipo", "titulo", "mensaje", "entidad_tipo",
+        "entidad_id", "url", "es_leida", "fecha_creacion", "fecha_lectura"
+    )
+
     def __init__(
         self,
         notificacion_id=None,
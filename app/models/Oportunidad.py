@@ -4,6 +4,15 @@ from datetime import datetime
 
 
 class Oportunidad:
+    __slots__ = (
+        "oportunidad_id", "nombre", "empresa_id", "contacto_id", "etapa_id", "monto_estimado",
+        "moneda_id", "probabilidad_cierre", "fecha_cierre_estimada", "fecha_cierre_real",
+        "origen_id", "propietario_id", "motivos_perdida_id", "notas_perdida", "descripcion",
+        "es_ganada", "fecha_creacion", "fecha_modificacion", "creado_por", "modificado_por",
+        "nombre_empresa", "nombre_contacto", "nombre_etapa", "nombre_moneda",
+        "nombre_propietario", "nombre_origen", "nombre_motivo_perdida"
+    )
+
     def __init__(
         self,
         oportunidad_id=None,
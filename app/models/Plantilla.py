@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class Plantilla:
+    __slots__ = (
+        "plantilla_id", "nombre", "asunto", "contenido_html", "contenido_texto", "categoria",
+        "activa", "creado_por", "fecha_creacion", "fecha_modificacion", "nombre_creador"
+    )
+
     def __init__(
         self,
         plantilla_id=None,
@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class Producto:
+    __slots__ = (
+        "producto_id", "codigo", "nombre", "descripcion", "categoria", "precio_unitario",
+        "moneda_id", "unidad_medida", "activo", "fecha_creacion", "nombre_moneda"
+    )
+
     def __init__(
         self,
         producto_id=None,
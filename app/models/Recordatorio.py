@@ -2,6 +2,13 @@
 
 
 class Recordatorio:
+    __slots__ = (
+        "recordatorio_id", "usuario_id", "titulo", "descripcion", "fecha_recordatorio",
+        "contacto_id", "empresa_id", "oportunidad_id", "actividad_id", "tipo_recurrencia",
+        "es_leido", "es_completado", "fecha_creacion", "nombre_contacto", "nombre_empresa",
+        "nombre_oportunidad"
+    )
+
     def __init__(
         self,
         recordatorio_id=None,
@@ -4,6 +4,10 @@ from datetime import datetime
 
 
 class Rol:
+    __slots__ = (
+        "rol_id", "nombre_rol", "descripcion", "fecha_creacion"
+    )
+
     def __init__(
         self,
         rol_id=None,
@@ -4,6 +4,11 @@ from datetime import datetime
 
 
 class Segmento:
+    __slots__ = (
+        "segmento_id", "nombre", "descripcion", "tipo_entidad", "cantidad_registros",
+        "creado_por", "fecha_creacion", "fecha_modificacion", "nombre_creador"
+    )
+
     def __init__(
         self,
         segmento_id=None,
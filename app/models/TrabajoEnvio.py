@@ -0,0 +1,57 @@
+# Modelo de TrabajoEnvio - representa un registro de la tabla TrabajosEnvio
+
+# estados en los que el trabajo sigue vivo (se puede reanudar)
+ESTADOS_VIVOS = ("Pendiente", "En Curso", "Pausado")
+
+
+class TrabajoEnvio:
+    __slots__ = (
+        "trabajo_id", "campana_id", "estado", "total_destinatarios", "enviados", "fallidos",
+        "ultimo_destinatario_id", "error", "creado_por", "fecha_creacion", "fecha_inicio",
+        "fecha_actualizacion", "fecha_fin",
+        # campo JOIN para visualizacion
+        "nombre_campana",
+    )
+
+    def __init__(
+        self,
+        trabajo_id=None,
+        campana_id=None,
+        estado="Pendiente",
+        total_destinatarios=0,
+        enviados=0,
+        fallidos=0,
+        ultimo_destinatario_id=0,
+        error=None,
+        creado_por=None,
+        fecha_creacion=None,
+        fecha_inicio=None,
+        fecha_actualizacion=None,
+        fecha_fin=None,
+        nombre_campana=None,
+    ):
+        self.trabajo_id = trabajo_id
+        self.campana_id = campana_id
+        self.estado = estado
+        self.total_destinatarios = total_destinatarios
+        self.enviados = enviados
+        self.fallidos = fallidos
+        self.ultimo_destinatario_id = ultimo_destinatario_id
+        self.error = error
+        self.creado_por = creado_por
+        self.fecha_creacion = fecha_creacion
+        self.fecha_inicio = fecha_inicio
+        self.fecha_actualizacion = fecha_actualizacion
+        self.fecha_fin = fecha_fin
+        self.nombre_campana = nombre_campana
+
+    @property
+    def procesados(self):
+        return (self.enviados or 0) + (self.fallidos or 0)
+
+    @property
+    def vivo(self):
+        return self.estado in ESTADOS_VIVOS
+
+    def __repr__(self):
+        return f"<TrabajoEnvio(id={self.trabajo_id}, campana={self.campana_id}, estado='{self.estado}')>"
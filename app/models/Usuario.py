@@ -4,6 +4,12 @@ from datetime import datetime
 
 
 class Usuario:
+    __slots__ = (
+        "usuario_id", "nombre", "apellido_paterno", "apellido_materno", "email", "telefono",
+        "contrasena_hash", "rol_id", "activo", "foto_perfil", "fecha_creacion", "ultimo_acceso",
+        "nombre_rol"
+    )
+
     def __init__(
         self,
         usuario_id=None,
@@ -0,0 +1,11 @@
+# Modelos del CRM.
+#
+# Cada modelo declara __slots__ con exactamente los atributos que asigna su
+# __init__: las instancias no llevan un __dict__ propio, lo que reduce a
+# menos de la mitad la memoria de un listado grande (ver
+# benchmarks/bench_memoria_modelos.py). Al agregar un campo a un modelo hay
+# que agregarlo tambien a su __slots__; asignar un atributo que no este
+# declarado lanza AttributeError.
+#
+# La excepcion es Catalogo: recibe columnas arbitrarias como kwargs, asi que
+# conserva su __dict__.
@@ -1,38 +1,101 @@
 # Repositorio de actividades - queries contra la tabla Actividades
 
 from app.database.connection import get_connection
+from app.utils.paginacion import paginar, construir_filtros
 from app.models.Actividad import Actividad
+from app.utils.mapeo import MapeadorFilas
 
 
 class ActividadRepository:
 
+    # columna de la consulta -> argumento de Actividad; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Actividad, {
+        "actividad_id": "ActividadID",
+        "tipo_actividad_id": "TipoActividadID",
+        "asunto": "Asunto",
+        "descripcion": "Descripcion",
+        "contacto_id": "ContactoID",
+        "empresa_id": "EmpresaID",
+        "oportunidad_id": "OportunidadID",
+        "propietario_id": "PropietarioID",
+        "prioridad_id": "PrioridadID",
+        "estado_actividad_id": "EstadoActividadID",
+        "fecha_inicio": "FechaInicio",
+        "fecha_fin": "FechaFin",
+        "fecha_vencimiento": "FechaVencimiento",
+        "duracion_minutos": "DuracionMinutos",
+        "ubicacion": "Ubicacion",
+        "resultado": "Resultado",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "creado_por": "CreadoPor",
+        "modificado_por": "ModificadoPor",
+        "nombre_tipo_actividad": "NombreTipoActividad",
+        "nombre_contacto": "NombreContacto",
+        "nombre_empresa": "NombreEmpresa",
+        "nombre_oportunidad": "NombreOportunidad",
+        "nombre_propietario": "NombrePropietario",
+        "nombre_prioridad": "NombrePrioridad",
+        "nombre_estado_actividad": "NombreEstadoActividad",
+    }, opcionales=(
+        "NombreTipoActividad",
+        "NombreContacto",
+        "NombreEmpresa",
+        "NombreOportunidad",
+        "NombrePropietario",
+        "NombrePrioridad",
+        "NombreEstadoActividad",
+    ))
+
+    # SELECT comun de los listados (sin WHERE ni ORDER BY)
+    _SELECT_LISTADO = """
+        SELECT a.*,
+               ta.Nombre AS NombreTipoActividad,
+               (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
+               e.RazonSocial AS NombreEmpresa,
+               o.Nombre AS NombreOportunidad,
+               (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario,
+               p.Nombre AS NombrePrioridad,
+               ea.Nombre AS NombreEstadoActividad
+        FROM Actividades a
+        LEFT JOIN TiposActividad ta ON a.TipoActividadID = ta.TipoActividadID
+        LEFT JOIN Contactos ct ON a.ContactoID = ct.ContactoID
+        LEFT JOIN Empresas e ON a.EmpresaID = e.EmpresaID
+        LEFT JOIN Oportunidades o ON a.OportunidadID = o.OportunidadID
+        LEFT JOIN Usuarios u ON a.PropietarioID = u.UsuarioID
+        LEFT JOIN Prioridades p ON a.PrioridadID = p.PrioridadID
+        LEFT JOIN EstadosActividad ea ON a.EstadoActividadID = ea.EstadoActividadID
+    """
+
+    # filtros aceptados por find_page: clave -> columna
+    _FILTROS = {
+        "tipo_actividad_id": "a.TipoActividadID",
+        "estado_actividad_id": "a.EstadoActividadID",
+        "propietario_id": "a.PropietarioID",
+        "contacto_id": "a.ContactoID",
+        "empresa_id": "a.EmpresaID",
+        "oportunidad_id": "a.OportunidadID",
+    }
+    _COLUMNAS_TEXTO = ("a.Asunto",)
+
     def find_all(self, limit=None, offset=0):
         conn = get_connection()
-        query = """
-            SELECT a.*,
-                   ta.Nombre AS NombreTipoActividad,
-                   (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
-                   e.RazonSocial AS NombreEmpresa,
-                   o.Nombre AS NombreOportunidad,
-                   (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario,
-                   p.Nombre AS NombrePrioridad,
-                   ea.Nombre AS NombreEstadoActividad
-            FROM Actividades a
-            LEFT JOIN TiposActividad ta ON a.TipoActividadID = ta.TipoActividadID
-            LEFT JOIN Contactos ct ON a.ContactoID = ct.ContactoID
-            LEFT JOIN Empresas e ON a.EmpresaID = e.EmpresaID
-            LEFT JOIN Oportunidades o ON a.OportunidadID = o.OportunidadID
-            LEFT JOIN Usuarios u ON a.PropietarioID = u.UsuarioID
-            LEFT JOIN Prioridades p ON a.PrioridadID = p.PrioridadID
-            LEFT JOIN EstadosActividad ea ON a.EstadoActividadID = ea.EstadoActividadID
-            ORDER BY a.FechaCreacion DESC
-        """
+        query = self._SELECT_LISTADO + " ORDER BY a.FechaCreacion DESC"
+        params = []
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
 
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
-        return [self._row_to_actividad(row) for row in rows]
+        return self._MAPEO.consultar(conn, query, params)
+
+    def find_page(self, limit=50, token=None, filtros=None):
+        # pagina por cursor sobre (FechaCreacion, ActividadID); costo constante en paginas profundas
+        condiciones, params = construir_filtros(filtros, self._FILTROS, self._COLUMNAS_TEXTO)
+        return paginar(
+            get_connection(), self._SELECT_LISTADO,
+            "a.FechaCreacion", "a.ActividadID", self._MAPEO,
+            limit=limit, token=token, condiciones=condiciones, params=params,
+        )
 
     def count_all(self):
         conn = get_connection()
@@ -41,7 +104,8 @@ class ActividadRepository:
 
     def find_by_id(self, actividad_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT a.*,
                    ta.Nombre AS NombreTipoActividad,
@@ -63,10 +127,6 @@ class ActividadRepository:
             """,
             (actividad_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_actividad(row)
 
     def create(self, actividad):
         conn = get_connection()
@@ -138,41 +198,3 @@ class ActividadRepository:
             ),
         )
         conn.commit()
-
-    @staticmethod
-    def _row_to_actividad(row):
-        def safe(key):
-            try:
-                return row[key]
-            except (KeyError, IndexError):
-                return None
-
-        return Actividad(
-            actividad_id=row["ActividadID"],
-            tipo_actividad_id=row["TipoActividadID"],
-            asunto=row["Asunto"],
-            descripcion=row["Descripcion"],
-            contacto_id=row["ContactoID"],
-            empresa_id=row["EmpresaID"],
-            oportunidad_id=row["OportunidadID"],
-            propietario_id=row["PropietarioID"],
-            prioridad_id=row["PrioridadID"],
-            estado_actividad_id=row["EstadoActividadID"],
-            fecha_inicio=row["FechaInicio"],
-            fecha_fin=row["FechaFin"],
-            fecha_vencimiento=row["FechaVencimiento"],
-            duracion_minutos=row["DuracionMinutos"],
-            ubicacion=row["Ubicacion"],
-            resultado=row["Resultado"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            creado_por=row["CreadoPor"],
-            modificado_por=row["ModificadoPor"],
-            nombre_tipo_actividad=safe("NombreTipoActividad"),
-            nombre_contacto=safe("NombreContacto"),
-            nombre_empresa=safe("NombreEmpresa"),
-            nombre_oportunidad=safe("NombreOportunidad"),
-            nombre_propietario=safe("NombrePropietario"),
-            nombre_prioridad=safe("NombrePrioridad"),
-            nombre_estado_actividad=safe("NombreEstadoActividad"),
-        )
@@ -0,0 +1,175 @@
+# Repositorio de busqueda global - consultas contra el indice FTS5 BusquedaGlobal
+#
+# El indice se mantiene con triggers (ver database_query.sql). El rowid
+# codifica la entidad: rowid = ID * 4 + tipo.
+
+from app.database.connection import get_reader, get_writer
+
+TIPO_CONTACTO = 0
+TIPO_EMPRESA = 1
+TIPO_NOTA_CONTACTO = 2
+TIPO_NOTA_EMPRESA = 3
+
+TIPOS = {
+    TIPO_CONTACTO: "contacto",
+    TIPO_EMPRESA: "empresa",
+    TIPO_NOTA_CONTACTO: "nota_contacto",
+    TIPO_NOTA_EMPRESA: "nota_empresa",
+}
+
+# Pesos de bm25 por columna: un acierto en el nombre pesa mas que en el
+# email/telefono, y este mas que en el cuerpo de una nota
+_PESOS_BM25 = "10.0, 4.0, 1.0"
+
+# Maximo de coincidencias que se puntuan con bm25 en cada paso. Puntuar
+# cuesta ~2 us por fila: un termino comun ("ma", "nunez") coincide con
+# cientos de miles de titulos y ordenarlos todos pasa de 300 ms con un
+# millon de filas. Los aciertos en el titulo se buscan primero (ver buscar),
+# asi un registro viejo con el termino en el nombre no queda fuera por
+# miles de notas mas recientes.
+_VENTANA_CANDIDATOS = 2000
+
+# rowid de las notas privadas de otros usuarios. Se filtra por rowid (no por
+# una columna del indice) para no leer el contenido de cada coincidencia;
+# usa los indices parciales idx_notas*_privadas.
+_NOTAS_PRIVADAS_AJENAS = """
+    SELECT NotaID * 4 + 2 FROM NotasContacto WHERE EsPrivada = 1 AND CreadoPor <> ?
+    UNION ALL
+    SELECT NotaID * 4 + 3 FROM NotasEmpresa WHERE EsPrivada = 1 AND CreadoPor <> ?
+"""
+
+# Mismas expresiones que los triggers; se usan para reconstruir el indice
+_POBLAR = [
+    """
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    SELECT ContactoID * 4,
+           Nombre || ' ' || ApellidoPaterno || ' ' || IFNULL(ApellidoMaterno, ''),
+           IFNULL(Email, '') || ' ' || IFNULL(EmailSecundario, '') || ' ' ||
+           IFNULL(TelefonoOficina, '') || ' ' || IFNULL(TelefonoCelular, '') || ' ' ||
+           IFNULL(Puesto, '') || ' ' || IFNULL(Departamento, ''),
+           '', EmpresaID
+    FROM Contactos
+    """,
+    """
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    SELECT EmpresaID * 4 + 1,
+           RazonSocial || ' ' || IFNULL(NombreComercial, ''),
+           IFNULL(RFC, '') || ' ' || IFNULL(Email, '') || ' ' ||
+           IFNULL(Telefono, '') || ' ' || IFNULL(SitioWeb, ''),
+           IFNULL(Descripcion, ''), NULL
+    FROM Empresas
+    """,
+    """
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    SELECT NotaID * 4 + 2, IFNULL(Titulo, ''), '', Contenido, ContactoID
+    FROM NotasContacto
+    """,
+    """
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    SELECT NotaID * 4 + 3, IFNULL(Titulo, ''), '', Contenido, EmpresaID
+    FROM NotasEmpresa
+    """,
+]
+
+
+class BusquedaRepository:
+
+    def buscar(self, consulta_fts, usuario_id=None, tipos=None, limit=20):
+        """
+        Devuelve los `limit` registros mas relevantes como dicts.
+
+        consulta_fts ya viene armada por el servicio (terminos entre comillas).
+        La consulta se hace en pasos, cada uno con a lo mas
+        _VENTANA_CANDIDATOS filas puntuadas:
+          1. titulos: coincidencias solo en Titulo ("{Titulo} : ..."), las
+             mas recientes primero, ordenadas por bm25;
+          2. resto: solo si el titulo dio menos de `limit`, lo mismo sobre
+             todas las columnas (email, telefono, cuerpo de las notas), sin
+             repetir lo que ya salio en el paso 1;
+          3. texto: se leen Titulo/Detalle/Contenido solo de esos rowid. Un
+             snippet() o un MATCH con rowid en SQLite recorre otra vez toda
+             la lista de coincidencias del termino, por eso no se usa aqui.
+        Si un paso tiene mas coincidencias que la ventana, se ordenan las
+        mas recientes; con menos, el orden es el de bm25 completo.
+        """
+        with get_reader() as conn:
+            puntajes = self._ranking(conn, f"{{Titulo}} : ({consulta_fts})", usuario_id, tipos, limit)
+            if len(puntajes) < limit:
+                vistos = {fila["rowid"] for fila in puntajes}
+                resto = self._ranking(conn, consulta_fts, usuario_id, tipos, limit + len(puntajes))
+                puntajes += [fila for fila in resto if fila["rowid"] not in vistos][:limit - len(puntajes)]
+            if not puntajes:
+                return []
+            rowids = [fila["rowid"] for fila in puntajes]
+            cursor = conn.execute(
+                f"""
+                SELECT rowid, Titulo, Detalle, Contenido, PadreID
+                FROM BusquedaGlobal
+                WHERE rowid IN ({', '.join('?' for _ in rowids)})
+                """,
+                rowids,
+            )
+            textos = {fila["rowid"]: fila for fila in cursor.fetchall()}
+        return [
+            self._row_to_dict(textos[fila["rowid"]], fila["Puntaje"])
+            for fila in puntajes
+        ]
+
+    @staticmethod
+    def _ranking(conn, consulta_fts, usuario_id, tipos, limit):
+        # (rowid, Puntaje) de las mejores `limit` entre las coincidencias mas
+        # recientes (orden nativo del indice, sin ordenar)
+        filtros = ""
+        params = [consulta_fts, usuario_id or 0, usuario_id or 0]
+        if tipos:
+            filtros = f" AND rowid % 4 IN ({', '.join('?' for _ in tipos)})"
+            params.extend(tipos)
+        params.extend([_VENTANA_CANDIDATOS, limit])
+        return conn.execute(
+            f"""
+            SELECT rowid, Puntaje FROM (
+                SELECT rowid, bm25(BusquedaGlobal, {_PESOS_BM25}) AS Puntaje
+                FROM BusquedaGlobal
+                WHERE BusquedaGlobal MATCH ?
+                  AND rowid NOT IN ({_NOTAS_PRIVADAS_AJENAS}){filtros}
+                ORDER BY rowid DESC
+                LIMIT ?
+            )
+            ORDER BY Puntaje
+            LIMIT ?
+            """,
+            params,
+        ).fetchall()
+
+    def count(self):
+        with get_reader() as conn:
+            return conn.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0]
+
+    def reconstruir(self, conn=None):
+        # vacia y vuelve a llenar el indice en una sola transaccion
+        with get_writer() as escritor:
+            conn = conn or escritor
+            conn.execute("DELETE FROM BusquedaGlobal")
+            for sentencia in _POBLAR:
+                conn.execute(sentencia)
+            conn.commit()
+        return conn.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0]
+
+    def optimizar(self, conn=None):
+        # fusiona los segmentos del indice en uno solo (consultas mas rapidas)
+        with get_writer() as escritor:
+            conn = conn or escritor
+            conn.execute("INSERT INTO BusquedaGlobal (BusquedaGlobal) VALUES ('optimize')")
+            conn.commit()
+
+    @staticmethod
+    def _row_to_dict(row, puntaje):
+        return {
+            "tipo": TIPOS[row["rowid"] % 4],
+            "entidad_id": row["rowid"] // 4,
+            "padre_id": row["PadreID"],
+            "titulo": row["Titulo"].strip(),
+            "detalle": " ".join(row["Detalle"].split()),
+            "contenido": row["Contenido"],
+            "puntaje": puntaje,
+        }
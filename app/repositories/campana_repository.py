@@ -2,13 +2,48 @@
 
 from app.database.connection import get_connection
 from app.models.Campana import Campana
+from app.utils.mapeo import MapeadorFilas
 
 
 class CampanaRepository:
 
+    # columna de la consulta -> argumento de Campana; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Campana, {
+        "campana_id": "CampanaID",
+        "nombre": "Nombre",
+        "descripcion": "Descripcion",
+        "tipo": "Tipo",
+        "estado": "Estado",
+        "plantilla_id": "PlantillaID",
+        "segmento_id": "SegmentoID",
+        "fecha_programada": "FechaProgramada",
+        "fecha_envio": "FechaEnvio",
+        "fecha_finalizacion": "FechaFinalizacion",
+        "total_destinatarios": "TotalDestinatarios",
+        "total_enviados": "TotalEnviados",
+        "total_entregados": "TotalEntregados",
+        "total_abiertos": "TotalAbiertos",
+        "total_clics": "TotalClics",
+        "total_rebotados": "TotalRebotados",
+        "total_desuscripciones": "TotalDesuscripciones",
+        "presupuesto": "Presupuesto",
+        "moneda_id": "MonedaID",
+        "propietario_id": "PropietarioID",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "nombre_plantilla": "NombrePlantilla",
+        "nombre_segmento": "NombreSegmento",
+        "nombre_propietario": "NombrePropietario",
+    }, opcionales=(
+        "NombrePlantilla",
+        "NombreSegmento",
+        "NombrePropietario",
+    ))
+
     def find_all(self):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT c.*,
                    p.Nombre AS NombrePlantilla,
@@ -21,11 +56,11 @@ class CampanaRepository:
             ORDER BY c.FechaCreacion DESC
             """
         )
-        return [self._row_to_campana(row) for row in cursor.fetchall()]
 
     def find_by_id(self, campana_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT c.*,
                    p.Nombre AS NombrePlantilla,
@@ -39,8 +74,6 @@ class CampanaRepository:
             """,
             (campana_id,),
         )
-        row = cursor.fetchone()
-        return self._row_to_campana(row) if row else None
 
     def create(self, campana):
         conn = get_connection()
@@ -163,6 +196,35 @@ class CampanaRepository:
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    def tomar_pendientes(self, campana_id, despues_de=0, limite=-1):
+        """
+        Destinatarios pendientes despues de `despues_de`, con los campos de la
+        combinacion de correspondencia (ver app/utils/combinacion_correo.py)
+        en la misma consulta.
+
+        Recorre idx_campana_dest_estado por DestinatarioID (paginacion por
+        cursor): cada lote cuesta lo mismo aunque la campana tenga 100k filas.
+        limite=-1 trae todos.
+        """
+        conn = get_connection()
+        cursor = conn.execute(
+            """
+            SELECT cd.DestinatarioID, cd.EmailDestino,
+                   c.Nombre, c.ApellidoPaterno, c.ApellidoMaterno,
+                   (c.Nombre || ' ' || c.ApellidoPaterno) AS NombreCompleto,
+                   c.Puesto, c.Departamento,
+                   COALESCE(NULLIF(e.NombreComercial, ''), e.RazonSocial) AS Empresa
+            FROM CampanaDestinatarios cd
+            LEFT JOIN Contactos c ON cd.ContactoID = c.ContactoID
+            LEFT JOIN Empresas e ON c.EmpresaID = e.EmpresaID
+            WHERE cd.CampanaID = ? AND cd.EstadoEnvio = 'Pendiente' AND cd.DestinatarioID > ?
+            ORDER BY cd.DestinatarioID
+            LIMIT ?
+            """,
+            (campana_id, despues_de, limite),
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
     def agregar_destinatario(self, campana_id, contacto_id, email_destino):
         conn = get_connection()
         conn.execute(
@@ -176,28 +238,59 @@ class CampanaRepository:
         conn.commit()
 
     def cargar_destinatarios_desde_segmento(self, campana_id, segmento_id):
+        """
+        Agrega como destinatarios a los contactos del segmento con un solo
+        INSERT ... SELECT, sin pasar las filas por Python.
+
+        Omite a los contactos inactivos, con NoContactar, sin email, con un
+        email de CorreosSuprimidos o que ya esta en la campana (por email o
+        por contacto). Si varios contactos del segmento comparten email, entra
+        solo el de menor ContactoID. Los emails se comparan sin mayusculas.
+        TotalDestinatarios se incrementa en la misma escritura.
+
+        Returns:
+            tuple: (insertados, omitidos); omitidos son los miembros del
+            segmento que no entraron.
+        """
         conn = get_connection()
+        miembros = conn.execute(
+            "SELECT COUNT(*) FROM SegmentoContactos WHERE SegmentoID = ?", (segmento_id,)
+        ).fetchone()[0]
         cursor = conn.execute(
             """
-            SELECT c.ContactoID, c.Email
-            FROM SegmentoContactos sc
-            INNER JOIN Contactos c ON sc.ContactoID = c.ContactoID
-            WHERE sc.SegmentoID = ? AND c.Email IS NOT NULL AND c.Email != ''
+            INSERT INTO CampanaDestinatarios (CampanaID, ContactoID, EmailDestino, EstadoEnvio)
+            SELECT ?, k.ContactoID, k.Email, 'Pendiente'
+            FROM (
+                -- un candidato por email (el de menor ContactoID)
+                SELECT MIN(c.ContactoID) AS ContactoID, TRIM(c.Email) AS Email
+                FROM SegmentoContactos sc
+                INNER JOIN Contactos c ON sc.ContactoID = c.ContactoID
+                WHERE sc.SegmentoID = ?
+                  AND COALESCE(c.Activo, 1) = 1
+                  AND COALESCE(c.NoContactar, 0) = 0
+                  AND TRIM(COALESCE(c.Email, '')) != ''
+                GROUP BY LOWER(TRIM(c.Email))
+            ) k
+            WHERE NOT EXISTS (SELECT 1 FROM CorreosSuprimidos s WHERE s.Email = k.Email)
+              AND NOT EXISTS (
+                  SELECT 1 FROM CampanaDestinatarios cd
+                  WHERE cd.CampanaID = ? AND cd.EmailDestino = k.Email COLLATE NOCASE
+              )
+              AND NOT EXISTS (
+                  SELECT 1 FROM CampanaDestinatarios cd
+                  WHERE cd.CampanaID = ? AND cd.ContactoID = k.ContactoID
+              )
             """,
-            (segmento_id,),
+            (campana_id, segmento_id, campana_id, campana_id),
         )
-        rows = cursor.fetchall()
-        for row in rows:
+        insertados = cursor.rowcount
+        if insertados:
             conn.execute(
-                """
-                INSERT OR IGNORE INTO CampanaDestinatarios
-                    (CampanaID, ContactoID, EmailDestino, EstadoEnvio)
-                VALUES (?, ?, ?, 'Pendiente')
-                """,
-                (campana_id, row["ContactoID"], row["Email"]),
+                "UPDATE Campanas SET TotalDestinatarios = TotalDestinatarios + ? WHERE CampanaID = ?",
+                (insertados, campana_id),
             )
         conn.commit()
-        return len(rows)
+        return insertados, miembros - insertados
 
     def eliminar_destinatario(self, destinatario_id):
         conn = get_connection()
@@ -207,64 +300,56 @@ class CampanaRepository:
         )
         conn.commit()
 
-    def marcar_enviado(self, destinatario_id):
+    def marcar_estados(self, campana_id, cambios):
+        """
+        Guarda el resultado de varios envios con un solo executemany.
+
+        Args:
+            cambios: lista de (estado, destinatario_id), estado 'Enviado' o 'Fallido'.
+
+        TotalEnviados de la campana se incrementa en la misma escritura, asi
+        que no hace falta recontar CampanaDestinatarios despues del envio.
+        """
         conn = get_connection()
-        conn.execute(
+        conn.executemany(
             """
             UPDATE CampanaDestinatarios SET
-                EstadoEnvio = 'Enviado',
+                EstadoEnvio = ?,
                 FechaEnvio = datetime('now', 'localtime')
             WHERE DestinatarioID = ?
             """,
-            (destinatario_id,),
+            cambios,
         )
+        enviados = sum(1 for estado, _ in cambios if estado == "Enviado")
+        if enviados:
+            conn.execute(
+                "UPDATE Campanas SET TotalEnviados = TotalEnviados + ? WHERE CampanaID = ?",
+                (enviados, campana_id),
+            )
         conn.commit()
 
-    def marcar_fallido(self, destinatario_id):
+    def cerrar_envio(self, campana_id, enviados):
+        """
+        Estado de la campana al terminar un envio, en una sola sentencia:
+        Completada si ya no quedan pendientes y se envio algo; En Progreso si
+        este envio mando al menos un correo. Usa los contadores que ya llevo
+        marcar_estados en lugar de volver a leer los destinatarios.
+        """
         conn = get_connection()
         conn.execute(
             """
-            UPDATE CampanaDestinatarios SET
-                EstadoEnvio = 'Fallido',
-                FechaEnvio = datetime('now', 'localtime')
-            WHERE DestinatarioID = ?
+            UPDATE Campanas SET
+                Estado = CASE
+                    WHEN TotalEnviados > 0 AND NOT EXISTS (
+                        SELECT 1 FROM CampanaDestinatarios
+                        WHERE CampanaID = ? AND EstadoEnvio = 'Pendiente'
+                    ) THEN 'Completada'
+                    WHEN ? > 0 THEN 'En Progreso'
+                    ELSE Estado
+                END,
+                FechaModificacion = datetime('now', 'localtime')
+            WHERE CampanaID = ?
             """,
-            (destinatario_id,),
+            (campana_id, enviados, campana_id),
         )
         conn.commit()
-
-    @staticmethod
-    def _row_to_campana(row):
-        def safe(key):
-            try:
-                return row[key]
-            except (KeyError, IndexError):
-                return None
-
-        return Campana(
-            campana_id=row["CampanaID"],
-            nombre=row["Nombre"],
-            descripcion=row["Descripcion"],
-            tipo=row["Tipo"],
-            estado=row["Estado"],
-            plantilla_id=row["PlantillaID"],
-            segmento_id=row["SegmentoID"],
-            fecha_programada=row["FechaProgramada"],
-            fecha_envio=row["FechaEnvio"],
-            fecha_finalizacion=row["FechaFinalizacion"],
-            total_destinatarios=row["TotalDestinatarios"],
-            total_enviados=row["TotalEnviados"],
-            total_entregados=row["TotalEntregados"],
-            total_abiertos=row["TotalAbiertos"],
-            total_clics=row["TotalClics"],
-            total_rebotados=row["TotalRebotados"],
-            total_desuscripciones=row["TotalDesuscripciones"],
-            presupuesto=row["Presupuesto"],
-            moneda_id=row["MonedaID"],
-            propietario_id=row["PropietarioID"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            nombre_plantilla=safe("NombrePlantilla"),
-            nombre_segmento=safe("NombreSegmento"),
-            nombre_propietario=safe("NombrePropietario"),
-        )
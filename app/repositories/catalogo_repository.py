@@ -4,6 +4,10 @@ import re
 import sqlite3
 from app.database.connection import get_connection
 from app.models.Catalogo import Catalogo
+from app.utils.mapeo import MapeadorFilas
+
+# (tabla, columna id, columnas) -> MapeadorFilas
+_MAPEOS = {}
 
 
 class CatalogoRepository:
@@ -25,6 +29,7 @@ class CatalogoRepository:
 
         # validar identificadores SQL al inicializar
         self._validate_identifiers()
+        self._mapeo = self._obtener_mapeo()
 
     def _validate_identifiers(self):
         # validar que tabla esta en whitelist
@@ -45,6 +50,16 @@ class CatalogoRepository:
         if self._fk_column and not sql_identifier_pattern.match(self._fk_column):
             raise ValueError(f"Columna FK invalida: {self._fk_column}")
 
+    def _obtener_mapeo(self):
+        # un mapeador por forma de catalogo, compartido entre instancias del repositorio
+        clave = (self._table, self._id_col, tuple(self._columns))
+        mapeo = _MAPEOS.get(clave)
+        if mapeo is None:
+            campos = {"id_value": self._id_col}
+            campos.update({col: col for col in self._columns})
+            mapeo = _MAPEOS.setdefault(clave, MapeadorFilas(Catalogo, campos, opcionales=self._columns))
+        return mapeo
+
     def find_all(self, filters=None):
         conn = get_connection()
         query = f"SELECT {self._id_col}, {', '.join(self._columns)} FROM {self._table}"
@@ -62,17 +77,12 @@ class CatalogoRepository:
             query += " WHERE " + " AND ".join(conditions)
 
         query += f" ORDER BY {self._order_by}"
-        cursor = conn.execute(query, params)
-        return [self._row_to_catalogo(row) for row in cursor.fetchall()]
+        return self._mapeo.consultar(conn, query, params)
 
     def find_by_id(self, id_value):
         conn = get_connection()
         query = f"SELECT {self._id_col}, {', '.join(self._columns)} FROM {self._table} WHERE {self._id_col} = ?"
-        cursor = conn.execute(query, (id_value,))
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_catalogo(row)
+        return self._mapeo.consultar_uno(conn, query, (id_value,))
 
     def create(self, data):
         conn = get_connection()
@@ -124,12 +134,3 @@ class CatalogoRepository:
             )
             total += cursor.fetchone()["total"]
         return total
-
-    def _row_to_catalogo(self, row):
-        kwargs = {}
-        for col in self._columns:
-            try:
-                kwargs[col] = row[col]
-            except (KeyError, IndexError):
-                kwargs[col] = None
-        return Catalogo(id_value=row[self._id_col], **kwargs)
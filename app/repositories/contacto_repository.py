@@ -1,33 +1,112 @@
 # Repositorio de contactos - queries contra la tabla Contactos
 
 from app.database.connection import get_connection
+from app.utils.paginacion import paginar, construir_filtros
 from app.models.Contacto import Contacto
+from app.utils.mapeo import MapeadorFilas
 
 
 class ContactoRepository:
 
+    # columna de la consulta -> argumento de Contacto; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Contacto, {
+        "contacto_id": "ContactoID",
+        "nombre": "Nombre",
+        "apellido_paterno": "ApellidoPaterno",
+        "apellido_materno": "ApellidoMaterno",
+        "email": "Email",
+        "email_secundario": "EmailSecundario",
+        "telefono_oficina": "TelefonoOficina",
+        "telefono_celular": "TelefonoCelular",
+        "puesto": "Puesto",
+        "departamento": "Departamento",
+        "empresa_id": "EmpresaID",
+        "direccion": "Direccion",
+        "ciudad_id": "CiudadID",
+        "codigo_postal": "CodigoPostal",
+        "fecha_nacimiento": "FechaNacimiento",
+        "linkedin_url": "LinkedInURL",
+        "origen_id": "OrigenID",
+        "propietario_id": "PropietarioID",
+        "es_contacto_principal": "EsContactoPrincipal",
+        "no_contactar": "NoContactar",
+        "activo": "Activo",
+        "foto_url": "FotoURL",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "creado_por": "CreadoPor",
+        "modificado_por": "ModificadoPor",
+        "nombre_empresa": "NombreEmpresa",
+        "nombre_ciudad": "NombreCiudad",
+        "nombre_origen": "NombreOrigen",
+        "nombre_propietario": "NombrePropietario",
+    }, opcionales=(
+        "NombreEmpresa",
+        "NombreCiudad",
+        "NombreOrigen",
+        "NombrePropietario",
+    ))
+
+    # SELECT comun de los listados (sin WHERE ni ORDER BY)
+    _SELECT_LISTADO = """
+        SELECT ct.*,
+               e.RazonSocial AS NombreEmpresa,
+               c.Nombre AS NombreCiudad,
+               oc.Nombre AS NombreOrigen,
+               (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario
+        FROM Contactos ct
+        LEFT JOIN Empresas e ON ct.EmpresaID = e.EmpresaID
+        LEFT JOIN Ciudades c ON ct.CiudadID = c.CiudadID
+        LEFT JOIN OrigenesContacto oc ON ct.OrigenID = oc.OrigenID
+        LEFT JOIN Usuarios u ON ct.PropietarioID = u.UsuarioID
+    """
+
+    # filtros aceptados por find_page: clave -> columna
+    _FILTROS = {
+        "empresa_id": "ct.EmpresaID",
+        "propietario_id": "ct.PropietarioID",
+        "origen_id": "ct.OrigenID",
+        "ciudad_id": "ct.CiudadID",
+        "activo": "ct.Activo",
+    }
+    _COLUMNAS_TEXTO = ("ct.Nombre", "ct.ApellidoPaterno", "ct.Email")
+
+    # columnas por las que se puede ordenar: clave -> (expresion SQL, columna en la fila)
+    _ORDENES = {
+        "fecha": ("ct.FechaCreacion", "FechaCreacion"),
+        "id": ("ct.ContactoID", "ContactoID"),
+        "nombre": ("ct.Nombre", "Nombre"),
+        "email": ("IFNULL(ct.Email, '')", "Email"),
+        "telefono": ("IFNULL(ct.TelefonoCelular, '')", "TelefonoCelular"),
+        "puesto": ("IFNULL(ct.Puesto, '')", "Puesto"),
+        "empresa": ("IFNULL(e.RazonSocial, '')", "NombreEmpresa"),
+        "propietario": ("IFNULL(u.Nombre || ' ' || u.ApellidoPaterno, '')", "NombrePropietario"),
+        "activo": ("ct.Activo", "Activo"),
+    }
+
     def find_all(self, limit=None, offset=0):
         # obtiene contactos con paginacion opcional
         conn = get_connection()
-        query = """
-            SELECT ct.*,
-                   e.RazonSocial AS NombreEmpresa,
-                   c.Nombre AS NombreCiudad,
-                   oc.Nombre AS NombreOrigen,
-                   (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario
-            FROM Contactos ct
-            LEFT JOIN Empresas e ON ct.EmpresaID = e.EmpresaID
-            LEFT JOIN Ciudades c ON ct.CiudadID = c.CiudadID
-            LEFT JOIN OrigenesContacto oc ON ct.OrigenID = oc.OrigenID
-            LEFT JOIN Usuarios u ON ct.PropietarioID = u.UsuarioID
-            ORDER BY ct.FechaCreacion DESC
-        """
+        query = self._SELECT_LISTADO + " ORDER BY ct.FechaCreacion DESC"
+        params = []
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
+
+        return self._MAPEO.consultar(conn, query, params)
 
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
-        return [self._row_to_contacto(row) for row in rows]
+    def find_page(self, limit=50, token=None, filtros=None, orden="fecha", descendente=True):
+        # pagina por cursor sobre (columna de orden, ContactoID); costo constante en paginas profundas
+        if orden not in self._ORDENES:
+            raise ValueError(f"Orden no permitido: {orden}")
+        orden_col, clave_orden = self._ORDENES[orden]
+        condiciones, params = construir_filtros(filtros, self._FILTROS, self._COLUMNAS_TEXTO)
+        return paginar(
+            get_connection(), self._SELECT_LISTADO,
+            orden_col, "ct.ContactoID", self._MAPEO,
+            limit=limit, token=token, condiciones=condiciones, params=params,
+            descendente=descendente, clave_orden=clave_orden,
+        )
 
     def count_all(self):
         # cuenta total de contactos para calcular paginas
@@ -35,9 +114,19 @@ class ContactoRepository:
         cursor = conn.execute("SELECT COUNT(*) as total FROM Contactos")
         return cursor.fetchone()["total"]
 
-    def find_by_id(self, contacto_id):
+    def count_resumen(self):
+        # total y activos en una sola pasada (para las tarjetas de estadisticas)
         conn = get_connection()
         cursor = conn.execute(
+            "SELECT COUNT(*) AS total, IFNULL(SUM(Activo = 1), 0) AS activos FROM Contactos"
+        )
+        row = cursor.fetchone()
+        return row["total"], row["activos"]
+
+    def find_by_id(self, contacto_id):
+        conn = get_connection()
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT ct.*,
                    e.RazonSocial AS NombreEmpresa,
@@ -53,52 +142,57 @@ class ContactoRepository:
             """,
             (contacto_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_contacto(row)
+
+    _INSERT = """
+        INSERT INTO Contactos (
+            Nombre, ApellidoPaterno, ApellidoMaterno, Email,
+            EmailSecundario, TelefonoOficina, TelefonoCelular,
+            Puesto, Departamento, EmpresaID, Direccion,
+            CiudadID, CodigoPostal, FechaNacimiento, LinkedInURL,
+            OrigenID, PropietarioID, EsContactoPrincipal,
+            NoContactar, Activo, CreadoPor, ModificadoPor
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _valores_insert(contacto):
+        return (
+            contacto.nombre,
+            contacto.apellido_paterno,
+            contacto.apellido_materno,
+            contacto.email,
+            contacto.email_secundario,
+            contacto.telefono_oficina,
+            contacto.telefono_celular,
+            contacto.puesto,
+            contacto.departamento,
+            contacto.empresa_id,
+            contacto.direccion,
+            contacto.ciudad_id,
+            contacto.codigo_postal,
+            contacto.fecha_nacimiento,
+            contacto.linkedin_url,
+            contacto.origen_id,
+            contacto.propietario_id,
+            contacto.es_contacto_principal,
+            contacto.no_contactar,
+            contacto.activo,
+            contacto.creado_por,
+            contacto.modificado_por,
+        )
 
     def create(self, contacto):
         conn = get_connection()
-        cursor = conn.execute(
-            """
-            INSERT INTO Contactos (
-                Nombre, ApellidoPaterno, ApellidoMaterno, Email,
-                EmailSecundario, TelefonoOficina, TelefonoCelular,
-                Puesto, Departamento, EmpresaID, Direccion,
-                CiudadID, CodigoPostal, FechaNacimiento, LinkedInURL,
-                OrigenID, PropietarioID, EsContactoPrincipal,
-                NoContactar, Activo, CreadoPor, ModificadoPor
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                contacto.nombre,
-                contacto.apellido_paterno,
-                contacto.apellido_materno,
-                contacto.email,
-                contacto.email_secundario,
-                contacto.telefono_oficina,
-                contacto.telefono_celular,
-                contacto.puesto,
-                contacto.departamento,
-                contacto.empresa_id,
-                contacto.direccion,
-                contacto.ciudad_id,
-                contacto.codigo_postal,
-                contacto.fecha_nacimiento,
-                contacto.linkedin_url,
-                contacto.origen_id,
-                contacto.propietario_id,
-                contacto.es_contacto_principal,
-                contacto.no_contactar,
-                contacto.activo,
-                contacto.creado_por,
-                contacto.modificado_por,
-            ),
-        )
+        cursor = conn.execute(self._INSERT, self._valores_insert(contacto))
         conn.commit()
         return cursor.lastrowid
 
+    def create_many(self, contactos):
+        # un solo executemany; la transaccion la abre quien llama (ver transaction())
+        conn = get_connection()
+        conn.executemany(self._INSERT, map(self._valores_insert, contactos))
+        conn.commit()
+
     def update(self, contacto):
         conn = get_connection()
         conn.execute(
@@ -155,58 +249,9 @@ class ContactoRepository:
         result = cursor.fetchone()
         return result["total"] > 0
 
-    @staticmethod
-    def _row_to_contacto(row):
-        nombre_empresa = None
-        nombre_ciudad = None
-        nombre_origen = None
-        nombre_propietario = None
-        try:
-            nombre_empresa = row["NombreEmpresa"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_ciudad = row["NombreCiudad"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_origen = row["NombreOrigen"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_propietario = row["NombrePropietario"]
-        except (KeyError, IndexError):
-            pass
-
-        return Contacto(
-            contacto_id=row["ContactoID"],
-            nombre=row["Nombre"],
-            apellido_paterno=row["ApellidoPaterno"],
-            apellido_materno=row["ApellidoMaterno"],
-            email=row["Email"],
-            email_secundario=row["EmailSecundario"],
-            telefono_oficina=row["TelefonoOficina"],
-            telefono_celular=row["TelefonoCelular"],
-            puesto=row["Puesto"],
-            departamento=row["Departamento"],
-            empresa_id=row["EmpresaID"],
-            direccion=row["Direccion"],
-            ciudad_id=row["CiudadID"],
-            codigo_postal=row["CodigoPostal"],
-            fecha_nacimiento=row["FechaNacimiento"],
-            linkedin_url=row["LinkedInURL"],
-            origen_id=row["OrigenID"],
-            propietario_id=row["PropietarioID"],
-            es_contacto_principal=row["EsContactoPrincipal"],
-            no_contactar=row["NoContactar"],
-            activo=row["Activo"],
-            foto_url=row["FotoURL"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            creado_por=row["CreadoPor"],
-            modificado_por=row["ModificadoPor"],
-            nombre_empresa=nombre_empresa,
-            nombre_ciudad=nombre_ciudad,
-            nombre_origen=nombre_origen,
-            nombre_propietario=nombre_propietario,
-        )
+    def emails_registrados(self):
+        # todos los emails en minusculas, para detectar duplicados sin una consulta por fila
+        conn = get_connection()
+        cursor = conn.execute("SELECT lower(Email) FROM Contactos WHERE Email IS NOT NULL")
+        cursor.row_factory = None
+        return {fila[0] for fila in cursor}
@@ -1,28 +1,77 @@
 # Repositorio de cotizaciones - queries contra la tabla Cotizaciones
 
 from app.database.connection import get_connection
+from app.utils.paginacion import paginar, construir_filtros
 from app.models.Cotizacion import Cotizacion
+from app.utils.mapeo import MapeadorFilas
 
 
 class CotizacionRepository:
 
+    # columna de la consulta -> argumento de Cotizacion; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Cotizacion, {
+        "cotizacion_id": "CotizacionID",
+        "numero_cotizacion": "NumeroCotizacion",
+        "oportunidad_id": "OportunidadID",
+        "contacto_id": "ContactoID",
+        "fecha_emision": "FechaEmision",
+        "fecha_vigencia": "FechaVigencia",
+        "subtotal": "Subtotal",
+        "iva": "IVA",
+        "total": "Total",
+        "moneda_id": "MonedaID",
+        "estado": "Estado",
+        "notas": "Notas",
+        "terminos_condiciones": "TerminosCondiciones",
+        "creado_por": "CreadoPor",
+        "fecha_creacion": "FechaCreacion",
+        "nombre_oportunidad": "NombreOportunidad",
+        "nombre_contacto": "NombreContacto",
+        "nombre_moneda": "NombreMoneda",
+    }, opcionales=(
+        "NombreOportunidad",
+        "NombreContacto",
+        "NombreMoneda",
+    ))
+
+    # SELECT comun de los listados (sin WHERE ni ORDER BY)
+    _SELECT_LISTADO = """
+        SELECT c.*,
+               o.Nombre AS NombreOportunidad,
+               (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
+               m.Nombre AS NombreMoneda
+        FROM Cotizaciones c
+        LEFT JOIN Oportunidades o ON c.OportunidadID = o.OportunidadID
+        LEFT JOIN Contactos ct ON c.ContactoID = ct.ContactoID
+        LEFT JOIN Monedas m ON c.MonedaID = m.MonedaID
+    """
+
+    # filtros aceptados por find_page: clave -> columna
+    _FILTROS = {
+        "estado": "c.Estado",
+        "oportunidad_id": "c.OportunidadID",
+        "contacto_id": "c.ContactoID",
+    }
+    _COLUMNAS_TEXTO = ("c.NumeroCotizacion",)
+
     def find_all(self, limit=None, offset=0):
         conn = get_connection()
-        query = """
-            SELECT c.*,
-                   o.Nombre AS NombreOportunidad,
-                   (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
-                   m.Nombre AS NombreMoneda
-            FROM Cotizaciones c
-            LEFT JOIN Oportunidades o ON c.OportunidadID = o.OportunidadID
-            LEFT JOIN Contactos ct ON c.ContactoID = ct.ContactoID
-            LEFT JOIN Monedas m ON c.MonedaID = m.MonedaID
-            ORDER BY c.FechaCreacion DESC
-        """
+        query = self._SELECT_LISTADO + " ORDER BY c.FechaCreacion DESC"
+        params = []
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
-        cursor = conn.execute(query)
-        return [self._row_to_cotizacion(row) for row in cursor.fetchall()]
+            query += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
+
+        return self._MAPEO.consultar(conn, query, params)
+
+    def find_page(self, limit=50, token=None, filtros=None):
+        # pagina por cursor sobre (FechaCreacion, CotizacionID); costo constante en paginas profundas
+        condiciones, params = construir_filtros(filtros, self._FILTROS, self._COLUMNAS_TEXTO)
+        return paginar(
+            get_connection(), self._SELECT_LISTADO,
+            "c.FechaCreacion", "c.CotizacionID", self._MAPEO,
+            limit=limit, token=token, condiciones=condiciones, params=params,
+        )
 
     def count_all(self):
         conn = get_connection()
@@ -31,7 +80,8 @@ class CotizacionRepository:
 
     def find_by_id(self, cotizacion_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT c.*,
                    o.Nombre AS NombreOportunidad,
@@ -45,8 +95,6 @@ class CotizacionRepository:
             """,
             (cotizacion_id,),
         )
-        row = cursor.fetchone()
-        return self._row_to_cotizacion(row) if row else None
 
     def create(self, cotizacion):
         conn = get_connection()
@@ -128,41 +176,3 @@ class CotizacionRepository:
         )
         row = cursor.fetchone()
         return row["ultimo"] or 0
-
-    @staticmethod
-    def _row_to_cotizacion(row):
-        nombre_oportunidad = None
-        nombre_contacto = None
-        nombre_moneda = None
-        try:
-            nombre_oportunidad = row["NombreOportunidad"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_contacto = row["NombreContacto"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_moneda = row["NombreMoneda"]
-        except (KeyError, IndexError):
-            pass
-        return Cotizacion(
-            cotizacion_id=row["CotizacionID"],
-            numero_cotizacion=row["NumeroCotizacion"],
-            oportunidad_id=row["OportunidadID"],
-            contacto_id=row["ContactoID"],
-            fecha_emision=row["FechaEmision"],
-            fecha_vigencia=row["FechaVigencia"],
-            subtotal=row["Subtotal"],
-            iva=row["IVA"],
-            total=row["Total"],
-            moneda_id=row["MonedaID"],
-            estado=row["Estado"],
-            notas=row["Notas"],
-            terminos_condiciones=row["TerminosCondiciones"],
-            creado_por=row["CreadoPor"],
-            fecha_creacion=row["FechaCreacion"],
-            nombre_oportunidad=nombre_oportunidad,
-            nombre_contacto=nombre_contacto,
-            nombre_moneda=nombre_moneda,
-        )
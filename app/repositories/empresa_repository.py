@@ -1,37 +1,118 @@
 # Repositorio de empresas - queries contra la tabla Empresas
 
 from app.database.connection import get_connection
+from app.utils.paginacion import paginar, construir_filtros
 from app.models.Empresa import Empresa
+from app.utils.mapeo import MapeadorFilas
 
 
 class EmpresaRepository:
 
+    # columna de la consulta -> argumento de Empresa; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Empresa, {
+        "empresa_id": "EmpresaID",
+        "razon_social": "RazonSocial",
+        "nombre_comercial": "NombreComercial",
+        "rfc": "RFC",
+        "industria_id": "IndustriaID",
+        "tamano_id": "TamanoID",
+        "sitio_web": "SitioWeb",
+        "telefono": "Telefono",
+        "email": "Email",
+        "direccion": "Direccion",
+        "ciudad_id": "CiudadID",
+        "codigo_postal": "CodigoPostal",
+        "ingreso_anual_estimado": "IngresoAnualEstimado",
+        "moneda_id": "MonedaID",
+        "num_empleados": "NumEmpleados",
+        "descripcion": "Descripcion",
+        "logo_url": "LogoURL",
+        "origen_id": "OrigenID",
+        "propietario_id": "PropietarioID",
+        "activo": "Activo",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "creado_por": "CreadoPor",
+        "modificado_por": "ModificadoPor",
+        "nombre_industria": "NombreIndustria",
+        "nombre_tamano": "NombreTamano",
+        "nombre_ciudad": "NombreCiudad",
+        "nombre_moneda": "NombreMoneda",
+        "nombre_origen": "NombreOrigen",
+        "nombre_propietario": "NombrePropietario",
+    }, opcionales=(
+        "NombreIndustria",
+        "NombreTamano",
+        "NombreCiudad",
+        "NombreMoneda",
+        "NombreOrigen",
+        "NombrePropietario",
+    ))
+
+    # SELECT comun de los listados (sin WHERE ni ORDER BY)
+    _SELECT_LISTADO = """
+        SELECT e.*,
+               i.Nombre AS NombreIndustria,
+               t.Nombre AS NombreTamano,
+               c.Nombre AS NombreCiudad,
+               m.Nombre AS NombreMoneda,
+               oc.Nombre AS NombreOrigen,
+               (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario
+        FROM Empresas e
+        LEFT JOIN Industrias i ON e.IndustriaID = i.IndustriaID
+        LEFT JOIN TamanosEmpresa t ON e.TamanoID = t.TamanoID
+        LEFT JOIN Ciudades c ON e.CiudadID = c.CiudadID
+        LEFT JOIN Monedas m ON e.MonedaID = m.MonedaID
+        LEFT JOIN OrigenesContacto oc ON e.OrigenID = oc.OrigenID
+        LEFT JOIN Usuarios u ON e.PropietarioID = u.UsuarioID
+    """
+
+    # filtros aceptados por find_page: clave -> columna
+    _FILTROS = {
+        "industria_id": "e.IndustriaID",
+        "tamano_id": "e.TamanoID",
+        "ciudad_id": "e.CiudadID",
+        "propietario_id": "e.PropietarioID",
+        "activo": "e.Activo",
+    }
+    _COLUMNAS_TEXTO = ("e.RazonSocial", "e.NombreComercial", "e.RFC")
+
+    # columnas por las que se puede ordenar: clave -> (expresion SQL, columna en la fila)
+    _ORDENES = {
+        "fecha": ("e.FechaCreacion", "FechaCreacion"),
+        "id": ("e.EmpresaID", "EmpresaID"),
+        "razon_social": ("e.RazonSocial", "RazonSocial"),
+        "nombre_comercial": ("IFNULL(e.NombreComercial, '')", "NombreComercial"),
+        "industria": ("IFNULL(i.Nombre, '')", "NombreIndustria"),
+        "telefono": ("IFNULL(e.Telefono, '')", "Telefono"),
+        "email": ("IFNULL(e.Email, '')", "Email"),
+        "propietario": ("IFNULL(u.Nombre || ' ' || u.ApellidoPaterno, '')", "NombrePropietario"),
+        "activo": ("e.Activo", "Activo"),
+    }
+
     def find_all(self, limit=None, offset=0):
         # obtiene empresas con paginacion opcional
         conn = get_connection()
-        query = """
-            SELECT e.*,
-                   i.Nombre AS NombreIndustria,
-                   t.Nombre AS NombreTamano,
-                   c.Nombre AS NombreCiudad,
-                   m.Nombre AS NombreMoneda,
-                   oc.Nombre AS NombreOrigen,
-                   (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario
-            FROM Empresas e
-            LEFT JOIN Industrias i ON e.IndustriaID = i.IndustriaID
-            LEFT JOIN TamanosEmpresa t ON e.TamanoID = t.TamanoID
-            LEFT JOIN Ciudades c ON e.CiudadID = c.CiudadID
-            LEFT JOIN Monedas m ON e.MonedaID = m.MonedaID
-            LEFT JOIN OrigenesContacto oc ON e.OrigenID = oc.OrigenID
-            LEFT JOIN Usuarios u ON e.PropietarioID = u.UsuarioID
-            ORDER BY e.FechaCreacion DESC
-        """
+        query = self._SELECT_LISTADO + " ORDER BY e.FechaCreacion DESC"
+        params = []
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
 
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
-        return [self._row_to_empresa(row) for row in rows]
+        return self._MAPEO.consultar(conn, query, params)
+
+    def find_page(self, limit=50, token=None, filtros=None, orden="fecha", descendente=True):
+        # pagina por cursor sobre (columna de orden, EmpresaID); costo constante en paginas profundas
+        if orden not in self._ORDENES:
+            raise ValueError(f"Orden no permitido: {orden}")
+        orden_col, clave_orden = self._ORDENES[orden]
+        condiciones, params = construir_filtros(filtros, self._FILTROS, self._COLUMNAS_TEXTO)
+        return paginar(
+            get_connection(), self._SELECT_LISTADO,
+            orden_col, "e.EmpresaID", self._MAPEO,
+            limit=limit, token=token, condiciones=condiciones, params=params,
+            descendente=descendente, clave_orden=clave_orden,
+        )
 
     def count_all(self):
         # cuenta total de empresas para calcular paginas
@@ -39,9 +120,19 @@ class EmpresaRepository:
         cursor = conn.execute("SELECT COUNT(*) as total FROM Empresas")
         return cursor.fetchone()["total"]
 
-    def find_by_id(self, empresa_id):
+    def count_resumen(self):
+        # total y activos en una sola pasada (para las tarjetas de estadisticas)
         conn = get_connection()
         cursor = conn.execute(
+            "SELECT COUNT(*) AS total, IFNULL(SUM(Activo = 1), 0) AS activos FROM Empresas"
+        )
+        row = cursor.fetchone()
+        return row["total"], row["activos"]
+
+    def find_by_id(self, empresa_id):
+        conn = get_connection()
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT e.*,
                    i.Nombre AS NombreIndustria,
@@ -61,49 +152,54 @@ class EmpresaRepository:
             """,
             (empresa_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_empresa(row)
+
+    _INSERT = """
+        INSERT INTO Empresas (
+            RazonSocial, NombreComercial, RFC, IndustriaID, TamanoID,
+            SitioWeb, Telefono, Email, Direccion, CiudadID,
+            CodigoPostal, IngresoAnualEstimado, MonedaID, NumEmpleados,
+            Descripcion, OrigenID, PropietarioID, Activo,
+            CreadoPor, ModificadoPor
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """
+
+    @staticmethod
+    def _valores_insert(empresa):
+        return (
+            empresa.razon_social,
+            empresa.nombre_comercial,
+            empresa.rfc,
+            empresa.industria_id,
+            empresa.tamano_id,
+            empresa.sitio_web,
+            empresa.telefono,
+            empresa.email,
+            empresa.direccion,
+            empresa.ciudad_id,
+            empresa.codigo_postal,
+            empresa.ingreso_anual_estimado,
+            empresa.moneda_id,
+            empresa.num_empleados,
+            empresa.descripcion,
+            empresa.origen_id,
+            empresa.propietario_id,
+            empresa.activo,
+            empresa.creado_por,
+            empresa.modificado_por,
+        )
 
     def create(self, empresa):
         conn = get_connection()
-        cursor = conn.execute(
-            """
-            INSERT INTO Empresas (
-                RazonSocial, NombreComercial, RFC, IndustriaID, TamanoID,
-                SitioWeb, Telefono, Email, Direccion, CiudadID,
-                CodigoPostal, IngresoAnualEstimado, MonedaID, NumEmpleados,
-                Descripcion, OrigenID, PropietarioID, Activo,
-                CreadoPor, ModificadoPor
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
-            (
-                empresa.razon_social,
-                empresa.nombre_comercial,
-                empresa.rfc,
-                empresa.industria_id,
-                empresa.tamano_id,
-                empresa.sitio_web,
-                empresa.telefono,
-                empresa.email,
-                empresa.direccion,
-                empresa.ciudad_id,
-                empresa.codigo_postal,
-                empresa.ingreso_anual_estimado,
-                empresa.moneda_id,
-                empresa.num_empleados,
-                empresa.descripcion,
-                empresa.origen_id,
-                empresa.propietario_id,
-                empresa.activo,
-                empresa.creado_por,
-                empresa.modificado_por,
-            ),
-        )
+        cursor = conn.execute(self._INSERT, self._valores_insert(empresa))
         conn.commit()
         return cursor.lastrowid
 
+    def create_many(self, empresas):
+        # un solo executemany; la transaccion la abre quien llama (ver transaction())
+        conn = get_connection()
+        conn.executemany(self._INSERT, map(self._valores_insert, empresas))
+        conn.commit()
+
     def update(self, empresa):
         conn = get_connection()
         conn.execute(
@@ -158,68 +254,16 @@ class EmpresaRepository:
         result = cursor.fetchone()
         return result["total"] > 0
 
-    @staticmethod
-    def _row_to_empresa(row):
-        nombre_industria = None
-        nombre_tamano = None
-        nombre_ciudad = None
-        nombre_moneda = None
-        nombre_origen = None
-        nombre_propietario = None
-        try:
-            nombre_industria = row["NombreIndustria"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_tamano = row["NombreTamano"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_ciudad = row["NombreCiudad"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_moneda = row["NombreMoneda"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_origen = row["NombreOrigen"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_propietario = row["NombrePropietario"]
-        except (KeyError, IndexError):
-            pass
-
-        return Empresa(
-            empresa_id=row["EmpresaID"],
-            razon_social=row["RazonSocial"],
-            nombre_comercial=row["NombreComercial"],
-            rfc=row["RFC"],
-            industria_id=row["IndustriaID"],
-            tamano_id=row["TamanoID"],
-            sitio_web=row["SitioWeb"],
-            telefono=row["Telefono"],
-            email=row["Email"],
-            direccion=row["Direccion"],
-            ciudad_id=row["CiudadID"],
-            codigo_postal=row["CodigoPostal"],
-            ingreso_anual_estimado=row["IngresoAnualEstimado"],
-            moneda_id=row["MonedaID"],
-            num_empleados=row["NumEmpleados"],
-            descripcion=row["Descripcion"],
-            logo_url=row["LogoURL"],
-            origen_id=row["OrigenID"],
-            propietario_id=row["PropietarioID"],
-            activo=row["Activo"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            creado_por=row["CreadoPor"],
-            modificado_por=row["ModificadoPor"],
-            nombre_industria=nombre_industria,
-            nombre_tamano=nombre_tamano,
-            nombre_ciudad=nombre_ciudad,
-            nombre_moneda=nombre_moneda,
-            nombre_origen=nombre_origen,
-            nombre_propietario=nombre_propietario,
-        )
+    def rfcs_registrados(self):
+        # todos los RFC en mayusculas, para detectar duplicados sin una consulta por fila
+        conn = get_connection()
+        cursor = conn.execute("SELECT upper(RFC) FROM Empresas WHERE RFC IS NOT NULL")
+        cursor.row_factory = None
+        return {fila[0] for fila in cursor}
+
+    def ids_por_razon_social(self):
+        # (RazonSocial, EmpresaID) de todas las empresas, para resolver nombres a IDs
+        conn = get_connection()
+        cursor = conn.execute("SELECT RazonSocial, EmpresaID FROM Empresas")
+        cursor.row_factory = None
+        return cursor.fetchall()
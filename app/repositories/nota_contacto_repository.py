@@ -2,14 +2,32 @@
 
 from app.database.connection import get_connection
 from app.models.NotaContacto import NotaContacto
+from app.utils.mapeo import MapeadorFilas
 
 
 class NotaContactoRepository:
 
+    # columna de la consulta -> argumento de NotaContacto; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(NotaContacto, {
+        "nota_id": "NotaID",
+        "contacto_id": "ContactoID",
+        "titulo": "Titulo",
+        "contenido": "Contenido",
+        "es_privada": "EsPrivada",
+        "fecha_creacion": "FechaCreacion",
+        "creado_por": "CreadoPor",
+        "nombre_contacto": "NombreContacto",
+        "nombre_creador": "NombreCreador",
+    }, opcionales=(
+        "NombreContacto",
+        "NombreCreador",
+    ))
+
     def find_by_contacto(self, contacto_id):
         # obtiene todas las notas de un contacto especifico
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT nc.*,
                    (c.Nombre || ' ' || c.ApellidoPaterno) AS NombreContacto,
@@ -22,12 +40,11 @@ class NotaContactoRepository:
             """,
             (contacto_id,),
         )
-        rows = cursor.fetchall()
-        return [self._row_to_nota(row) for row in rows]
 
     def find_by_id(self, nota_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT nc.*,
                    (c.Nombre || ' ' || c.ApellidoPaterno) AS NombreContacto,
@@ -39,10 +56,6 @@ class NotaContactoRepository:
             """,
             (nota_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_nota(row)
 
     def create(self, nota):
         conn = get_connection()
@@ -84,27 +97,3 @@ class NotaContactoRepository:
         conn = get_connection()
         conn.execute("DELETE FROM NotasContacto WHERE NotaID = ?", (nota_id,))
         conn.commit()
-
-    def _row_to_nota(self, row):
-        nombre_contacto = None
-        nombre_creador = None
-        try:
-            nombre_contacto = row["NombreContacto"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_creador = row["NombreCreador"]
-        except (KeyError, IndexError):
-            pass
-
-        return NotaContacto(
-            nota_id=row["NotaID"],
-            contacto_id=row["ContactoID"],
-            titulo=row["Titulo"],
-            contenido=row["Contenido"],
-            es_privada=row["EsPrivada"],
-            fecha_creacion=row["FechaCreacion"],
-            creado_por=row["CreadoPor"],
-            nombre_contacto=nombre_contacto,
-            nombre_creador=nombre_creador,
-        )
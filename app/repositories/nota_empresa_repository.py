@@ -2,14 +2,32 @@
 
 from app.database.connection import get_connection
 from app.models.NotaEmpresa import NotaEmpresa
+from app.utils.mapeo import MapeadorFilas
 
 
 class NotaEmpresaRepository:
 
+    # columna de la consulta -> argumento de NotaEmpresa; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(NotaEmpresa, {
+        "nota_id": "NotaID",
+        "empresa_id": "EmpresaID",
+        "titulo": "Titulo",
+        "contenido": "Contenido",
+        "es_privada": "EsPrivada",
+        "fecha_creacion": "FechaCreacion",
+        "creado_por": "CreadoPor",
+        "nombre_empresa": "NombreEmpresa",
+        "nombre_creador": "NombreCreador",
+    }, opcionales=(
+        "NombreEmpresa",
+        "NombreCreador",
+    ))
+
     def find_by_empresa(self, empresa_id):
         # obtiene todas las notas de una empresa especifica
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT ne.*,
                    e.RazonSocial AS NombreEmpresa,
@@ -22,12 +40,11 @@ class NotaEmpresaRepository:
             """,
             (empresa_id,),
         )
-        rows = cursor.fetchall()
-        return [self._row_to_nota(row) for row in rows]
 
     def find_by_id(self, nota_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT ne.*,
                    e.RazonSocial AS NombreEmpresa,
@@ -39,10 +56,6 @@ class NotaEmpresaRepository:
             """,
             (nota_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_nota(row)
 
     def create(self, nota):
         conn = get_connection()
@@ -84,27 +97,3 @@ class NotaEmpresaRepository:
         conn = get_connection()
         conn.execute("DELETE FROM NotasEmpresa WHERE NotaID = ?", (nota_id,))
         conn.commit()
-
-    def _row_to_nota(self, row):
-        nombre_empresa = None
-        nombre_creador = None
-        try:
-            nombre_empresa = row["NombreEmpresa"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_creador = row["NombreCreador"]
-        except (KeyError, IndexError):
-            pass
-
-        return NotaEmpresa(
-            nota_id=row["NotaID"],
-            empresa_id=row["EmpresaID"],
-            titulo=row["Titulo"],
-            contenido=row["Contenido"],
-            es_privada=row["EsPrivada"],
-            fecha_creacion=row["FechaCreacion"],
-            creado_por=row["CreadoPor"],
-            nombre_empresa=nombre_empresa,
-            nombre_creador=nombre_creador,
-        )
@@ -1,39 +1,100 @@
 # Repositorio de oportunidades - queries contra la tabla Oportunidades
 
 from app.database.connection import get_connection
+from app.utils.paginacion import paginar, construir_filtros
 from app.models.Oportunidad import Oportunidad
+from app.utils.mapeo import MapeadorFilas
 
 
 class OportunidadRepository:
 
+    # columna de la consulta -> argumento de Oportunidad; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Oportunidad, {
+        "oportunidad_id": "OportunidadID",
+        "nombre": "Nombre",
+        "empresa_id": "EmpresaID",
+        "contacto_id": "ContactoID",
+        "etapa_id": "EtapaID",
+        "monto_estimado": "MontoEstimado",
+        "moneda_id": "MonedaID",
+        "probabilidad_cierre": "ProbabilidadCierre",
+        "fecha_cierre_estimada": "FechaCierreEstimada",
+        "fecha_cierre_real": "FechaCierreReal",
+        "origen_id": "OrigenID",
+        "propietario_id": "PropietarioID",
+        "motivos_perdida_id": "MotivosPerdidaID",
+        "notas_perdida": "NotasPerdida",
+        "descripcion": "Descripcion",
+        "es_ganada": "EsGanada",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "creado_por": "CreadoPor",
+        "modificado_por": "ModificadoPor",
+        "nombre_empresa": "NombreEmpresa",
+        "nombre_contacto": "NombreContacto",
+        "nombre_etapa": "NombreEtapa",
+        "nombre_moneda": "NombreMoneda",
+        "nombre_propietario": "NombrePropietario",
+        "nombre_origen": "NombreOrigen",
+        "nombre_motivo_perdida": "NombreMotivoPerdida",
+    }, opcionales=(
+        "NombreEmpresa",
+        "NombreContacto",
+        "NombreEtapa",
+        "NombreMoneda",
+        "NombrePropietario",
+        "NombreOrigen",
+        "NombreMotivoPerdida",
+    ))
+
+    # SELECT comun de los listados (sin WHERE ni ORDER BY)
+    _SELECT_LISTADO = """
+        SELECT o.*,
+               e.RazonSocial AS NombreEmpresa,
+               (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
+               ev.Nombre AS NombreEtapa,
+               m.Nombre AS NombreMoneda,
+               (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario,
+               oc.Nombre AS NombreOrigen,
+               mp.Nombre AS NombreMotivoPerdida
+        FROM Oportunidades o
+        LEFT JOIN Empresas e ON o.EmpresaID = e.EmpresaID
+        LEFT JOIN Contactos ct ON o.ContactoID = ct.ContactoID
+        LEFT JOIN EtapasVenta ev ON o.EtapaID = ev.EtapaID
+        LEFT JOIN Monedas m ON o.MonedaID = m.MonedaID
+        LEFT JOIN Usuarios u ON o.PropietarioID = u.UsuarioID
+        LEFT JOIN OrigenesContacto oc ON o.OrigenID = oc.OrigenID
+        LEFT JOIN MotivosPerdida mp ON o.MotivosPerdidaID = mp.MotivoID
+    """
+
+    # filtros aceptados por find_page: clave -> columna
+    _FILTROS = {
+        "etapa_id": "o.EtapaID",
+        "propietario_id": "o.PropietarioID",
+        "empresa_id": "o.EmpresaID",
+        "contacto_id": "o.ContactoID",
+    }
+    _COLUMNAS_TEXTO = ("o.Nombre",)
+
     def find_all(self, limit=None, offset=0):
         # obtiene oportunidades con paginacion opcional
         conn = get_connection()
-        query = """
-            SELECT o.*,
-                   e.RazonSocial AS NombreEmpresa,
-                   (ct.Nombre || ' ' || ct.ApellidoPaterno) AS NombreContacto,
-                   ev.Nombre AS NombreEtapa,
-                   m.Nombre AS NombreMoneda,
-                   (u.Nombre || ' ' || u.ApellidoPaterno) AS NombrePropietario,
-                   oc.Nombre AS NombreOrigen,
-                   mp.Nombre AS NombreMotivoPerdida
-            FROM Oportunidades o
-            LEFT JOIN Empresas e ON o.EmpresaID = e.EmpresaID
-            LEFT JOIN Contactos ct ON o.ContactoID = ct.ContactoID
-            LEFT JOIN EtapasVenta ev ON o.EtapaID = ev.EtapaID
-            LEFT JOIN Monedas m ON o.MonedaID = m.MonedaID
-            LEFT JOIN Usuarios u ON o.PropietarioID = u.UsuarioID
-            LEFT JOIN OrigenesContacto oc ON o.OrigenID = oc.OrigenID
-            LEFT JOIN MotivosPerdida mp ON o.MotivosPerdidaID = mp.MotivoID
-            ORDER BY o.FechaCreacion DESC
-        """
+        query = self._SELECT_LISTADO + " ORDER BY o.FechaCreacion DESC"
+        params = []
         if limit:
-            query += f" LIMIT {limit} OFFSET {offset}"
+            query += " LIMIT ? OFFSET ?"
+            params = [limit, offset]
 
-        cursor = conn.execute(query)
-        rows = cursor.fetchall()
-        return [self._row_to_oportunidad(row) for row in rows]
+        return self._MAPEO.consultar(conn, query, params)
+
+    def find_page(self, limit=50, token=None, filtros=None):
+        # pagina por cursor sobre (FechaCreacion, OportunidadID); costo constante en paginas profundas
+        condiciones, params = construir_filtros(filtros, self._FILTROS, self._COLUMNAS_TEXTO)
+        return paginar(
+            get_connection(), self._SELECT_LISTADO,
+            "o.FechaCreacion", "o.OportunidadID", self._MAPEO,
+            limit=limit, token=token, condiciones=condiciones, params=params,
+        )
 
     def count_all(self):
         # cuenta total de oportunidades para calcular paginas
@@ -43,7 +104,8 @@ class OportunidadRepository:
 
     def find_by_id(self, oportunidad_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT o.*,
                    e.RazonSocial AS NombreEmpresa,
@@ -65,10 +127,6 @@ class OportunidadRepository:
             """,
             (oportunidad_id,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_oportunidad(row)
 
     def create(self, oportunidad):
         conn = get_connection()
@@ -138,72 +196,3 @@ class OportunidadRepository:
             ),
         )
         conn.commit()
-
-    @staticmethod
-    def _row_to_oportunidad(row):
-        nombre_empresa = None
-        nombre_contacto = None
-        nombre_etapa = None
-        nombre_moneda = None
-        nombre_propietario = None
-        nombre_origen = None
-        nombre_motivo_perdida = None
-
-        try:
-            nombre_empresa = row["NombreEmpresa"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_contacto = row["NombreContacto"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_etapa = row["NombreEtapa"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_moneda = row["NombreMoneda"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_propietario = row["NombrePropietario"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_origen = row["NombreOrigen"]
-        except (KeyError, IndexError):
-            pass
-        try:
-            nombre_motivo_perdida = row["NombreMotivoPerdida"]
-        except (KeyError, IndexError):
-            pass
-
-        return Oportunidad(
-            oportunidad_id=row["OportunidadID"],
-            nombre=row["Nombre"],
-            empresa_id=row["EmpresaID"],
-            contacto_id=row["ContactoID"],
-            etapa_id=row["EtapaID"],
-            monto_estimado=row["MontoEstimado"],
-            moneda_id=row["MonedaID"],
-            probabilidad_cierre=row["ProbabilidadCierre"],
-            fecha_cierre_estimada=row["FechaCierreEstimada"],
-            fecha_cierre_real=row["FechaCierreReal"],
-            origen_id=row["OrigenID"],
-            propietario_id=row["PropietarioID"],
-            motivos_perdida_id=row["MotivosPerdidaID"],
-            notas_perdida=row["NotasPerdida"],
-            descripcion=row["Descripcion"],
-            es_ganada=row["EsGanada"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            creado_por=row["CreadoPor"],
-            modificado_por=row["ModificadoPor"],
-            nombre_empresa=nombre_empresa,
-            nombre_contacto=nombre_contacto,
-            nombre_etapa=nombre_etapa,
-            nombre_moneda=nombre_moneda,
-            nombre_propietario=nombre_propietario,
-            nombre_origen=nombre_origen,
-            nombre_motivo_perdida=nombre_motivo_perdida,
-        )
@@ -2,13 +2,32 @@
 
 from app.database.connection import get_connection
 from app.models.Plantilla import Plantilla
+from app.utils.mapeo import MapeadorFilas
 
 
 class PlantillaRepository:
 
+    # columna de la consulta -> argumento de Plantilla; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Plantilla, {
+        "plantilla_id": "PlantillaID",
+        "nombre": "Nombre",
+        "asunto": "Asunto",
+        "contenido_html": "ContenidoHTML",
+        "contenido_texto": "ContenidoTexto",
+        "categoria": "Categoria",
+        "activa": "Activa",
+        "creado_por": "CreadoPor",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "nombre_creador": "NombreCreador",
+    }, opcionales=(
+        "NombreCreador",
+    ))
+
     def find_all(self):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT p.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -17,11 +36,11 @@ class PlantillaRepository:
             ORDER BY p.Nombre
             """
         )
-        return [self._row_to_plantilla(row) for row in cursor.fetchall()]
 
     def find_all_activas(self):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT p.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -31,11 +50,11 @@ class PlantillaRepository:
             ORDER BY p.Nombre
             """
         )
-        return [self._row_to_plantilla(row) for row in cursor.fetchall()]
 
     def find_by_id(self, plantilla_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT p.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -45,8 +64,6 @@ class PlantillaRepository:
             """,
             (plantilla_id,),
         )
-        row = cursor.fetchone()
-        return self._row_to_plantilla(row) if row else None
 
     def create(self, plantilla):
         conn = get_connection()
@@ -95,25 +112,3 @@ class PlantillaRepository:
         conn = get_connection()
         conn.execute("DELETE FROM PlantillasCorreo WHERE PlantillaID = ?", (plantilla_id,))
         conn.commit()
-
-    @staticmethod
-    def _row_to_plantilla(row):
-        def safe(key):
-            try:
-                return row[key]
-            except (KeyError, IndexError):
-                return None
-
-        return Plantilla(
-            plantilla_id=row["PlantillaID"],
-            nombre=row["Nombre"],
-            asunto=row["Asunto"],
-            contenido_html=row["ContenidoHTML"],
-            contenido_texto=row["ContenidoTexto"],
-            categoria=row["Categoria"],
-            activa=row["Activa"],
-            creado_por=row["CreadoPor"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            nombre_creador=safe("NombreCreador"),
-        )
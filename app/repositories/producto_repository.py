@@ -2,10 +2,28 @@
 
 from app.database.connection import get_connection
 from app.models.Producto import Producto
+from app.utils.mapeo import MapeadorFilas
 
 
 class ProductoRepository:
 
+    # columna de la consulta -> argumento de Producto; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Producto, {
+        "producto_id": "ProductoID",
+        "codigo": "Codigo",
+        "nombre": "Nombre",
+        "descripcion": "Descripcion",
+        "categoria": "Categoria",
+        "precio_unitario": "PrecioUnitario",
+        "moneda_id": "MonedaID",
+        "unidad_medida": "UnidadMedida",
+        "activo": "Activo",
+        "fecha_creacion": "FechaCreacion",
+        "nombre_moneda": "NombreMoneda",
+    }, opcionales=(
+        "NombreMoneda",
+    ))
+
     def find_all(self, limit=None, offset=0):
         conn = get_connection()
         query = """
@@ -16,8 +34,7 @@ class ProductoRepository:
         """
         if limit:
             query += f" LIMIT {limit} OFFSET {offset}"
-        cursor = conn.execute(query)
-        return [self._row_to_producto(row) for row in cursor.fetchall()]
+        return self._MAPEO.consultar(conn, query)
 
     def count_all(self):
         conn = get_connection()
@@ -26,7 +43,8 @@ class ProductoRepository:
 
     def find_by_id(self, producto_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT p.*, m.Nombre AS NombreMoneda
             FROM Productos p
@@ -35,12 +53,11 @@ class ProductoRepository:
             """,
             (producto_id,),
         )
-        row = cursor.fetchone()
-        return self._row_to_producto(row) if row else None
 
     def find_activos(self):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT p.*, m.Nombre AS NombreMoneda
             FROM Productos p
@@ -49,7 +66,6 @@ class ProductoRepository:
             ORDER BY p.Nombre
             """
         )
-        return [self._row_to_producto(row) for row in cursor.fetchall()]
 
     def create(self, producto):
         conn = get_connection()
@@ -108,24 +124,3 @@ class ProductoRepository:
                 "SELECT COUNT(*) as total FROM Productos WHERE Codigo = ?", (codigo,)
             )
         return cursor.fetchone()["total"] > 0
-
-    @staticmethod
-    def _row_to_producto(row):
-        nombre_moneda = None
-        try:
-            nombre_moneda = row["NombreMoneda"]
-        except (KeyError, IndexError):
-            pass
-        return Producto(
-            producto_id=row["ProductoID"],
-            codigo=row["Codigo"],
-            nombre=row["Nombre"],
-            descripcion=row["Descripcion"],
-            categoria=row["Categoria"],
-            precio_unitario=row["PrecioUnitario"],
-            moneda_id=row["MonedaID"],
-            unidad_medida=row["UnidadMedida"],
-            activo=row["Activo"],
-            fecha_creacion=row["FechaCreacion"],
-            nombre_moneda=nombre_moneda,
-        )
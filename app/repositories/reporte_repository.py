@@ -1,53 +1,145 @@
-from app.database.connection import get_connection
+from app.database.connection import get_reader, get_writer
+
+# Mismas definiciones que los triggers del resumen de actividad por contacto;
+# se usan para recalcularlo completo
+_POBLAR_ACTIVIDAD = [
+    """
+    INSERT INTO ResumenActividadContacto (ContactoID, TotalActividades, UltimaActividad)
+    SELECT co.ContactoID, COUNT(a.ActividadID), MAX(a.FechaCreacion)
+    FROM Contactos co
+        LEFT JOIN Actividades a ON a.ContactoID = co.ContactoID
+    GROUP BY co.ContactoID
+    """,
+    """
+    INSERT INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+    SELECT ContactoID, TipoActividadID, COUNT(*)
+    FROM Actividades
+    WHERE ContactoID IS NOT NULL
+    GROUP BY ContactoID, TipoActividadID
+    """,
+]
 
 
 class ReporteRepository:
+    # Solo lecturas pesadas sobre vistas: se usan los lectores del pool para
+    # no competir con las escrituras de la conexion principal.
+
+    # clave del reporte -> metodo que arma su consulta (query, params)
+    _CONSULTAS = {
+        "pipeline": "_sql_pipeline_ventas",
+        "vendedores": "_sql_rendimiento_vendedores",
+        "etapas": "_sql_conversion_por_etapa",
+        "campanas": "_sql_analisis_campanas",
+        "actividad": "_sql_actividad_contactos",
+    }
 
     def _rows_to_dicts(self, cursor):
         cols = [d[0] for d in cursor.description]
         return [dict(zip(cols, row)) for row in cursor.fetchall()]
 
-    def get_pipeline_ventas(self, fecha_desde=None, fecha_hasta=None):
-        conn = get_connection()
+    def _todas(self, query, params):
+        with get_reader() as conn:
+            cur = conn.execute(query, params)
+            return self._rows_to_dicts(cur)
+
+    def iterar(self, clave, fecha_desde=None, fecha_hasta=None, tamano_bloque=1000):
+        """
+        Recorre un reporte fila por fila (dicts) sin materializarlo completo.
+
+        Lee del cursor en bloques con fetchmany; el lector del pool queda
+        ocupado hasta que el generador se agota o se cierra.
+        """
+        query, params = getattr(self, self._CONSULTAS[clave])(fecha_desde, fecha_hasta)
+        with get_reader() as conn:
+            cur = conn.execute(query, params)
+            cols = [d[0] for d in cur.description]
+            while True:
+                bloque = cur.fetchmany(tamano_bloque)
+                if not bloque:
+                    break
+                for row in bloque:
+                    yield dict(zip(cols, row))
+
+    # ------------------------------------------------------------------ #
+    # Consultas                                                            #
+    # ------------------------------------------------------------------ #
+
+    def _sql_pipeline_ventas(self, fecha_desde=None, fecha_hasta=None):
         query = "SELECT * FROM vw_PipelineVentas"
         params = []
         if fecha_desde and fecha_hasta:
-            query += " WHERE date(FechaCreacion) BETWEEN date(?) AND date(?)"
+            # Rango semiabierto sobre la columna (sin date()) para que use
+            # idx_oportunidades_abiertas_fecha; incluye todo el dia final
+            query += " WHERE FechaCreacion >= date(?) AND FechaCreacion < date(?, '+1 day')"
             params = [str(fecha_desde), str(fecha_hasta)]
         query += " ORDER BY OrdenEtapa, ValorPonderado DESC"
-        cur = conn.execute(query, params)
-        return self._rows_to_dicts(cur)
+        return query, params
 
-    def get_rendimiento_vendedores(self):
-        conn = get_connection()
-        cur = conn.execute("SELECT * FROM vw_RendimientoVendedores ORDER BY MontoGanado DESC")
-        return self._rows_to_dicts(cur)
+    def _sql_rendimiento_vendedores(self, fecha_desde=None, fecha_hasta=None):
+        # sin filtro de fechas: la vista acumula todo el historial
+        return "SELECT * FROM vw_RendimientoVendedores ORDER BY MontoGanado DESC", []
 
-    def get_conversion_por_etapa(self):
-        conn = get_connection()
-        cur = conn.execute("SELECT * FROM vw_ConversionPorEtapa ORDER BY Orden")
-        return self._rows_to_dicts(cur)
+    def _sql_conversion_por_etapa(self, fecha_desde=None, fecha_hasta=None):
+        # sin filtro de fechas: la vista acumula todo el historial
+        return "SELECT * FROM vw_ConversionPorEtapa ORDER BY Orden", []
 
-    def get_analisis_campanas(self, fecha_desde=None, fecha_hasta=None):
-        conn = get_connection()
+    def _sql_analisis_campanas(self, fecha_desde=None, fecha_hasta=None):
         query = "SELECT * FROM vw_AnalisisCampanas"
         params = []
         if fecha_desde and fecha_hasta:
-            # Incluir campañas sin fecha de envío (borradores) siempre
-            query += " WHERE FechaEnvio IS NULL OR date(FechaEnvio) BETWEEN date(?) AND date(?)"
+            # Incluir campañas sin fecha de envío (borradores) siempre.
+            # Rango semiabierto para usar idx_campanas_fecha_envio en ambas ramas
+            query += (
+                " WHERE FechaEnvio IS NULL"
+                " OR (FechaEnvio >= date(?) AND FechaEnvio < date(?, '+1 day'))"
+            )
             params = [str(fecha_desde), str(fecha_hasta)]
         query += " ORDER BY FechaEnvio DESC"
-        cur = conn.execute(query, params)
-        return self._rows_to_dicts(cur)
+        return query, params
 
-    def get_actividad_contactos(self, fecha_desde=None, fecha_hasta=None):
-        conn = get_connection()
+    def _sql_actividad_contactos(self, fecha_desde=None, fecha_hasta=None):
         query = "SELECT * FROM vw_ActividadRecienteContacto"
         params = []
         if fecha_desde and fecha_hasta:
-            # Incluir contactos sin actividad registrada siempre (UltimaActividad NULL)
-            query += " WHERE UltimaActividad IS NULL OR date(UltimaActividad) BETWEEN date(?) AND date(?)"
+            # Incluir contactos sin actividad registrada siempre (UltimaActividad NULL).
+            # Rango sobre la columna sin date() para usar idx_resumen_actividad_ultima
+            query += (
+                " WHERE UltimaActividad IS NULL"
+                " OR (UltimaActividad >= date(?) AND UltimaActividad < date(?, '+1 day'))"
+            )
             params = [str(fecha_desde), str(fecha_hasta)]
         query += " ORDER BY DiasSinContacto DESC"
-        cur = conn.execute(query, params)
-        return self._rows_to_dicts(cur)
+        return query, params
+
+    # ------------------------------------------------------------------ #
+    # Reportes completos (para mostrar en pantalla)                        #
+    # ------------------------------------------------------------------ #
+
+    def get_pipeline_ventas(self, fecha_desde=None, fecha_hasta=None):
+        return self._todas(*self._sql_pipeline_ventas(fecha_desde, fecha_hasta))
+
+    def get_rendimiento_vendedores(self):
+        return self._todas(*self._sql_rendimiento_vendedores())
+
+    def get_conversion_por_etapa(self):
+        return self._todas(*self._sql_conversion_por_etapa())
+
+    def get_analisis_campanas(self, fecha_desde=None, fecha_hasta=None):
+        return self._todas(*self._sql_analisis_campanas(fecha_desde, fecha_hasta))
+
+    def get_actividad_contactos(self, fecha_desde=None, fecha_hasta=None):
+        return self._todas(*self._sql_actividad_contactos(fecha_desde, fecha_hasta))
+
+    # ------------------------------------------------------------------ #
+    # Mantenimiento                                                        #
+    # ------------------------------------------------------------------ #
+
+    def reconstruir_actividad_contactos(self, conn=None):
+        """Recalcula el resumen de actividad por contacto desde Actividades."""
+        with get_writer() as escritor:
+            conn = conn or escritor
+            conn.execute("DELETE FROM ResumenActividadContacto")
+            conn.execute("DELETE FROM ResumenActividadContactoTipo")
+            for sentencia in _POBLAR_ACTIVIDAD:
+                conn.execute(sentencia)
+            conn.commit()
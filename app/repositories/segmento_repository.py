@@ -2,10 +2,26 @@
 
 from app.database.connection import get_connection
 from app.models.Segmento import Segmento
+from app.utils.mapeo import MapeadorFilas
 
 
 class SegmentoRepository:
 
+    # columna de la consulta -> argumento de Segmento; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Segmento, {
+        "segmento_id": "SegmentoID",
+        "nombre": "Nombre",
+        "descripcion": "Descripcion",
+        "tipo_entidad": "TipoEntidad",
+        "cantidad_registros": "CantidadRegistros",
+        "creado_por": "CreadoPor",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_modificacion": "FechaModificacion",
+        "nombre_creador": "NombreCreador",
+    }, opcionales=(
+        "NombreCreador",
+    ))
+
     def __init__(self):
         self._ensure_tables()
 
@@ -43,7 +59,8 @@ class SegmentoRepository:
 
     def find_all(self):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT s.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -52,11 +69,11 @@ class SegmentoRepository:
             ORDER BY s.Nombre
             """
         )
-        return [self._row_to_segmento(row) for row in cursor.fetchall()]
 
     def find_by_id(self, segmento_id):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             """
             SELECT s.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -66,8 +83,6 @@ class SegmentoRepository:
             """,
             (segmento_id,),
         )
-        row = cursor.fetchone()
-        return self._row_to_segmento(row) if row else None
 
     def create(self, segmento):
         conn = get_connection()
@@ -200,7 +215,8 @@ class SegmentoRepository:
 
     def find_all_by_tipo(self, tipo_entidad):
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT s.*,
                    (u.Nombre || ' ' || u.ApellidoPaterno) AS NombreCreador
@@ -211,7 +227,6 @@ class SegmentoRepository:
             """,
             (tipo_entidad,),
         )
-        return [self._row_to_segmento(row) for row in cursor.fetchall()]
 
     def get_segmentos_de_contacto(self, contacto_id):
         conn = get_connection()
@@ -240,23 +255,3 @@ class SegmentoRepository:
             (empresa_id,),
         )
         return [dict(row) for row in cursor.fetchall()]
-
-    @staticmethod
-    def _row_to_segmento(row):
-        def safe(key):
-            try:
-                return row[key]
-            except (KeyError, IndexError):
-                return None
-
-        return Segmento(
-            segmento_id=row["SegmentoID"],
-            nombre=row["Nombre"],
-            descripcion=row["Descripcion"],
-            tipo_entidad=row["TipoEntidad"],
-            cantidad_registros=row["CantidadRegistros"],
-            creado_por=row["CreadoPor"],
-            fecha_creacion=row["FechaCreacion"],
-            fecha_modificacion=row["FechaModificacion"],
-            nombre_creador=safe("NombreCreador"),
-        )
@@ -0,0 +1,141 @@
+# Repositorio de trabajos de envio - queries contra TrabajosEnvio
+
+from app.database.connection import get_connection
+from app.models.TrabajoEnvio import TrabajoEnvio
+from app.utils.mapeo import MapeadorFilas
+
+# estados que cierran el trabajo (se registra FechaFin)
+_ESTADOS_FINALES = ("Completado", "Cancelado", "Error")
+
+_SELECT = """
+    SELECT t.*, c.Nombre AS NombreCampana
+    FROM TrabajosEnvio t
+    LEFT JOIN Campanas c ON t.CampanaID = c.CampanaID
+"""
+
+
+class TrabajoEnvioRepository:
+
+    _MAPEO = MapeadorFilas(TrabajoEnvio, {
+        "trabajo_id": "TrabajoID",
+        "campana_id": "CampanaID",
+        "estado": "Estado",
+        "total_destinatarios": "TotalDestinatarios",
+        "enviados": "Enviados",
+        "fallidos": "Fallidos",
+        "ultimo_destinatario_id": "UltimoDestinatarioID",
+        "error": "Error",
+        "creado_por": "CreadoPor",
+        "fecha_creacion": "FechaCreacion",
+        "fecha_inicio": "FechaInicio",
+        "fecha_actualizacion": "FechaActualizacion",
+        "fecha_fin": "FechaFin",
+        "nombre_campana": "NombreCampana",
+    }, opcionales=("NombreCampana",))
+
+    def find_by_id(self, trabajo_id):
+        return self._MAPEO.consultar_uno(
+            get_connection(), _SELECT + " WHERE t.TrabajoID = ?", (trabajo_id,)
+        )
+
+    def find_vivo_por_campana(self, campana_id):
+        """El trabajo Pendiente, En Curso o Pausado de la campana (hay a lo mas uno)."""
+        return self._MAPEO.consultar_uno(
+            get_connection(),
+            _SELECT + " WHERE t.CampanaID = ? AND t.Estado IN ('Pendiente', 'En Curso', 'Pausado')",
+            (campana_id,),
+        )
+
+    def find_para_reanudar(self):
+        """Trabajos que quedaron por correr: encolados o cortados a la mitad."""
+        return self._MAPEO.consultar(
+            get_connection(),
+            _SELECT + " WHERE t.Estado IN ('Pendiente', 'En Curso') ORDER BY t.TrabajoID",
+        )
+
+    def create(self, campana_id, total_destinatarios, creado_por=None):
+        conn = get_connection()
+        cursor = conn.execute(
+            """
+            INSERT INTO TrabajosEnvio (CampanaID, TotalDestinatarios, CreadoPor)
+            VALUES (?, ?, ?)
+            """,
+            (campana_id, total_destinatarios, creado_por),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+    def contar_pendientes(self, campana_id):
+        conn = get_connection()
+        return conn.execute(
+            "SELECT COUNT(*) FROM CampanaDestinatarios WHERE CampanaID = ? AND EstadoEnvio = 'Pendiente'",
+            (campana_id,),
+        ).fetchone()[0]
+
+    def marcar_iniciado(self, trabajo_id):
+        conn = get_connection()
+        conn.execute(
+            """
+            UPDATE TrabajosEnvio SET
+                Estado = 'En Curso',
+                Error = NULL,
+                FechaInicio = COALESCE(FechaInicio, datetime('now', 'localtime')),
+                FechaActualizacion = datetime('now', 'localtime')
+            WHERE TrabajoID = ?
+            """,
+            (trabajo_id,),
+        )
+        conn.commit()
+
+    def guardar_avance(self, trabajo_id, enviados, fallidos, ultimo_destinatario_id):
+        """Punto de control: contadores acumulados y ultimo destinatario del lote."""
+        conn = get_connection()
+        conn.execute(
+            """
+            UPDATE TrabajosEnvio SET
+                Enviados = ?,
+                Fallidos = ?,
+                UltimoDestinatarioID = ?,
+                FechaActualizacion = datetime('now', 'localtime')
+            WHERE TrabajoID = ?
+            """,
+            (enviados, fallidos, ultimo_destinatario_id, trabajo_id),
+        )
+        conn.commit()
+
+    def update_estado(self, trabajo_id, estado, error=None):
+        conn = get_connection()
+        conn.execute(
+            """
+            UPDATE TrabajosEnvio SET
+                Estado = ?,
+                Error = ?,
+                FechaActualizacion = datetime('now', 'localtime'),
+                FechaFin = CASE WHEN ? THEN datetime('now', 'localtime') ELSE NULL END
+            WHERE TrabajoID = ?
+            """,
+            (estado, error, estado in _ESTADOS_FINALES, trabajo_id),
+        )
+        conn.commit()
+
+    def cambiar_estado(self, trabajo_id, desde, hacia):
+        """
+        Pasa el trabajo a `hacia` solo si esta en uno de los estados `desde`.
+
+        Returns:
+            bool: True si cambio (la comprobacion y el cambio son una sola sentencia).
+        """
+        conn = get_connection()
+        marcas = ", ".join("?" for _ in desde)
+        cursor = conn.execute(
+            f"""
+            UPDATE TrabajosEnvio SET
+                Estado = ?,
+                FechaActualizacion = datetime('now', 'localtime'),
+                FechaFin = CASE WHEN ? THEN datetime('now', 'localtime') ELSE NULL END
+            WHERE TrabajoID = ? AND Estado IN ({marcas})
+            """,
+            (hacia, hacia in _ESTADOS_FINALES, trabajo_id, *desde),
+        )
+        conn.commit()
+        return cursor.rowcount > 0
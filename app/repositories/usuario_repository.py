@@ -2,21 +2,41 @@
 
 from app.database.connection import get_connection
 from app.models.Usuario import Usuario
+from app.utils.mapeo import MapeadorFilas
 
 
 class UsuarioRepository:
 
+    # columna de la consulta -> argumento de Usuario; se compila una vez por consulta
+    _MAPEO = MapeadorFilas(Usuario, {
+        "usuario_id": "UsuarioID",
+        "nombre": "Nombre",
+        "apellido_paterno": "ApellidoPaterno",
+        "apellido_materno": "ApellidoMaterno",
+        "email": "Email",
+        "telefono": "Telefono",
+        "contrasena_hash": "ContrasenaHash",
+        "rol_id": "RolID",
+        "activo": "Activo",
+        "foto_perfil": "FotoPerfil",
+        "fecha_creacion": "FechaCreacion",
+        "ultimo_acceso": "UltimoAcceso",
+        "nombre_rol": "NombreRol",
+    }, opcionales=(
+        "NombreRol",
+    ), conversiones={
+        # si la consulta trae el rol pero es NULL se muestra "Sin rol"
+        "nombre_rol": lambda valor: valor if valor else "Sin rol",
+    })
+
     def find_by_email(self, email):
         # buscar usuario activo por email
         conn = get_connection()
-        cursor = conn.execute(
+        return self._MAPEO.consultar_uno(
+            conn,
             "SELECT * FROM Usuarios WHERE Email = ? AND Activo = 1",
             (email,),
         )
-        row = cursor.fetchone()
-        if row is None:
-            return None
-        return self._row_to_usuario(row)
 
     def update_ultimo_acceso(self, usuario_id, timestamp):
         conn = get_connection()
@@ -29,7 +49,9 @@ class UsuarioRepository:
     def find_all(self):
         # obtener todos los usuarios del sistema con información de su rol
         conn = get_connection()
-        cursor = conn.execute(
+        # convertir cada fila a un objeto Usuario (incluye nombre_rol automáticamente)
+        return self._MAPEO.consultar(
+            conn,
             """
             SELECT u.*, r.NombreRol
             FROM Usuarios u
@@ -37,9 +59,6 @@ class UsuarioRepository:
             ORDER BY u.FechaCreacion DESC
             """
         )
-        rows = cursor.fetchall()
-        # convertir cada fila a un objeto Usuario (incluye nombre_rol automáticamente)
-        return [self._row_to_usuario(row) for row in rows]
 
     def email_exists(self, email, excluir_id=None):
         # verificar si ya existe un usuario con este email
@@ -114,30 +133,3 @@ class UsuarioRepository:
             (contrasena_hash, usuario_id),
         )
         conn.commit()
-
-    @staticmethod
-    def _row_to_usuario(row):
-        # convertir el Row de sqlite a nuestro modelo Usuario
-        # intentar obtener el nombre del rol si está disponible en la consulta
-        nombre_rol = None
-        try:
-            nombre_rol = row["NombreRol"] if row["NombreRol"] else "Sin rol"
-        except (KeyError, IndexError):
-            # el campo NombreRol no está en el resultado de la consulta
-            nombre_rol = None
-
-        return Usuario(
-            usuario_id=row["UsuarioID"],
-            nombre=row["Nombre"],
-            apellido_paterno=row["ApellidoPaterno"],
-            apellido_materno=row["ApellidoMaterno"],
-            email=row["Email"],
-            telefono=row["Telefono"],
-            contrasena_hash=row["ContrasenaHash"],
-            rol_id=row["RolID"],
-            activo=row["Activo"],
-            foto_perfil=row["FotoPerfil"],
-            fecha_creacion=row["FechaCreacion"],
-            ultimo_acceso=row["UltimoAcceso"],
-            nombre_rol=nombre_rol,
-        )
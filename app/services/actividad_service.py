@@ -31,6 +31,18 @@ class ActividadService:
             AppLogger.log_exception(logger, "Error al obtener actividades")
             return None, sanitize_error_message(e)
 
+    def obtener_pagina(self, limit=50, token=None, filtros=None):
+        try:
+            logger.debug(f"Obteniendo pagina de actividades - limit: {limit}, filtros: {filtros}")
+            pagina = self._repo.find_page(limit=limit, token=token, filtros=filtros)
+            return pagina, None
+        except ValueError as e:
+            # token corrupto o filtro no permitido: el mensaje ya es legible
+            return None, str(e)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al obtener pagina de actividades")
+            return None, sanitize_error_message(e)
+
     def contar_total(self):
         try:
             total = self._repo.count_all()
@@ -0,0 +1,161 @@
+"""
+Servicio de busqueda global del CRM (contactos, empresas y notas).
+
+La busqueda usa el indice FTS5 BusquedaGlobal, que los triggers mantienen
+al dia en cada INSERT/UPDATE/DELETE. La ultima palabra escrita se busca
+como prefijo ("jose gonz" encuentra "José González"), sin distinguir
+mayusculas ni acentos, y los resultados de todas las entidades se ordenan
+juntos por relevancia (bm25), con los aciertos en el nombre primero.
+
+Las notas privadas solo aparecen para el usuario que las creo.
+
+Attributes:
+    logger: Logger configurado con filtrado automatico de datos sensibles.
+"""
+
+import re
+import unicodedata
+from app.repositories.busqueda_repository import BusquedaRepository, TIPOS
+from app.utils.logger import AppLogger
+from app.utils.db_retry import sanitize_error_message
+
+logger = AppLogger.get_logger(__name__)
+
+# Limites para que una busqueda nunca recorra el indice completo
+MAX_TERMINOS = 8
+MAX_RESULTADOS = 200
+ANCHO_FRAGMENTO = 80
+
+_CODIGO_TIPO = {nombre: codigo for codigo, nombre in TIPOS.items()}
+
+
+def _terminos(texto):
+    return re.findall(r"\w+", texto or "")[:MAX_TERMINOS]
+
+
+def _sin_acentos(texto):
+    # un caracter de salida por cada caracter de entrada, para que las
+    # posiciones encontradas sirvan sobre el texto original
+    return "".join(unicodedata.normalize("NFKD", ch)[0].lower() for ch in texto)
+
+
+def generar_fragmento(texto, terminos, ancho=ANCHO_FRAGMENTO):
+    """
+    Recorta el texto alrededor del primer termino encontrado y marca las
+    palabras que coinciden con [ ], igual que lo haria snippet() de FTS5
+    (prefijo, sin mayusculas ni acentos).
+
+    Returns:
+        str: fragmento, o "" si ningun termino aparece en el texto.
+    """
+    if not texto or not terminos:
+        return ""
+    normal = _sin_acentos(texto)
+    patron = re.compile(
+        r"\b(?:" + "|".join(re.escape(_sin_acentos(t)) for t in terminos) + r")\w*"
+    )
+    primero = patron.search(normal)
+    if primero is None:
+        return ""
+
+    inicio = max(0, primero.start() - ancho // 4)
+    fin = min(len(texto), inicio + ancho)
+    partes, ultimo = [], inicio
+    for m in patron.finditer(normal, inicio):
+        if m.start() >= fin:
+            break
+        fin = max(fin, m.end())  # no cortar una palabra marcada
+        partes.append(texto[ultimo:m.start()])
+        partes.append(f"[{texto[m.start():m.end()]}]")
+        ultimo = m.end()
+    partes.append(texto[ultimo:fin])
+    fragmento = " ".join("".join(partes).split())
+    return ("..." if inicio > 0 else "") + fragmento + ("..." if fin < len(texto) else "")
+
+
+def construir_consulta_fts(texto):
+    """
+    Convierte el texto del usuario en una consulta FTS5 segura.
+
+    Solo se conservan las palabras (letras y numeros); cada una va entre
+    comillas para que la sintaxis de FTS5 (AND, NEAR, *, ^...) escrita por
+    el usuario se trate como texto. Solo la ultima palabra (la que se esta
+    escribiendo) se busca como prefijo, y solo si tiene 2+ caracteres: un
+    prefijo sin indice propio (prefix = '2 3') junta en memoria todos los
+    terminos que empiezan igual ("empresa" -> cada "empresa4242" de los
+    emails), y una sola letra recorreria medio indice.
+
+    Returns:
+        str: consulta para MATCH, o "" si no hay nada que buscar.
+    """
+    terminos = _terminos(texto)
+    citados = [f'"{t}"' for t in terminos]
+    if terminos and len(terminos[-1]) > 1:
+        citados[-1] += "*"
+    return " ".join(citados)
+
+
+class BusquedaService:
+
+    def __init__(self):
+        self._repo = BusquedaRepository()
+
+    def buscar(self, texto, usuario_id=None, tipos=None, limit=20):
+        """
+        Busca en contactos, empresas y notas.
+
+        Args:
+            texto:      lo que escribio el usuario.
+            usuario_id: usuario actual (para incluir sus notas privadas).
+            tipos:      nombres de TIPOS a incluir; None = todos.
+            limit:      maximo de resultados (1..MAX_RESULTADOS).
+
+        Returns:
+            tuple: (lista de dicts ordenada por relevancia, None) o (None, error)
+        """
+        consulta = construir_consulta_fts(texto)
+        if not consulta:
+            return [], None
+
+        try:
+            codigos = [_CODIGO_TIPO[t] for t in tipos] if tipos else None
+        except KeyError as e:
+            return None, f"Tipo de busqueda no permitido: {e.args[0]}"
+
+        limit = max(1, min(int(limit), MAX_RESULTADOS))
+        try:
+            logger.debug(f"Busqueda global - consulta: {consulta}, tipos: {tipos}")
+            resultados = self._repo.buscar(consulta, usuario_id=usuario_id, tipos=codigos, limit=limit)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error en busqueda global")
+            return None, sanitize_error_message(e)
+
+        terminos = _terminos(texto)
+        for resultado in resultados:
+            contenido = resultado.pop("contenido")
+            resultado["fragmento"] = (
+                generar_fragmento(contenido, terminos)
+                or generar_fragmento(resultado["detalle"], terminos)
+            )
+        return resultados, None
+
+    def reconstruir_indice(self):
+        """Vuelve a llenar el indice desde las tablas. Devuelve (total, error)."""
+        try:
+            logger.info("Reconstruyendo indice de busqueda")
+            total = self._repo.reconstruir()
+            self._repo.optimizar()
+            logger.info(f"Indice de busqueda reconstruido: {total} registros")
+            return total, None
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al reconstruir indice de busqueda")
+            return None, sanitize_error_message(e)
+
+    def optimizar_indice(self):
+        """Fusiona los segmentos del indice. Devuelve (True, error)."""
+        try:
+            self._repo.optimizar()
+            return True, None
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al optimizar indice de busqueda")
+            return None, sanitize_error_message(e)
@@ -7,12 +7,21 @@ Validaciones:
     - ConfiguracionCorreo: nombre y email_remitente requeridos
 """
 
+import time
+from functools import partial
+
 from app.repositories.plantilla_repository import PlantillaRepository
 from app.repositories.campana_repository import CampanaRepository
 from app.repositories.config_correo_repository import ConfigCorreoRepository
 from app.models.Plantilla import Plantilla
 from app.models.Campana import Campana
 from app.models.ConfiguracionCorreo import ConfiguracionCorreo
+from app.config.settings import (
+    ENVIO_ESCRITURA_FILAS, ENVIO_ESCRITURA_MS, SMTP_MENSAJES_POR_SEGUNDO, SMTP_SESIONES,
+)
+from app.database.connection import transaction
+from app.utils.combinacion_correo import CAMPOS, PlantillaCompilada, campos_desconocidos
+from app.utils.envio_smtp import MensajeSmtp, PoolSmtp
 from app.utils.logger import AppLogger
 from app.utils.db_retry import sanitize_error_message
 
@@ -23,6 +32,112 @@ _TIPOS_CAMPANA = ("Email", "Newsletter", "Promocional", "Transaccional", "Seguim
 _PROVEEDORES_CORREO = ("Gmail", "Outlook", "SMTP", "SendGrid", "Mailgun", "Yahoo", "Otro")
 
 
+class EnvioCampana:
+    """
+    Campaña lista para enviarse: plantilla compilada, configuración SMTP y
+    remitente. La arma CampanaService.preparar_envio().
+    """
+
+    __slots__ = ("campana", "plantilla", "config", "compilada")
+
+    def __init__(self, campana, plantilla, config):
+        self.campana = campana
+        self.plantilla = plantilla
+        self.config = config
+        from_name = config.nombre_remitente or config.email_remitente
+        # una sola vez por campana: el esqueleto MIME queda codificado
+        self.compilada = PlantillaCompilada(plantilla, f"{from_name} <{config.email_remitente}>")
+
+    def mensajes(self, destinatarios):
+        """
+        Un MensajeSmtp por destinatario (dict de tomar_pendientes: DestinatarioID,
+        EmailDestino y los campos de la plantilla).
+        """
+        remitente = self.config.email_remitente
+        renderizar = self.compilada.renderizar
+        for dest in destinatarios:
+            yield MensajeSmtp(
+                dest["DestinatarioID"], remitente, dest["EmailDestino"], partial(renderizar, dest),
+            )
+
+    def enviar(self, destinatarios, al_resultado, cancelado=None):
+        """
+        Envía a los destinatarios por el pool de sesiones SMTP.
+
+        Returns:
+            str | None: error de conexión si quedaron correos sin enviar.
+        """
+        pool = PoolSmtp(self.config, sesiones=SMTP_SESIONES, por_segundo=SMTP_MENSAJES_POR_SEGUNDO)
+        return pool.enviar(self.mensajes(destinatarios), al_resultado=al_resultado, cancelado=cancelado)
+
+
+class EscritorEstados:
+    """
+    Guarda el estado de los destinatarios en bloque mientras se envia.
+
+    Junta los ResultadoEnvio y los escribe con un executemany, en una
+    transaccion, cada `cada` resultados o cada `cada_ms` milisegundos (lo que
+    pase primero). Lleva los contadores en memoria, asi que al terminar no
+    hay que recontar CampanaDestinatarios.
+
+    al_vaciar(enviados, fallidos), si se da, corre en la misma transaccion
+    que cada escritura (p. ej. el punto de control de un trabajo de envio).
+
+    No es seguro entre hilos: PoolSmtp entrega los resultados en el hilo que
+    llama a enviar(), que es el que usa el escritor.
+    """
+
+    def __init__(self, campana_repo, campana_id, enviados=0, fallidos=0, al_vaciar=None,
+                 cada=ENVIO_ESCRITURA_FILAS, cada_ms=ENVIO_ESCRITURA_MS, reloj=time.monotonic):
+        self._repo = campana_repo
+        self._campana_id = campana_id
+        self._al_vaciar = al_vaciar
+        self._cada = max(1, cada)
+        self._cada_s = cada_ms / 1000
+        self._reloj = reloj
+        self._cambios = []
+        self._desde = reloj()
+        self.enviados = enviados
+        self.fallidos = fallidos
+
+    @property
+    def procesados(self):
+        return self.enviados + self.fallidos
+
+    @property
+    def en_espera(self):
+        """Resultados que aun no se escriben."""
+        return len(self._cambios)
+
+    def agregar(self, resultado):
+        """Callback al_resultado de EnvioCampana.enviar()."""
+        if resultado.enviado:
+            self.enviados += 1
+            self._cambios.append(("Enviado", resultado.clave))
+            logger.debug(
+                f"Correo enviado a {resultado.destino} "
+                f"(destinatario {resultado.clave}, campaña {self._campana_id})"
+            )
+        else:
+            self.fallidos += 1
+            self._cambios.append(("Fallido", resultado.clave))
+        if len(self._cambios) >= self._cada or self._reloj() - self._desde >= self._cada_s:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe los resultados en espera (y corre al_vaciar aunque no haya)."""
+        cambios, self._cambios = self._cambios, []
+        self._desde = self._reloj()
+        if self._al_vaciar is None:
+            if cambios:
+                self._repo.marcar_estados(self._campana_id, cambios)
+            return
+        with transaction():
+            if cambios:
+                self._repo.marcar_estados(self._campana_id, cambios)
+            self._al_vaciar(self.enviados, self.fallidos)
+
+
 class CampanaService:
 
     def __init__(self):
@@ -124,6 +239,16 @@ class CampanaService:
         if len(asunto) > 255:
             return "El asunto no puede exceder 255 caracteres"
 
+        desconocidos = campos_desconocidos(
+            asunto, datos.get("contenido_html", ""), datos.get("contenido_texto", ""),
+        )
+        if desconocidos:
+            disponibles = ", ".join("{{" + c + "}}" for c in CAMPOS)
+            return (
+                "Campo desconocido en la plantilla: {{" + desconocidos[0] + "}}.\n"
+                f"Campos disponibles: {disponibles}"
+            )
+
         return None
 
     # ==========================================
@@ -236,14 +361,25 @@ class CampanaService:
             return False, sanitize_error_message(e)
 
     def cargar_desde_segmento(self, campana_id, segmento_id):
+        """
+        Agrega los contactos del segmento que se pueden contactar.
+
+        Returns: ((insertados: int, omitidos: int), error_message: str | None)
+        """
         try:
-            n = self._campana_repo.cargar_destinatarios_desde_segmento(campana_id, segmento_id)
-            self._actualizar_total_destinatarios(campana_id)
-            logger.info(f"Cargados {n} destinatarios del segmento {segmento_id} a campana {campana_id}")
-            return n, None
+            # el conteo del segmento y la insercion ven los mismos datos
+            with transaction():
+                insertados, omitidos = self._campana_repo.cargar_destinatarios_desde_segmento(
+                    campana_id, segmento_id
+                )
+            logger.info(
+                f"Cargados {insertados} destinatarios del segmento {segmento_id} a campana {campana_id} "
+                f"({omitidos} omitidos)"
+            )
+            return (insertados, omitidos), None
         except Exception as e:
             AppLogger.log_exception(logger, f"Error al cargar destinatarios desde segmento")
-            return 0, sanitize_error_message(e)
+            return (0, 0), sanitize_error_message(e)
 
     def eliminar_destinatario(self, destinatario_id, campana_id):
         try:
@@ -400,109 +536,76 @@ class CampanaService:
     # ENVIO DE CORREOS
     # ==========================================
 
-    def enviar_campana(self, campana_id):
-        """
-        Envía los correos pendientes de la campaña usando la configuración activa.
-        Returns: (enviados: int, fallidos: int, error_message: str | None)
+    def preparar_envio(self, campana_id):
         """
-        import smtplib
-        from email.mime.multipart import MIMEMultipart
-        from email.mime.text import MIMEText
+        Valida que la campaña se pueda enviar y reúne lo necesario.
 
+        Returns: (EnvioCampana | None, error_message: str | None)
+        """
         campana = self._campana_repo.find_by_id(campana_id)
         if not campana:
-            return 0, 0, "Campaña no encontrada"
+            return None, "Campaña no encontrada"
 
         if not campana.plantilla_id:
-            return 0, 0, "La campaña no tiene una plantilla de correo asignada"
+            return None, "La campaña no tiene una plantilla de correo asignada"
 
         plantilla = self._plantilla_repo.find_by_id(campana.plantilla_id)
         if not plantilla:
-            return 0, 0, "La plantilla asignada no existe en la base de datos"
+            return None, "La plantilla asignada no existe en la base de datos"
 
         config = self._config_repo.find_activa()
         if not config:
-            return 0, 0, (
+            return None, (
                 "No hay una configuración de correo activa.\n"
                 "Ve a la pestaña 'Config. Correo' y activa una configuración SMTP."
             )
         if not config.host:
-            return 0, 0, "La configuración activa no tiene un servidor (host) SMTP configurado"
+            return None, "La configuración activa no tiene un servidor (host) SMTP configurado"
 
-        destinatarios = self._campana_repo.get_destinatarios(campana_id)
-        pendientes = [d for d in destinatarios if d.get("EstadoEnvio") == "Pendiente"]
+        return EnvioCampana(campana, plantilla, config), None
 
-        if not pendientes:
-            return 0, 0, "No hay destinatarios con estado 'Pendiente' en esta campaña"
+    def enviar_campana(self, campana_id):
+        """
+        Envía los correos pendientes de la campaña usando la configuración activa.
 
-        enviados = 0
-        fallidos = 0
-        conn_error = None
+        Los correos salen por varias sesiones SMTP en paralelo (PoolSmtp, ver
+        SMTP_SESIONES y SMTP_MENSAJES_POR_SEGUNDO); el estado de los
+        destinatarios se guarda en bloque con EscritorEstados.
 
-        try:
-            if config.usar_ssl:
-                smtp = smtplib.SMTP_SSL(config.host, config.puerto, timeout=15)
-            else:
-                smtp = smtplib.SMTP(config.host, config.puerto, timeout=15)
-                if config.usar_tls:
-                    smtp.starttls()
-
-            if config.usuario and config.contrasena:
-                smtp.login(config.usuario, config.contrasena)
-
-            from_addr = config.email_remitente
-            from_name = config.nombre_remitente or from_addr
-            from_header = f"{from_name} <{from_addr}>"
-
-            for dest in pendientes:
-                try:
-                    msg = MIMEMultipart("alternative")
-                    msg["Subject"] = plantilla.asunto
-                    msg["From"] = from_header
-                    msg["To"] = dest["EmailDestino"]
-
-                    if plantilla.contenido_texto:
-                        msg.attach(MIMEText(plantilla.contenido_texto, "plain", "utf-8"))
-                    if plantilla.contenido_html:
-                        msg.attach(MIMEText(plantilla.contenido_html, "html", "utf-8"))
-
-                    smtp.sendmail(from_addr, [dest["EmailDestino"]], msg.as_string())
-                    self._campana_repo.marcar_enviado(dest["DestinatarioID"])
-                    enviados += 1
-                    logger.info(
-                        f"Correo enviado a {dest['EmailDestino']} "
-                        f"(destinatario {dest['DestinatarioID']}, campaña {campana_id})"
-                    )
-                except Exception as e:
-                    self._campana_repo.marcar_fallido(dest["DestinatarioID"])
-                    fallidos += 1
-                    logger.error(
-                        f"Error enviando a {dest['EmailDestino']}: {e}"
-                    )
-
-            smtp.quit()
+        Returns: (enviados: int, fallidos: int, error_message: str | None)
+        """
+        envio, error = self.preparar_envio(campana_id)
+        if error:
+            return 0, 0, error
 
-        except Exception as e:
-            conn_error = sanitize_error_message(e)
-            logger.error(f"Error de conexión SMTP para campaña {campana_id}: {e}")
-            return enviados, fallidos, f"Error de conexión SMTP: {conn_error}"
+        pendientes = self._campana_repo.tomar_pendientes(campana_id)
 
-        # Sincronizar TotalDestinatarios y TotalEnviados con el conteo real en BD
-        self._campana_repo.sincronizar_metricas(campana_id)
+        if not pendientes:
+            return 0, 0, "No hay destinatarios con estado 'Pendiente' en esta campaña"
 
-        # Determinar nuevo estado según los pendientes restantes
-        todos_dest = self._campana_repo.get_destinatarios(campana_id)
-        aun_pendientes = sum(1 for d in todos_dest if d.get("EstadoEnvio") == "Pendiente")
-        total_enviados_real = sum(1 for d in todos_dest if d.get("EstadoEnvio") == "Enviado")
+        escritor = self.escritor_estados(campana_id)
+        try:
+            conn_error = envio.enviar(pendientes, escritor.agregar)
+        finally:
+            escritor.vaciar()
+        enviados, fallidos = escritor.enviados, escritor.fallidos
 
-        if aun_pendientes == 0 and total_enviados_real > 0:
-            self._campana_repo.update_estado(campana_id, "Completada")
-        elif enviados > 0:
-            self._campana_repo.update_estado(campana_id, "En Progreso")
+        if conn_error:
+            logger.error(f"Error de conexión SMTP para campaña {campana_id}: {conn_error}")
+            return enviados, fallidos, f"Error de conexión SMTP: {conn_error}"
 
+        self.cerrar_envio(campana_id, enviados)
         logger.info(f"Campaña {campana_id} enviada: {enviados} exitosos, {fallidos} fallidos")
         return enviados, fallidos, None
 
+    def escritor_estados(self, campana_id, enviados=0, fallidos=0, al_vaciar=None):
+        """EscritorEstados de la campaña, con los contadores ya acumulados."""
+        return EscritorEstados(self._campana_repo, campana_id, enviados, fallidos, al_vaciar)
+
+    def cerrar_envio(self, campana_id, enviados):
+        """Deja la campaña Completada o En Progreso después de enviar."""
+        self._campana_repo.cerrar_envio(campana_id, enviados)
+
     @property
     def tipos_campana(self):
         return _TIPOS_CAMPANA
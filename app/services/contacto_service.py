@@ -59,6 +59,37 @@ class ContactoService:
             AppLogger.log_exception(logger, "Error al obtener contactos")
             return None, sanitize_error_message(e)
 
+    def obtener_pagina(self, limit=50, token=None, filtros=None, orden="fecha", descendente=True):
+        """
+        Obtiene una pagina de contactos con paginacion por cursor.
+
+        A diferencia de limit/offset, el costo es el mismo en la primera
+        pagina que en la pagina 10000.
+
+        Args:
+            limit (int, opcional): Registros por pagina (default 50)
+            token (str, opcional): Pagina.siguiente o Pagina.anterior de una
+                consulta previa; None para la primera pagina
+            filtros (dict, opcional): Filtros por columna y "texto" (LIKE)
+            orden (str, opcional): Clave de ordenamiento (default "fecha")
+            descendente (bool, opcional): Direccion del ordenamiento
+
+        Returns:
+            tuple: (Pagina|None, str|None)
+        """
+        try:
+            logger.debug(f"Obteniendo pagina de contactos - limit: {limit}, filtros: {filtros}")
+            pagina = self._repo.find_page(
+                limit=limit, token=token, filtros=filtros, orden=orden, descendente=descendente
+            )
+            return pagina, None
+        except ValueError as e:
+            # token corrupto o filtro no permitido: el mensaje ya es legible
+            return None, str(e)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al obtener pagina de contactos")
+            return None, sanitize_error_message(e)
+
     def contar_total(self):
         """Cuenta el total de contactos para paginacion."""
         # cuenta total de contactos para paginacion
@@ -70,6 +101,19 @@ class ContactoService:
             AppLogger.log_exception(logger, "Error al contar contactos")
             return None, sanitize_error_message(e)
 
+    def contar_resumen(self):
+        """
+        Cuenta el total de contactos y cuantos estan activos.
+
+        Returns:
+            tuple: ((int, int)|None, str|None) - ((total, activos), error)
+        """
+        try:
+            return self._repo.count_resumen(), None
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al contar contactos por estado")
+            return None, sanitize_error_message(e)
+
     def obtener_por_id(self, contacto_id):
         """Obtiene un contacto por su ID."""
         try:
@@ -13,6 +13,7 @@ IVA: 16% aplicado sobre subtotal.
 
 import re
 import datetime
+from app.database.connection import transaction
 from app.repositories.cotizacion_repository import CotizacionRepository
 from app.repositories.cotizacion_detalle_repository import CotizacionDetalleRepository
 from app.models.Cotizacion import Cotizacion
@@ -39,6 +40,18 @@ class CotizacionService:
             AppLogger.log_exception(logger, "Error al obtener cotizaciones")
             return None, sanitize_error_message(e)
 
+    def obtener_pagina(self, limit=50, token=None, filtros=None):
+        try:
+            logger.debug(f"Obteniendo pagina de cotizaciones - limit: {limit}, filtros: {filtros}")
+            pagina = self._repo.find_page(limit=limit, token=token, filtros=filtros)
+            return pagina, None
+        except ValueError as e:
+            # token corrupto o filtro no permitido: el mensaje ya es legible
+            return None, str(e)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al obtener pagina de cotizaciones")
+            return None, sanitize_error_message(e)
+
     def contar_total(self):
         try:
             return self._repo.count_all(), None
@@ -91,10 +104,12 @@ class CotizacionService:
 
         try:
             logger.info(f"Creando cotizacion '{numero}' por usuario {usuario_id}")
-            cid = self._repo.create(nueva)
-            nueva.cotizacion_id = cid
-            if items_detalle:
-                self._detalle_repo.create_many(cid, items_detalle)
+            # encabezado y partidas se confirman juntos o no se guarda nada
+            with transaction():
+                cid = self._repo.create(nueva)
+                nueva.cotizacion_id = cid
+                if items_detalle:
+                    self._detalle_repo.create_many(cid, items_detalle)
             logger.info(f"Cotizacion {cid} creada exitosamente")
             return nueva, None
         except Exception as e:
@@ -130,10 +145,11 @@ class CotizacionService:
 
         try:
             logger.info(f"Actualizando cotizacion {cotizacion_id}: '{numero}'")
-            self._repo.update(cotizacion)
-            self._detalle_repo.delete_by_cotizacion(cotizacion_id)
-            if items_detalle:
-                self._detalle_repo.create_many(cotizacion_id, items_detalle)
+            with transaction():
+                self._repo.update(cotizacion)
+                self._detalle_repo.delete_by_cotizacion(cotizacion_id)
+                if items_detalle:
+                    self._detalle_repo.create_many(cotizacion_id, items_detalle)
             logger.info(f"Cotizacion {cotizacion_id} actualizada exitosamente")
             return cotizacion, None
         except Exception as e:
@@ -0,0 +1,145 @@
+"""
+Servicio del dashboard: lee todos los paneles en una sola foto de la BD.
+
+Responsabilidades:
+    - Consultar KPIs, pipeline, estado de oportunidades, actividades recientes
+      y recordatorios dentro de una misma transaccion de lectura, para que los
+      paneles no se contradigan si otro hilo escribe a mitad de la carga.
+    - Entregar el resultado como un SnapshotDashboard inmutable, con una
+      huella por panel: la vista compara huellas y no vuelve a pintar un
+      panel cuyos datos no cambiaron.
+    - Avisar panel por panel (al_panel) para que la vista pinte cada uno en
+      cuanto llega, sin esperar a los demas.
+
+Se llama desde un hilo del ejecutor de tareas: nada aqui toca widgets.
+"""
+
+import hashlib
+import sqlite3
+from types import MappingProxyType
+
+from app.database.connection import read_transaction
+from app.repositories.dashboard_repository import DashboardRepository
+from app.utils.logger import AppLogger
+from app.utils.db_retry import sanitize_error_message
+
+logger = AppLogger.get_logger(__name__)
+
+# orden en que se leen (y se pintan) los paneles: primero lo que se ve arriba
+PANELES = ("kpis", "pipeline", "oportunidades", "actividades", "recordatorios")
+
+
+def _congelar(valor):
+    # filas y dicts -> mappingproxy (solo lectura); listas -> tuplas
+    if isinstance(valor, (sqlite3.Row, dict)):
+        return MappingProxyType(dict(valor))
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    return valor
+
+
+def _huella(datos):
+    # repr de datos congelados es estable (mappingproxy muestra su contenido)
+    return hashlib.blake2b(repr(datos).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class PanelDashboard:
+    """
+    Datos de un panel, de solo lectura.
+
+    Atributos:
+        nombre: clave del panel (ver PANELES).
+        datos:  filas como mappingproxy (acceso por columna) dentro de tuplas.
+        huella: resumen de datos; igual huella = mismos datos.
+    """
+
+    __slots__ = ("nombre", "datos", "huella")
+
+    def __init__(self, nombre, datos):
+        datos = _congelar(datos)
+        object.__setattr__(self, "nombre", nombre)
+        object.__setattr__(self, "datos", datos)
+        object.__setattr__(self, "huella", _huella(datos))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("PanelDashboard es de solo lectura")
+
+    def __repr__(self):
+        return f"<PanelDashboard(nombre='{self.nombre}', huella='{self.huella[:8]}')>"
+
+
+class SnapshotDashboard:
+    """
+    Todos los paneles leidos en la misma transaccion. Un panel cuya consulta
+    fallo no aparece (la vista conserva lo que ya mostraba).
+    """
+
+    __slots__ = ("_paneles",)
+
+    def __init__(self, paneles):
+        object.__setattr__(self, "_paneles", MappingProxyType(dict(paneles)))
+
+    def __setattr__(self, nombre, valor):
+        raise AttributeError("SnapshotDashboard es de solo lectura")
+
+    def __getitem__(self, nombre):
+        return self._paneles[nombre]
+
+    def __contains__(self, nombre):
+        return nombre in self._paneles
+
+    def __iter__(self):
+        return iter(self._paneles.values())
+
+    def __len__(self):
+        return len(self._paneles)
+
+    @property
+    def huellas(self):
+        return {nombre: panel.huella for nombre, panel in self._paneles.items()}
+
+
+class DashboardService:
+
+    def __init__(self):
+        self._repo = DashboardRepository()
+
+    def obtener_snapshot(self, usuario_id, al_panel=None):
+        """
+        Lee todos los paneles en una transaccion de lectura.
+
+        Args:
+            usuario_id: dueno de los recordatorios que se muestran.
+            al_panel:   callback(PanelDashboard) llamado en este hilo en cuanto
+                        cada panel esta listo (la vista pasa el emit de una
+                        senal para recibirlo en el hilo de la GUI).
+
+        Returns:
+            tuple: (SnapshotDashboard, None) o (None, mensaje) si no se pudo
+            abrir la lectura. Si falla un solo panel se omite y los demas se
+            entregan igual.
+        """
+        consultas = {
+            "kpis":          (self._repo.get_kpis, ()),
+            "pipeline":      (self._repo.get_pipeline_por_etapa, ()),
+            "oportunidades": (self._repo.get_oportunidades_estado, ()),
+            "actividades":   (self._repo.get_actividades_recientes, ()),
+            "recordatorios": (self._repo.get_recordatorios_proximos, (usuario_id,)),
+        }
+        paneles = {}
+        try:
+            with read_transaction() as conn:
+                for nombre in PANELES:
+                    consulta, args = consultas[nombre]
+                    try:
+                        panel = PanelDashboard(nombre, consulta(*args, conn=conn))
+                    except Exception:
+                        AppLogger.log_exception(logger, f"Error al leer el panel '{nombre}' del dashboard")
+                        continue
+                    paneles[nombre] = panel
+                    if al_panel is not None:
+                        al_panel(panel)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al leer el dashboard")
+            return None, sanitize_error_message(e)
+        return SnapshotDashboard(paneles), None
@@ -0,0 +1,492 @@
+"""
+Servicio de importacion masiva de contactos y empresas desde CSV o XLSX.
+
+ContactoService.crear_contacto y EmpresaService.crear_empresa estan pensados
+para el formulario: una fila, varias consultas de verificacion y un COMMIT.
+Para 100 000 filas eso son cientos de miles de consultas y otros tantos
+fsync. La importacion trabaja distinto:
+
+    1. El archivo se lee en streaming (LectorTabular): nunca esta completo
+       en memoria.
+    2. Antes de empezar se cargan una sola vez los mapas nombre -> ID de los
+       catalogos (CatalogCache) y los emails/RFC ya registrados. Validar una
+       fila no toca la BD.
+    3. Las filas validas se acumulan en lotes de TAMANO_LOTE y cada lote se
+       inserta con un executemany dentro de una transaccion (un COMMIT por
+       lote).
+    4. Las filas invalidas no detienen la importacion: se copian a un archivo
+       de rechazos (CSV) con el numero de fila y el motivo, para corregirlas
+       y volver a importarlas.
+
+Columnas:
+    Los encabezados se comparan sin mayusculas, acentos ni espacios
+    ("Apellido Paterno" = "apellido_paterno"), con algunos sinonimos comunes
+    ("Correo" = email, "CP" = codigo_postal). Los catalogos se escriben por
+    nombre (Industria = "Tecnologia", Ciudad = "Monterrey") y el propietario
+    con el nombre del usuario como aparece en los ComboBox.
+    Las columnas que no se reconocen se ignoran.
+
+Las validaciones son las mismas del formulario; ademas se rechazan emails
+(contactos) y RFC (empresas) ya registrados o repetidos dentro del archivo.
+
+Attributes:
+    logger: Logger configurado con filtrado automatico de datos sensibles.
+"""
+
+import csv
+import os
+import re
+import time
+import unicodedata
+from app.database.connection import transaction
+from app.models.Contacto import Contacto
+from app.models.Empresa import Empresa
+from app.repositories.contacto_repository import ContactoRepository
+from app.repositories.empresa_repository import EmpresaRepository
+from app.utils.catalog_cache import CatalogCache
+from app.utils.lector_tabular import LectorTabular
+from app.utils.sanitizer import Sanitizer
+from app.utils.validators import Validator
+from app.utils.logger import AppLogger
+from app.utils.db_retry import sanitize_error_message
+
+logger = AppLogger.get_logger(__name__)
+
+# Filas por transaccion (y cada cuantas filas leidas se reporta el avance)
+TAMANO_LOTE = 2000
+
+_RFC_PATTERN = re.compile(r"^[A-Za-z0-9]{12,13}$")
+_FECHA_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# Campos que entiende cada importacion, en el orden de la plantilla
+CAMPOS_CONTACTO = (
+    "nombre", "apellido_paterno", "apellido_materno", "email", "email_secundario",
+    "telefono_oficina", "telefono_celular", "puesto", "departamento", "empresa",
+    "direccion", "ciudad", "codigo_postal", "fecha_nacimiento", "linkedin_url",
+    "origen", "propietario",
+)
+CAMPOS_EMPRESA = (
+    "razon_social", "nombre_comercial", "rfc", "industria", "tamano", "sitio_web",
+    "telefono", "email", "direccion", "ciudad", "codigo_postal",
+    "ingreso_anual_estimado", "moneda", "num_empleados", "descripcion",
+    "origen", "propietario",
+)
+
+# Encabezado normalizado -> campo, para los nombres alternativos mas comunes
+_SINONIMOS = {
+    "correo": "email",
+    "correo_electronico": "email",
+    "e_mail": "email",
+    "correo_secundario": "email_secundario",
+    "celular": "telefono_celular",
+    "movil": "telefono_celular",
+    "telefono_movil": "telefono_celular",
+    "cp": "codigo_postal",
+    "linkedin": "linkedin_url",
+    "empresa_razon_social": "empresa",
+    "tamano_empresa": "tamano",
+    "pagina_web": "sitio_web",
+    "web": "sitio_web",
+    "ingreso_anual": "ingreso_anual_estimado",
+    "empleados": "num_empleados",
+    "numero_empleados": "num_empleados",
+}
+
+
+def normalizar(texto):
+    """Minusculas, sin acentos y con espacios colapsados ("  José  Ruíz" -> "jose ruiz")."""
+    if texto.isascii():
+        return " ".join(texto.lower().split())
+    sin_acentos = unicodedata.normalize("NFKD", texto)
+    sin_acentos = "".join(c for c in sin_acentos if not unicodedata.combining(c))
+    return " ".join(sin_acentos.casefold().split())
+
+
+def _clave_encabezado(encabezado):
+    clave = re.sub(r"[^a-z0-9]+", "_", normalizar(encabezado)).strip("_")
+    return _SINONIMOS.get(clave, clave)
+
+
+def _mapa_nombres(pares):
+    # nombre normalizado -> ID; un nombre repetido queda como ambiguo (None)
+    mapa = {}
+    for id_value, nombre in pares:
+        clave = normalizar(nombre or "")
+        mapa[clave] = None if clave in mapa else id_value
+    return mapa
+
+
+# marcadores de _catalogo: texto aun no buscado / nombre que no esta en el catalogo
+_SIN_RESOLVER = object()
+_NO_EXISTE = object()
+
+
+class _Rechazo(Exception):
+    """La fila no es valida; el mensaje es el motivo que va al archivo de rechazos."""
+
+
+class ResumenImportacion:
+    """
+    Resultado de una importacion.
+
+    Atributos:
+        procesadas:    filas con datos leidas del archivo.
+        insertadas:    filas guardadas en la BD.
+        rechazadas:    filas que no pasaron la validacion.
+        ruta_rechazos: archivo con las filas rechazadas, o None si no hubo.
+        segundos:      duracion total.
+    """
+
+    def __init__(self):
+        self.procesadas = 0
+        self.insertadas = 0
+        self.rechazadas = 0
+        self.ruta_rechazos = None
+        self.segundos = 0.0
+
+    def __repr__(self):
+        return (
+            f"<ResumenImportacion procesadas={self.procesadas} "
+            f"insertadas={self.insertadas} rechazadas={self.rechazadas}>"
+        )
+
+
+class _ArchivoRechazos:
+    """CSV de filas rechazadas; solo se crea si hay al menos una."""
+
+    def __init__(self, ruta, encabezados):
+        self.ruta = ruta
+        self._encabezados = encabezados
+        self._archivo = None
+        self._writer = None
+
+    @property
+    def usado(self):
+        return self._writer is not None
+
+    def escribir(self, numero, motivo, valores):
+        if self._writer is None:
+            # utf-8-sig: Excel abre el archivo con los acentos correctos
+            self._archivo = open(self.ruta, "w", encoding="utf-8-sig", newline="")
+            self._writer = csv.writer(self._archivo)
+            self._writer.writerow(["Fila", "Motivo"] + list(self._encabezados))
+        self._writer.writerow([numero, motivo] + list(valores))
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+class ImportacionService:
+    """
+    Servicio de importacion masiva de contactos y empresas.
+
+    Pensado para correr en segundo plano (EjecutorTareas, no interrumpible):
+    el avance se informa con el callback al_progreso, que se llama desde el
+    hilo de trabajo.
+    """
+
+    def __init__(self):
+        """Inicializa el servicio de importacion."""
+        self._contacto_repo = ContactoRepository()
+        self._empresa_repo = EmpresaRepository()
+
+    # ==========================================
+    # API PUBLICA
+    # ==========================================
+
+    def importar_contactos(self, ruta, usuario_actual_id, al_progreso=None,
+                           ruta_rechazos=None, tamano_lote=TAMANO_LOTE):
+        """
+        Importa contactos desde un archivo CSV o XLSX.
+
+        Columnas requeridas: nombre, apellido_paterno. Opcionales: las de
+        CAMPOS_CONTACTO (empresa se busca por razon social).
+
+        Args:
+            ruta (str): archivo .csv o .xlsx con encabezados en la primera fila
+            usuario_actual_id (int): usuario que queda como creador
+            al_progreso (callable, opcional): al_progreso(procesadas, insertadas, rechazadas)
+            ruta_rechazos (str, opcional): destino del CSV de rechazos
+                (default: <archivo>_rechazos.csv junto al original)
+            tamano_lote (int, opcional): filas por transaccion
+
+        Returns:
+            tuple: (ResumenImportacion|None, str|None)
+        """
+        contexto = {
+            "emails": self._contacto_repo.emails_registrados,
+            "empresas": lambda: _mapa_nombres(
+                (id_value, nombre) for nombre, id_value in self._empresa_repo.ids_por_razon_social()
+            ),
+            "ciudades": lambda: _mapa_nombres(CatalogCache.get_ciudades()),
+            "origenes": lambda: _mapa_nombres(CatalogCache.get_origenes_contacto()),
+            "usuarios": lambda: _mapa_nombres(CatalogCache.get_usuarios()),
+        }
+        return self._importar(
+            "contactos", ruta, usuario_actual_id, CAMPOS_CONTACTO,
+            ("nombre", "apellido_paterno"), contexto, self._construir_contacto,
+            self._contacto_repo, al_progreso, ruta_rechazos, tamano_lote,
+        )
+
+    def importar_empresas(self, ruta, usuario_actual_id, al_progreso=None,
+                          ruta_rechazos=None, tamano_lote=TAMANO_LOTE):
+        """
+        Importa empresas desde un archivo CSV o XLSX.
+
+        Columna requerida: razon_social. Opcionales: las de CAMPOS_EMPRESA.
+        Los argumentos y el resultado son los de importar_contactos.
+
+        Returns:
+            tuple: (ResumenImportacion|None, str|None)
+        """
+        contexto = {
+            "rfcs": self._empresa_repo.rfcs_registrados,
+            "industrias": lambda: _mapa_nombres(CatalogCache.get_industrias()),
+            "tamanos": lambda: _mapa_nombres(CatalogCache.get_tamanos_empresa()),
+            "ciudades": lambda: _mapa_nombres(CatalogCache.get_ciudades()),
+            "monedas": lambda: _mapa_nombres(CatalogCache.get_monedas()),
+            "origenes": lambda: _mapa_nombres(CatalogCache.get_origenes_contacto()),
+            "usuarios": lambda: _mapa_nombres(CatalogCache.get_usuarios()),
+        }
+        return self._importar(
+            "empresas", ruta, usuario_actual_id, CAMPOS_EMPRESA,
+            ("razon_social",), contexto, self._construir_empresa,
+            self._empresa_repo, al_progreso, ruta_rechazos, tamano_lote,
+        )
+
+    # ==========================================
+    # PROCESO COMUN
+    # ==========================================
+
+    def _importar(self, entidad, ruta, usuario_id, campos, requeridos, contexto,
+                  construir, repo, al_progreso, ruta_rechazos, tamano_lote):
+        inicio = time.perf_counter()
+        resumen = ResumenImportacion()
+        if ruta_rechazos is None:
+            ruta_rechazos = os.path.splitext(ruta)[0] + "_rechazos.csv"
+        try:
+            logger.info(f"Importando {entidad} desde {os.path.basename(ruta)} por usuario {usuario_id}")
+            with LectorTabular(ruta) as lector:
+                # campo -> posicion de su columna (la primera si se repite)
+                indices = {}
+                for i, encabezado in enumerate(lector.encabezados):
+                    campo = _clave_encabezado(encabezado)
+                    if campo in campos:
+                        indices.setdefault(campo, i)
+                faltan = [c for c in requeridos if c not in indices]
+                if faltan:
+                    return None, f"Faltan columnas requeridas: {', '.join(faltan)}"
+
+                # mapas de catalogos y llaves existentes: una consulta cada uno
+                datos = {clave: cargar() for clave, cargar in contexto.items()}
+                datos["usuario_id"] = usuario_id
+                posiciones = list(indices.items())
+
+                rechazos = _ArchivoRechazos(ruta_rechazos, lector.encabezados)
+                lote = []
+                try:
+                    for numero, valores in lector:
+                        resumen.procesadas += 1
+                        total = len(valores)
+                        fila = {c: (valores[i] if i < total else "") for c, i in posiciones}
+                        try:
+                            lote.append(construir(fila, datos))
+                        except _Rechazo as motivo:
+                            resumen.rechazadas += 1
+                            rechazos.escribir(numero, str(motivo), valores)
+                        if resumen.procesadas % tamano_lote == 0:
+                            self._guardar_lote(repo, lote, resumen, al_progreso)
+                    self._guardar_lote(repo, lote, resumen, al_progreso)
+                finally:
+                    rechazos.cerrar()
+                if rechazos.usado:
+                    resumen.ruta_rechazos = ruta_rechazos
+        except ValueError as e:
+            # formato de archivo no soportado: el mensaje ya es legible
+            return None, str(e)
+        except OSError:
+            AppLogger.log_exception(logger, f"Error al leer el archivo de {entidad}")
+            return None, "No se pudo leer el archivo"
+        except Exception as e:
+            AppLogger.log_exception(
+                logger, f"Error al importar {entidad} ({resumen.insertadas} filas ya guardadas)"
+            )
+            return None, sanitize_error_message(e)
+
+        resumen.segundos = time.perf_counter() - inicio
+        logger.info(
+            f"Importacion de {entidad}: {resumen.insertadas} insertadas, "
+            f"{resumen.rechazadas} rechazadas en {resumen.segundos:.1f} s"
+        )
+        return resumen, None
+
+    @staticmethod
+    def _guardar_lote(repo, lote, resumen, al_progreso):
+        if lote:
+            with transaction():
+                repo.create_many(lote)
+            resumen.insertadas += len(lote)
+            lote.clear()
+        if al_progreso is not None:
+            al_progreso(resumen.procesadas, resumen.insertadas, resumen.rechazadas)
+
+    # ==========================================
+    # VALIDACION POR FILA
+    # ==========================================
+
+    @staticmethod
+    def _texto(fila, campo, etiqueta, max_length=None):
+        # espacios colapsados; "" -> None. Sin escapar HTML: se guarda igual que desde el formulario
+        valor = " ".join(fila.get(campo, "").split())
+        if not valor:
+            return None
+        if max_length:
+            error = Validator.validate_length(valor, max_len=max_length, field_name=etiqueta)
+            if error:
+                raise _Rechazo(error)
+        return valor
+
+    @staticmethod
+    def _email(fila, campo, etiqueta):
+        crudo = fila.get(campo, "").strip()
+        if not crudo:
+            return None
+        email = Sanitizer.sanitize_email(crudo)
+        if email is None:
+            raise _Rechazo(f"El formato del {etiqueta} no es valido")
+        return email
+
+    @staticmethod
+    def _digitos(fila, campo, validar):
+        # "81 1234-5678" y "(81) 12345678" se aceptan como 8112345678
+        crudo = fila.get(campo, "")
+        if not crudo:
+            return None
+        valor = re.sub(r"\D", "", crudo)
+        error = validar(valor)
+        if error:
+            raise _Rechazo(error)
+        return valor
+
+    @staticmethod
+    def _catalogo(fila, campo, mapa, etiqueta, femenino=False):
+        nombre = fila.get(campo, "")
+        if not nombre:
+            return None
+        # el mapa tambien recuerda el texto tal cual venia: los nombres se
+        # repiten mucho (ciudad, origen) y asi se normalizan una sola vez
+        id_value = mapa.get(nombre, _SIN_RESOLVER)
+        if id_value is _SIN_RESOLVER:
+            id_value = mapa.get(normalizar(nombre), _NO_EXISTE)
+            mapa[nombre] = id_value
+        if id_value is _NO_EXISTE:
+            raise _Rechazo(f"{etiqueta} no encontrad{'a' if femenino else 'o'}: {nombre}")
+        if id_value is None:
+            raise _Rechazo(
+                f"{etiqueta} ambigu{'a' if femenino else 'o'} (hay varios con ese nombre): {nombre}"
+            )
+        return id_value
+
+    @staticmethod
+    def _numero(fila, campo, convertir, etiqueta):
+        crudo = fila.get(campo, "").replace(",", "").replace("$", "").strip()
+        if not crudo:
+            return None
+        try:
+            valor = convertir(crudo)
+        except ValueError:
+            raise _Rechazo(f"{etiqueta} debe ser un numero valido")
+        if valor < 0:
+            raise _Rechazo(f"{etiqueta} no puede ser negativo")
+        return valor
+
+    def _construir_contacto(self, fila, datos):
+        nombre = self._texto(fila, "nombre", "El nombre", Sanitizer.MAX_NOMBRE_LENGTH)
+        if not nombre:
+            raise _Rechazo("El nombre es requerido")
+        apellido_paterno = self._texto(
+            fila, "apellido_paterno", "El apellido paterno", Sanitizer.MAX_NOMBRE_LENGTH
+        )
+        if not apellido_paterno:
+            raise _Rechazo("El apellido paterno es requerido")
+
+        email = self._email(fila, "email", "email")
+        if email is not None:
+            if email in datos["emails"]:
+                raise _Rechazo("Este email ya esta registrado")
+        email_secundario = self._email(fila, "email_secundario", "email secundario")
+
+        fecha_nacimiento = fila.get("fecha_nacimiento", "")[:10] or None
+        if fecha_nacimiento and not _FECHA_PATTERN.match(fecha_nacimiento):
+            raise _Rechazo("La fecha de nacimiento debe tener formato AAAA-MM-DD")
+
+        contacto = Contacto(
+            nombre=nombre,
+            apellido_paterno=apellido_paterno,
+            apellido_materno=self._texto(
+                fila, "apellido_materno", "El apellido materno", Sanitizer.MAX_NOMBRE_LENGTH
+            ),
+            email=email,
+            email_secundario=email_secundario,
+            telefono_oficina=self._digitos(fila, "telefono_oficina", Validator.validate_phone),
+            telefono_celular=self._digitos(fila, "telefono_celular", Validator.validate_phone),
+            puesto=self._texto(fila, "puesto", "El puesto", Sanitizer.MAX_NOMBRE_LENGTH),
+            departamento=self._texto(fila, "departamento", "El departamento", Sanitizer.MAX_NOMBRE_LENGTH),
+            empresa_id=self._catalogo(fila, "empresa", datos["empresas"], "Empresa", femenino=True),
+            direccion=self._texto(fila, "direccion", "La direccion"),
+            ciudad_id=self._catalogo(fila, "ciudad", datos["ciudades"], "Ciudad", femenino=True),
+            codigo_postal=self._digitos(fila, "codigo_postal", Validator.validate_postal_code),
+            fecha_nacimiento=fecha_nacimiento,
+            linkedin_url=self._texto(fila, "linkedin_url", "LinkedIn"),
+            origen_id=self._catalogo(fila, "origen", datos["origenes"], "Origen"),
+            propietario_id=self._catalogo(fila, "propietario", datos["usuarios"], "Propietario"),
+            creado_por=datos["usuario_id"],
+            modificado_por=datos["usuario_id"],
+        )
+        # a partir de aqui el email cuenta como registrado (duplicados dentro del archivo)
+        if email is not None:
+            datos["emails"].add(email)
+        return contacto
+
+    def _construir_empresa(self, fila, datos):
+        razon_social = self._texto(fila, "razon_social", "La razon social", Sanitizer.MAX_TITULO_LENGTH)
+        if not razon_social:
+            raise _Rechazo("La razon social es requerida")
+
+        rfc = fila.get("rfc", "").strip().upper() or None
+        if rfc is not None:
+            if not _RFC_PATTERN.match(rfc):
+                raise _Rechazo("El RFC debe contener 12 o 13 caracteres alfanumericos")
+            if rfc in datos["rfcs"]:
+                raise _Rechazo("Este RFC ya esta registrado")
+
+        empresa = Empresa(
+            razon_social=razon_social,
+            nombre_comercial=self._texto(
+                fila, "nombre_comercial", "El nombre comercial", Sanitizer.MAX_TITULO_LENGTH
+            ),
+            rfc=rfc,
+            industria_id=self._catalogo(fila, "industria", datos["industrias"], "Industria", femenino=True),
+            tamano_id=self._catalogo(fila, "tamano", datos["tamanos"], "Tamano"),
+            sitio_web=self._texto(fila, "sitio_web", "El sitio web"),
+            telefono=self._digitos(fila, "telefono", Validator.validate_phone),
+            email=self._email(fila, "email", "email"),
+            direccion=self._texto(fila, "direccion", "La direccion"),
+            ciudad_id=self._catalogo(fila, "ciudad", datos["ciudades"], "Ciudad", femenino=True),
+            codigo_postal=self._digitos(fila, "codigo_postal", Validator.validate_postal_code),
+            ingreso_anual_estimado=self._numero(
+                fila, "ingreso_anual_estimado", float, "El ingreso anual estimado"
+            ),
+            moneda_id=self._catalogo(fila, "moneda", datos["monedas"], "Moneda", femenino=True),
+            num_empleados=self._numero(fila, "num_empleados", int, "El numero de empleados"),
+            descripcion=self._texto(fila, "descripcion", "La descripcion", Sanitizer.MAX_CONTENIDO_LENGTH),
+            origen_id=self._catalogo(fila, "origen", datos["origenes"], "Origen"),
+            propietario_id=self._catalogo(fila, "propietario", datos["usuarios"], "Propietario"),
+            creado_por=datos["usuario_id"],
+            modificado_por=datos["usuario_id"],
+        )
+        if rfc is not None:
+            datos["rfcs"].add(rfc)
+        return empresa
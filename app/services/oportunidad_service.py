@@ -35,6 +35,18 @@ class OportunidadService:
             AppLogger.log_exception(logger, "Error al obtener oportunidades")
             return None, sanitize_error_message(e)
 
+    def obtener_pagina(self, limit=50, token=None, filtros=None):
+        try:
+            logger.debug(f"Obteniendo pagina de oportunidades - limit: {limit}, filtros: {filtros}")
+            pagina = self._repo.find_page(limit=limit, token=token, filtros=filtros)
+            return pagina, None
+        except ValueError as e:
+            # token corrupto o filtro no permitido: el mensaje ya es legible
+            return None, str(e)
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error al obtener pagina de oportunidades")
+            return None, sanitize_error_message(e)
+
     def contar_total(self):
         try:
             total = self._repo.count_all()
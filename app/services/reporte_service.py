@@ -1,6 +1,9 @@
-from datetime import datetime
+from datetime import date, datetime
+from itertools import chain, islice
 
+from app.config.settings import CACHE_REPORTES_MB
 from app.repositories.reporte_repository import ReporteRepository
+from app.utils.cache_resultados import CacheResultados
 from app.utils.logger import AppLogger
 from app.utils.db_retry import sanitize_error_message
 
@@ -72,11 +75,351 @@ REPORTES = {
     },
 }
 
+# tablas (de VersionTablas) que alimenta cada reporte: si cambia alguna, el
+# resultado en cache deja de ser valido
+_TABLAS_REPORTE = {
+    "pipeline": ("Oportunidades", "Empresas", "Contactos", "EtapasVenta", "Usuarios"),
+    "vendedores": ("Usuarios", "Roles", "Oportunidades"),
+    "etapas": ("EtapasVenta", "Oportunidades"),
+    "campanas": ("Campanas", "Usuarios"),
+    "actividad": ("Actividades", "Contactos", "Empresas", "TiposActividad"),
+}
+
+# reportes con columnas calculadas contra julianday('now') (DiasEnPipeline,
+# DiasSinContacto): cambian con el dia aunque no cambie ninguna tabla
+_REPORTES_POR_DIA = {"pipeline", "actividad"}
+
+# compartido por todas las instancias (cada vista crea su propio servicio)
+_cache = CacheResultados(CACHE_REPORTES_MB)
+
+# filas que se revisan para calcular el ancho de las columnas
+_MUESTRA_ANCHOS = 200
+# cada cuantas filas se llama al_progreso
+_FILAS_POR_AVISO = 5000
+
+
+def _estilos_excel(wb):
+    # estilos con nombre: se registran una vez y las celdas solo guardan el nombre
+    from openpyxl.styles import (
+        NamedStyle, PatternFill, Font, Alignment, Border, Side
+    )
+
+    thin = Side(style="thin", color="CBD5E0")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    estilos = (
+        NamedStyle(
+            "crm_titulo",
+            font=Font(bold=True, size=14, color="FFFFFF"),
+            fill=PatternFill("solid", fgColor="1a365d"),
+            alignment=Alignment(horizontal="center", vertical="center"),
+        ),
+        NamedStyle(
+            "crm_fecha",
+            font=Font(italic=True, size=10, color="718096"),
+            alignment=Alignment(horizontal="center"),
+        ),
+        NamedStyle(
+            "crm_cabecera",
+            font=Font(bold=True, color="FFFFFF", size=11),
+            fill=PatternFill("solid", fgColor="4a90d9"),
+            border=border,
+            alignment=Alignment(horizontal="center", vertical="center", wrap_text=True),
+        ),
+    )
+    for estilo in estilos:
+        wb.add_named_style(estilo)
+    return border
+
+
+def _escribir_excel(cfg, datos, ruta, al_progreso=None):
+    """Escribe el reporte en modo write_only. Devuelve el numero de filas de datos."""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.formatting.rule import FormulaRule
+    from openpyxl.styles import PatternFill
+    from openpyxl.utils import get_column_letter
+
+    columnas = cfg["columnas"]
+    cabeceras = cfg["cabeceras"]
+    titulo = cfg["titulo"]
+    ultima_col = get_column_letter(len(columnas))
+
+    wb = Workbook(write_only=True)
+    border = _estilos_excel(wb)
+    ws = wb.create_sheet(titulo[:31])  # Excel limita a 31 chars
+
+    # --- auto-ancho con una muestra; el resto de las filas sigue en el iterador ---
+    filas = (tuple(fila.get(col) for col in columnas) for fila in datos)
+    muestra = list(islice(filas, _MUESTRA_ANCHOS))
+    for col_idx, cabecera in enumerate(cabeceras):
+        max_len = max(
+            [len(str(cabecera))]
+            + [len(str(fila[col_idx])) for fila in muestra if fila[col_idx] is not None]
+        )
+        ws.column_dimensions[get_column_letter(col_idx + 1)].width = min(max_len + 4, 40)
+
+    # en write_only las propiedades de hoja y filas se fijan antes de escribir
+    ws.freeze_panes = "A4"
+    ws.row_dimensions[1].height = 30
+    ws.row_dimensions[2].height = 18
+    ws.row_dimensions[3].height = 22
+
+    # --- título, fecha de generación y cabeceras ---
+    def celda(valor, estilo):
+        c = WriteOnlyCell(ws, value=valor)
+        c.style = estilo
+        return c
+
+    ws.append([celda(titulo, "crm_titulo")])
+    ws.append([celda(f"Generado el {datetime.now().strftime('%d/%m/%Y %H:%M')}", "crm_fecha")])
+    ws.append([celda(cabecera, "crm_cabecera") for cabecera in cabeceras])
+    ws.merged_cells.add(f"A1:{ultima_col}1")
+    ws.merged_cells.add(f"A2:{ultima_col}2")
+
+    # --- filas de datos (valores simples, sin objetos de estilo) ---
+    total = 0
+    for fila in chain(muestra, filas):
+        ws.append(fila)
+        total += 1
+        if al_progreso is not None and total % _FILAS_POR_AVISO == 0:
+            al_progreso(total)
+
+    # --- filas alternadas y bordes para todo el rango de una vez ---
+    if total:
+        rango = f"A4:{ultima_col}{total + 3}"
+        ws.conditional_formatting.add(rango, FormulaRule(
+            formula=["MOD(ROW(),2)=0"], border=border,
+            fill=PatternFill("solid", start_color="EBF4FF", end_color="EBF4FF"),
+        ))
+        ws.conditional_formatting.add(rango, FormulaRule(formula=["MOD(ROW(),2)=1"], border=border))
+
+    wb.save(ruta)
+    if al_progreso is not None:
+        al_progreso(total)
+    return total
+
+
+# --- PDF ---
+_PDF_MARGEN_CM = 1.5
+_PDF_FUENTE = "Helvetica"
+_PDF_FUENTE_NEGRITA = "Helvetica-Bold"
+_PDF_TAM_CELDA = 8
+_PDF_INTERLINEA_CELDA = 10
+_PDF_TAM_CABECERA = 9
+_PDF_INTERLINEA_CABECERA = 11
+_PDF_PADDING_H = 6
+_PDF_PADDING_V = 5
+# una celda larga se corta con "..." para que ninguna fila exceda la pagina
+_PDF_MAX_LINEAS_CELDA = 6
+# ninguna letra de Helvetica mide mas de 1 em: si len(texto) em cabe, no se mide
+_PDF_EM_MAXIMO = 1.0
+
+
+def _anchos_pdf(columnas, cabeceras, muestra, ancho_util, minimo):
+    # anchos proporcionales a la longitud maxima de contenido en la muestra
+    max_lens = []
+    for col_idx, cabecera in enumerate(cabeceras):
+        max_len = len(str(cabecera))
+        for fila in muestra:
+            max_len = max(max_len, len(fila[col_idx]))
+        max_lens.append(max(max_len, 4))  # minimo 4 caracteres
+
+    total_chars = sum(max_lens)
+    anchos = [max((length / total_chars) * ancho_util, minimo) for length in max_lens]
+    # escalar para ocupar exactamente el ancho de pagina
+    escala = ancho_util / sum(anchos)
+    return [a * escala for a in anchos]
+
+
+def _lineas_celda(texto, ancho, fuente, tam, max_lineas):
+    """Devuelve el texto tal cual (str) si cabe, o la lista de lineas en que se parte."""
+    from reportlab.lib.utils import simpleSplit
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    if len(texto) * tam * _PDF_EM_MAXIMO <= ancho or stringWidth(texto, fuente, tam) <= ancho:
+        return texto
+    lineas = simpleSplit(texto, fuente, tam, ancho)
+    if len(lineas) > max_lineas:
+        lineas = lineas[:max_lineas]
+        lineas[-1] = lineas[-1].rstrip() + "..."
+    return lineas
+
+
+def _escribir_pdf(cfg, datos, ruta, al_progreso=None):
+    """
+    Dibuja el reporte en el canvas, una pagina a la vez.
+
+    Las filas se toman del iterador conforme se necesitan; cada pagina se
+    cierra con showPage() (contenido comprimido) y solo la fila en curso
+    esta en memoria. La cabecera de la tabla se repite en cada pagina.
+
+    Returns:
+        (filas de datos, paginas)
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import cm
+    from reportlab.pdfgen.canvas import Canvas
+
+    columnas = cfg["columnas"]
+    cabeceras = cfg["cabeceras"]
+    titulo = cfg["titulo"]
+
+    color_header = colors.HexColor("#4a90d9")
+    color_fila_par = colors.HexColor("#EBF4FF")
+    color_borde = colors.HexColor("#CBD5E0")
+    color_texto = colors.HexColor("#2d3748")
+    color_titulo = colors.HexColor("#1a365d")
+    color_gris = colors.HexColor("#718096")
+
+    # usar landscape si hay más de 5 columnas
+    pagesize = landscape(A4) if len(columnas) > 5 else A4
+    ancho_pag, alto_pag = pagesize
+    margen = _PDF_MARGEN_CM * cm
+    izquierda = margen
+    derecha = ancho_pag - margen
+    abajo = margen
+
+    filas = (tuple(str(fila.get(col, "") or "") for col in columnas) for fila in datos)
+    muestra = list(islice(filas, _MUESTRA_ANCHOS))
+    anchos = _anchos_pdf(columnas, cabeceras, muestra, derecha - izquierda, 1.5 * cm)
+    xs = [izquierda]
+    for ancho in anchos:
+        xs.append(xs[-1] + ancho)
+    disponibles = [a - 2 * _PDF_PADDING_H for a in anchos]
+
+    # cabecera: se parte una sola vez y se repite en cada pagina
+    lineas_cab = [
+        _lineas_celda(c, d, _PDF_FUENTE_NEGRITA, _PDF_TAM_CABECERA, _PDF_MAX_LINEAS_CELDA)
+        for c, d in zip(cabeceras, disponibles)
+    ]
+    lineas_cab = [[l] if isinstance(l, str) else l for l in lineas_cab]
+    alto_cab = max(map(len, lineas_cab)) * _PDF_INTERLINEA_CABECERA + 2 * _PDF_PADDING_V
+
+    lienzo = Canvas(ruta, pagesize=pagesize, pageCompression=1)
+    lienzo.setTitle(titulo)
+    paginas = 0
+    separadores = []  # lineas horizontales entre filas de la pagina en curso
+
+    def abrir_pagina():
+        # devuelve la coordenada y donde empieza la primera fila de datos
+        y = alto_pag - margen
+        if paginas == 0:
+            lienzo.setFont(_PDF_FUENTE_NEGRITA, 16)
+            lienzo.setFillColor(color_titulo)
+            lienzo.drawCentredString(ancho_pag / 2, y - 16, titulo)
+            lienzo.setFont(_PDF_FUENTE, 9)
+            lienzo.setFillColor(color_gris)
+            lienzo.drawCentredString(
+                ancho_pag / 2, y - 34,
+                f"Generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}",
+            )
+            y -= 34 + 0.3 * cm + 12
+        lienzo.setFillColor(color_header)
+        lienzo.rect(izquierda, y - alto_cab, derecha - izquierda, alto_cab, stroke=0, fill=1)
+        lienzo.setFont(_PDF_FUENTE_NEGRITA, _PDF_TAM_CABECERA)
+        lienzo.setFillColor(colors.white)
+        for x, ancho, lineas in zip(xs, anchos, lineas_cab):
+            # centrado vertical y horizontal
+            base = y - (alto_cab - len(lineas) * _PDF_INTERLINEA_CABECERA) / 2 - _PDF_TAM_CABECERA
+            for linea in lineas:
+                lienzo.drawCentredString(x + ancho / 2, base, linea)
+                base -= _PDF_INTERLINEA_CABECERA
+        # todas las celdas de la pagina van en un solo objeto de texto: un
+        # BT/ET por pagina en lugar de uno por celda
+        texto = lienzo.beginText()
+        texto.setFont(_PDF_FUENTE, _PDF_TAM_CELDA)
+        texto.setFillColor(color_texto)
+        lienzo.setFillColor(color_fila_par)  # fondo de filas alternas
+        return y - alto_cab, y, texto
+
+    def cerrar_pagina(y, y_tabla, texto):
+        lienzo.drawText(texto)
+        # rejilla de la pagina en un solo trazo; la pagina que solo lleva el
+        # total (y == y_tabla) no tiene tabla
+        if y < y_tabla:
+            lienzo.setStrokeColor(color_borde)
+            lienzo.setLineWidth(0.5)
+            lienzo.lines([(x, y_tabla, x, y) for x in xs] + separadores)
+            lienzo.line(izquierda, y_tabla, derecha, y_tabla)
+        separadores.clear()
+        lienzo.setFont(_PDF_FUENTE, 8)
+        lienzo.setFillColor(color_gris)
+        lienzo.drawRightString(derecha, abajo / 2, f"Pagina {paginas + 1}")
+        lienzo.showPage()
+
+    y, y_tabla, texto = abrir_pagina()
+    total = 0
+    for fila in chain(muestra, filas):
+        celdas = [
+            _lineas_celda(t, d, _PDF_FUENTE, _PDF_TAM_CELDA, _PDF_MAX_LINEAS_CELDA)
+            for t, d in zip(fila, disponibles)
+        ]
+        n_lineas = max(1 if isinstance(c, str) else len(c) for c in celdas)
+        alto = n_lineas * _PDF_INTERLINEA_CELDA + 2 * _PDF_PADDING_V
+        if y - alto < abajo:
+            cerrar_pagina(y, y_tabla, texto)
+            paginas += 1
+            if al_progreso is not None:
+                al_progreso(total)
+            y, y_tabla, texto = abrir_pagina()
+
+        if total % 2:
+            lienzo.rect(izquierda, y - alto, derecha - izquierda, alto, stroke=0, fill=1)
+        # texto alineado a la izquierda y centrado vertical en la fila
+        base_fila = y - _PDF_PADDING_V - _PDF_TAM_CELDA
+        for x, celda in zip(xs, celdas):
+            if isinstance(celda, str):
+                if celda:
+                    desplazamiento = (n_lineas - 1) * _PDF_INTERLINEA_CELDA / 2
+                    texto.setTextOrigin(x + _PDF_PADDING_H, base_fila - desplazamiento)
+                    texto.textOut(celda)
+                continue
+            base = base_fila - (n_lineas - len(celda)) * _PDF_INTERLINEA_CELDA / 2
+            for linea in celda:
+                texto.setTextOrigin(x + _PDF_PADDING_H, base)
+                texto.textOut(linea)
+                base -= _PDF_INTERLINEA_CELDA
+        y -= alto
+        separadores.append((izquierda, y, derecha, y))
+        total += 1
+
+    # --- total de registros ---
+    if y - 0.4 * cm - 10 < abajo:
+        cerrar_pagina(y, y_tabla, texto)
+        paginas += 1
+        y = y_tabla = alto_pag - margen
+        texto = lienzo.beginText()
+    texto.setFont(_PDF_FUENTE, 8)
+    texto.setFillColor(color_gris)
+    texto.setTextOrigin(izquierda, y - 0.4 * cm - 8)
+    texto.textOut(f"Total de registros: {total}")
+    cerrar_pagina(y, y_tabla, texto)
+    paginas += 1
+    lienzo.save()
+    if al_progreso is not None:
+        al_progreso(total)
+    return total, paginas
+
 
 class ReporteService:
 
-    def __init__(self):
+    def __init__(self, alcance=None):
+        # alcance: quien consulta (p. ej. el id del usuario). Forma parte de la
+        # clave del cache para que dos alcances nunca compartan resultados.
         self._repo = ReporteRepository()
+        self._alcance = alcance
+
+    def _consultar(self, clave_reporte, cargar, fecha_desde=None, fecha_hasta=None):
+        # mismas fechas como date o como texto -> misma entrada
+        clave = (
+            clave_reporte,
+            str(fecha_desde) if fecha_desde else None,
+            str(fecha_hasta) if fecha_hasta else None,
+            self._alcance,
+            date.today() if clave_reporte in _REPORTES_POR_DIA else None,
+        )
+        return _cache.obtener(clave, _TABLAS_REPORTE[clave_reporte], cargar)
 
     # ------------------------------------------------------------------ #
     # Obtener datos                                                        #
@@ -84,7 +427,10 @@ class ReporteService:
 
     def obtener_pipeline_ventas(self, fecha_desde=None, fecha_hasta=None):
         try:
-            datos = self._repo.get_pipeline_ventas(fecha_desde, fecha_hasta)
+            datos = self._consultar(
+                "pipeline", lambda: self._repo.get_pipeline_ventas(fecha_desde, fecha_hasta),
+                fecha_desde, fecha_hasta,
+            )
             return datos, None
         except Exception as e:
             AppLogger.log_exception(logger, "Error al obtener pipeline de ventas")
@@ -92,7 +438,7 @@ class ReporteService:
 
     def obtener_rendimiento_vendedores(self):
         try:
-            datos = self._repo.get_rendimiento_vendedores()
+            datos = self._consultar("vendedores", self._repo.get_rendimiento_vendedores)
             return datos, None
         except Exception as e:
             AppLogger.log_exception(logger, "Error al obtener rendimiento vendedores")
@@ -100,7 +446,7 @@ class ReporteService:
 
     def obtener_conversion_etapas(self):
         try:
-            datos = self._repo.get_conversion_por_etapa()
+            datos = self._consultar("etapas", self._repo.get_conversion_por_etapa)
             return datos, None
         except Exception as e:
             AppLogger.log_exception(logger, "Error al obtener conversión por etapa")
@@ -108,7 +454,10 @@ class ReporteService:
 
     def obtener_analisis_campanas(self, fecha_desde=None, fecha_hasta=None):
         try:
-            datos = self._repo.get_analisis_campanas(fecha_desde, fecha_hasta)
+            datos = self._consultar(
+                "campanas", lambda: self._repo.get_analisis_campanas(fecha_desde, fecha_hasta),
+                fecha_desde, fecha_hasta,
+            )
             return datos, None
         except Exception as e:
             AppLogger.log_exception(logger, "Error al obtener análisis de campañas")
@@ -116,7 +465,10 @@ class ReporteService:
 
     def obtener_actividad_contactos(self, fecha_desde=None, fecha_hasta=None):
         try:
-            datos = self._repo.get_actividad_contactos(fecha_desde, fecha_hasta)
+            datos = self._consultar(
+                "actividad", lambda: self._repo.get_actividad_contactos(fecha_desde, fecha_hasta),
+                fecha_desde, fecha_hasta,
+            )
             return datos, None
         except Exception as e:
             AppLogger.log_exception(logger, "Error al obtener actividad de contactos")
@@ -126,261 +478,108 @@ class ReporteService:
     # Exportar a Excel                                                     #
     # ------------------------------------------------------------------ #
 
-    def exportar_excel(self, clave_reporte, datos, ruta):
+    def exportar_excel(self, clave_reporte, datos, ruta, al_progreso=None):
         """
         Exporta los datos de un reporte a un archivo Excel (.xlsx).
 
+        Se escribe en modo write_only de openpyxl: cada fila se manda al
+        archivo en cuanto se agrega y no queda en memoria, asi que el consumo
+        es el mismo con 1 000 que con 500 000 filas. Por eso:
+            - Titulo, fecha y cabeceras usan estilos con nombre registrados
+              una vez en el libro (no un objeto de estilo por celda).
+            - Las filas de datos se escriben como valores simples; el color
+              alterno y los bordes se aplican con formato condicional sobre
+              todo el rango.
+            - El ancho de cada columna se calcula con las primeras
+              _MUESTRA_ANCHOS filas, no con una segunda pasada por todas.
+
         Args:
             clave_reporte: clave del dict REPORTES ('pipeline', 'vendedores', etc.)
-            datos: lista de dicts con los datos a exportar
+            datos: lista o cualquier iterable de dicts (se recorre una sola vez)
             ruta: ruta completa del archivo destino
+            al_progreso: callback opcional al_progreso(filas_escritas)
 
         Returns:
             (True, None) si éxito, (None, mensaje_error) si falla
         """
         try:
-            from openpyxl import Workbook
-            from openpyxl.styles import (
-                PatternFill, Font, Alignment, Border, Side
-            )
-            from openpyxl.utils import get_column_letter
-
-            cfg = REPORTES[clave_reporte]
-            columnas = cfg["columnas"]
-            cabeceras = cfg["cabeceras"]
-            titulo = cfg["titulo"]
-
-            wb = Workbook()
-            ws = wb.active
-            ws.title = titulo[:31]  # Excel limita a 31 chars
-
-            # --- fila de título ---
-            ws.merge_cells(start_row=1, start_column=1,
-                           end_row=1, end_column=len(columnas))
-            titulo_cell = ws.cell(row=1, column=1, value=titulo)
-            titulo_cell.font = Font(bold=True, size=14, color="FFFFFF")
-            titulo_cell.fill = PatternFill("solid", fgColor="1a365d")
-            titulo_cell.alignment = Alignment(horizontal="center", vertical="center")
-            ws.row_dimensions[1].height = 30
-
-            # --- fila de fecha generación ---
-            ws.merge_cells(start_row=2, start_column=1,
-                           end_row=2, end_column=len(columnas))
-            fecha_cell = ws.cell(
-                row=2, column=1,
-                value=f"Generado el {datetime.now().strftime('%d/%m/%Y %H:%M')}"
-            )
-            fecha_cell.font = Font(italic=True, size=10, color="718096")
-            fecha_cell.alignment = Alignment(horizontal="center")
-            ws.row_dimensions[2].height = 18
-
-            # --- cabeceras de columnas ---
-            header_fill = PatternFill("solid", fgColor="4a90d9")
-            header_font = Font(bold=True, color="FFFFFF", size=11)
-            thin = Side(style="thin", color="CBD5E0")
-            border = Border(left=thin, right=thin, top=thin, bottom=thin)
-
-            for col_idx, cabecera in enumerate(cabeceras, start=1):
-                cell = ws.cell(row=3, column=col_idx, value=cabecera)
-                cell.fill = header_fill
-                cell.font = header_font
-                cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-                cell.border = border
-            ws.row_dimensions[3].height = 22
-
-            # --- filas de datos ---
-            fill_par = PatternFill("solid", fgColor="EBF4FF")
-            fill_impar = PatternFill("solid", fgColor="FFFFFF")
-
-            for row_idx, fila in enumerate(datos, start=4):
-                fill = fill_par if row_idx % 2 == 0 else fill_impar
-                for col_idx, col_key in enumerate(columnas, start=1):
-                    valor = fila.get(col_key, "")
-                    if valor is None:
-                        valor = ""
-                    cell = ws.cell(row=row_idx, column=col_idx, value=valor)
-                    cell.fill = fill
-                    cell.border = border
-                    cell.alignment = Alignment(vertical="center")
-
-            # --- auto-ancho de columnas ---
-            for col_idx, col_key in enumerate(columnas, start=1):
-                max_len = len(str(cabeceras[col_idx - 1]))
-                for fila in datos:
-                    val = str(fila.get(col_key, "") or "")
-                    max_len = max(max_len, len(val))
-                ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 4, 40)
-
-            # --- congelar cabeceras ---
-            ws.freeze_panes = "A4"
-
-            wb.save(ruta)
-            logger.info(f"Reporte '{titulo}' exportado a Excel: {ruta}")
+            titulo = REPORTES[clave_reporte]["titulo"]
+            total = _escribir_excel(REPORTES[clave_reporte], datos, ruta, al_progreso)
+            logger.info(f"Reporte '{titulo}' exportado a Excel ({total} filas): {ruta}")
             return True, None
 
         except Exception as e:
             AppLogger.log_exception(logger, "Error al exportar a Excel")
             return None, sanitize_error_message(e)
 
+    def exportar_excel_desde_bd(self, clave_reporte, ruta, fecha_desde=None,
+                                fecha_hasta=None, al_progreso=None):
+        """
+        Exporta un reporte leyendo las filas directo del cursor de la BD.
+
+        A diferencia de exportar_excel(datos), el reporte nunca esta completo
+        en memoria: las filas pasan del cursor (fetchmany) al archivo.
+
+        Returns:
+            (True, None) si éxito, (None, mensaje_error) si falla
+        """
+        datos = self._repo.iterar(clave_reporte, fecha_desde, fecha_hasta)
+        try:
+            return self.exportar_excel(clave_reporte, datos, ruta, al_progreso)
+        finally:
+            # si la exportacion fallo a medias, libera el lector del pool
+            datos.close()
+
     # ------------------------------------------------------------------ #
     # Exportar a PDF                                                       #
     # ------------------------------------------------------------------ #
 
-    def exportar_pdf(self, clave_reporte, datos, ruta):
+    def exportar_pdf(self, clave_reporte, datos, ruta, al_progreso=None):
         """
         Exporta los datos de un reporte a un archivo PDF.
 
+        La tabla se dibuja directo sobre el canvas de reportlab, pagina por
+        pagina (ver _escribir_pdf): el costo crece lineal con las filas y
+        cada pagina terminada queda comprimida, sin el arbol de flowables
+        de una Table gigante. Solo las celdas que no caben en su columna se
+        parten en lineas; el resto se dibuja como texto simple.
+
         Args:
             clave_reporte: clave del dict REPORTES
-            datos: lista de dicts
+            datos: lista o cualquier iterable de dicts (se recorre una sola vez)
             ruta: ruta completa del archivo destino
+            al_progreso: callback opcional al_progreso(filas_escritas),
+                llamado al cerrar cada pagina
 
         Returns:
             (True, None) si éxito, (None, mensaje_error) si falla
         """
         try:
-            from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.lib import colors
-            from reportlab.lib.units import cm
-            from reportlab.platypus import (
-                SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-            )
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT
-
-            cfg = REPORTES[clave_reporte]
-            columnas = cfg["columnas"]
-            cabeceras = cfg["cabeceras"]
-            titulo = cfg["titulo"]
-
-            # usar landscape si hay más de 5 columnas
-            pagesize = landscape(A4) if len(columnas) > 5 else A4
-            doc = SimpleDocTemplate(
-                ruta,
-                pagesize=pagesize,
-                leftMargin=1.5 * cm,
-                rightMargin=1.5 * cm,
-                topMargin=1.5 * cm,
-                bottomMargin=1.5 * cm,
-            )
-
-            styles = getSampleStyleSheet()
-            story = []
-
-            # --- título ---
-            style_titulo = ParagraphStyle(
-                "titulo",
-                parent=styles["Title"],
-                fontSize=16,
-                textColor=colors.HexColor("#1a365d"),
-                spaceAfter=4,
-                alignment=TA_CENTER,
-            )
-            story.append(Paragraph(titulo, style_titulo))
-
-            # --- subtítulo con fecha ---
-            style_sub = ParagraphStyle(
-                "subtitulo",
-                parent=styles["Normal"],
-                fontSize=9,
-                textColor=colors.HexColor("#718096"),
-                spaceAfter=12,
-                alignment=TA_CENTER,
-            )
-            story.append(Paragraph(
-                f"Generado el {datetime.now().strftime('%d/%m/%Y a las %H:%M')}",
-                style_sub
-            ))
-
-            story.append(Spacer(1, 0.3 * cm))
-
-            # --- tabla de datos ---
-            color_header     = colors.HexColor("#4a90d9")
-            color_fila_par   = colors.HexColor("#EBF4FF")
-            color_fila_impar = colors.white
-            color_borde      = colors.HexColor("#CBD5E0")
-            color_texto      = colors.HexColor("#2d3748")
-
-            # estilos de Paragraph para soporte de word-wrap en celdas
-            style_hdr = ParagraphStyle(
-                "th", fontSize=9, leading=11,
-                textColor=colors.white, fontName="Helvetica-Bold",
-                alignment=TA_CENTER, wordWrap="LTR",
-            )
-            style_cel = ParagraphStyle(
-                "td", fontSize=8, leading=10,
-                textColor=color_texto, fontName="Helvetica",
-                alignment=TA_LEFT, wordWrap="LTR",
+            titulo = REPORTES[clave_reporte]["titulo"]
+            total, paginas = _escribir_pdf(REPORTES[clave_reporte], datos, ruta, al_progreso)
+            logger.info(
+                f"Reporte '{titulo}' exportado a PDF ({total} filas, {paginas} paginas): {ruta}"
             )
-
-            # construir filas usando Paragraph para habilitar word-wrap
-            filas_tabla = [[Paragraph(h, style_hdr) for h in cabeceras]]
-            for fila in datos:
-                filas_tabla.append([
-                    Paragraph(str(fila.get(col, "") or ""), style_cel)
-                    for col in columnas
-                ])
-
-            # --- anchos proporcionales según longitud máxima de contenido ---
-            page_w = pagesize[0] - 3 * cm  # ancho útil (márgenes 1.5 cm c/lado)
-            MIN_COL = 1.5 * cm
-
-            max_lens = []
-            for col_key, cabecera in zip(columnas, cabeceras):
-                max_len = len(str(cabecera))
-                for fila in datos[:100]:          # muestra máximo 100 filas
-                    val = str(fila.get(col_key, "") or "")
-                    max_len = max(max_len, len(val))
-                max_lens.append(max(max_len, 4))  # mínimo 4 caracteres
-
-            total_chars = sum(max_lens)
-            col_widths = [
-                max((length / total_chars) * page_w, MIN_COL)
-                for length in max_lens
-            ]
-            # escalar para ocupar exactamente el ancho de página
-            scale = page_w / sum(col_widths)
-            col_widths = [w * scale for w in col_widths]
-
-            tabla = Table(filas_tabla, colWidths=col_widths, repeatRows=1)
-
-            # estilo base
-            ts = TableStyle([
-                # cabecera
-                ("BACKGROUND",  (0, 0), (-1, 0), color_header),
-                ("ALIGN",       (0, 0), (-1, 0), "CENTER"),
-                ("VALIGN",      (0, 0), (-1, -1), "MIDDLE"),
-                ("LINEBELOW",   (0, 0), (-1, 0), 1.5, color_header),
-                # filas alternadas
-                ("ROWBACKGROUND", (0, 1), (-1, -1), [color_fila_impar, color_fila_par]),
-                # bordes
-                ("GRID",        (0, 0), (-1, -1), 0.5, color_borde),
-                # padding uniforme
-                ("TOPPADDING",    (0, 0), (-1, -1), 5),
-                ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
-                ("LEFTPADDING",   (0, 0), (-1, -1), 6),
-                ("RIGHTPADDING",  (0, 0), (-1, -1), 6),
-            ])
-            tabla.setStyle(ts)
-            story.append(tabla)
-
-            # --- total de registros ---
-            story.append(Spacer(1, 0.4 * cm))
-            story.append(Paragraph(
-                f"Total de registros: {len(datos)}",
-                ParagraphStyle("pie", parent=styles["Normal"],
-                               fontSize=8, textColor=colors.HexColor("#718096"),
-                               alignment=TA_LEFT)
-            ))
-
-            doc.build(story)
-            logger.info(f"Reporte '{titulo}' exportado a PDF: {ruta}")
             return True, None
 
         except Exception as e:
             AppLogger.log_exception(logger, "Error al exportar a PDF")
             return None, sanitize_error_message(e)
 
+    def exportar_pdf_desde_bd(self, clave_reporte, ruta, fecha_desde=None,
+                              fecha_hasta=None, al_progreso=None):
+        """
+        Exporta un reporte a PDF leyendo las filas directo del cursor de la BD.
+
+        Returns:
+            (True, None) si éxito, (None, mensaje_error) si falla
+        """
+        datos = self._repo.iterar(clave_reporte, fecha_desde, fecha_hasta)
+        try:
+            return self.exportar_pdf(clave_reporte, datos, ruta, al_progreso)
+        finally:
+            datos.close()
+
     @property
     def info_reportes(self):
         return REPORTES
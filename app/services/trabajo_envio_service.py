@@ -0,0 +1,279 @@
+"""
+Servicio de trabajos de envio de campanas: envios largos en segundo plano
+que sobreviven a un cierre de la aplicacion.
+
+Problema que resuelve:
+    enviar_campana manda todos los pendientes de una sola vez. Si la app se
+    cerraba o caia a la mitad, la campana quedaba a medias, sin registro de
+    por donde iba y sin forma de seguir.
+
+Como funciona:
+    - crear_trabajo() registra un TrabajoEnvio (tabla TrabajosEnvio) con el
+      total de pendientes. Hay a lo mas un trabajo vivo por campana.
+    - procesar() corre en un hilo de trabajo (ver app/utils/cola_envios.py):
+      toma lotes de ENVIO_LOTE destinatarios pendientes despues del punto de
+      control y los envia por el pool SMTP. EscritorEstados guarda los
+      estados de los destinatarios en bloque mientras el lote avanza, y
+      cada escritura lleva en la misma transaccion los contadores y el
+      punto de control del trabajo.
+    - pausar() / cancelar() de un trabajo que esta corriendo dejan una
+      solicitud en memoria: el hilo deja de tomar correos, termina los que
+      estan en vuelo, guarda el lote y sale con el estado pedido.
+    - interrumpir_todos() (al cerrar la app) detiene los trabajos sin
+      cambiar su estado: quedan "En Curso" y find_para_reanudar() los
+      devuelve en el siguiente arranque.
+
+Garantia: un destinatario puede recibir el correo dos veces solo si la app
+se cae entre que se envio y que se guardo su estado (a lo mas los
+resultados que el escritor tenia en memoria, ver ENVIO_ESCRITURA_FILAS).
+"""
+
+import threading
+
+from app.config.settings import ENVIO_LOTE
+from app.models.TrabajoEnvio import ESTADOS_VIVOS
+from app.repositories.campana_repository import CampanaRepository
+from app.repositories.trabajo_envio_repository import TrabajoEnvioRepository
+from app.services.campana_service import CampanaService
+from app.utils.db_retry import sanitize_error_message
+from app.utils.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+# solicitudes de detencion para el hilo que corre el trabajo; pausar y
+# cancelar coinciden con el estado final, interrumpir deja el que tenia
+_PAUSAR = "Pausado"
+_CANCELAR = "Cancelado"
+_INTERRUMPIR = "Interrumpido"
+
+# trabajo_id -> solicitud pendiente de los trabajos que estan corriendo
+_solicitudes = {}
+_corriendo = set()
+_lock = threading.Lock()
+
+
+def _solicitud(trabajo_id):
+    with _lock:
+        return _solicitudes.get(trabajo_id)
+
+
+def _pedir_detener(trabajo_id, solicitud):
+    """Deja la solicitud si el trabajo esta corriendo. True si la dejo."""
+    with _lock:
+        if trabajo_id not in _corriendo:
+            return False
+        _solicitudes[trabajo_id] = solicitud
+        return True
+
+
+class TrabajoEnvioService:
+
+    def __init__(self):
+        self._repo = TrabajoEnvioRepository()
+        self._campana_repo = CampanaRepository()
+        self._campana_service = CampanaService()
+
+    # ==========================================
+    # CONSULTAS
+    # ==========================================
+
+    def obtener_trabajo(self, trabajo_id):
+        try:
+            return self._repo.find_by_id(trabajo_id), None
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error obteniendo trabajo de envio {trabajo_id}")
+            return None, sanitize_error_message(e)
+
+    def obtener_trabajo_vivo(self, campana_id):
+        """El trabajo Pendiente, En Curso o Pausado de la campaña, o None."""
+        try:
+            return self._repo.find_vivo_por_campana(campana_id), None
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error obteniendo el envio de la campaña {campana_id}")
+            return None, sanitize_error_message(e)
+
+    def trabajos_para_reanudar(self):
+        """Trabajos encolados o cortados a la mitad (para el arranque)."""
+        try:
+            return self._repo.find_para_reanudar(), None
+        except Exception as e:
+            AppLogger.log_exception(logger, "Error buscando envios por reanudar")
+            return [], sanitize_error_message(e)
+
+    @staticmethod
+    def corriendo(trabajo_id):
+        with _lock:
+            return trabajo_id in _corriendo
+
+    # ==========================================
+    # CONTROL
+    # ==========================================
+
+    def crear_trabajo(self, campana_id, usuario_id=None):
+        """
+        Registra el envío de los pendientes de la campaña.
+
+        Returns: (TrabajoEnvio | None, error_message: str | None)
+        """
+        try:
+            _, error = self._campana_service.preparar_envio(campana_id)
+            if error:
+                return None, error
+            if self._repo.find_vivo_por_campana(campana_id) is not None:
+                return None, "Esta campaña ya tiene un envío en curso o pausado"
+            total = self._repo.contar_pendientes(campana_id)
+            if total == 0:
+                return None, "No hay destinatarios con estado 'Pendiente' en esta campaña"
+            trabajo_id = self._repo.create(campana_id, total, usuario_id)
+            logger.info(f"Trabajo de envio {trabajo_id} creado para la campaña {campana_id} ({total} destinatarios)")
+            return self._repo.find_by_id(trabajo_id), None
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error creando el envio de la campaña {campana_id}")
+            return None, sanitize_error_message(e)
+
+    def pausar(self, trabajo_id):
+        """Pausa el trabajo; si esta corriendo, se detiene al terminar los correos en vuelo."""
+        return self._detener(trabajo_id, _PAUSAR, desde=("Pendiente", "En Curso"))
+
+    def cancelar(self, trabajo_id):
+        """Cancela el trabajo. Los destinatarios sin enviar quedan como 'Pendiente'."""
+        return self._detener(trabajo_id, _CANCELAR, desde=ESTADOS_VIVOS + ("Error",))
+
+    def reanudar(self, trabajo_id):
+        """
+        Vuelve a encolar un trabajo pausado o con error.
+
+        Returns: (ok: bool, error_message: str | None). Quien lo llama debe
+        lanzar procesar() despues (GestorEnvios lo hace).
+        """
+        try:
+            if self._repo.cambiar_estado(trabajo_id, ("Pausado", "Error"), "Pendiente"):
+                return True, None
+            trabajo = self._repo.find_by_id(trabajo_id)
+            if trabajo is not None and trabajo.estado in ("Pendiente", "En Curso"):
+                return True, None
+            return False, "El envío no está pausado"
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error reanudando el trabajo de envio {trabajo_id}")
+            return False, sanitize_error_message(e)
+
+    @staticmethod
+    def interrumpir_todos():
+        """Detiene los trabajos que corren sin cambiar su estado (cierre de la app)."""
+        with _lock:
+            for trabajo_id in _corriendo:
+                _solicitudes.setdefault(trabajo_id, _INTERRUMPIR)
+            return len(_corriendo)
+
+    def _detener(self, trabajo_id, solicitud, desde):
+        try:
+            if _pedir_detener(trabajo_id, solicitud):
+                return True, None
+            if self._repo.cambiar_estado(trabajo_id, desde, solicitud):
+                return True, None
+            return False, "El envío ya terminó"
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error cambiando el trabajo de envio {trabajo_id}")
+            return False, sanitize_error_message(e)
+
+    # ==========================================
+    # PROCESO (hilo de trabajo)
+    # ==========================================
+
+    def procesar(self, trabajo_id, al_progreso=None, tamano_lote=ENVIO_LOTE):
+        """
+        Envía el trabajo lote por lote hasta terminar o hasta que lo detengan.
+
+        Args:
+            al_progreso: callback(trabajo_id, enviados, fallidos, total),
+                         llamado despues de guardar cada lote.
+
+        Returns: (estado_final: str, error_message: str | None). Si el trabajo
+        ya lo corre otro hilo o no esta vivo, devuelve su estado sin hacer nada.
+        """
+        with _lock:
+            if trabajo_id in _corriendo:
+                return "En Curso", None
+            _corriendo.add(trabajo_id)
+        try:
+            return self._procesar(trabajo_id, al_progreso, tamano_lote)
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error procesando el trabajo de envio {trabajo_id}")
+            error = sanitize_error_message(e)
+            try:
+                self._repo.update_estado(trabajo_id, "Error", error)
+            except Exception:
+                AppLogger.log_exception(logger, f"No se pudo marcar con error el trabajo {trabajo_id}")
+            return "Error", error
+        finally:
+            with _lock:
+                _corriendo.discard(trabajo_id)
+                _solicitudes.pop(trabajo_id, None)
+
+    def _procesar(self, trabajo_id, al_progreso, tamano_lote):
+        trabajo = self._repo.find_by_id(trabajo_id)
+        if trabajo is None:
+            return "Error", "Trabajo de envío no encontrado"
+        if trabajo.estado not in ("Pendiente", "En Curso"):
+            return trabajo.estado, None
+
+        campana_id = trabajo.campana_id
+        envio, error = self._campana_service.preparar_envio(campana_id)
+        if error:
+            self._repo.update_estado(trabajo_id, "Error", error)
+            return "Error", error
+
+        self._repo.marcar_iniciado(trabajo_id)
+        logger.info(f"Trabajo de envio {trabajo_id} (campaña {campana_id}) en curso desde el destinatario {trabajo.ultimo_destinatario_id}")
+
+        ultimo_id = trabajo.ultimo_destinatario_id
+
+        def guardar_avance(enviados, fallidos):
+            # misma transaccion que los estados: contadores y punto de control
+            # nunca quedan detras de lo que ya se marco como enviado
+            self._repo.guardar_avance(trabajo_id, enviados, fallidos, ultimo_id)
+
+        escritor = self._campana_service.escritor_estados(
+            campana_id, trabajo.enviados, trabajo.fallidos, al_vaciar=guardar_avance,
+        )
+        detener = lambda: _solicitud(trabajo_id) is not None
+        conn_error = None
+
+        while not detener():
+            lote = self._campana_repo.tomar_pendientes(campana_id, ultimo_id, tamano_lote)
+            if not lote:
+                break
+            antes = escritor.procesados
+            try:
+                conn_error = envio.enviar(lote, escritor.agregar, cancelado=detener)
+            finally:
+                if escritor.procesados - antes == len(lote):
+                    # lote completo; si se corto, los que faltan siguen
+                    # Pendientes y el siguiente lote los vuelve a tomar
+                    ultimo_id = lote[-1]["DestinatarioID"]
+                escritor.vaciar()
+
+            if al_progreso is not None:
+                al_progreso(trabajo_id, escritor.enviados, escritor.fallidos, trabajo.total_destinatarios)
+            if conn_error:
+                break
+
+        enviados, fallidos = escritor.enviados, escritor.fallidos
+        solicitud = _solicitud(trabajo_id)
+        if conn_error:
+            estado = "Error"
+            self._repo.update_estado(trabajo_id, estado, f"Error de conexión SMTP: {conn_error}")
+        elif solicitud == _INTERRUMPIR:
+            # cierre de la app: sigue En Curso para reanudarse al arrancar
+            logger.info(f"Trabajo de envio {trabajo_id} interrumpido en el destinatario {ultimo_id}")
+            return "En Curso", None
+        elif solicitud is not None:
+            estado = solicitud
+            self._repo.update_estado(trabajo_id, estado)
+        else:
+            estado = "Completado"
+            self._repo.update_estado(trabajo_id, estado)
+
+        self._campana_service.cerrar_envio(campana_id, enviados)
+        logger.info(f"Trabajo de envio {trabajo_id} {estado.lower()}: {enviados} enviados, {fallidos} fallidos")
+        return estado, (f"Error de conexión SMTP: {conn_error}" if conn_error else None)
@@ -0,0 +1,278 @@
+"""
+Traza del arranque: en que se va el tiempo desde que main.py empieza hasta
+que la ventana principal se pinta por primera vez.
+
+Que registra:
+    - Fases (fase()): bloques con inicio y duracion, por ejemplo
+      initialize_database, has_users o la construccion de MainView.
+    - Marcas (marcar()): instantes sueltos, como "login_mostrado".
+    - Vistas (registrar_vista()): cuanto tardo en construirse cada seccion.
+    - Importaciones (capturar_imports()): tiempo propio y acumulado de cada
+      modulo, como `python -X importtime`, pero sin salir de la aplicacion
+      (sirve tambien en el ejecutable de PyInstaller, donde no hay forma de
+      pasar -X). Es opcional porque envuelve cada importacion: se activa con
+      TRAZA_IMPORTS_ARRANQUE o con la variable de entorno CRM_TRAZA_IMPORTS=1.
+
+El reporte se guarda como JSON en REPORTE_ARRANQUE_PATH (logs/arranque.json).
+Los tiempos van en ms desde que se importo este modulo, que es lo primero
+que hace main.py; lo que tarda el interprete en arrancar queda fuera.
+
+No depende de Qt. Uso (main.py):
+    from app.utils.arranque import traza_arranque
+    traza = traza_arranque()
+    ...
+    with traza.fase("initialize_database"):
+        initialize_database()
+    traza.marcar("primer_pintado")
+    traza.guardar()
+"""
+
+import importlib.abc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from app.config.settings import REPORTE_ARRANQUE_PATH, TRAZA_IMPORTS_ARRANQUE
+
+_INICIO = time.perf_counter()
+
+
+def _ms(segundos):
+    return round(segundos * 1000, 3)
+
+
+class _CargadorCronometrado:
+    """
+    Envuelve el loader de un modulo para medir su exec_module.
+
+    Solo vive mientras el modulo se ejecuta: al terminar se devuelve el
+    loader original a __loader__ y __spec__.loader.
+    """
+
+    def __init__(self, cargador, buscador, nombre, busqueda):
+        self._cargador = cargador
+        self._buscador = buscador
+        self._nombre = nombre
+        self._busqueda = busqueda
+
+    def __getattr__(self, nombre):
+        return getattr(self._cargador, nombre)
+
+    def create_module(self, spec):
+        return self._cargador.create_module(spec)
+
+    def exec_module(self, modulo):
+        spec = getattr(modulo, "__spec__", None)
+        self._buscador._entrar()
+        inicio = time.perf_counter()
+        try:
+            self._cargador.exec_module(modulo)
+        finally:
+            duracion = time.perf_counter() - inicio + self._busqueda
+            self._buscador._salir(self._nombre, duracion)
+            modulo.__loader__ = self._cargador
+            if spec is not None and spec.loader is self:
+                spec.loader = self._cargador
+
+
+class _BuscadorCronometrado(importlib.abc.MetaPathFinder):
+    """
+    Primer elemento de sys.meta_path: pide el spec a los demas buscadores y
+    cambia su loader por uno cronometrado.
+
+    Como en -X importtime, el tiempo propio de un modulo es su tiempo
+    acumulado menos el acumulado de los modulos que importo mientras corria.
+    """
+
+    def __init__(self, traza):
+        self._traza = traza
+        self._local = threading.local()
+
+    def _pila(self):
+        if not hasattr(self._local, "pila"):
+            self._local.pila = []
+        return self._local.pila
+
+    def find_spec(self, nombre, path, target=None):
+        inicio = time.perf_counter()
+        for buscador in sys.meta_path:
+            if buscador is self or not hasattr(buscador, "find_spec"):
+                continue
+            spec = buscador.find_spec(nombre, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _CargadorCronometrado(
+                spec.loader, self, nombre, time.perf_counter() - inicio,
+            )
+        return spec
+
+    def _entrar(self):
+        # acumulado de los hijos de este modulo
+        self._pila().append(0.0)
+
+    def _salir(self, nombre, acumulado):
+        pila = self._pila()
+        hijos = pila.pop()
+        if pila:
+            pila[-1] += acumulado
+        self._traza._registrar_import(nombre, acumulado - hijos, acumulado, len(pila))
+
+
+class TrazaArranque:
+    """
+    Tiempos del arranque de la aplicacion.
+
+    Args:
+        inicio: instante (perf_counter) que se toma como 0.
+        reloj:  fuente de tiempo (para las pruebas).
+    """
+
+    def __init__(self, inicio=None, reloj=time.perf_counter):
+        self._reloj = reloj
+        self._inicio = reloj() if inicio is None else inicio
+        self._fases = []
+        self._marcas = {}
+        self._vistas = []
+        self._imports = []
+        self._buscador = None
+        self._lock = threading.Lock()
+
+    def _desde_inicio(self, instante=None):
+        return _ms((self._reloj() if instante is None else instante) - self._inicio)
+
+    # ---- fases, marcas y vistas ----
+
+    @contextmanager
+    def fase(self, nombre):
+        """Mide el bloque with como una fase del arranque."""
+        inicio = self._reloj()
+        try:
+            yield
+        finally:
+            fin = self._reloj()
+            with self._lock:
+                self._fases.append({
+                    "nombre": nombre,
+                    "inicio_ms": self._desde_inicio(inicio),
+                    "duracion_ms": _ms(fin - inicio),
+                })
+
+    def marcar(self, nombre):
+        """Registra el instante actual con ese nombre (la ultima marca gana)."""
+        with self._lock:
+            self._marcas[nombre] = self._desde_inicio()
+
+    def registrar_vista(self, nombre, segundos):
+        """Tiempo de construccion de una vista (lo llama RegistroSecciones)."""
+        with self._lock:
+            self._vistas.append({
+                "nombre": nombre,
+                "inicio_ms": self._desde_inicio(self._reloj() - segundos),
+                "duracion_ms": _ms(segundos),
+            })
+
+    def marca(self, nombre):
+        """ms desde el inicio de la marca, o None si no se registro."""
+        return self._marcas.get(nombre)
+
+    # ---- importaciones ----
+
+    @property
+    def capturando_imports(self):
+        return self._buscador is not None
+
+    def capturar_imports(self):
+        """Empieza a medir cada importacion nueva (las ya hechas no cuentan)."""
+        if self._buscador is None:
+            self._buscador = _BuscadorCronometrado(self)
+            sys.meta_path.insert(0, self._buscador)
+
+    def detener_imports(self):
+        if self._buscador is not None:
+            try:
+                sys.meta_path.remove(self._buscador)
+            except ValueError:
+                pass
+            self._buscador = None
+
+    def _registrar_import(self, modulo, propio, acumulado, nivel):
+        with self._lock:
+            self._imports.append({
+                "modulo": modulo,
+                "propio_ms": _ms(propio),
+                "acumulado_ms": _ms(acumulado),
+                "nivel": nivel,
+            })
+
+    @property
+    def imports(self):
+        """Modulos medidos en el orden en que terminaron (como -X importtime)."""
+        with self._lock:
+            return list(self._imports)
+
+    # ---- reporte ----
+
+    def reporte(self):
+        """Todo lo registrado, como dict listo para json."""
+        with self._lock:
+            imports = list(self._imports)
+            reporte = {
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "ejecutable": bool(getattr(sys, "frozen", False)),
+                "fases": list(self._fases),
+                "marcas": dict(self._marcas),
+                "vistas": list(self._vistas),
+            }
+        if imports:
+            reporte["imports"] = {
+                "total_ms": round(sum(i["acumulado_ms"] for i in imports if i["nivel"] == 0), 3),
+                "modulos": sorted(imports, key=lambda i: i["acumulado_ms"], reverse=True),
+            }
+        return reporte
+
+    def guardar(self, ruta=None):
+        """
+        Escribe el reporte como JSON. Un fallo solo se registra en el log:
+        la traza nunca debe impedir que la aplicacion arranque.
+
+        Returns:
+            str | None: la ruta escrita, o None si no se pudo.
+        """
+        ruta = ruta or REPORTE_ARRANQUE_PATH
+        try:
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            temporal = f"{ruta}.tmp"
+            with open(temporal, "w", encoding="utf-8") as f:
+                json.dump(self.reporte(), f, ensure_ascii=False, indent=2)
+            os.replace(temporal, ruta)
+        except OSError:
+            from app.utils.logger import AppLogger
+            AppLogger.log_exception(AppLogger.get_logger(__name__), "No se pudo guardar el reporte de arranque")
+            return None
+        return ruta
+
+
+# Traza global del proceso; empieza a contar al importar este modulo.
+_traza = None
+
+
+def traza_arranque():
+    """
+    Devuelve la traza global. La primera llamada activa la captura de
+    importaciones si TRAZA_IMPORTS_ARRANQUE o CRM_TRAZA_IMPORTS=1.
+    """
+    global _traza
+    if _traza is None:
+        _traza = TrazaArranque(inicio=_INICIO)
+        if TRAZA_IMPORTS_ARRANQUE or os.environ.get("CRM_TRAZA_IMPORTS") == "1":
+            _traza.capturar_imports()
+    return _traza
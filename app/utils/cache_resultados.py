@@ -0,0 +1,138 @@
+"""
+Cache en memoria de resultados de consultas, invalidado por version de tabla.
+
+Problema que resuelve:
+    Cada vez que se cambia de pestana en Reportes (o se pulsa Actualizar) se
+    vuelven a correr vistas pesadas como vw_PipelineVentas aunque nadie haya
+    modificado los datos. Con este cache, la segunda consulta con los mismos
+    parametros devuelve la lista ya calculada.
+
+Invalidacion por version (no por tiempo):
+    Los triggers de VersionTablas incrementan un contador por tabla en cada
+    INSERT/UPDATE/DELETE, venga de la conexion que venga (mismo esquema que
+    VersionCatalogos para CatalogCache). Cada entrada guarda las versiones de
+    las tablas de las que depende al momento de cargarse; en cada consulta se
+    leen las versiones actuales (una consulta de ~10 filas) y si alguna
+    cambio, la entrada se vuelve a cargar. Mientras nadie escriba en esas
+    tablas, el resultado sigue vigente indefinidamente.
+
+    Las versiones se leen ANTES de correr la consulta: si alguien escribe
+    mientras tanto, la entrada queda con la version vieja y la siguiente
+    consulta la recarga (nunca se sirve un dato mas viejo que su version).
+
+Presupuesto de memoria (LRU):
+    El tamano de cada resultado se estima con sys.getsizeof sobre una muestra
+    de filas. Si el total pasa del presupuesto se descartan las entradas
+    usadas hace mas tiempo; un resultado mas grande que todo el presupuesto
+    no se guarda.
+
+Uso:
+    cache = CacheResultados(presupuesto_mb=64)
+    datos = cache.obtener(
+        ("pipeline", desde, hasta), ("Oportunidades", "Empresas"),
+        lambda: repo.get_pipeline_ventas(desde, hasta),
+    )
+
+    Las listas devueltas se comparten entre llamadas: no modificarlas.
+"""
+
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+
+from app.database.connection import get_reader
+
+# filas que se miden para estimar el tamano de un resultado
+_MUESTRA_TAMANO = 50
+
+
+def estimar_bytes(filas):
+    """Tamano aproximado de una lista de dicts (o tuplas) con valores simples."""
+    total = sys.getsizeof(filas)
+    if not filas:
+        return total
+    muestra = filas[:_MUESTRA_TAMANO]
+    medido = 0
+    for fila in muestra:
+        valores = fila.values() if isinstance(fila, dict) else fila
+        medido += sys.getsizeof(fila) + sum(sys.getsizeof(v) for v in valores)
+    return total + medido * len(filas) // len(muestra)
+
+
+class CacheResultados:
+    """
+    Cache LRU de resultados, con presupuesto de memoria y validez por version.
+
+    Es seguro usarlo desde varios hilos (las consultas de reportes corren en
+    el ejecutor de tareas en segundo plano).
+    """
+
+    def __init__(self, presupuesto_mb):
+        self._presupuesto = int(presupuesto_mb * 1024 * 1024)
+        # clave -> (valor, versiones de sus tablas, bytes estimados)
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def obtener(self, clave, tablas, cargar):
+        """
+        Devuelve el resultado de `clave`, llamando a cargar() si no hay uno vigente.
+
+        Args:
+            clave:  tupla hashable con todo lo que distingue al resultado
+                    (reporte, parametros, alcance).
+            tablas: nombres de las tablas de VersionTablas de las que depende.
+            cargar: funcion sin argumentos que ejecuta la consulta.
+        """
+        versiones = self._leer_versiones(tablas)
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and versiones is not None and entrada[1] == versiones:
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[0]
+            self.fallos += 1
+
+        valor = cargar()
+        if versiones is not None:
+            self._guardar(clave, valor, versiones)
+        return valor
+
+    def _guardar(self, clave, valor, versiones):
+        tamano = estimar_bytes(valor)
+        with self._lock:
+            anterior = self._entradas.pop(clave, None)
+            if anterior is not None:
+                self._bytes -= anterior[2]
+            if tamano > self._presupuesto:
+                return
+            self._entradas[clave] = (valor, versiones, tamano)
+            self._bytes += tamano
+            while self._bytes > self._presupuesto:
+                _, (_, _, liberado) = self._entradas.popitem(last=False)
+                self._bytes -= liberado
+
+    @staticmethod
+    def _leer_versiones(tablas):
+        """Versiones actuales de `tablas` (tupla), o None si VersionTablas no existe."""
+        try:
+            with get_reader() as conn:
+                versiones = dict(conn.execute("SELECT Tabla, Version FROM VersionTablas").fetchall())
+        except sqlite3.OperationalError:
+            return None
+        return tuple(versiones.get(tabla) for tabla in tablas)
+
+    def invalidar_todo(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def __len__(self):
+        return len(self._entradas)
@@ -12,16 +12,29 @@ Problema que resuelve:
     la interfaz mas rapida y fluida.
 
 Patron usado: Cache de clase compartida (Class-level cache)
-    Los atributos _cache y _cache_time son de CLASE, no de instancia. Esto significa
-    que son compartidos por todos los usos de CatalogCache en toda la aplicacion,
-    como si fuera un singleton. No es necesario instanciar la clase; todos los
-    metodos son @classmethod.
-
-TTL (Time To Live):
-    El cache tiene una vigencia de 5 minutos (300 segundos). Despues de ese tiempo
-    se considera expirado y la siguiente consulta volvera a leer de la BD.
-    Esto garantiza que si un administrador agrega una nueva industria, los
-    formularios la veran en menos de 5 minutos sin necesidad de reiniciar la app.
+    Los atributos _cache y _cache_version son de CLASE, no de instancia. Esto
+    significa que son compartidos por todos los usos de CatalogCache en toda la
+    aplicacion, como si fuera un singleton. No es necesario instanciar la clase;
+    todos los metodos son @classmethod.
+
+Precarga (una sola consulta):
+    precargar() se llama al iniciar sesion y trae TODOS los catalogos con una
+    unica consulta UNION ALL, en lugar de una consulta por ComboBox. Estados y
+    ciudades se cargan completos y se indexan por su padre (pais -> estados,
+    estado -> ciudades), asi el selector en cascada filtra en memoria.
+
+Invalidacion por version (en lugar de TTL):
+    Los triggers de la tabla VersionCatalogos incrementan un contador por tabla
+    en cada INSERT/UPDATE/DELETE, venga de la conexion que venga. Cada entrada
+    del cache recuerda la version de su tabla al cargarse; a lo mas cada
+    _ttl_seconds (2 s) se leen las versiones (una consulta de ~14 filas) y se
+    descartan solo las entradas cuya tabla cambio. Mientras nadie modifique un
+    catalogo, sus datos siguen vigentes indefinidamente.
+
+    Se eligio una tabla de versiones y no PRAGMA data_version porque este
+    ultimo no cambia con los commits de la propia conexion (justo la que usan
+    las pantallas de catalogos) y si cambia con cualquier escritura de otra
+    conexion, aunque no toque catalogos.
 
     Para cambios inmediatos, llamar CatalogCache.invalidate('nombre_catalogo') o
     CatalogCache.invalidate_all() despues de guardar en la BD.
@@ -39,10 +52,35 @@ Como usar este modulo en formularios (vistas):
     CatalogCache.invalidate('industrias')
 """
 
+import sqlite3
+import threading
 import time
 from typing import Dict, List, Tuple, Optional
 from app.database.connection import get_connection
 
+# Catalogos que conoce la precarga:
+#   clave -> (tabla, columna ID, expresion a mostrar, columnas de ORDER BY, filtro WHERE)
+_CATALOGOS = {
+    'industrias':        ('Industrias', 'IndustriaID', 'Nombre', ('Nombre',), ''),
+    'tamanos':           ('TamanosEmpresa', 'TamanoID', 'Nombre', ('Nombre',), ''),
+    'origenes':          ('OrigenesContacto', 'OrigenID', 'Nombre', ('Nombre',), ''),
+    'monedas':           ('Monedas', 'MonedaID', 'Nombre', ('Nombre',), ''),
+    'paises':            ('Paises', 'PaisID', 'Nombre', ('Nombre',), ''),
+    'estados':           ('Estados', 'EstadoID', 'Nombre', ('Nombre',), ''),
+    'ciudades':          ('Ciudades', 'CiudadID', 'Nombre', ('Nombre',), ''),
+    'usuarios':          ('Usuarios', 'UsuarioID', "Nombre || ' ' || ApellidoPaterno",
+                          ("Nombre || ' ' || ApellidoPaterno",), 'Activo = 1'),
+    'etapas_venta':      ('EtapasVenta', 'EtapaID', 'Nombre', ('Orden', 'Nombre'), ''),
+    'motivos_perdida':   ('MotivosPerdida', 'MotivoID', 'Nombre', ('Nombre',), ''),
+    'tipos_actividad':   ('TiposActividad', 'TipoActividadID', 'Nombre', ('Nombre',), ''),
+    'estados_actividad': ('EstadosActividad', 'EstadoActividadID', 'Nombre', ('Nombre',), ''),
+    'etiquetas':         ('Etiquetas', 'EtiquetaID', 'Nombre', ('Nombre',), ''),
+    'prioridades':       ('Prioridades', 'PrioridadID', 'Nombre', ('Nivel',), ''),
+}
+
+# Cascada geografica: clave del catalogo hijo -> columna que apunta a su padre
+_PADRES = {'estados': 'PaisID', 'ciudades': 'EstadoID'}
+
 
 class CatalogCache:
     """
@@ -55,19 +93,33 @@ class CatalogCache:
         datos = cache.get_industrias()          # tambien funciona, pero innecesario
 
     Atributos de clase:
-        _cache      : Diccionario {clave: lista_de_tuplas}. Almacena los datos en memoria.
-        _cache_time : Diccionario {clave: timestamp}. Guarda cuando se cargo cada catalogo.
-        _ttl_seconds: Segundos de vigencia del cache. Por defecto 300 (5 minutos).
+        _cache        : Diccionario {clave: lista_de_tuplas}. Almacena los datos en memoria.
+        _cache_version: Diccionario {clave: (tabla, version)}. Version de la tabla con
+                        la que se cargo cada entrada (None si aun no se conocia).
+        _hijos        : Indice de la cascada geografica
+                        {'estados': {pais_id: [(id, nombre)]}, 'ciudades': {...}}.
+        _versiones    : Ultima lectura de VersionCatalogos {tabla: version}.
+        _ttl_seconds  : Segundos entre revalidaciones de version. Por defecto 2.
     """
 
     # Diccionario principal del cache. Clave: nombre del catalogo. Valor: lista de tuplas (id, nombre).
     _cache: Dict[str, List[Tuple]] = {}
 
-    # Timestamps de cuando se cargo cada catalogo. Usado para calcular si el cache expiro.
-    _cache_time: Dict[str, float] = {}
+    # Tabla y version con que se cargo cada entrada del cache.
+    _cache_version: Dict[str, Tuple[str, Optional[int]]] = {}
+
+    # Indice padre -> hijos de estados y ciudades (solo existe tras cargar el catalogo completo).
+    _hijos: Dict[str, Dict[int, List[Tuple]]] = {}
+
+    # Ultima lectura de la tabla VersionCatalogos y cuando se hizo.
+    _versiones: Dict[str, int] = {}
+    _ultima_revision = 0.0
 
-    # Tiempo de vida del cache en segundos. Despues de este tiempo, la BD se vuelve a consultar.
-    _ttl_seconds = 300  # 5 minutos
+    # Cada cuantos segundos, como maximo, se comparan las versiones con la BD.
+    _ttl_seconds = 2
+
+    # La precarga puede correr en un hilo de trabajo mientras la GUI lee el cache.
+    _lock = threading.RLock()
 
     # -------------------------------------------------------------------------
     # Metodos publicos para obtener cada catalogo
@@ -79,27 +131,27 @@ class CatalogCache:
     @classmethod
     def get_industrias(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de industrias [(id, nombre), ...] para ComboBox."""
-        return cls._get_catalog('industrias', 'Industrias', 'IndustriaID', 'Nombre')
+        return cls._get_catalog('industrias')
 
     @classmethod
     def get_tamanos_empresa(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de tamanos de empresa [(id, nombre), ...] para ComboBox."""
-        return cls._get_catalog('tamanos', 'TamanosEmpresa', 'TamanoID', 'Nombre')
+        return cls._get_catalog('tamanos')
 
     @classmethod
     def get_origenes_contacto(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de origenes de contacto/empresa [(id, nombre), ...] para ComboBox."""
-        return cls._get_catalog('origenes', 'OrigenesContacto', 'OrigenID', 'Nombre')
+        return cls._get_catalog('origenes')
 
     @classmethod
     def get_monedas(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de monedas [(id, nombre), ...] para ComboBox."""
-        return cls._get_catalog('monedas', 'Monedas', 'MonedaID', 'Nombre')
+        return cls._get_catalog('monedas')
 
     @classmethod
     def get_paises(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de paises [(id, nombre), ...] para ComboBox."""
-        return cls._get_catalog('paises', 'Paises', 'PaisID', 'Nombre')
+        return cls._get_catalog('paises')
 
     @classmethod
     def get_estados(cls, pais_id: Optional[int] = None) -> List[Tuple[int, str]]:
@@ -114,14 +166,9 @@ class CatalogCache:
             pais_id: ID del pais para filtrar. Si es None, retorna todos los estados.
         """
         if pais_id:
-            # Cache separado por pais para no mezclar resultados
-            cache_key = f'estados_pais_{pais_id}'
-            return cls._get_catalog(
-                cache_key, 'Estados', 'EstadoID', 'Nombre',
-                where_clause=f'PaisID = {pais_id}'
-            )
+            return cls._get_hijos('estados', pais_id)
         # Sin filtro: retornar todos los estados (todos los paises)
-        return cls._get_catalog('estados', 'Estados', 'EstadoID', 'Nombre')
+        return cls._get_catalog('estados')
 
     @classmethod
     def get_ciudades(cls, estado_id: Optional[int] = None) -> List[Tuple[int, str]]:
@@ -135,14 +182,9 @@ class CatalogCache:
             estado_id: ID del estado para filtrar. Si es None, retorna todas las ciudades.
         """
         if estado_id:
-            # Cache separado por estado para no mezclar ciudades de diferentes estados
-            cache_key = f'ciudades_estado_{estado_id}'
-            return cls._get_catalog(
-                cache_key, 'Ciudades', 'CiudadID', 'Nombre',
-                where_clause=f'EstadoID = {estado_id}'
-            )
+            return cls._get_hijos('ciudades', estado_id)
         # Sin filtro: retornar todas las ciudades (todos los estados/paises)
-        return cls._get_catalog('ciudades', 'Ciudades', 'CiudadID', 'Nombre')
+        return cls._get_catalog('ciudades')
 
     @classmethod
     def get_usuarios(cls) -> List[Tuple[int, str]]:
@@ -153,11 +195,7 @@ class CatalogCache:
         en los campos de asignacion de oportunidades, actividades, etc.
         El nombre mostrado es 'Nombre Apellido' (concatenacion SQL).
         """
-        return cls._get_catalog(
-            'usuarios', 'Usuarios', 'UsuarioID',
-            'Nombre || " " || ApellidoPaterno',  # concatenar nombre y apellido en SQL
-            where_clause='Activo = 1'            # solo usuarios activos en el sistema
-        )
+        return cls._get_catalog('usuarios')
 
     @classmethod
     def get_etapas_venta(cls) -> List[Tuple[int, str]]:
@@ -165,43 +203,30 @@ class CatalogCache:
         Retorna la lista de etapas de venta ordenadas por su campo Orden.
 
         Las etapas de venta tienen un orden especifico (ej: Prospecto=1, Demo=2,
-        Propuesta=3, Negociacion=4, Cerrada=5). Se usa ORDER BY Orden para que
-        el ComboBox las muestre en el orden del pipeline de ventas.
-
-        Nota: Este metodo no usa _get_catalog() porque necesita un ORDER BY especial
-        (por Orden, no por Nombre como hace el metodo generico).
+        Propuesta=3, Negociacion=4, Cerrada=5). Se usa ORDER BY Orden, Nombre para
+        que el ComboBox las muestre en el orden del pipeline de ventas.
         """
-        # Verificar si el cache es valido antes de consultar la BD
-        if cls._is_cache_valid('etapas_venta'):
-            return cls._cache['etapas_venta']
-        conn = get_connection()
-        # ORDER BY Orden, Nombre: primero por orden numerico, luego alfabetico como tiebreaker
-        cursor = conn.execute('SELECT EtapaID, Nombre FROM EtapasVenta ORDER BY Orden, Nombre')
-        result = [(row[0], row[1]) for row in cursor.fetchall()]
-        # Guardar en cache para reutilizar
-        cls._cache['etapas_venta'] = result
-        cls._cache_time['etapas_venta'] = time.time()
-        return result
+        return cls._get_catalog('etapas_venta')
 
     @classmethod
     def get_motivos_perdida(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de motivos de perdida de oportunidades para ComboBox."""
-        return cls._get_catalog('motivos_perdida', 'MotivosPerdida', 'MotivoID', 'Nombre')
+        return cls._get_catalog('motivos_perdida')
 
     @classmethod
     def get_tipos_actividad(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de tipos de actividad (Llamada, Reunion, Tarea...) para ComboBox."""
-        return cls._get_catalog('tipos_actividad', 'TiposActividad', 'TipoActividadID', 'Nombre')
+        return cls._get_catalog('tipos_actividad')
 
     @classmethod
     def get_estados_actividad(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de estados de actividad (Pendiente, En progreso, Completada...) para ComboBox."""
-        return cls._get_catalog('estados_actividad', 'EstadosActividad', 'EstadoActividadID', 'Nombre')
+        return cls._get_catalog('estados_actividad')
 
     @classmethod
     def get_etiquetas(cls) -> List[Tuple[int, str]]:
         """Retorna la lista de etiquetas/tags disponibles para asignar a contactos y empresas."""
-        return cls._get_catalog('etiquetas', 'Etiquetas', 'EtiquetaID', 'Nombre')
+        return cls._get_catalog('etiquetas')
 
     @classmethod
     def get_prioridades(cls) -> List[Tuple[int, str]]:
@@ -210,72 +235,189 @@ class CatalogCache:
 
         Las prioridades tienen un nivel numerico (ej: Alta=1, Media=2, Baja=3).
         Se ordena por Nivel para que el ComboBox las muestre de mayor a menor prioridad.
+        """
+        return cls._get_catalog('prioridades')
+
+    # -------------------------------------------------------------------------
+    # Precarga
+    # -------------------------------------------------------------------------
 
-        Nota: No usa _get_catalog() porque necesita ORDER BY Nivel, no por Nombre.
+    @classmethod
+    def precargar(cls) -> int:
+        """
+        Carga todos los catalogos de _CATALOGOS con una sola consulta.
+
+        Cada catalogo aporta un SELECT con la forma
+            (clave, id, nombre, padre, orden1, orden2)
+        y se unen con UNION ALL ordenando por clave y por las columnas de orden
+        de cada catalogo. Estados y ciudades traen ademas su padre para armar
+        el indice de la cascada geografica.
+
+        Las versiones se leen ANTES que los datos: si un catalogo cambia entre
+        ambas lecturas, su entrada queda con una version vieja y se recarga en
+        la siguiente revalidacion (nunca se da por vigente un dato viejo).
+
+        Returns:
+            int: numero total de filas cargadas.
         """
-        if cls._is_cache_valid('prioridades'):
-            return cls._cache['prioridades']
         conn = get_connection()
-        cursor = conn.execute('SELECT PrioridadID, Nombre FROM Prioridades ORDER BY Nivel')
-        result = [(row[0], row[1]) for row in cursor.fetchall()]
-        cls._cache['prioridades'] = result
-        cls._cache_time['prioridades'] = time.time()
-        return result
+        versiones = cls._leer_versiones(conn)
+
+        partes = []
+        for clave, (tabla, id_column, display, orden, where) in _CATALOGOS.items():
+            orden1, orden2 = (orden + ('NULL',))[:2]
+            parte = (
+                f"SELECT '{clave}', {id_column}, {display}, {_PADRES.get(clave, 'NULL')}, "
+                f"{orden1}, {orden2} FROM {tabla}"
+            )
+            if where:
+                parte += f' WHERE {where}'
+            partes.append(parte)
+        query = ' UNION ALL '.join(partes) + ' ORDER BY 1, 5, 6'
+
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        filas = cursor.execute(query).fetchall()
+
+        datos = {clave: [] for clave in _CATALOGOS}
+        hijos = {clave: {} for clave in _PADRES}
+        for clave, id_value, nombre, padre, _, _ in filas:
+            datos[clave].append((id_value, nombre))
+            if clave in hijos:
+                hijos[clave].setdefault(padre, []).append((id_value, nombre))
+
+        with cls._lock:
+            for clave, lista in datos.items():
+                tabla = _CATALOGOS[clave][0]
+                cls._cache[clave] = lista
+                cls._cache_version[clave] = (tabla, versiones.get(tabla))
+            cls._hijos.update(hijos)
+            cls._versiones = versiones
+            cls._ultima_revision = time.time()
+        return len(filas)
 
     # -------------------------------------------------------------------------
-    # Metodo generico privado
+    # Metodos genericos privados
     # -------------------------------------------------------------------------
 
     @classmethod
-    def _get_catalog(
-        cls,
-        cache_key: str,
-        table: str,
-        id_column: str,
-        display_column: str,
-        where_clause: str = ''
-    ) -> List[Tuple[int, str]]:
+    def _get_catalog(cls, cache_key: str) -> List[Tuple[int, str]]:
         """
-        Metodo generico para obtener cualquier catalogo con soporte de cache.
+        Obtiene un catalogo completo de _CATALOGOS con soporte de cache.
 
-        Construye y ejecuta una consulta SELECT dinamica con los parametros dados.
-        Si el cache es valido, lo retorna sin tocar la BD.
-        Si el cache expirou o no existe, consulta la BD y guarda el resultado.
+        Si el cache tiene la entrada (y su tabla no cambio), la retorna sin tocar
+        la BD. Si no, la consulta sola (sin esperar a la precarga); para estados
+        y ciudades aprovecha la misma lectura para armar el indice por padre.
 
         Parametros:
-            cache_key      : Clave unica para identificar este catalogo en el cache.
-                             Debe ser unica por catalogo/filtro para evitar colisiones.
-            table          : Nombre de la tabla en SQLite (ej. 'Industrias').
-            id_column      : Columna que contiene el ID numerico (ej. 'IndustriaID').
-            display_column : Columna a mostrar en la UI (ej. 'Nombre'), o expresion SQL.
-            where_clause   : Condicion WHERE opcional (sin el WHERE). Ej: 'Activo = 1'.
+            cache_key: Clave del catalogo en _CATALOGOS (ej. 'industrias').
 
         Returns:
             List[Tuple[int, str]]: Lista de (id, nombre) lista para llenar un ComboBox.
         """
-        # Si el cache es valido (existe y no ha expirado), retornarlo directamente
-        if cls._is_cache_valid(cache_key):
-            return cls._cache[cache_key]
+        cls._revalidar()
+        result = cls._cache.get(cache_key)
+        if result is not None:
+            return result
 
-        # Cache invalido o no existe: consultar la base de datos
-        conn = get_connection()
+        table, id_column, display_column, orden, where_clause = _CATALOGOS[cache_key]
+        padre = _PADRES.get(cache_key)
+        version = cls._versiones.get(table)
 
-        # Construir la query dinamicamente con los parametros
-        query = f'SELECT {id_column}, {display_column} FROM {table}'
+        columnas = f'{id_column}, {display_column}' + (f', {padre}' if padre else '')
+        query = f'SELECT {columnas} FROM {table}'
         if where_clause:
             query += f' WHERE {where_clause}'
-        query += f' ORDER BY {display_column}'  # siempre ordenar por nombre para consistencia
+        query += f" ORDER BY {', '.join(orden)}"
 
-        cursor = conn.execute(query)
+        rows = get_connection().execute(query).fetchall()
         # Convertir cada Row de SQLite a una tupla (id, nombre) simple
-        result = [(row[0], row[1]) for row in cursor.fetchall()]
+        result = [(row[0], row[1]) for row in rows]
+
+        with cls._lock:
+            if padre:
+                indice = {}
+                for row in rows:
+                    indice.setdefault(row[2], []).append((row[0], row[1]))
+                cls._hijos[cache_key] = indice
+            cls._guardar(cache_key, table, version, result)
+        return result
 
-        # Guardar en cache con timestamp actual
-        cls._cache[cache_key] = result
-        cls._cache_time[cache_key] = time.time()
+    @classmethod
+    def _get_hijos(cls, cache_key: str, padre_id: int) -> List[Tuple[int, str]]:
+        """
+        Hijos de un pais (estados) o de un estado (ciudades).
 
+        Con el indice en memoria (tras precargar o tras pedir el catalogo
+        completo) no hay consulta. Si aun no existe, se consulta solo ese padre
+        con un parametro y se guarda en '<clave>_<padre>_<id>'.
+        """
+        cls._revalidar()
+        indice = cls._hijos.get(cache_key)
+        if indice is not None:
+            return indice.get(padre_id, [])
+
+        table, id_column, display_column, orden, _ = _CATALOGOS[cache_key]
+        columna_padre = _PADRES[cache_key]
+        entrada = f"{cache_key}_{columna_padre[:-2].lower()}_{padre_id}"
+        result = cls._cache.get(entrada)
+        if result is not None:
+            return result
+
+        version = cls._versiones.get(table)
+        query = (
+            f"SELECT {id_column}, {display_column} FROM {table} "
+            f"WHERE {columna_padre} = ? ORDER BY {', '.join(orden)}"
+        )
+        rows = get_connection().execute(query, (padre_id,)).fetchall()
+        result = [(row[0], row[1]) for row in rows]
+        with cls._lock:
+            cls._guardar(entrada, table, version, result)
         return result
 
+    @classmethod
+    def _guardar(cls, cache_key, table, version, result):
+        if not cls._cache:
+            # el reloj de revalidacion arranca con la primera entrada
+            cls._ultima_revision = time.time()
+        cls._cache[cache_key] = result
+        cls._cache_version[cache_key] = (table, version)
+
+    @staticmethod
+    def _leer_versiones(conn) -> Dict[str, int]:
+        """Lee VersionCatalogos. {} si la tabla no existe (BD sin migrar)."""
+        try:
+            return dict(conn.execute('SELECT Tabla, Version FROM VersionCatalogos').fetchall())
+        except sqlite3.OperationalError:
+            return {}
+
+    @classmethod
+    def _revalidar(cls):
+        """
+        Descarta las entradas cuya tabla cambio desde que se cargaron.
+
+        Solo consulta la BD si hay algo en cache y pasaron _ttl_seconds desde
+        la ultima revision. Las entradas sin version conocida (cargadas antes
+        de la primera lectura de versiones) se descartan una vez para quedar
+        etiquetadas en la siguiente carga.
+        """
+        if not cls._cache or time.time() - cls._ultima_revision < cls._ttl_seconds:
+            return
+        versiones = cls._leer_versiones(get_connection())
+        with cls._lock:
+            for clave, (tabla, version) in list(cls._cache_version.items()):
+                if version is None or versiones.get(tabla) != version:
+                    cls._descartar(clave)
+            cls._versiones = versiones
+            cls._ultima_revision = time.time()
+
+    @classmethod
+    def _descartar(cls, cache_key):
+        cls._cache.pop(cache_key, None)
+        cls._cache_version.pop(cache_key, None)
+        # el indice geografico se arma con el catalogo completo: cae con el
+        cls._hijos.pop(cache_key, None)
+
     # -------------------------------------------------------------------------
     # Metodos de gestion del cache
     # -------------------------------------------------------------------------
@@ -285,16 +427,15 @@ class CatalogCache:
         """
         Invalida el cache de un catalogo especifico.
 
-        Llamar este metodo despues de crear, editar o eliminar un registro
-        de un catalogo para que la proxima consulta obtenga datos actualizados de la BD.
+        Los cambios hechos desde la app ya se detectan por version; este metodo
+        sirve para verlos de inmediato, sin esperar la siguiente revalidacion.
 
         Parametros:
             catalog_name: La misma clave que se usa internamente (ej: 'industrias',
                           'origenes', 'etapas_venta', 'ciudades_estado_5').
         """
-        if catalog_name in cls._cache:
-            del cls._cache[catalog_name]
-            del cls._cache_time[catalog_name]
+        with cls._lock:
+            cls._descartar(catalog_name)
 
     @classmethod
     def invalidate_all(cls):
@@ -304,42 +445,22 @@ class CatalogCache:
         Util despues de importar datos masivos o cuando se hacen cambios
         en multiples catalogos al mismo tiempo.
         """
-        cls._cache.clear()
-        cls._cache_time.clear()
-
-    @classmethod
-    def _is_cache_valid(cls, cache_key: str) -> bool:
-        """
-        Verifica si el cache de un catalogo especifico esta vigente.
-
-        El cache es valido si:
-        1. Existe una entrada para esa clave en _cache.
-        2. La edad del cache (tiempo actual - timestamp de carga) es menor que _ttl_seconds.
-
-        Parametros:
-            cache_key: Clave del catalogo a verificar.
-
-        Returns:
-            bool: True si el cache existe y no ha expirado. False en caso contrario.
-        """
-        # Si la clave no existe en el cache, definitivamente no es valido
-        if cache_key not in cls._cache:
-            return False
-
-        # Calcular cuantos segundos han pasado desde que se cargo el cache
-        age = time.time() - cls._cache_time.get(cache_key, 0)
-        # El cache es valido solo si su edad es menor que el TTL configurado
-        return age < cls._ttl_seconds
+        with cls._lock:
+            cls._cache.clear()
+            cls._cache_version.clear()
+            cls._hijos.clear()
+            cls._versiones = {}
+            cls._ultima_revision = 0.0
 
     @classmethod
     def set_ttl(cls, seconds: int):
         """
-        Configura el tiempo de vida (TTL) del cache en segundos.
+        Configura cada cuantos segundos se revisan las versiones de los catalogos.
 
-        Util para pruebas (set_ttl(0) para forzar siempre consultar la BD)
-        o para entornos donde los datos cambian con frecuencia.
+        Util para pruebas (set_ttl(0) revisa en cada consulta) o para reducir
+        todavia mas las lecturas de VersionCatalogos.
 
         Parametros:
-            seconds: Nuevos segundos de vigencia. 0 = sin cache (siempre va a BD).
+            seconds: Segundos entre revalidaciones. 0 = revisar siempre.
         """
         cls._ttl_seconds = seconds
@@ -0,0 +1,179 @@
+"""
+Cola de envios de campanas: corre los trabajos de envio en segundo plano e
+informa su avance con senales de Qt.
+
+La logica (lotes, punto de control, pausa) vive en TrabajoEnvioService y no
+depende de Qt; este modulo solo la lanza en un ejecutor y traduce su avance
+a senales, como ejecutor.py hace con tareas.py.
+
+El ejecutor es propio del gestor, con ENVIO_HILOS hilos, y no el global: un
+envio ocupa su hilo durante toda la campana y la prioridad del QThreadPool
+no desaloja tareas que ya corren. En el pool compartido dos campanas y una
+importacion dejaban sin hilos al dashboard y a los reportes.
+
+Los trabajos no pertenecen a ninguna vista: siguen corriendo aunque el
+usuario cambie de seccion o la seccion de Comunicacion se libere. Al cerrar
+la app apagar_gestor_envios() los interrumpe sin cambiar su estado y
+reanudar_pendientes() los retoma en el siguiente arranque.
+
+Uso (en una vista):
+    gestor = obtener_gestor_envios()
+    gestor.progreso.connect(self._on_progreso_envio)
+    trabajo, error = gestor.iniciar(campana_id, usuario_id)
+"""
+
+from PyQt5.QtCore import QCoreApplication, QObject, pyqtSignal
+
+from app.config.settings import ENVIO_HILOS
+from app.utils.ejecutor import EjecutorTareas
+from app.utils.logger import AppLogger
+from app.utils.tareas import PRIORIDAD_BAJA
+
+logger = AppLogger.get_logger(__name__)
+
+
+def _clave(trabajo_id):
+    return f"envios.trabajo.{trabajo_id}"
+
+
+class GestorEnvios(QObject):
+    """
+    Lanza, pausa, reanuda y cancela trabajos de envio.
+
+    Senales:
+        progreso (trabajo_id, campana_id, enviados, fallidos, total): despues
+            de guardar cada lote.
+        estado_cambiado (trabajo_id, campana_id, estado): al encolarse,
+            pausarse, cancelarse o terminar (Completado, Error, ...).
+    """
+
+    progreso = pyqtSignal(int, int, int, int, int)
+    estado_cambiado = pyqtSignal(int, int, str)
+
+    # se emite desde el hilo de trabajo; Qt la entrega en el hilo de la GUI
+    _avance = pyqtSignal(int, int, int, int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # importado aqui: main.py importa este modulo al arrancar y el
+        # servicio arrastra smtplib/email, que solo hacen falta al enviar
+        from app.services.trabajo_envio_service import TrabajoEnvioService
+        self._service = TrabajoEnvioService()
+        # trabajo_id -> campana_id de los trabajos lanzados en esta sesion
+        self._campanas = {}
+        self._ejecutor = EjecutorTareas(max_hilos=ENVIO_HILOS, parent=self)
+        self._avance.connect(self._on_avance)
+        # una sola referencia: el ejecutor compara kwargs para detectar
+        # solicitudes repetidas
+        self._emitir_avance = self._avance.emit
+
+    # ==========================================
+    # API PUBLICA
+    # ==========================================
+
+    def iniciar(self, campana_id, usuario_id=None):
+        """Crea el trabajo de la campana y lo lanza. Returns: (TrabajoEnvio | None, error)."""
+        trabajo, error = self._service.crear_trabajo(campana_id, usuario_id)
+        if error:
+            return None, error
+        self._lanzar(trabajo.trabajo_id, trabajo.campana_id)
+        return trabajo, None
+
+    def pausar(self, trabajo_id):
+        ok, error = self._service.pausar(trabajo_id)
+        if ok and not self._service.corriendo(trabajo_id):
+            self._avisar_estado(trabajo_id, "Pausado")
+        return ok, error
+
+    def cancelar(self, trabajo_id):
+        ok, error = self._service.cancelar(trabajo_id)
+        if ok and not self._service.corriendo(trabajo_id):
+            self._avisar_estado(trabajo_id, "Cancelado")
+        return ok, error
+
+    def reanudar(self, trabajo_id):
+        ok, error = self._service.reanudar(trabajo_id)
+        if ok:
+            trabajo, _ = self._service.obtener_trabajo(trabajo_id)
+            if trabajo is not None:
+                self._lanzar(trabajo_id, trabajo.campana_id)
+        return ok, error
+
+    def reanudar_pendientes(self):
+        """Lanza los trabajos que quedaron encolados o a medias (arranque)."""
+        trabajos, error = self._service.trabajos_para_reanudar()
+        for trabajo in trabajos:
+            logger.info(f"Reanudando trabajo de envio {trabajo.trabajo_id} (campaña {trabajo.campana_id})")
+            self._lanzar(trabajo.trabajo_id, trabajo.campana_id)
+        return len(trabajos), error
+
+    def obtener_trabajo(self, trabajo_id):
+        trabajo, _ = self._service.obtener_trabajo(trabajo_id)
+        return trabajo
+
+    def trabajo_de_campana(self, campana_id):
+        """El trabajo vivo de la campana (Pendiente, En Curso o Pausado), o None."""
+        trabajo, _ = self._service.obtener_trabajo_vivo(campana_id)
+        return trabajo
+
+    def en_curso(self, trabajo_id):
+        return self._ejecutor.en_curso(_clave(trabajo_id))
+
+    def apagar(self):
+        """Detiene los trabajos que corren; quedan para el siguiente arranque."""
+        if self._service.interrumpir_todos():
+            logger.info("Envios en curso interrumpidos; se reanudaran al volver a iniciar")
+        # los encolados no llegan a empezar y siguen Pendiente en la BD
+        self._ejecutor.apagar()
+
+    # ==========================================
+    # INTERNOS (hilo de la GUI)
+    # ==========================================
+
+    def _lanzar(self, trabajo_id, campana_id):
+        self._campanas[trabajo_id] = campana_id
+        self._ejecutor.ejecutar(
+            _clave(trabajo_id), self._service.procesar,
+            args=(trabajo_id,), kwargs={"al_progreso": self._emitir_avance},
+            prioridad=PRIORIDAD_BAJA, interrumpible=False,
+            al_terminar=lambda resultado: self._on_terminado(trabajo_id, resultado),
+            al_fallar=lambda error: self._on_terminado(trabajo_id, ("Error", error)),
+        )
+        self._avisar_estado(trabajo_id, "En Curso")
+
+    def _avisar_estado(self, trabajo_id, estado):
+        campana_id = self._campanas.get(trabajo_id)
+        if campana_id is None:
+            trabajo, _ = self._service.obtener_trabajo(trabajo_id)
+            if trabajo is None:
+                return
+            campana_id = self._campanas[trabajo_id] = trabajo.campana_id
+        self.estado_cambiado.emit(trabajo_id, campana_id, estado)
+
+    def _on_avance(self, trabajo_id, enviados, fallidos, total):
+        campana_id = self._campanas.get(trabajo_id)
+        if campana_id is not None:
+            self.progreso.emit(trabajo_id, campana_id, enviados, fallidos, total)
+
+    def _on_terminado(self, trabajo_id, resultado):
+        estado, error = resultado
+        if error:
+            logger.error(f"Trabajo de envio {trabajo_id} termino con error: {error}")
+        self._avisar_estado(trabajo_id, estado)
+
+
+# Gestor global; se crea la primera vez que se pide (en el hilo de la GUI).
+_gestor = None
+
+
+def obtener_gestor_envios():
+    global _gestor
+    if _gestor is None:
+        _gestor = GestorEnvios(parent=QCoreApplication.instance())
+    return _gestor
+
+
+def apagar_gestor_envios():
+    """Interrumpe los envios en curso y espera sus hilos. Para aboutToQuit."""
+    if _gestor is not None:
+        _gestor.apagar()
@@ -0,0 +1,225 @@
+"""
+Combinacion de correspondencia: plantillas de correo con campos {{Nombre}},
+{{Empresa}}, etc., compiladas una vez por campana.
+
+Problema que resuelve:
+    enviar_campana armaba un MIMEMultipart por destinatario, volvia a
+    codificar el texto y el HTML de la plantilla y llamaba a as_string().
+    Todo eso era igual para todos los destinatarios y no habia forma de
+    personalizar el correo.
+
+Como funciona:
+    - PlantillaCompilada parte el asunto, el texto y el HTML en pedazos
+      fijos y campos. Los pedazos fijos se codifican una sola vez
+      (quoted-printable en utf-8) junto con los encabezados y los limites
+      del multipart: el esqueleto del mensaje ya en bytes.
+    - renderizar(destinatario) solo codifica los valores de ese
+      destinatario y los intercala en el esqueleto con b"".join().
+    - Cada pedazo y cada valor termina en un salto suave de quoted-printable
+      ("=\\r\\n"), que no aparece en el texto decodificado: asi se pueden
+      pegar sin recalcular el largo de las lineas.
+    - Los valores van escapados en la parte HTML.
+
+Los valores salen de las columnas de CAMPOS en la consulta de destinatarios
+(CampanaRepository.tomar_pendientes), que ya trae el contacto y su empresa.
+
+Uso:
+    compilada = PlantillaCompilada(plantilla, "Avisos <avisos@empresa.mx>")
+    datos = compilada.renderizar(destinatario)   # bytes listos para sendmail
+"""
+
+import base64
+import html
+import re
+import uuid
+from email import quoprimime
+from email.utils import formataddr, parseaddr
+
+# campo de la plantilla -> columna de la consulta de destinatarios
+CAMPOS = {
+    "Nombre": "Nombre",
+    "ApellidoPaterno": "ApellidoPaterno",
+    "ApellidoMaterno": "ApellidoMaterno",
+    "NombreCompleto": "NombreCompleto",
+    "Email": "EmailDestino",
+    "Puesto": "Puesto",
+    "Departamento": "Departamento",
+    "Empresa": "Empresa",
+}
+
+# los campos no distinguen mayusculas: {{nombre}} es {{Nombre}}
+_COLUMNAS = {campo.lower(): columna for campo, columna in CAMPOS.items()}
+
+_PATRON = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+# ASCII imprimible sin "=" y sin espacio al final: sale igual en quoted-printable
+_ASCII_SEGURO = re.compile(r"[!-<>-~ ]*[!-<>-~]")
+_CRLF = "\r\n"
+_CRLF_B = b"\r\n"
+_SALTO_SUAVE = b"=\r\n"
+
+
+def campos_de(texto):
+    """Nombres de los campos que usa el texto, en orden y sin repetir."""
+    return list(dict.fromkeys(_PATRON.findall(texto or "")))
+
+
+def campos_desconocidos(*textos):
+    """Campos usados en los textos que no estan en CAMPOS."""
+    return [c for texto in textos for c in campos_de(texto) if c.lower() not in _COLUMNAS]
+
+
+def _partir(texto):
+    """
+    "Hola {{Nombre}}, ..." -> (["Hola ", ", ..."], ["Nombre"]): pedazos fijos
+    y la columna de cada campo (None si no esta en CAMPOS). Siempre hay un
+    pedazo fijo mas que campos.
+    """
+    partes = _PATRON.split(texto or "")
+    return partes[0::2], [_COLUMNAS.get(campo.lower()) for campo in partes[1::2]]
+
+
+def _qp(texto):
+    """Texto en quoted-printable utf-8, terminado en salto suave."""
+    if not texto:
+        return b""
+    if len(texto) < 76 and _ASCII_SEGURO.fullmatch(texto):
+        # el caso comun de un valor (nombre, empresa): ya es quoted-printable
+        return texto.encode("ascii") + _SALTO_SUAVE
+    latin = texto.replace("\r\n", "\n").encode("utf-8").decode("latin-1")
+    codificado = quoprimime.body_encode(latin, maxlinelen=76, eol=_CRLF)
+    return codificado.encode("ascii") + _SALTO_SUAVE
+
+
+def _encabezado(valor):
+    """
+    Valor de encabezado; palabras codificadas RFC 2047 (base64) solo si no
+    es ASCII. Cada palabra lleva a lo mas 39 bytes (52 en base64, 64 con
+    "=?utf-8?b?...?="), asi la linea no pasa de 78 aun tras "Subject: ",
+    y nunca parte un caracter.
+    """
+    if valor.isascii():
+        return valor
+    trozos, actual = [], b""
+    for caracter in valor:
+        codificado = caracter.encode("utf-8")
+        if len(actual) + len(codificado) > 39:
+            trozos.append(actual)
+            actual = b""
+        actual += codificado
+    trozos.append(actual)
+    return (_CRLF + " ").join(
+        "=?utf-8?b?" + base64.b64encode(trozo).decode("ascii") + "?=" for trozo in trozos
+    )
+
+
+def _remitente(from_header):
+    nombre, direccion = parseaddr(from_header)
+    return formataddr((nombre, direccion), charset="utf-8") if nombre else from_header
+
+
+class _Cuerpo:
+    """Una parte (texto o HTML): pedazos fijos ya codificados y sus campos."""
+
+    __slots__ = ("fijos", "columnas", "escapar")
+
+    def __init__(self, texto, escapar):
+        fijos, self.columnas = _partir(texto)
+        self.fijos = [_qp(f) for f in fijos]
+        self.escapar = escapar
+
+    def pedazos(self, destinatario, salida):
+        fijos = self.fijos
+        salida.append(fijos[0])
+        # cada columna se codifica una vez aunque el campo se repita
+        codificados = {}
+        for i, columna in enumerate(self.columnas, 1):
+            codificado = codificados.get(columna)
+            if codificado is None:
+                valor = destinatario.get(columna) if columna else None
+                if valor:
+                    valor = str(valor)
+                    codificado = _qp(html.escape(valor) if self.escapar else valor)
+                else:
+                    codificado = b""
+                codificados[columna] = codificado
+            salida.append(codificado)
+            salida.append(fijos[i])
+
+
+class PlantillaCompilada:
+    """
+    Plantilla de correo lista para renderizar a muchos destinatarios.
+
+    Args:
+        plantilla:   Plantilla (asunto, contenido_texto, contenido_html).
+        from_header: "Nombre <correo>" del remitente.
+
+    Un campo que no esta en CAMPOS, o sin valor para el destinatario, se
+    reemplaza por vacio.
+    """
+
+    def __init__(self, plantilla, from_header):
+        # como email.generator: "=" no sale en quoted-printable sin codificar,
+        # asi que el limite no puede aparecer dentro de las partes
+        limite = "=" * 15 + f"{uuid.uuid4().int % 10 ** 19:019d}" + "=="
+        self._limite = limite.encode("ascii")
+        self._asunto_fijo, self._asunto_columnas = _partir(plantilla.asunto or "")
+        # sin campos el asunto se codifica una sola vez; los saltos de linea
+        # se quitan igual que en asunto() para no inyectar encabezados
+        asunto_campos = bool(self._asunto_columnas)
+        asunto = "" if asunto_campos else _encabezado(" ".join((plantilla.asunto or "").split()))
+
+        self._inicio = (
+            f'Content-Type: multipart/alternative;{_CRLF} boundary="{limite}"{_CRLF}'
+            f"MIME-Version: 1.0{_CRLF}"
+            f"From: {_remitente(from_header)}{_CRLF}"
+        ).encode("utf-8")
+        self._asunto = f"Subject: {asunto}{_CRLF}".encode("ascii") if not asunto_campos else None
+
+        self._cuerpos = []
+        if plantilla.contenido_texto:
+            self._cuerpos.append((self._cabecera_parte("plain"), _Cuerpo(plantilla.contenido_texto, False)))
+        if plantilla.contenido_html:
+            self._cuerpos.append((self._cabecera_parte("html"), _Cuerpo(plantilla.contenido_html, True)))
+        self._cierre = b"--" + self._limite + b"--" + _CRLF_B
+
+    def _cabecera_parte(self, subtipo):
+        return (
+            f"--{self._limite.decode('ascii')}{_CRLF}"
+            f'Content-Type: text/{subtipo}; charset="utf-8"{_CRLF}'
+            f"MIME-Version: 1.0{_CRLF}"
+            f"Content-Transfer-Encoding: quoted-printable{_CRLF}{_CRLF}"
+        ).encode("ascii")
+
+    def asunto(self, destinatario):
+        """Asunto con los campos del destinatario (sin codificar)."""
+        fijos = self._asunto_fijo
+        partes = [fijos[0]]
+        for i, columna in enumerate(self._asunto_columnas, 1):
+            valor = destinatario.get(columna) if columna else None
+            partes.append(str(valor) if valor else "")
+            partes.append(fijos[i])
+        # sin saltos de linea ni espacios de sobra si un campo vino vacio
+        return " ".join("".join(partes).split())
+
+    def renderizar(self, destinatario):
+        """
+        Mensaje completo del destinatario en bytes (para sendmail).
+
+        Args:
+            destinatario: dict con EmailDestino y las columnas de CAMPOS.
+        """
+        salida = [self._inicio]
+        if self._asunto is not None:
+            salida.append(self._asunto)
+        else:
+            salida.append(f"Subject: {_encabezado(self.asunto(destinatario))}{_CRLF}".encode("ascii"))
+        # una direccion no lleva espacios: sin saltos de linea que abran otro encabezado
+        para = "".join(str(destinatario["EmailDestino"]).split())
+        salida.append(f"To: {para}{_CRLF}{_CRLF}".encode("utf-8"))
+        for cabecera, cuerpo in self._cuerpos:
+            salida.append(cabecera)
+            cuerpo.pedazos(destinatario, salida)
+            salida.append(_CRLF_B)
+        salida.append(self._cierre)
+        return b"".join(salida)
@@ -0,0 +1,205 @@
+"""
+Ejecutor de tareas en segundo plano para las vistas.
+
+Problema que resuelve:
+    Las vistas llamaban a los servicios directamente en el hilo de la GUI.
+    Un reporte que tarda 3 segundos congelaba la ventana 3 segundos (sin
+    repintar, sin responder a clics). LoginController ya resolvia esto para
+    bcrypt con un QThread propio; este modulo generaliza esa idea para
+    cualquier consulta o exportacion.
+
+Como funciona:
+    - Un QThreadPool propio con tantos hilos como lectores tiene el pool de
+      conexiones. Los hilos no expiran, asi que cada uno conserva su
+      conexion thread-local (get_connection) entre tareas.
+    - ejecutar() crea una Tarea (app/utils/tareas.py) y la encola con su
+      prioridad. Si ya hay una tarea igual activa no se lanza otra.
+    - Al terminar, el hilo de trabajo emite una senal del ejecutor; como el
+      ejecutor vive en el hilo de la GUI, Qt entrega la senal en ese hilo y
+      ahi se llaman al_terminar/al_fallar. Los callbacks pueden tocar widgets.
+    - cancelar(clave) saca la tarea de la cola o, si ya esta corriendo,
+      aborta su consulta; su resultado nunca llega a la vista.
+
+Uso tipico (en una vista):
+    from app.utils.ejecutor import obtener_ejecutor
+
+    obtener_ejecutor().ejecutar(
+        "reportes.pipeline", self._service.obtener_pipeline_ventas,
+        kwargs={"fecha_desde": desde, "fecha_hasta": hasta},
+        al_terminar=self._on_reporte_cargado,
+    )
+"""
+
+from PyQt5.QtCore import QCoreApplication, QObject, QRunnable, QThreadPool, pyqtSignal
+
+from app.database.connection import DEFAULT_POOL_SIZE
+from app.utils.db_retry import sanitize_error_message
+from app.utils.logger import AppLogger
+from app.utils.tareas import PRIORIDAD_NORMAL, RegistroTareas, Tarea, TareaCancelada
+
+logger = AppLogger.get_logger(__name__)
+
+
+class _TareaRunnable(QRunnable):
+    """Corre una Tarea en un hilo del pool y avisa al ejecutor con senales."""
+
+    def __init__(self, tarea, ejecutor):
+        super().__init__()
+        # el ejecutor conserva la referencia; Qt no debe borrar el objeto
+        self.setAutoDelete(False)
+        self._tarea = tarea
+        self._ejecutor = ejecutor
+
+    def run(self):
+        tarea = self._tarea
+        try:
+            resultado = tarea.ejecutar()
+        except TareaCancelada:
+            self._ejecutor._descartada.emit(tarea)
+        except Exception as e:
+            AppLogger.log_exception(logger, f"Error en tarea en segundo plano '{tarea.clave}'")
+            self._ejecutor._fallida.emit(tarea, sanitize_error_message(e))
+        else:
+            self._ejecutor._terminada.emit(tarea, resultado)
+
+
+class EjecutorTareas(QObject):
+    """
+    Ejecuta tareas en un QThreadPool y entrega los resultados en el hilo de la GUI.
+
+    Debe crearse en el hilo de la GUI (obtener_ejecutor() se encarga).
+
+    Senales:
+        tareas_activas (int): numero de tareas en cola o corriendo; cambia
+            cada vez que una empieza o termina (util para un indicador).
+    """
+
+    tareas_activas = pyqtSignal(int)
+
+    # Senales internas: se emiten desde los hilos del pool
+    _terminada = pyqtSignal(object, object)
+    _fallida = pyqtSignal(object, str)
+    _descartada = pyqtSignal(object)
+
+    def __init__(self, max_hilos=DEFAULT_POOL_SIZE, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(max_hilos)
+        # -1: los hilos no expiran y reutilizan su conexion thread-local
+        self._pool.setExpiryTimeout(-1)
+        self._registro = RegistroTareas()
+        self._runnables = {}
+
+        self._terminada.connect(self._on_terminada)
+        self._fallida.connect(self._on_fallida)
+        self._descartada.connect(self._finalizar)
+
+    # ==========================================
+    # API PUBLICA
+    # ==========================================
+
+    def ejecutar(self, clave, funcion, args=(), kwargs=None, al_terminar=None,
+                 al_fallar=None, prioridad=PRIORIDAD_NORMAL, interrumpible=True):
+        """
+        Encola funcion(*args, **kwargs) en segundo plano.
+
+        Args:
+            clave:         identifica la carga; una solicitud igual a una
+                           activa se une a ella y una distinta con la misma
+                           clave la reemplaza (la anterior se cancela).
+            funcion:       funcion o metodo a ejecutar (no una lambda).
+            al_terminar:   callback(resultado) en el hilo de la GUI.
+            al_fallar:     callback(mensaje) si funcion lanzo una excepcion.
+            prioridad:     PRIORIDAD_BAJA / NORMAL / ALTA.
+            interrumpible: False para tareas que escriben en la BD.
+
+        Returns:
+            Tarea: la tarea vigente para la clave.
+        """
+        nueva = Tarea(
+            clave, funcion, args=args, kwargs=kwargs, prioridad=prioridad,
+            interrumpible=interrumpible, al_terminar=al_terminar, al_fallar=al_fallar,
+        )
+        tarea, reemplazada = self._registro.registrar(nueva)
+        if reemplazada is not None:
+            logger.debug(f"Tarea '{clave}' reemplazada por una solicitud nueva")
+            self._sacar_de_cola(reemplazada)
+        if tarea is not nueva:
+            logger.debug(f"Tarea '{clave}' ya en curso; se reutiliza")
+            return tarea
+
+        runnable = _TareaRunnable(tarea, self)
+        self._runnables[tarea] = runnable
+        self._pool.start(runnable, prioridad)
+        self.tareas_activas.emit(len(self._runnables))
+        return tarea
+
+    def cancelar(self, clave):
+        """Cancela la tarea activa con esa clave (si la hay)."""
+        tarea = self._registro.cancelar(clave)
+        if tarea is not None:
+            self._sacar_de_cola(tarea)
+
+    def cancelar_todas(self):
+        for tarea in self._registro.cancelar_todas():
+            self._sacar_de_cola(tarea)
+
+    def en_curso(self, clave):
+        """True si hay una tarea activa con esa clave."""
+        return self._registro.activa(clave) is not None
+
+    def en_curso_con_prefijo(self, prefijo):
+        """True si hay alguna tarea activa cuya clave empieza con prefijo."""
+        return bool(self._registro.activas_con_prefijo(prefijo))
+
+    def apagar(self, espera_ms=3000):
+        """Cancela todo y espera a que terminen las tareas que ya corren."""
+        self.cancelar_todas()
+        self._pool.clear()
+        self._pool.waitForDone(espera_ms)
+
+    # ==========================================
+    # INTERNOS (hilo de la GUI)
+    # ==========================================
+
+    def _sacar_de_cola(self, tarea):
+        # si aun no empezo, tryTake la quita del pool y no llega a correr;
+        # si ya corre, la cancelacion aborta su consulta y _descartada la limpia
+        runnable = self._runnables.get(tarea)
+        if runnable is not None and self._pool.tryTake(runnable):
+            self._finalizar(tarea)
+
+    def _finalizar(self, tarea):
+        self._registro.terminar(tarea)
+        if self._runnables.pop(tarea, None) is not None:
+            self.tareas_activas.emit(len(self._runnables))
+
+    def _on_terminada(self, tarea, resultado):
+        self._finalizar(tarea)
+        if not tarea.cancelada and tarea.al_terminar is not None:
+            tarea.al_terminar(resultado)
+
+    def _on_fallida(self, tarea, mensaje):
+        self._finalizar(tarea)
+        if not tarea.cancelada and tarea.al_fallar is not None:
+            tarea.al_fallar(mensaje)
+
+
+# Ejecutor global de la aplicacion; se crea la primera vez que una vista lo pide.
+_ejecutor = None
+
+
+def obtener_ejecutor():
+    """Devuelve el ejecutor global (creado en el hilo de la GUI)."""
+    global _ejecutor
+    if _ejecutor is None:
+        _ejecutor = EjecutorTareas(parent=QCoreApplication.instance())
+    return _ejecutor
+
+
+def apagar_ejecutor():
+    """Cancela las tareas pendientes y espera las que corren. Para aboutToQuit."""
+    global _ejecutor
+    if _ejecutor is not None:
+        _ejecutor.apagar()
+        _ejecutor = None
@@ -0,0 +1,306 @@
+"""
+Envio de correos con varias sesiones SMTP en paralelo.
+
+Problema que resuelve:
+    enviar_campana abria una sola conexion y mandaba un correo tras otro.
+    Cada correo espera varias idas y vueltas al servidor (MAIL, RCPT, DATA),
+    asi que una campana grande iba al ritmo de una sola sesion TCP.
+
+Como funciona:
+    - PoolSmtp abre hasta `sesiones` conexiones, cada una en su hilo. Los
+      hilos toman el siguiente mensaje de un iterador compartido (se arma
+      justo antes de enviarse, nunca toda la campana en memoria).
+    - Si una sesion se cae (desconexion, timeout), se reconecta y reintenta
+      el mismo mensaje hasta `reintentos` veces. Si no logra reconectar,
+      ese hilo termina y los demas siguen; si ninguno puede conectar, los
+      mensajes que faltan se quedan sin enviar y se devuelve el error.
+    - Un error del destinatario (rechazo del servidor) no tumba la sesion:
+      solo marca ese envio como fallido.
+    - LimitadorTasa reparte un maximo de mensajes por segundo entre todas
+      las sesiones (los proveedores bloquean cuentas que se pasan).
+    - Los resultados llegan a una cola y enviar() los entrega en el hilo
+      que lo llamo: las escrituras en la BD no salen de ese hilo.
+
+Uso:
+    pool = PoolSmtp(config, sesiones=4, por_segundo=10)
+    error = pool.enviar(mensajes, al_resultado=registrar)
+    # mensajes: iterable de MensajeSmtp; registrar(ResultadoEnvio)
+"""
+
+import queue
+import smtplib
+import threading
+import time
+
+from app.config.settings import SMTP_REINTENTOS, SMTP_TIMEOUT
+from app.utils.db_retry import sanitize_error_message
+from app.utils.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+
+def _error_de_sesion(error):
+    """
+    True si el error deja la conexion inservible (hay que reconectar).
+
+    SMTPException hereda de OSError, asi que un rechazo del destinatario
+    tambien es OSError: solo cuentan los de red y las desconexiones.
+    """
+    if isinstance(error, (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError)):
+        return True
+    return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+
+class MensajeSmtp:
+    """
+    Un correo listo para enviarse.
+
+    Atributos:
+        clave:     identifica el envio en los resultados (ej. DestinatarioID).
+        remitente: direccion del sobre (MAIL FROM).
+        destino:   direccion del destinatario (RCPT TO).
+        datos:     mensaje completo (str o bytes), o callable sin argumentos
+                   que lo arma; se llama en el hilo de la sesion.
+    """
+
+    __slots__ = ("clave", "remitente", "destino", "datos")
+
+    def __init__(self, clave, remitente, destino, datos):
+        self.clave = clave
+        self.remitente = remitente
+        self.destino = destino
+        self.datos = datos
+
+
+class ResultadoEnvio:
+    """Resultado de un MensajeSmtp: enviado o no, y el error si fallo."""
+
+    __slots__ = ("clave", "destino", "enviado", "error")
+
+    def __init__(self, clave, destino, enviado, error=None):
+        self.clave = clave
+        self.destino = destino
+        self.enviado = enviado
+        self.error = error
+
+    def __repr__(self):
+        return f"<ResultadoEnvio(clave={self.clave!r}, enviado={self.enviado})>"
+
+
+class LimitadorTasa:
+    """
+    Cubeta de fichas compartida entre hilos: a lo mas por_segundo llamadas a
+    esperar() por segundo, con rafagas de hasta `rafaga`. por_segundo <= 0
+    desactiva el limite.
+    """
+
+    def __init__(self, por_segundo, rafaga=1, reloj=time.monotonic, dormir=time.sleep):
+        self._por_segundo = por_segundo
+        self._rafaga = max(rafaga, 1)
+        self._fichas = float(self._rafaga)
+        self._reloj = reloj
+        self._dormir = dormir
+        self._ultimo = reloj()
+        self._lock = threading.Lock()
+
+    def esperar(self):
+        if self._por_segundo <= 0:
+            return
+        with self._lock:
+            ahora = self._reloj()
+            self._fichas = min(self._rafaga, self._fichas + (ahora - self._ultimo) * self._por_segundo)
+            self._ultimo = ahora
+            # se reserva la ficha aunque falte: el saldo negativo es la cola
+            # de espera, asi cada hilo duerme una sola vez lo que le toca
+            self._fichas -= 1
+            falta = -self._fichas / self._por_segundo
+        if falta > 0:
+            self._dormir(falta)
+
+
+class SesionSmtp:
+    """Una conexion SMTP con la configuracion de correo; se abre al primer envio."""
+
+    def __init__(self, config, timeout=SMTP_TIMEOUT):
+        self._config = config
+        self._timeout = timeout
+        self._smtp = None
+
+    def abrir(self):
+        config = self._config
+        if config.usar_ssl:
+            smtp = smtplib.SMTP_SSL(config.host, config.puerto, timeout=self._timeout)
+        else:
+            smtp = smtplib.SMTP(config.host, config.puerto, timeout=self._timeout)
+            if config.usar_tls:
+                smtp.starttls()
+        try:
+            if config.usuario and config.contrasena:
+                smtp.login(config.usuario, config.contrasena)
+        except Exception:
+            smtp.close()
+            raise
+        self._smtp = smtp
+
+    def cerrar(self):
+        if self._smtp is None:
+            return
+        try:
+            self._smtp.quit()
+        except Exception:
+            self._smtp.close()
+        self._smtp = None
+
+    def enviar(self, remitente, destino, datos):
+        if self._smtp is None:
+            self.abrir()
+        try:
+            self._smtp.sendmail(remitente, [destino], datos)
+        except Exception as e:
+            if _error_de_sesion(e):
+                # la conexion quedo inservible: la siguiente llamada reconecta
+                self._smtp.close()
+                self._smtp = None
+            raise
+
+
+class PoolSmtp:
+    """
+    Envia mensajes por varias sesiones SMTP a la vez.
+
+    Args:
+        config:      ConfiguracionCorreo activa.
+        sesiones:    conexiones simultaneas (>= 1).
+        por_segundo: tope de mensajes por segundo entre todas (0 = sin tope).
+        reintentos:  reconexiones por mensaje antes de dar la sesion por perdida.
+        fabrica:     callable(config) -> sesion (para las pruebas).
+    """
+
+    def __init__(self, config, sesiones=1, por_segundo=0, reintentos=SMTP_REINTENTOS, fabrica=SesionSmtp):
+        self._config = config
+        self._sesiones = max(1, int(sesiones))
+        self._limitador = LimitadorTasa(por_segundo, rafaga=self._sesiones)
+        self._reintentos = reintentos
+        self._fabrica = fabrica
+
+    def enviar(self, mensajes, al_resultado=None, cancelado=None):
+        """
+        Envia todos los mensajes y entrega cada resultado en este hilo.
+
+        Args:
+            mensajes:     iterable de MensajeSmtp (se consume una sola vez).
+            al_resultado: callback(ResultadoEnvio), llamado en este hilo. Si
+                          lanza, se dejan de tomar mensajes y la excepcion
+                          sale de enviar() cuando terminan los hilos.
+            cancelado:    callable() -> bool; True deja de tomar mensajes nuevos
+                          (los que ya estan en vuelo terminan).
+
+        Returns:
+            str | None: mensaje de error si alguna sesion no pudo conectar y
+            quedaron mensajes sin enviar; None si se procesaron todos.
+        """
+        fuente = _FuenteCompartida(mensajes, cancelado)
+        resultados = queue.Queue()
+        errores = []
+        hilos = [
+            threading.Thread(
+                target=self._trabajar, args=(fuente, resultados, errores),
+                name=f"smtp-{i}", daemon=True,
+            )
+            for i in range(self._sesiones)
+        ]
+        for hilo in hilos:
+            hilo.start()
+
+        activos = len(hilos)
+        fallo = None
+        while activos:
+            resultado = resultados.get()
+            if resultado is None:        # un hilo termino
+                activos -= 1
+            elif al_resultado is not None and fallo is None:
+                try:
+                    al_resultado(resultado)
+                except Exception as e:
+                    # no dejar hilos enviando sin que nadie registre el resultado
+                    fallo = e
+                    fuente.detener()
+        for hilo in hilos:
+            hilo.join()
+
+        if fallo is not None:
+            raise fallo
+        if errores and not fuente.agotada:
+            return errores[0]
+        return None
+
+    def _trabajar(self, fuente, resultados, errores):
+        sesion = self._fabrica(self._config)
+        try:
+            while True:
+                mensaje = fuente.siguiente()
+                if mensaje is None:
+                    return
+                self._limitador.esperar()
+                try:
+                    self._enviar_con_reintentos(sesion, mensaje)
+                except Exception as e:
+                    if _error_de_sesion(e) or isinstance(e, smtplib.SMTPAuthenticationError):
+                        # sin conexion: devolver el mensaje para que otra sesion lo intente
+                        logger.error(f"Sesion SMTP perdida sin poder reconectar: {e}")
+                        errores.append(sanitize_error_message(e))
+                        fuente.devolver(mensaje)
+                        return
+                    logger.error(f"Error enviando a {mensaje.destino}: {e}")
+                    resultados.put(ResultadoEnvio(mensaje.clave, mensaje.destino, False, sanitize_error_message(e)))
+                else:
+                    resultados.put(ResultadoEnvio(mensaje.clave, mensaje.destino, True))
+        finally:
+            sesion.cerrar()
+            resultados.put(None)
+
+    def _enviar_con_reintentos(self, sesion, mensaje):
+        datos = mensaje.datos() if callable(mensaje.datos) else mensaje.datos
+        intento = 0
+        while True:
+            try:
+                sesion.enviar(mensaje.remitente, mensaje.destino, datos)
+                return
+            except Exception as e:
+                intento += 1
+                if not _error_de_sesion(e) or intento > self._reintentos:
+                    raise
+                logger.warning(f"Sesion SMTP caida; reconectando (intento {intento})")
+                time.sleep(min(0.2 * intento, 1.0))
+
+
+class _FuenteCompartida:
+    """Iterador de mensajes compartido por los hilos, con devoluciones."""
+
+    def __init__(self, mensajes, cancelado):
+        self._iter = iter(mensajes)
+        self._devueltos = []
+        self._cancelado = cancelado
+        self._lock = threading.Lock()
+        self._detenida = False
+        self.agotada = False
+
+    def detener(self):
+        with self._lock:
+            self._detenida = True
+
+    def siguiente(self):
+        with self._lock:
+            if self._detenida or (self._cancelado is not None and self._cancelado()):
+                return None
+            if self._devueltos:
+                return self._devueltos.pop()
+            mensaje = next(self._iter, None)
+            if mensaje is None:
+                self.agotada = True
+            return mensaje
+
+    def devolver(self, mensaje):
+        with self._lock:
+            self._devueltos.append(mensaje)
+            self.agotada = False
@@ -0,0 +1,146 @@
+"""
+Geometria de las graficas del CRM: la parte de app/views/graficas.py que no
+depende de Qt.
+
+Aqui se calcula donde va cada barra, segmento o punto (en pixeles, como
+tuplas simples) y que elemento hay bajo el cursor. Los widgets solo pintan
+lo que estas funciones devuelven, asi que la logica se prueba sin interfaz
+(mismo reparto que tareas.py / ejecutor.py).
+
+Convenciones:
+    - Rectangulos: (x, y, ancho, alto) con el origen arriba a la izquierda.
+    - Angulos en grados, 0 a las 3 en punto y positivos en sentido
+      antihorario (lo que espera QPainter.drawPie, multiplicado por 16).
+"""
+
+import math
+
+# fraccion de la banda de cada categoria que ocupa la barra
+RELLENO_BARRA = 0.55
+
+
+def escala_bonita(maximo, divisiones=4):
+    """
+    Tope del eje y paso entre marcas con numeros "redondos".
+
+    escala_bonita(873) -> (1000.0, 250.0); escala_bonita(0) -> (1.0, 0.25)
+
+    Returns:
+        tuple: (tope, paso), con tope >= maximo y tope multiplo de paso.
+    """
+    if maximo <= 0:
+        return 1.0, 1.0 / divisiones
+    paso_bruto = maximo / divisiones
+    magnitud = 10 ** math.floor(math.log10(paso_bruto))
+    for factor in (1, 2, 2.5, 5, 10):
+        paso = factor * magnitud
+        if paso >= paso_bruto:
+            break
+    return paso * math.ceil(maximo / paso - 1e-9), paso
+
+
+def barras(valores, area, tope, horizontal=True, relleno=RELLENO_BARRA):
+    """
+    Rectangulo de cada barra dentro de area.
+
+    Args:
+        valores:    numeros >= 0, en el orden de las categorias.
+        area:       (x, y, ancho, alto) de la zona de trazado.
+        tope:       valor que corresponde al extremo del eje.
+        horizontal: True = barras de izquierda a derecha, una categoria por
+                    renglon de arriba hacia abajo.
+    """
+    x, y, ancho, alto = area
+    n = len(valores)
+    if not n or tope <= 0:
+        return []
+    rects = []
+    if horizontal:
+        banda = alto / n
+        grueso = banda * relleno
+        for i, valor in enumerate(valores):
+            largo = ancho * max(valor, 0) / tope
+            rects.append((x, y + i * banda + (banda - grueso) / 2, largo, grueso))
+    else:
+        banda = ancho / n
+        grueso = banda * relleno
+        for i, valor in enumerate(valores):
+            largo = alto * max(valor, 0) / tope
+            rects.append((x + i * banda + (banda - grueso) / 2, y + alto - largo, grueso, largo))
+    return rects
+
+
+def segmentos_dona(valores, inicio=90.0):
+    """
+    (angulo_inicial, barrido) de cada segmento, en el orden de valores.
+
+    Empieza arriba (90 grados) y avanza en sentido antihorario, igual que
+    la grafica de matplotlib que reemplaza. Un valor 0 da barrido 0.
+    """
+    total = sum(max(v, 0) for v in valores)
+    if total <= 0:
+        return []
+    segmentos = []
+    angulo = inicio
+    for valor in valores:
+        barrido = 360.0 * max(valor, 0) / total
+        segmentos.append((angulo % 360.0, barrido))
+        angulo += barrido
+    return segmentos
+
+
+def puntos_linea(valores, area, tope):
+    """Centro de cada punto de una serie, repartidos a lo ancho de area."""
+    x, y, ancho, alto = area
+    n = len(valores)
+    if not n or tope <= 0:
+        return []
+    if n == 1:
+        return [(x + ancho / 2, y + alto - alto * valores[0] / tope)]
+    paso = ancho / (n - 1)
+    return [(x + i * paso, y + alto - alto * v / tope) for i, v in enumerate(valores)]
+
+
+def indice_rect(rects, px, py, horizontal=True, area=None):
+    """
+    Indice del rectangulo bajo (px, py), o None.
+
+    Con area, basta estar en la banda de la categoria (todo el renglon o la
+    columna), asi las barras cortas tambien muestran su tooltip.
+    """
+    for i, (x, y, ancho, alto) in enumerate(rects):
+        if area is not None:
+            ax, ay, a_ancho, a_alto = area
+            if horizontal:
+                banda = a_alto / len(rects)
+                if ax <= px <= ax + a_ancho and ay + i * banda <= py < ay + (i + 1) * banda:
+                    return i
+            else:
+                banda = a_ancho / len(rects)
+                if ay <= py <= ay + a_alto and ax + i * banda <= px < ax + (i + 1) * banda:
+                    return i
+        elif x <= px <= x + ancho and y <= py <= y + alto:
+            return i
+    return None
+
+
+def indice_segmento(segmentos, centro, radio_ext, radio_int, px, py):
+    """Indice del segmento de la dona bajo (px, py), o None."""
+    dx, dy = px - centro[0], centro[1] - py
+    distancia = math.hypot(dx, dy)
+    if not radio_int <= distancia <= radio_ext:
+        return None
+    angulo = math.degrees(math.atan2(dy, dx)) % 360.0
+    for i, (inicio, barrido) in enumerate(segmentos):
+        if barrido > 0 and (angulo - inicio) % 360.0 < barrido:
+            return i
+    return None
+
+
+def indice_punto(puntos, px, radio):
+    """Indice del punto con x mas cercana a px (a no mas de radio), o None."""
+    mejor, distancia = None, radio
+    for i, (x, _) in enumerate(puntos):
+        if abs(x - px) <= distancia:
+            mejor, distancia = i, abs(x - px)
+    return mejor
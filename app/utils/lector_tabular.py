@@ -0,0 +1,127 @@
+"""
+Lectura en streaming de archivos tabulares (CSV y XLSX) para importaciones.
+
+Ninguno de los dos lectores carga el archivo completo en memoria: el CSV se
+recorre linea por linea y el XLSX se abre con openpyxl en modo read_only,
+que va leyendo el XML de la hoja conforme se piden filas. Asi un archivo de
+100 000 filas ocupa lo mismo que uno de 100.
+
+La primera fila se toma como encabezados. Cada fila siguiente se entrega
+como (numero_de_fila, lista_de_textos): los valores ya vienen como str (las
+celdas vacias como "") para que la validacion no tenga que distinguir si
+el dato salio de un CSV o de una celda numerica de Excel.
+
+Uso:
+    with LectorTabular(ruta) as lector:
+        print(lector.encabezados)
+        for numero, valores in lector:
+            ...
+"""
+
+import csv
+import os
+from datetime import date, datetime
+
+# separadores que se prueban al detectar el formato del CSV
+# (Excel en espanol exporta con ';')
+_DELIMITADORES = ",;\t|"
+_BYTES_MUESTRA = 64 * 1024
+
+EXTENSIONES = (".csv", ".xlsx")
+
+
+def _texto_celda(valor):
+    # convierte el valor de una celda de Excel al texto que escribiria el usuario
+    if valor is None:
+        return ""
+    if isinstance(valor, datetime):
+        if valor.hour or valor.minute or valor.second:
+            return valor.isoformat(sep=" ")
+        return valor.date().isoformat()
+    if isinstance(valor, date):
+        return valor.isoformat()
+    if isinstance(valor, float) and valor.is_integer():
+        # telefonos y codigos postales capturados como numero: 8112345678.0
+        return str(int(valor))
+    return str(valor).strip()
+
+
+class LectorTabular:
+    """
+    Recorre un CSV o XLSX fila por fila.
+
+    Atributos:
+        ruta:        archivo de origen.
+        encabezados: textos de la primera fila, tal como vienen en el archivo.
+    """
+
+    def __init__(self, ruta):
+        extension = os.path.splitext(ruta)[1].lower()
+        if extension not in EXTENSIONES:
+            raise ValueError(
+                f"Formato no soportado: {extension or 'sin extension'} (use CSV o XLSX)"
+            )
+        self.ruta = ruta
+        self._es_xlsx = extension == ".xlsx"
+        self._archivo = None
+        self._libro = None
+        self._filas = None
+        self.encabezados = []
+        self._abrir()
+
+    def _abrir(self):
+        if self._es_xlsx:
+            from openpyxl import load_workbook
+
+            self._libro = load_workbook(self.ruta, read_only=True, data_only=True)
+            hoja = self._libro.active
+            filas = (
+                [_texto_celda(v) for v in fila]
+                for fila in hoja.iter_rows(values_only=True)
+            )
+        else:
+            codificacion = self._detectar_codificacion()
+            self._archivo = open(self.ruta, "r", encoding=codificacion, newline="")
+            muestra = self._archivo.read(_BYTES_MUESTRA)
+            self._archivo.seek(0)
+            try:
+                dialecto = csv.Sniffer().sniff(muestra, delimiters=_DELIMITADORES)
+            except csv.Error:
+                dialecto = csv.excel
+            filas = ([v.strip() for v in fila] for fila in csv.reader(self._archivo, dialecto))
+
+        self.encabezados = next(filas, [])
+        self._filas = filas
+
+    def _detectar_codificacion(self):
+        # UTF-8 (con o sin BOM) o, si no decodifica, Latin-1 (CSV de Excel en Windows)
+        with open(self.ruta, "rb") as f:
+            muestra = f.read(_BYTES_MUESTRA)
+        try:
+            muestra.decode("utf-8")
+        except UnicodeDecodeError as e:
+            # un caracter multibyte cortado al final de la muestra no cuenta
+            if e.start < len(muestra) - 3:
+                return "latin-1"
+        return "utf-8-sig"
+
+    def __iter__(self):
+        # numero de fila como lo ve el usuario en Excel (encabezados = fila 1)
+        for numero, valores in enumerate(self._filas, start=2):
+            if any(valores):
+                yield numero, valores
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+        if self._libro is not None:
+            self._libro.close()
+            self._libro = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+        return False
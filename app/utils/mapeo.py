@@ -0,0 +1,116 @@
+"""
+Mapeo compilado de filas SQLite a modelos.
+
+Antes cada repositorio convertia las filas con una funcion _row_to_X que
+buscaba cada columna por nombre en el sqlite3.Row y envolvia las columnas
+opcionales (las de los JOIN) en try/except, fila por fila. Con 100k filas
+eso son millones de busquedas por nombre y excepciones atrapadas.
+
+MapeadorFilas hace ese trabajo una sola vez por forma de consulta:
+    1. Lee cursor.description (nombres de columnas, en orden).
+    2. Genera y compila una funcion que construye el modelo leyendo la fila
+       por posicion: Contacto(contacto_id=r[0], nombre=r[1], ...). Las
+       columnas opcionales que la consulta no trae se compilan como None.
+    3. Guarda la funcion en un cache por texto SQL; la siguiente ejecucion
+       de la misma consulta la reutiliza sin volver a inspeccionar nada.
+
+La funcion compilada solo usa indices, asi que sirve igual para tuplas
+simples (consultar() desactiva el row_factory y evita crear un
+sqlite3.Row por fila) que para sqlite3.Row (paginar()).
+
+Uso tipico (en un repositorio):
+    _MAPEO = MapeadorFilas(Contacto, {
+        "contacto_id": "ContactoID",
+        "nombre": "Nombre",
+        "nombre_empresa": "NombreEmpresa",
+    }, opcionales=("NombreEmpresa",))
+
+    def find_all(self):
+        return self._MAPEO.consultar(get_connection(), "SELECT ...")
+"""
+
+import threading
+
+
+class MapeadorFilas:
+    """
+    Convierte filas de una consulta en instancias de un modelo.
+
+    Args:
+        modelo:       clase (o funcion) que recibe los campos como kwargs.
+        campos:       dict kwarg del modelo -> nombre de columna en la consulta.
+        opcionales:   columnas que pueden no venir en la consulta (valen None).
+        conversiones: dict kwarg -> funcion aplicada al valor de la columna
+                      cuando esta presente.
+    """
+
+    def __init__(self, modelo, campos, opcionales=(), conversiones=None):
+        self._modelo = modelo
+        self._campos = dict(campos)
+        self._opcionales = frozenset(opcionales)
+        self._conversiones = dict(conversiones or {})
+        # texto SQL -> funcion compilada
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def compilar(self, description):
+        """
+        Genera la funcion fila -> modelo para las columnas de description.
+
+        Raises:
+            KeyError: si falta una columna que no es opcional.
+        """
+        posiciones = {}
+        for i, columna in enumerate(description):
+            # en un JOIN con nombres repetidos gana la primera, igual que sqlite3.Row
+            posiciones.setdefault(columna[0], i)
+
+        espacio = {"_Modelo": self._modelo}
+        argumentos = []
+        for kwarg, columna in self._campos.items():
+            i = posiciones.get(columna)
+            if i is None:
+                if columna not in self._opcionales:
+                    raise KeyError(f"La consulta no incluye la columna {columna}")
+                expresion = "None"
+            elif kwarg in self._conversiones:
+                espacio[f"_conv_{kwarg}"] = self._conversiones[kwarg]
+                expresion = f"_conv_{kwarg}(r[{i}])"
+            else:
+                expresion = f"r[{i}]"
+            argumentos.append(f"{kwarg}={expresion}")
+
+        codigo = f"def _mapear(r):\n    return _Modelo({', '.join(argumentos)})\n"
+        exec(compile(codigo, f"<mapeo {getattr(self._modelo, '__name__', 'modelo')}>", "exec"), espacio)
+        return espacio["_mapear"]
+
+    def para(self, sql, description):
+        """Devuelve la funcion compilada para `sql`, compilandola la primera vez."""
+        funcion = self._cache.get(sql)
+        if funcion is None:
+            with self._lock:
+                funcion = self._cache.get(sql)
+                if funcion is None:
+                    funcion = self.compilar(description)
+                    self._cache[sql] = funcion
+        return funcion
+
+    def consultar(self, conn, sql, params=()):
+        """Ejecuta `sql` y devuelve la lista de modelos (filas como tuplas)."""
+        cursor = self._ejecutar(conn, sql, params)
+        return list(map(self.para(sql, cursor.description), cursor.fetchall()))
+
+    def consultar_uno(self, conn, sql, params=()):
+        """Ejecuta `sql` y devuelve el primer modelo, o None si no hay filas."""
+        cursor = self._ejecutar(conn, sql, params)
+        fila = cursor.fetchone()
+        if fila is None:
+            return None
+        return self.para(sql, cursor.description)(fila)
+
+    @staticmethod
+    def _ejecutar(conn, sql, params):
+        # cursor propio sin row_factory: las filas llegan como tuplas simples
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(sql, params)
@@ -0,0 +1,206 @@
+"""
+Paginacion por cursor (keyset pagination) para los listados grandes.
+
+Por que no LIMIT/OFFSET:
+    Con "LIMIT 50 OFFSET 100000" SQLite tiene que recorrer y descartar las
+    primeras 100000 filas antes de devolver las 50 pedidas. Cada pagina es
+    mas lenta que la anterior, y si alguien inserta un registro mientras se
+    navega, las filas se "recorren" y aparecen duplicadas o se saltan.
+
+Como funciona el keyset:
+    Los listados se ordenan por (FechaCreacion DESC, ID DESC). Para pedir la
+    pagina siguiente no se dice "salta N filas" sino "dame las filas que van
+    despues de esta", usando la ultima fila vista como punto de partida:
+
+        WHERE (FechaCreacion, ID) < (?, ?)
+        ORDER BY FechaCreacion DESC, ID DESC
+        LIMIT 51
+
+    Con un indice sobre (FechaCreacion, ID) SQLite salta directo a esa
+    posicion, asi que la pagina 1 y la pagina 10000 cuestan lo mismo.
+    El ID desempata filas creadas en el mismo segundo.
+
+Tokens opacos:
+    El punto de partida se entrega a la vista como un token (texto base64).
+    La vista no necesita saber que contiene; solo lo devuelve para pedir la
+    pagina siguiente o la anterior. El token tambien indica la direccion.
+
+Uso tipico (en un repositorio):
+    return paginar(
+        conn, SELECT_BASE, "ct.FechaCreacion", "ct.ContactoID",
+        self._MAPEO, limit=50, token=token,
+        condiciones=["ct.Activo = ?"], params=[1],
+    )
+"""
+
+import base64
+import json
+
+from app.utils.mapeo import MapeadorFilas
+
+# Limite superior para una pagina. Evita que un llamador pida "todo" por
+# accidente y se pierda la ventaja de paginar.
+MAX_LIMIT = 1000
+
+_ADELANTE = "s"   # pagina siguiente (filas mas antiguas)
+_ATRAS = "a"      # pagina anterior (filas mas recientes)
+
+
+class Pagina:
+    """
+    Resultado de una consulta paginada.
+
+    Atributos:
+        items:     lista de objetos de la pagina, en orden de presentacion.
+        siguiente: token para pedir la pagina siguiente, o None si es la ultima.
+        anterior:  token para pedir la pagina anterior, o None si es la primera.
+    """
+
+    def __init__(self, items, siguiente=None, anterior=None):
+        self.items = items
+        self.siguiente = siguiente
+        self.anterior = anterior
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def __repr__(self):
+        return (
+            f"<Pagina items={len(self.items)} "
+            f"siguiente={self.siguiente is not None} anterior={self.anterior is not None}>"
+        )
+
+
+def codificar_token(valor, id_, direccion=_ADELANTE):
+    """Convierte (valor de orden, id, direccion) en un token opaco."""
+    crudo = json.dumps([valor, id_, direccion], separators=(",", ":"))
+    return base64.urlsafe_b64encode(crudo.encode("utf-8")).decode("ascii")
+
+
+def decodificar_token(token):
+    """
+    Recupera (valor, id, direccion) de un token.
+
+    Raises:
+        ValueError: si el token esta corrupto o no fue generado por este modulo.
+    """
+    try:
+        valor, id_, direccion = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+    except (ValueError, TypeError, AttributeError):
+        raise ValueError("Token de paginacion invalido")
+    if direccion not in (_ADELANTE, _ATRAS) or not isinstance(id_, int):
+        raise ValueError("Token de paginacion invalido")
+    return valor, id_, direccion
+
+
+def _ultimo_segmento(columna):
+    # "ct.FechaCreacion" -> "FechaCreacion" (nombre de la columna en la fila)
+    return columna.rsplit(".", 1)[-1]
+
+
+def _valor_orden(fila, clave):
+    # NULL se normaliza a '' para coincidir con el IFNULL(col, '') del ORDER BY
+    valor = fila[clave]
+    return "" if valor is None else valor
+
+
+def paginar(conn, select_sql, orden_col, id_col, mapper, limit=50, token=None,
+            condiciones=None, params=None, descendente=True, clave_orden=None):
+    """
+    Ejecuta una consulta paginada por keyset y devuelve una Pagina.
+
+    Args:
+        conn:        conexion SQLite.
+        select_sql:  SELECT ... FROM ... JOIN ... sin WHERE ni ORDER BY.
+        orden_col:   columna de orden (ej. "ct.FechaCreacion").
+        id_col:      columna ID que desempata (ej. "ct.ContactoID").
+        mapper:      funcion fila -> objeto, o un MapeadorFilas (se compila
+                     una vez por select_sql; los filtros no cambian columnas).
+        limit:       filas por pagina (1..MAX_LIMIT).
+        token:       token devuelto en una Pagina anterior, o None para la primera.
+        condiciones: lista de fragmentos SQL que se unen con AND.
+        params:      parametros de las condiciones, en orden.
+        descendente: True para (orden DESC, id DESC), el orden de los listados.
+        clave_orden: nombre de la columna de orden en la fila, cuando orden_col
+                     es una expresion. Las columnas que admiten NULL deben
+                     ordenarse como IFNULL(col, '') porque una comparacion
+                     con NULL nunca es verdadera y esas filas se perderian.
+
+    Returns:
+        Pagina
+    """
+    limit = max(1, min(int(limit), MAX_LIMIT))
+    condiciones = list(condiciones or [])
+    params = list(params or [])
+
+    direccion = _ADELANTE
+    if token:
+        valor, id_, direccion = decodificar_token(token)
+        # Avanzar en el orden de presentacion o retroceder en el inverso
+        hacia_menores = (direccion == _ADELANTE) == descendente
+        condiciones.append(f"({orden_col}, {id_col}) {'<' if hacia_menores else '>'} (?, ?)")
+        params.extend([valor, id_])
+
+    # Para retroceder se consulta en orden inverso y luego se invierte en Python
+    orden_sql = "DESC" if (direccion == _ADELANTE) == descendente else "ASC"
+
+    query = select_sql
+    if condiciones:
+        query += " WHERE " + " AND ".join(condiciones)
+    query += f" ORDER BY {orden_col} {orden_sql}, {id_col} {orden_sql} LIMIT ?"
+    params.append(limit + 1)  # una fila extra para saber si hay mas
+
+    cursor = conn.execute(query, params)
+    filas = cursor.fetchall()
+    if isinstance(mapper, MapeadorFilas):
+        mapper = mapper.para(select_sql, cursor.description)
+    hay_mas = len(filas) > limit
+    filas = filas[:limit]
+    if direccion == _ATRAS:
+        filas.reverse()
+
+    clave_orden = clave_orden or _ultimo_segmento(orden_col)
+    clave_id = _ultimo_segmento(id_col)
+    siguiente = anterior = None
+    if filas:
+        primera, ultima = filas[0], filas[-1]
+        # Hacia adelante: hay anterior si vinimos de un token; hay siguiente si sobro fila.
+        # Hacia atras: al reves.
+        hay_siguiente = hay_mas if direccion == _ADELANTE else True
+        hay_anterior = (token is not None) if direccion == _ADELANTE else hay_mas
+        if hay_siguiente:
+            siguiente = codificar_token(_valor_orden(ultima, clave_orden), ultima[clave_id], _ADELANTE)
+        if hay_anterior:
+            anterior = codificar_token(_valor_orden(primera, clave_orden), primera[clave_id], _ATRAS)
+
+    return Pagina([mapper(fila) for fila in filas], siguiente=siguiente, anterior=anterior)
+
+
+def construir_filtros(filtros, columnas_permitidas, columnas_texto=()):
+    """
+    Traduce un dict de filtros a condiciones SQL parametrizadas.
+
+    Solo se aceptan claves declaradas en columnas_permitidas (clave -> columna)
+    para que ningun nombre de columna venga del exterior. La clave especial
+    "texto" busca con LIKE en las columnas_texto.
+
+    Raises:
+        ValueError: si se usa un filtro no permitido.
+    """
+    condiciones, params = [], []
+    for clave, valor in (filtros or {}).items():
+        if valor is None or valor == "":
+            continue
+        if clave == "texto" and columnas_texto:
+            patron = f"%{valor}%"
+            condiciones.append("(" + " OR ".join(f"{col} LIKE ?" for col in columnas_texto) + ")")
+            params.extend([patron] * len(columnas_texto))
+        elif clave in columnas_permitidas:
+            condiciones.append(f"{columnas_permitidas[clave]} = ?")
+            params.append(valor)
+        else:
+            raise ValueError(f"Filtro no permitido: {clave}")
+    return condiciones, params
@@ -0,0 +1,179 @@
+"""
+Registro de secciones de la ventana principal: se importan y construyen
+la primera vez que se abren.
+
+Problema que resuelve:
+    MainView importaba y construia las 9 secciones (cada una carga su .ui,
+    crea sus servicios y algunas consultan catalogos) antes de mostrarse,
+    aunque el usuario solo viera el dashboard. Todo eso se pagaba entre el
+    login y la primera ventana interactiva.
+
+Como funciona:
+    - Cada Seccion dice en que modulo y clase vive su vista. obtener()
+      importa el modulo (importlib) y construye la vista solo si no esta viva.
+    - Las secciones vivas se ordenan por ultimo uso. Con mas de max_vivas se
+      descartan las menos usadas; descartar_inactivas() libera las que no se
+      abren hace tiempo. Nunca se descarta la seccion activa, una marcada
+      descartable=False ni una con tareas en curso (ocupada).
+    - importar_seccion() solo importa el modulo; es lo que corre en segundo
+      plano para precargar las secciones probables despues del primer pintado.
+
+No depende de Qt: construir y liberar los widgets lo hacen los callbacks
+que pasa MainView (mismo reparto que tareas.py / ejecutor.py).
+"""
+
+import importlib
+import time
+from collections import OrderedDict
+
+from app.utils.arranque import traza_arranque
+from app.utils.logger import AppLogger
+
+logger = AppLogger.get_logger(__name__)
+
+
+class Seccion:
+    """
+    Descripcion de una seccion del menu lateral.
+
+    Atributos:
+        nombre:            clave de la seccion (la misma que usa tiene_acceso).
+        modulo, clase:     donde vive la vista ("app.views.x_view", "XView").
+        titulo:            texto del encabezado al mostrarla.
+        con_usuario:       la vista recibe el usuario en su constructor.
+        cargar_al_mostrar: llamar cargar_datos() cada vez que se muestra.
+        descartable:       False = una vez construida no se libera.
+        prefijos_tareas:   claves del ejecutor que pertenecen a la vista; con
+                           una tarea asi en curso la seccion no se descarta.
+    """
+
+    __slots__ = (
+        "nombre", "modulo", "clase", "titulo", "con_usuario",
+        "cargar_al_mostrar", "descartable", "prefijos_tareas",
+    )
+
+    def __init__(self, nombre, modulo, clase, titulo, con_usuario=True,
+                 cargar_al_mostrar=True, descartable=True, prefijos_tareas=()):
+        self.nombre = nombre
+        self.modulo = modulo
+        self.clase = clase
+        self.titulo = titulo
+        self.con_usuario = con_usuario
+        self.cargar_al_mostrar = cargar_al_mostrar
+        self.descartable = descartable
+        self.prefijos_tareas = tuple(prefijos_tareas)
+
+    def __repr__(self):
+        return f"<Seccion(nombre='{self.nombre}', clase='{self.clase}')>"
+
+
+def importar_seccion(seccion):
+    """Importa el modulo de la seccion y devuelve la clase de su vista."""
+    return getattr(importlib.import_module(seccion.modulo), seccion.clase)
+
+
+class RegistroSecciones:
+    """
+    Secciones vivas de la ventana principal, ordenadas por ultimo uso.
+
+    Args:
+        secciones:  iterable de Seccion.
+        construir:  callback(seccion, clase) -> vista. Crea el widget.
+        liberar:    callback(seccion, vista). Lo quita del layout y lo destruye.
+        max_vivas:  secciones construidas a la vez (None = sin limite).
+        ocupada:    callback(seccion) -> bool; True impide descartarla.
+        reloj:      fuente de tiempo en segundos (para las pruebas).
+    """
+
+    def __init__(self, secciones, construir, liberar, max_vivas=None, ocupada=None,
+                 reloj=time.monotonic):
+        self._secciones = {s.nombre: s for s in secciones}
+        self._construir = construir
+        self._liberar = liberar
+        self._max_vivas = max_vivas
+        self._ocupada = ocupada or (lambda seccion: False)
+        self._reloj = reloj
+        # nombre -> (vista, ultimo uso); el final es el mas reciente
+        self._vivas = OrderedDict()
+        self._activa = None
+
+    def __contains__(self, nombre):
+        return nombre in self._secciones
+
+    def seccion(self, nombre):
+        return self._secciones[nombre]
+
+    @property
+    def activa(self):
+        return self._activa
+
+    @property
+    def vivas(self):
+        """Nombres de las secciones construidas, de la menos a la mas usada."""
+        return list(self._vivas)
+
+    def viva(self, nombre):
+        """La vista si ya esta construida, sin construirla."""
+        entrada = self._vivas.get(nombre)
+        return entrada[0] if entrada else None
+
+    def obtener(self, nombre):
+        """Devuelve la vista de la seccion, importandola y construyendola si hace falta."""
+        entrada = self._vivas.pop(nombre, None)
+        if entrada is None:
+            seccion = self._secciones[nombre]
+            inicio = time.perf_counter()
+            vista = self._construir(seccion, importar_seccion(seccion))
+            duracion = time.perf_counter() - inicio
+            traza_arranque().registrar_vista(nombre, duracion)
+            logger.debug(f"Seccion '{nombre}' construida en {duracion * 1000:.0f} ms")
+        else:
+            vista = entrada[0]
+        self._vivas[nombre] = (vista, self._reloj())
+        self._respetar_limite()
+        return vista
+
+    def activar(self, nombre):
+        """Marca la seccion como la que se muestra (None = ninguna) y la devuelve."""
+        self._activa = nombre
+        return self.obtener(nombre) if nombre is not None else None
+
+    def precargar(self, nombre):
+        """Construye la seccion sin mostrarla. False si ya estaba viva."""
+        if nombre in self._vivas:
+            return False
+        self.obtener(nombre)
+        return True
+
+    def descartar(self, nombre):
+        """Libera la seccion si se puede. Devuelve True si se libero."""
+        if nombre not in self._vivas or not self._descartable(nombre):
+            return False
+        vista, _ = self._vivas.pop(nombre)
+        self._liberar(self._secciones[nombre], vista)
+        logger.debug(f"Seccion '{nombre}' liberada")
+        return True
+
+    def descartar_inactivas(self, segundos):
+        """Libera las secciones sin usar hace mas de segundos. Devuelve sus nombres."""
+        limite = self._reloj() - segundos
+        viejas = [n for n, (_, uso) in self._vivas.items() if uso <= limite]
+        return [n for n in viejas if self.descartar(n)]
+
+    def descartar_todas(self):
+        """Libera todo lo descartable (por ejemplo, al minimizar)."""
+        return [n for n in list(self._vivas) if self.descartar(n)]
+
+    def _descartable(self, nombre):
+        seccion = self._secciones[nombre]
+        return seccion.descartable and nombre != self._activa and not self._ocupada(seccion)
+
+    def _respetar_limite(self):
+        if self._max_vivas is None:
+            return
+        sobran = len(self._vivas) - self._max_vivas
+        for nombre in list(self._vivas):
+            if sobran <= 0:
+                break
+            if self.descartar(nombre):
+                sobran -= 1
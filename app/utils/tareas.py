@@ -0,0 +1,174 @@
+"""
+Tareas en segundo plano: la parte del ejecutor que no depende de Qt.
+
+Una Tarea envuelve una llamada (normalmente un metodo de servicio) que el
+ejecutor (app/utils/ejecutor.py) corre en un hilo del QThreadPool. Aqui vive
+todo lo que no necesita Qt, para poder probarlo sin interfaz:
+
+    - Cancelacion: cancelar() marca la tarea; si todavia no empezo ya no se
+      ejecuta, y si esta corriendo su consulta SQL se aborta (ver
+      connection.cancelable). Una tarea cancelada nunca entrega resultado.
+    - Supresion de duplicados (RegistroTareas): cada tarea tiene una clave
+      que identifica "que carga es" (p. ej. "reportes.pipeline"). Si se pide
+      otra vez la misma clave con los mismos argumentos mientras la primera
+      sigue activa, no se lanza una segunda consulta: el resultado de la
+      primera se entrega al ultimo solicitante. Si los argumentos cambiaron
+      (otro rango de fechas, otro filtro), la tarea anterior se cancela y se
+      reemplaza.
+
+Prioridades: valores mas altos se ejecutan antes cuando hay tareas en cola.
+"""
+
+import sqlite3
+import threading
+
+from app.database.connection import cancelable
+
+PRIORIDAD_BAJA = 0
+PRIORIDAD_NORMAL = 5
+PRIORIDAD_ALTA = 10
+
+
+class TareaCancelada(Exception):
+    """La tarea se cancelo antes de terminar; no hay resultado que entregar."""
+
+
+class Tarea:
+    """
+    Una llamada pendiente de ejecutar en segundo plano.
+
+    Args:
+        clave:         identifica la carga para suprimir duplicados.
+        funcion:       lo que se ejecuta en el hilo de trabajo. Debe ser una
+                       funcion o metodo (no una lambda) para que dos
+                       solicitudes iguales se reconozcan como tales.
+        args, kwargs:  argumentos de funcion.
+        prioridad:     PRIORIDAD_BAJA / NORMAL / ALTA (o cualquier entero).
+        interrumpible: si es True, cancelar() aborta la consulta SQL en
+                       curso. Las tareas que escriben (envios, importaciones)
+                       deben usar False para no quedar a medias.
+        al_terminar:   callback(resultado), se llama en el hilo de la GUI.
+        al_fallar:     callback(mensaje), si funcion lanzo una excepcion.
+    """
+
+    def __init__(self, clave, funcion, args=(), kwargs=None, prioridad=PRIORIDAD_NORMAL,
+                 interrumpible=True, al_terminar=None, al_fallar=None):
+        self.clave = clave
+        self.funcion = funcion
+        self.args = tuple(args)
+        self.kwargs = dict(kwargs or {})
+        self.prioridad = prioridad
+        self.interrumpible = interrumpible
+        self.al_terminar = al_terminar
+        self.al_fallar = al_fallar
+        self._cancelada = threading.Event()
+
+    def __repr__(self):
+        return f"<Tarea(clave='{self.clave}', prioridad={self.prioridad})>"
+
+    @property
+    def cancelada(self):
+        return self._cancelada.is_set()
+
+    def cancelar(self):
+        """Marca la tarea como cancelada. Se puede llamar desde cualquier hilo."""
+        self._cancelada.set()
+
+    def misma_solicitud(self, otra):
+        """True si otra pide exactamente lo mismo (funcion y argumentos)."""
+        return (
+            self.funcion == otra.funcion
+            and self.args == otra.args
+            and self.kwargs == otra.kwargs
+        )
+
+    def _debe_abortar(self):
+        # la llama SQLite desde el hilo de trabajo durante cada consulta
+        return self.interrumpible and self._cancelada.is_set()
+
+    def ejecutar(self):
+        """
+        Ejecuta funcion en el hilo actual y devuelve su resultado.
+
+        Raises:
+            TareaCancelada: si la tarea se cancelo antes de empezar o si su
+                consulta se aborto por la cancelacion.
+            Exception: cualquier otra excepcion de funcion se propaga.
+        """
+        if self.cancelada:
+            raise TareaCancelada(self.clave)
+        try:
+            with cancelable(self._debe_abortar):
+                resultado = self.funcion(*self.args, **self.kwargs)
+        except sqlite3.OperationalError:
+            if self.cancelada:
+                raise TareaCancelada(self.clave)
+            raise
+        if self.cancelada:
+            # termino, pero ya nadie espera el resultado (p. ej. el servicio
+            # atrapo el "interrupted" y devolvio una tupla de error)
+            raise TareaCancelada(self.clave)
+        return resultado
+
+
+class RegistroTareas:
+    """
+    Tareas activas por clave. Se usa solo desde el hilo de la GUI.
+    """
+
+    def __init__(self):
+        self._activas = {}
+
+    def __len__(self):
+        return len(self._activas)
+
+    def registrar(self, tarea):
+        """
+        Registra una solicitud nueva.
+
+        Returns:
+            tuple: (tarea_vigente, tarea_reemplazada)
+                - Si ya habia una tarea identica activa, tarea_vigente es esa
+                  (con los callbacks de la nueva) y no hay que lanzar nada.
+                - Si habia una distinta con la misma clave, se cancela y se
+                  devuelve como tarea_reemplazada.
+        """
+        actual = self._activas.get(tarea.clave)
+        if actual is not None and not actual.cancelada:
+            if actual.misma_solicitud(tarea):
+                actual.al_terminar = tarea.al_terminar
+                actual.al_fallar = tarea.al_fallar
+                return actual, None
+            actual.cancelar()
+        else:
+            actual = None
+        self._activas[tarea.clave] = tarea
+        return tarea, actual
+
+    def activa(self, clave):
+        """La tarea activa con esa clave, o None."""
+        return self._activas.get(clave)
+
+    def activas_con_prefijo(self, prefijo):
+        """Claves activas que empiezan con prefijo."""
+        return [clave for clave in self._activas if clave.startswith(prefijo)]
+
+    def cancelar(self, clave):
+        """Cancela y quita la tarea de esa clave. Devuelve la tarea o None."""
+        tarea = self._activas.pop(clave, None)
+        if tarea is not None:
+            tarea.cancelar()
+        return tarea
+
+    def cancelar_todas(self):
+        """Cancela todas las tareas activas y las devuelve."""
+        tareas = list(self._activas.values())
+        self._activas.clear()
+        for tarea in tareas:
+            tarea.cancelar()
+        return tareas
+
+    def terminar(self, tarea):
+        """Quita la tarea del registro si sigue siendo la vigente de su clave."""
+        if self._activas.get(tarea.clave) is tarea:
+            del self._activas[tarea.clave]
@@ -2,10 +2,10 @@
 
 import os
 from PyQt5.QtWidgets import (
-    QWidget, QMessageBox, QTableWidgetItem, QHeaderView, QListWidgetItem
+    QWidget, QMessageBox, QHeaderView, QListWidgetItem, QFileDialog, QProgressDialog
 )
 from PyQt5.QtGui import QColor
-from PyQt5.QtCore import QDate
+from PyQt5.QtCore import QDate, Qt, QTimer, pyqtSignal
 from PyQt5 import uic
 
 _FECHA_NAC_NULA = QDate(1900, 1, 1)
@@ -13,16 +13,65 @@ from app.database.connection import get_connection
 from app.services.empresa_service import EmpresaService
 from app.services.contacto_service import ContactoService
 from app.services.etiqueta_service import EtiquetaService
+from app.services.importacion_service import ImportacionService
 from app.services.segmento_service import SegmentoService
 from app.utils.catalog_cache import CatalogCache
+from app.utils.ejecutor import obtener_ejecutor
+from app.utils.tareas import PRIORIDAD_BAJA
 from app.views.notas_empresa_widget import NotasEmpresaWidget
 from app.views.notas_contacto_widget import NotasContactoWidget
+from app.views.tabla_paginada_model import TablaPaginadaModel, ColumnaTabla
 
 UI_PATH = os.path.join(os.path.dirname(__file__), "ui", "clientes", "clientes_view.ui")
 
+# espera tras la ultima tecla antes de filtrar (evita una consulta por letra)
+_DEBOUNCE_BUSQUEDA_MS = 300
+
+
+def _color_estado(obj):
+    return QColor(34, 139, 34) if obj.activo == 1 else QColor(220, 53, 69)
+
+
+def _texto_estado(obj):
+    return "Activo" if obj.activo == 1 else "Inactivo"
+
+
+def _nombre_completo(contacto):
+    nombre = f"{contacto.nombre} {contacto.apellido_paterno}"
+    if contacto.apellido_materno:
+        nombre += f" {contacto.apellido_materno}"
+    return nombre
+
+
+_COLUMNAS_EMPRESAS = [
+    ColumnaTabla("ID", lambda e: str(e.empresa_id), orden="id"),
+    ColumnaTabla("Razon Social", lambda e: e.razon_social or "", orden="razon_social"),
+    ColumnaTabla("Nombre Comercial", lambda e: e.nombre_comercial or "", orden="nombre_comercial"),
+    ColumnaTabla("Industria", lambda e: e.nombre_industria or "N/A", orden="industria"),
+    ColumnaTabla("Telefono", lambda e: e.telefono or "N/A", orden="telefono"),
+    ColumnaTabla("Email", lambda e: e.email or "N/A", orden="email"),
+    ColumnaTabla("Propietario", lambda e: e.nombre_propietario or "N/A", orden="propietario"),
+    ColumnaTabla("Estado", _texto_estado, orden="activo", color=_color_estado),
+]
+
+_COLUMNAS_CONTACTOS = [
+    ColumnaTabla("ID", lambda c: str(c.contacto_id), orden="id"),
+    ColumnaTabla("Nombre Completo", _nombre_completo, orden="nombre"),
+    ColumnaTabla("Email", lambda c: c.email or "N/A", orden="email"),
+    ColumnaTabla("Telefono Celular", lambda c: c.telefono_celular or "N/A", orden="telefono"),
+    ColumnaTabla("Puesto", lambda c: c.puesto or "N/A", orden="puesto"),
+    ColumnaTabla("Empresa", lambda c: c.nombre_empresa or "N/A", orden="empresa"),
+    ColumnaTabla("Propietario", lambda c: c.nombre_propietario or "N/A", orden="propietario"),
+    ColumnaTabla("Estado", _texto_estado, orden="activo", color=_color_estado),
+]
+
 
 class ClientesView(QWidget):
 
+    # avance de una importacion (procesadas, insertadas, rechazadas); se emite
+    # desde el hilo de trabajo y Qt lo entrega en el hilo de la GUI
+    progresoImportacion = pyqtSignal(int, int, int)
+
     def __init__(self, usuario_actual, parent=None):
         super().__init__(parent)
         uic.loadUi(UI_PATH, self)
@@ -31,10 +80,10 @@ class ClientesView(QWidget):
         self._contacto_service = ContactoService()
         self._etiqueta_service = EtiquetaService()
         self._segmento_service = SegmentoService()
+        self._importacion_service = ImportacionService()
+        self._dialogo_importacion = None
         self._empresa_editando = None
         self._contacto_editando = None
-        self._empresas_cargadas = []
-        self._contactos_cargados = []
         self._notas_empresa_widget = None
         self._notas_contacto_widget = None
 
@@ -43,6 +92,7 @@ class ClientesView(QWidget):
         self._create_contacto_list()
         self._create_contacto_form()
         self._setup_tabs()
+        self.progresoImportacion.connect(self._on_progreso_importacion)
 
     # ==========================================
     # TABS
@@ -64,6 +114,9 @@ class ClientesView(QWidget):
         elif index == 1:
             self._cargar_tabla_contactos()
 
+    def _mostrar_error_carga(self, mensaje):
+        QMessageBox.critical(self, "Error", mensaje)
+
     # ==========================================
     # EMPRESAS - LISTA
     # ==========================================
@@ -75,14 +128,36 @@ class ClientesView(QWidget):
 
         # referencias directas
         self.btn_nueva_empresa = self.lista_empresas_widget.btn_nueva_empresa
+        self.btn_importar_empresas = self.lista_empresas_widget.btn_importar
         self.tabla_empresas = self.lista_empresas_widget.tabla_empresas
+        self.txt_buscar_empresa = self.lista_empresas_widget.txt_buscar
         self.stat_emp_total = self.lista_empresas_widget.statValueTotal
         self.stat_emp_activas = self.lista_empresas_widget.statValueActivas
         self.stat_emp_inactivas = self.lista_empresas_widget.statValueInactivas
 
+        # modelo paginado: la tabla solo pide las filas visibles
+        self._modelo_empresas = TablaPaginadaModel(
+            _COLUMNAS_EMPRESAS, self._empresa_service.obtener_pagina, parent=self
+        )
+        # en cola: el error puede llegar durante el pintado de la tabla
+        self._modelo_empresas.errorCarga.connect(self._mostrar_error_carga, Qt.QueuedConnection)
+        self.tabla_empresas.setModel(self._modelo_empresas)
+        self.tabla_empresas.horizontalHeader().setSortIndicator(-1, Qt.DescendingOrder)
+        self.tabla_empresas.setSortingEnabled(True)
+
+        # busqueda con debounce, filtrada en SQL
+        self._timer_buscar_empresa = QTimer(self)
+        self._timer_buscar_empresa.setSingleShot(True)
+        self._timer_buscar_empresa.setInterval(_DEBOUNCE_BUSQUEDA_MS)
+        self._timer_buscar_empresa.timeout.connect(
+            lambda: self._modelo_empresas.set_filtros({"texto": self.txt_buscar_empresa.text().strip()})
+        )
+
         # senales
         self.btn_nueva_empresa.clicked.connect(self._mostrar_form_nueva_empresa)
+        self.btn_importar_empresas.clicked.connect(lambda: self._importar("empresas"))
         self.tabla_empresas.doubleClicked.connect(self._editar_empresa_seleccionada)
+        self.txt_buscar_empresa.textChanged.connect(self._timer_buscar_empresa.start)
 
         # configurar headers
         h_header = self.tabla_empresas.horizontalHeader()
@@ -105,47 +180,28 @@ class ClientesView(QWidget):
         self.tabEmpresasLayout.addWidget(self.lista_empresas_widget)
 
     def _cargar_tabla_empresas(self):
-        try:
-            # cargar con limite de 200 registros para mejorar rendimiento
-            empresas, error = self._empresa_service.obtener_todas(limit=200)
-            if error:
-                QMessageBox.critical(self, "Error", error)
-                return
-
-            self._empresas_cargadas = empresas or []
-
-            total = len(self._empresas_cargadas)
-            activas = sum(1 for e in self._empresas_cargadas if e.activo == 1)
-            inactivas = total - activas
-
-            self.stat_emp_total.setText(str(total))
-            self.stat_emp_activas.setText(str(activas))
-            self.stat_emp_inactivas.setText(str(inactivas))
-
-            self.tabla_empresas.setRowCount(0)
-
-            for empresa in self._empresas_cargadas:
-                row = self.tabla_empresas.rowCount()
-                self.tabla_empresas.insertRow(row)
-
-                self.tabla_empresas.setItem(row, 0, QTableWidgetItem(str(empresa.empresa_id)))
-                self.tabla_empresas.setItem(row, 1, QTableWidgetItem(empresa.razon_social or ""))
-                self.tabla_empresas.setItem(row, 2, QTableWidgetItem(empresa.nombre_comercial or ""))
-                self.tabla_empresas.setItem(row, 3, QTableWidgetItem(empresa.nombre_industria or "N/A"))
-                self.tabla_empresas.setItem(row, 4, QTableWidgetItem(empresa.telefono or "N/A"))
-                self.tabla_empresas.setItem(row, 5, QTableWidgetItem(empresa.email or "N/A"))
-                self.tabla_empresas.setItem(row, 6, QTableWidgetItem(empresa.nombre_propietario or "N/A"))
+        # el modelo vuelve a pedir el primer bloque; el resto se carga al hacer scroll
+        self._modelo_empresas.recargar()
+
+        # los COUNT recorren la tabla completa: se calculan en segundo plano
+        obtener_ejecutor().ejecutar(
+            "clientes.empresas.resumen", self._empresa_service.contar_resumen,
+            al_terminar=self._mostrar_resumen_empresas,
+            al_fallar=lambda error: QMessageBox.critical(
+                self, "Error", f"No se pudieron cargar las empresas: {error}"
+            ),
+        )
 
-                estado = "Activo" if empresa.activo == 1 else "Inactivo"
-                item_estado = QTableWidgetItem(estado)
-                if empresa.activo == 1:
-                    item_estado.setForeground(QColor(34, 139, 34))
-                else:
-                    item_estado.setForeground(QColor(220, 53, 69))
-                self.tabla_empresas.setItem(row, 7, item_estado)
+    def _mostrar_resumen_empresas(self, resultado):
+        resumen, error = resultado
+        if error:
+            QMessageBox.critical(self, "Error", error)
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"No se pudieron cargar las empresas: {str(e)}")
+        total, activas = resumen
+        self.stat_emp_total.setText(str(total))
+        self.stat_emp_activas.setText(str(activas))
+        self.stat_emp_inactivas.setText(str(total - activas))
 
     def _mostrar_lista_empresas(self):
         self.form_empresas_widget.hide()
@@ -280,13 +336,7 @@ class ClientesView(QWidget):
         self._ocultar_notas_empresa()
 
     def _editar_empresa_seleccionada(self, index):
-        row = index.row()
-        id_item = self.tabla_empresas.item(row, 0)
-        if not id_item:
-            return
-
-        empresa_id = int(id_item.text())
-        empresa = next((e for e in self._empresas_cargadas if e.empresa_id == empresa_id), None)
+        empresa = self._modelo_empresas.objeto_en(index.row())
         if not empresa:
             return
 
@@ -540,14 +590,36 @@ class ClientesView(QWidget):
 
         # referencias directas
         self.btn_nuevo_contacto = self.lista_contactos_widget.btn_nuevo_contacto
+        self.btn_importar_contactos = self.lista_contactos_widget.btn_importar
         self.tabla_contactos = self.lista_contactos_widget.tabla_contactos
+        self.txt_buscar_contacto = self.lista_contactos_widget.txt_buscar
         self.stat_ct_total = self.lista_contactos_widget.statValueTotal
         self.stat_ct_activos = self.lista_contactos_widget.statValueActivos
         self.stat_ct_inactivos = self.lista_contactos_widget.statValueInactivos
 
+        # modelo paginado: la tabla solo pide las filas visibles
+        self._modelo_contactos = TablaPaginadaModel(
+            _COLUMNAS_CONTACTOS, self._contacto_service.obtener_pagina, parent=self
+        )
+        # en cola: el error puede llegar durante el pintado de la tabla
+        self._modelo_contactos.errorCarga.connect(self._mostrar_error_carga, Qt.QueuedConnection)
+        self.tabla_contactos.setModel(self._modelo_contactos)
+        self.tabla_contactos.horizontalHeader().setSortIndicator(-1, Qt.DescendingOrder)
+        self.tabla_contactos.setSortingEnabled(True)
+
+        # busqueda con debounce, filtrada en SQL
+        self._timer_buscar_contacto = QTimer(self)
+        self._timer_buscar_contacto.setSingleShot(True)
+        self._timer_buscar_contacto.setInterval(_DEBOUNCE_BUSQUEDA_MS)
+        self._timer_buscar_contacto.timeout.connect(
+            lambda: self._modelo_contactos.set_filtros({"texto": self.txt_buscar_contacto.text().strip()})
+        )
+
         # senales
         self.btn_nuevo_contacto.clicked.connect(self._mostrar_form_nuevo_contacto)
+        self.btn_importar_contactos.clicked.connect(lambda: self._importar("contactos"))
         self.tabla_contactos.doubleClicked.connect(self._editar_contacto_seleccionado)
+        self.txt_buscar_contacto.textChanged.connect(self._timer_buscar_contacto.start)
 
         # configurar headers
         h_header = self.tabla_contactos.horizontalHeader()
@@ -570,52 +642,28 @@ class ClientesView(QWidget):
         self.tabContactosLayout.addWidget(self.lista_contactos_widget)
 
     def _cargar_tabla_contactos(self):
-        try:
-            # cargar con limite de 200 registros para mejorar rendimiento
-            contactos, error = self._contacto_service.obtener_todos(limit=200)
-            if error:
-                QMessageBox.critical(self, "Error", error)
-                return
-
-            self._contactos_cargados = contactos or []
-
-            total = len(self._contactos_cargados)
-            activos = sum(1 for c in self._contactos_cargados if c.activo == 1)
-            inactivos = total - activos
-
-            self.stat_ct_total.setText(str(total))
-            self.stat_ct_activos.setText(str(activos))
-            self.stat_ct_inactivos.setText(str(inactivos))
-
-            self.tabla_contactos.setRowCount(0)
-
-            for contacto in self._contactos_cargados:
-                row = self.tabla_contactos.rowCount()
-                self.tabla_contactos.insertRow(row)
-
-                self.tabla_contactos.setItem(row, 0, QTableWidgetItem(str(contacto.contacto_id)))
-
-                nombre_completo = f"{contacto.nombre} {contacto.apellido_paterno}"
-                if contacto.apellido_materno:
-                    nombre_completo += f" {contacto.apellido_materno}"
-                self.tabla_contactos.setItem(row, 1, QTableWidgetItem(nombre_completo))
-
-                self.tabla_contactos.setItem(row, 2, QTableWidgetItem(contacto.email or "N/A"))
-                self.tabla_contactos.setItem(row, 3, QTableWidgetItem(contacto.telefono_celular or "N/A"))
-                self.tabla_contactos.setItem(row, 4, QTableWidgetItem(contacto.puesto or "N/A"))
-                self.tabla_contactos.setItem(row, 5, QTableWidgetItem(contacto.nombre_empresa or "N/A"))
-                self.tabla_contactos.setItem(row, 6, QTableWidgetItem(contacto.nombre_propietario or "N/A"))
+        # el modelo vuelve a pedir el primer bloque; el resto se carga al hacer scroll
+        self._modelo_contactos.recargar()
+
+        # los COUNT recorren la tabla completa: se calculan en segundo plano
+        obtener_ejecutor().ejecutar(
+            "clientes.contactos.resumen", self._contacto_service.contar_resumen,
+            al_terminar=self._mostrar_resumen_contactos,
+            al_fallar=lambda error: QMessageBox.critical(
+                self, "Error", f"No se pudieron cargar los contactos: {error}"
+            ),
+        )
 
-                estado = "Activo" if contacto.activo == 1 else "Inactivo"
-                item_estado = QTableWidgetItem(estado)
-                if contacto.activo == 1:
-                    item_estado.setForeground(QColor(34, 139, 34))
-                else:
-                    item_estado.setForeground(QColor(220, 53, 69))
-                self.tabla_contactos.setItem(row, 7, item_estado)
+    def _mostrar_resumen_contactos(self, resultado):
+        resumen, error = resultado
+        if error:
+            QMessageBox.critical(self, "Error", error)
+            return
 
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"No se pudieron cargar los contactos: {str(e)}")
+        total, activos = resumen
+        self.stat_ct_total.setText(str(total))
+        self.stat_ct_activos.setText(str(activos))
+        self.stat_ct_inactivos.setText(str(total - activos))
 
     def _mostrar_lista_contactos(self):
         self.form_contactos_widget.hide()
@@ -744,15 +792,7 @@ class ClientesView(QWidget):
         self._ocultar_notas_contacto()
 
     def _editar_contacto_seleccionado(self, index):
-        row = index.row()
-        id_item = self.tabla_contactos.item(row, 0)
-        if not id_item:
-            return
-
-        contacto_id = int(id_item.text())
-        contacto = next(
-            (c for c in self._contactos_cargados if c.contacto_id == contacto_id), None
-        )
+        contacto = self._modelo_contactos.objeto_en(index.row())
         if not contacto:
             return
 
@@ -1001,6 +1041,73 @@ class ClientesView(QWidget):
         else:
             self._cargar_segmentos_contacto(self._contacto_editando.contacto_id)
 
+    # ==========================================
+    # IMPORTACION (CSV / XLSX)
+    # ==========================================
+
+    def _importar(self, entidad):
+        ruta, _ = QFileDialog.getOpenFileName(
+            self,
+            f"Importar {entidad}",
+            os.path.expanduser("~"),
+            "Archivos de datos (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)",
+        )
+        if not ruta:
+            return
+        if entidad == "empresas":
+            importar = self._importacion_service.importar_empresas
+        else:
+            importar = self._importacion_service.importar_contactos
+
+        # dialogo sin boton de cancelar: la importacion escribe y no se interrumpe
+        self._dialogo_importacion = QProgressDialog(f"Importando {entidad}...", None, 0, 0, self)
+        self._dialogo_importacion.setWindowTitle("Importacion")
+        self._dialogo_importacion.setCancelButton(None)
+        self._dialogo_importacion.setMinimumDuration(0)
+        self._dialogo_importacion.show()
+        self.btn_importar_empresas.setEnabled(False)
+        self.btn_importar_contactos.setEnabled(False)
+
+        obtener_ejecutor().ejecutar(
+            f"clientes.importar.{entidad}", importar,
+            args=(ruta, self._usuario_actual.usuario_id),
+            kwargs={"al_progreso": self.progresoImportacion.emit},
+            prioridad=PRIORIDAD_BAJA, interrumpible=False,
+            al_terminar=lambda resultado: self._on_importacion_terminada(entidad, resultado),
+            al_fallar=lambda error: self._on_importacion_terminada(entidad, (None, error)),
+        )
+
+    def _on_progreso_importacion(self, procesadas, insertadas, rechazadas):
+        if self._dialogo_importacion is not None:
+            self._dialogo_importacion.setLabelText(
+                f"{procesadas:,} filas leidas\n{insertadas:,} guardadas, {rechazadas:,} rechazadas"
+            )
+
+    def _on_importacion_terminada(self, entidad, resultado):
+        resumen, error = resultado
+        if self._dialogo_importacion is not None:
+            self._dialogo_importacion.close()
+            self._dialogo_importacion = None
+        self.btn_importar_empresas.setEnabled(True)
+        self.btn_importar_contactos.setEnabled(True)
+        if error:
+            QMessageBox.critical(self, "Error al importar", error)
+            return
+
+        mensaje = (
+            f"Filas leidas: {resumen.procesadas:,}\n"
+            f"Guardadas: {resumen.insertadas:,}\n"
+            f"Rechazadas: {resumen.rechazadas:,}"
+        )
+        if resumen.ruta_rechazos:
+            mensaje += f"\n\nLas filas rechazadas y el motivo estan en:\n{resumen.ruta_rechazos}"
+        QMessageBox.information(self, "Importacion terminada", mensaje)
+
+        if entidad == "empresas":
+            self._cargar_tabla_empresas()
+        else:
+            self._cargar_tabla_contactos()
+
     # ==========================================
     # UTILIDADES
     # ==========================================
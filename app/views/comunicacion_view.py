@@ -5,7 +5,7 @@ from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
     QTableWidget, QTableWidgetItem, QHeaderView, QFrame,
     QLineEdit, QTextEdit, QPlainTextEdit, QComboBox, QCheckBox,
-    QSpinBox, QMessageBox, QSizePolicy, QScrollArea, QApplication
+    QSpinBox, QMessageBox, QSizePolicy, QScrollArea
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QColor
@@ -13,6 +13,8 @@ from PyQt5 import uic
 
 from app.database.connection import get_connection
 from app.services.campana_service import CampanaService
+from app.utils.cola_envios import obtener_gestor_envios
+from app.utils.combinacion_correo import CAMPOS
 
 UI_PATH = os.path.join(os.path.dirname(__file__), "ui", "comunicacion", "comunicacion_view.ui")
 
@@ -210,6 +212,13 @@ class ComunicacionView(QWidget):
         self._build_tab_config_correo()
         self._setup_tabs()
 
+        # los envios corren en segundo plano aunque esta vista se libere;
+        # aqui solo se muestra su avance
+        self._gestor_envios = obtener_gestor_envios()
+        self._trabajo_detalle = None
+        self._gestor_envios.progreso.connect(self._on_progreso_envio)
+        self._gestor_envios.estado_cambiado.connect(self._on_estado_envio)
+
     # ==========================================
     # TABS
     # ==========================================
@@ -331,9 +340,13 @@ class ComunicacionView(QWidget):
 
         # contenido HTML
         body_lay.addWidget(_make_label("Contenido HTML *", 13, True))
+        campos = ", ".join("{{" + c + "}}" for c in CAMPOS)
+        lbl_campos = _make_label(f"Campos disponibles en asunto y contenido: {campos}", 11, color="#718096")
+        lbl_campos.setWordWrap(True)
+        body_lay.addWidget(lbl_campos)
         self._ptl_input_html = QTextEdit()
         self._ptl_input_html.setPlaceholderText(
-            "<html>\n<body>\n  <h1>Hola {nombre},</h1>\n  <p>Bienvenido a nuestro servicio.</p>\n</body>\n</html>"
+            "<html>\n<body>\n  <h1>Hola {{Nombre}},</h1>\n  <p>Bienvenido a nuestro servicio.</p>\n</body>\n</html>"
         )
         self._ptl_input_html.setMinimumHeight(200)
         self._ptl_input_html.setStyleSheet(_STYLE_INPUT)
@@ -561,8 +574,10 @@ class ComunicacionView(QWidget):
         det_title_lay.setSpacing(4)
         self._det_titulo = _make_label("Campaña", 22, True, "#1a1a2e")
         self._det_estado_lbl = _make_label("Borrador", 13)
+        self._det_envio_lbl = _make_label("", 12, color="#4a5568")
         det_title_lay.addWidget(self._det_titulo)
         det_title_lay.addWidget(self._det_estado_lbl)
+        det_title_lay.addWidget(self._det_envio_lbl)
         det_hdr.addLayout(det_title_lay)
         det_hdr.addStretch()
         self._det_btn_editar = QPushButton("Editar")
@@ -581,8 +596,18 @@ class ComunicacionView(QWidget):
         self._det_btn_enviar.setStyleSheet(_STYLE_BTN_PRIMARY)
         self._det_btn_enviar.setCursor(Qt.PointingHandCursor)
         self._det_btn_enviar.clicked.connect(self._enviar_correos_campana)
+        self._det_btn_pausar = QPushButton("Pausar")
+        self._det_btn_pausar.setStyleSheet(_STYLE_BTN_SECONDARY)
+        self._det_btn_pausar.setCursor(Qt.PointingHandCursor)
+        self._det_btn_pausar.clicked.connect(self._pausar_o_reanudar_envio)
+        self._det_btn_cancelar_envio = QPushButton("Cancelar Envío")
+        self._det_btn_cancelar_envio.setStyleSheet(_STYLE_BTN_DANGER)
+        self._det_btn_cancelar_envio.setCursor(Qt.PointingHandCursor)
+        self._det_btn_cancelar_envio.clicked.connect(self._cancelar_envio)
         det_hdr.addWidget(self._det_btn_volver)
         det_hdr.addWidget(self._det_btn_enviar)
+        det_hdr.addWidget(self._det_btn_pausar)
+        det_hdr.addWidget(self._det_btn_cancelar_envio)
         det_hdr.addWidget(self._det_btn_editar)
         det_hdr.addWidget(self._det_btn_eliminar)
         dlay.addLayout(det_hdr)
@@ -1102,6 +1127,7 @@ class ComunicacionView(QWidget):
             self._det_combo_contacto.addItem(label, (row["ContactoID"], row["Email"]))
 
         self._cargar_tabla_destinatarios(campana.campana_id)
+        self._actualizar_controles_envio()
 
     def _cargar_tabla_destinatarios(self, campana_id):
         destinatarios, error = self._service.get_destinatarios(campana_id)
@@ -1150,20 +1176,25 @@ class ComunicacionView(QWidget):
             return
         resp = QMessageBox.question(
             self, "Cargar Destinatarios",
-            f"Se cargarán todos los contactos del segmento '{self._campana_detalle.nombre_segmento}' "
-            "como destinatarios (solo los que tengan email).\n\n¿Deseas continuar?",
+            f"Se cargarán los contactos del segmento '{self._campana_detalle.nombre_segmento}' "
+            "como destinatarios. Se omiten los que no tienen email, están inactivos, "
+            "marcados como 'No contactar', en la lista de supresión o ya en la campaña."
+            "\n\n¿Deseas continuar?",
             QMessageBox.Yes | QMessageBox.No,
             QMessageBox.No,
         )
         if resp != QMessageBox.Yes:
             return
-        n, error = self._service.cargar_desde_segmento(
+        (insertados, omitidos), error = self._service.cargar_desde_segmento(
             self._campana_detalle.campana_id, self._campana_detalle.segmento_id
         )
         if error:
             QMessageBox.critical(self, "Error", error)
         else:
-            QMessageBox.information(self, "Carga Completada", f"Se agregaron {n} destinatarios.")
+            mensaje = f"Se agregaron {insertados} destinatarios."
+            if omitidos:
+                mensaje += f"\nSe omitieron {omitidos} contactos del segmento."
+            QMessageBox.information(self, "Carga Completada", mensaje)
             self._cargar_tabla_destinatarios(self._campana_detalle.campana_id)
             campana_act, _ = self._service.obtener_campana(self._campana_detalle.campana_id)
             if campana_act:
@@ -1231,25 +1262,107 @@ class ComunicacionView(QWidget):
         if resp != QMessageBox.Yes:
             return
 
-        self._det_btn_enviar.setEnabled(False)
-        self._det_btn_enviar.setText("Enviando...")
-        QApplication.processEvents()
+        trabajo, error = self._gestor_envios.iniciar(
+            campana.campana_id, self._usuario_actual.usuario_id
+        )
+        if error:
+            QMessageBox.critical(self, "Error al enviar", error)
+            return
+        self._trabajo_detalle = trabajo
+        self._actualizar_controles_envio()
+        QMessageBox.information(
+            self, "Envío iniciado",
+            "El envío corre en segundo plano; puedes seguir usando el CRM.\n"
+            "Si cierras la aplicación, continuará la próxima vez que la abras."
+        )
 
-        enviados, fallidos, error = self._service.enviar_campana(campana.campana_id)
+    # ==========================================
+    # ENVIO EN SEGUNDO PLANO
+    # ==========================================
 
-        self._det_btn_enviar.setEnabled(True)
-        self._det_btn_enviar.setText("Enviar Correos")
+    def _actualizar_controles_envio(self, trabajo=None):
+        """Muestra el avance y los botones segun el trabajo vivo de la campana en detalle."""
+        if not self._campana_detalle:
+            return
+        if trabajo is None:
+            trabajo = self._gestor_envios.trabajo_de_campana(self._campana_detalle.campana_id)
+        self._trabajo_detalle = trabajo if trabajo is not None and trabajo.vivo else None
+
+        if self._trabajo_detalle is None:
+            self._det_envio_lbl.setText("")
+            self._det_btn_enviar.setEnabled(True)
+            self._det_btn_enviar.setText("Enviar Correos")
+            self._det_btn_pausar.hide()
+            self._det_btn_cancelar_envio.hide()
+            return
 
-        if error and enviados == 0:
-            QMessageBox.critical(self, "Error al enviar", error)
+        t = self._trabajo_detalle
+        pausado = t.estado == "Pausado"
+        self._det_envio_lbl.setText(
+            f"Envío {'pausado' if pausado else 'en curso'}: {t.procesados} de "
+            f"{t.total_destinatarios} ({t.fallidos} fallidos)"
+        )
+        self._det_btn_enviar.setEnabled(False)
+        self._det_btn_enviar.setText("Pausado" if pausado else "Enviando...")
+        self._det_btn_pausar.setText("Reanudar" if pausado else "Pausar")
+        self._det_btn_pausar.show()
+        self._det_btn_cancelar_envio.show()
+
+    def _pausar_o_reanudar_envio(self):
+        trabajo = self._trabajo_detalle
+        if trabajo is None:
+            return
+        if trabajo.estado == "Pausado":
+            ok, error = self._gestor_envios.reanudar(trabajo.trabajo_id)
         else:
-            msg = f"Envío completado:\n  Enviados: {enviados}\n  Fallidos: {fallidos}"
-            if fallidos > 0:
-                msg += "\n\nLos destinatarios fallidos quedaron marcados como 'Fallido'."
-            QMessageBox.information(self, "Envío Finalizado", msg)
+            ok, error = self._gestor_envios.pausar(trabajo.trabajo_id)
+        self._actualizar_controles_envio()
+        if error:
+            QMessageBox.warning(self, "Envío", error)
+        elif trabajo.estado != "Pausado" and self._gestor_envios.en_curso(trabajo.trabajo_id):
+            # el hilo termina los correos en vuelo y avisa con estado_cambiado
+            self._det_btn_pausar.setEnabled(False)
+            self._det_envio_lbl.setText("Pausando al terminar los correos en vuelo...")
+
+    def _cancelar_envio(self):
+        trabajo = self._trabajo_detalle
+        if trabajo is None:
+            return
+        resp = QMessageBox.question(
+            self, "Cancelar Envío",
+            "¿Cancelar el envío? Los destinatarios que aún no reciben el correo "
+            "quedarán como 'Pendiente'.",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No,
+        )
+        if resp != QMessageBox.Yes:
+            return
+        ok, error = self._gestor_envios.cancelar(trabajo.trabajo_id)
+        if error:
+            QMessageBox.warning(self, "Envío", error)
+        self._actualizar_controles_envio()
 
-        # Refrescar detalle y tabla
-        campana_act, _ = self._service.obtener_campana(campana.campana_id)
+    def _on_progreso_envio(self, trabajo_id, campana_id, enviados, fallidos, total):
+        if not self._campana_detalle or self._campana_detalle.campana_id != campana_id:
+            return
+        t = self._trabajo_detalle
+        if t is not None and t.trabajo_id == trabajo_id:
+            t.enviados, t.fallidos = enviados, fallidos
+        self._det_envio_lbl.setText(
+            f"Envío en curso: {enviados + fallidos} de {total} ({fallidos} fallidos)"
+        )
+
+    def _on_estado_envio(self, trabajo_id, campana_id, estado):
+        if not self._campana_detalle or self._campana_detalle.campana_id != campana_id:
+            return
+        self._det_btn_pausar.setEnabled(True)
+        if estado in ("En Curso", "Pendiente"):
+            self._actualizar_controles_envio()
+            return
+
+        # termino, se pauso o se cancelo: refrescar metricas, estado y tabla
+        trabajo = self._gestor_envios.obtener_trabajo(trabajo_id)
+        campana_act, _ = self._service.obtener_campana(campana_id)
         if campana_act:
             self._campana_detalle = campana_act
             self._lbl_met_env.setText(str(campana_act.total_enviados))
@@ -1258,7 +1371,18 @@ class ComunicacionView(QWidget):
             self._det_estado_lbl.setStyleSheet(
                 f"font-size: 13px; color: {color}; font-weight: 600;"
             )
-        self._cargar_tabla_destinatarios(campana.campana_id)
+        self._cargar_tabla_destinatarios(campana_id)
+        self._actualizar_controles_envio()
+
+        if not self.isVisible() or trabajo is None:
+            return
+        if estado == "Error":
+            QMessageBox.critical(self, "Error al enviar", trabajo.error or "El envío se detuvo por un error.")
+        elif estado == "Completado":
+            msg = f"Envío completado:\n  Enviados: {trabajo.enviados}\n  Fallidos: {trabajo.fallidos}"
+            if trabajo.fallidos > 0:
+                msg += "\n\nLos destinatarios fallidos quedaron marcados como 'Fallido'."
+            QMessageBox.information(self, "Envío Finalizado", msg)
 
     def _editar_campana_desde_detalle(self):
         if not self._campana_detalle:
@@ -1,16 +1,15 @@
 # Vista del Dashboard - carga dashboard_view.ui y puebla KPIs, graficas y tablas
 
 import os
+from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QWidget, QTableWidgetItem, QHeaderView, QVBoxLayout
 from PyQt5.QtGui import QColor
 from PyQt5 import uic
 
-import matplotlib
-matplotlib.use("Qt5Agg")
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-
-from app.repositories.dashboard_repository import DashboardRepository
+from app.views.graficas import GraficaBarras, GraficaDona
+from app.services.dashboard_service import DashboardService
+from app.utils.ejecutor import obtener_ejecutor
+from app.utils.tareas import PRIORIDAD_ALTA
 
 UI_PATH = os.path.join(os.path.dirname(__file__), "ui", "dashboard", "dashboard_view.ui")
 
@@ -42,11 +41,28 @@ _COLORES_ESTADO = {
 
 class DashboardView(QWidget):
 
+    # se emite desde el hilo de trabajo con cada panel leido; Qt la entrega
+    # en el hilo de la GUI
+    panelListo = pyqtSignal(object)
+
     def __init__(self, usuario, parent=None):
         super().__init__(parent)
         uic.loadUi(UI_PATH, self)
         self._usuario = usuario
-        self._repo = DashboardRepository()
+        self._service = DashboardService()
+        # huella del ultimo dato pintado por panel (ver _pintar_panel)
+        self._huellas = {}
+        self._pintores = {
+            "kpis":          self._cargar_kpis,
+            "pipeline":      self._cargar_grafica_pipeline,
+            "oportunidades": self._cargar_grafica_oportunidades,
+            "actividades":   self._cargar_actividades_recientes,
+            "recordatorios": self._cargar_recordatorios_proximos,
+        }
+        # mismo objeto en cada carga para que el ejecutor reconozca la
+        # solicitud repetida y no lance una segunda lectura
+        self._emitir_panel = self.panelListo.emit
+        self.panelListo.connect(self._pintar_panel)
         self._canvas_pipeline = None
         self._canvas_oportunidades = None
         self._configurar_tablas()
@@ -78,39 +94,60 @@ class DashboardView(QWidget):
         self.tablaRecordatoriosProximos.verticalHeader().setDefaultSectionSize(36)
 
     def _init_graficas(self):
-        # Crear canvases vacios y anclarlos a los contenedores del .ui
-        self._canvas_pipeline = self._crear_canvas(self.chartPipelineContainer)
-        self._canvas_oportunidades = self._crear_canvas(self.chartOportunidadesContainer)
+        # Graficas nativas (QPainter) ancladas a los contenedores del .ui
+        self._grafica_pipeline = self._anclar(
+            self.chartPipelineContainer,
+            GraficaBarras(
+                titulo_eje="Monto estimado (miles MXN)",
+                vacio="Sin oportunidades abiertas",
+                formato=lambda v: f"${v:.0f}K",
+            ),
+        )
+        self._grafica_oportunidades = self._anclar(
+            self.chartOportunidadesContainer,
+            GraficaDona(vacio="Sin datos de oportunidades", formato=lambda v: f"{v:.0f}"),
+        )
 
-    def _crear_canvas(self, contenedor):
-        fig = Figure(facecolor=_FONDO, tight_layout=True)
-        canvas = FigureCanvasQTAgg(fig)
+    def _anclar(self, contenedor, grafica):
         layout = QVBoxLayout(contenedor)
         layout.setContentsMargins(0, 0, 0, 0)
-        layout.addWidget(canvas)
-        return canvas
+        layout.addWidget(grafica)
+        return grafica
 
     # ------------------------------------------------------------------
     # Punto de entrada principal
     # ------------------------------------------------------------------
 
     def cargar_datos(self):
-        self._cargar_kpis()
-        self._cargar_grafica_pipeline()
-        self._cargar_grafica_oportunidades()
-        self._cargar_actividades_recientes()
-        self._cargar_recordatorios_proximos()
+        # todos los paneles se leen en segundo plano en una sola transaccion;
+        # cada uno se pinta en cuanto llega (senal panelListo)
+        obtener_ejecutor().ejecutar(
+            "dashboard", self._service.obtener_snapshot, args=(self._usuario.usuario_id,),
+            kwargs={"al_panel": self._emitir_panel},
+            al_terminar=self._on_snapshot, prioridad=PRIORIDAD_ALTA,
+        )
+
+    def _on_snapshot(self, resultado):
+        snapshot, error = resultado
+        if error:
+            return
+        # normalmente ya se pintaron al llegar; solo cubre avisos perdidos
+        for panel in snapshot:
+            self._pintar_panel(panel)
+
+    def _pintar_panel(self, panel):
+        # un panel con los mismos datos que lo ya mostrado no se vuelve a
+        # pintar (evita repintar graficas y rellenar tablas sin necesidad)
+        if self._huellas.get(panel.nombre) == panel.huella:
+            return
+        self._pintores[panel.nombre](panel.datos)
+        self._huellas[panel.nombre] = panel.huella
 
     # ------------------------------------------------------------------
     # KPI cards
     # ------------------------------------------------------------------
 
-    def _cargar_kpis(self):
-        try:
-            kpis = self._repo.get_kpis()
-        except Exception:
-            return
-
+    def _cargar_kpis(self, kpis):
         self.lblContactosValue.setText(str(kpis.get("ContactosActivos", 0)))
         self.lblEmpresasValue.setText(str(kpis.get("EmpresasActivas", 0)))
         self.lblOportunidadesValue.setText(str(kpis.get("OportunidadesAbiertas", 0)))
@@ -135,133 +172,39 @@ class DashboardView(QWidget):
     # Grafica 1: Pipeline por etapa (barras horizontales)
     # ------------------------------------------------------------------
 
-    def _cargar_grafica_pipeline(self):
-        try:
-            rows = self._repo.get_pipeline_por_etapa()
-        except Exception:
-            return
-
-        canvas = self._canvas_pipeline
-        fig = canvas.figure
-        fig.clear()
-
-        if not rows:
-            ax = fig.add_subplot(111)
-            ax.text(0.5, 0.5, "Sin oportunidades abiertas",
-                    ha="center", va="center", color=_GRIS, fontsize=11)
-            ax.axis("off")
-            canvas.draw()
-            return
-
-        etapas  = [r["Etapa"] for r in rows]
-        montos  = [r["MontoTotal"] / 1000 for r in rows]   # en miles MXN
-        colores = [_COLORES_PIPELINE[i % len(_COLORES_PIPELINE)] for i in range(len(etapas))]
-
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(_FONDO)
-        fig.patch.set_facecolor(_FONDO)
-
-        bars = ax.barh(etapas, montos, color=colores, height=0.55, zorder=2)
-
-        # Etiquetas de valor al final de cada barra
-        for bar, monto in zip(bars, montos):
-            ax.text(
-                bar.get_width() + max(montos) * 0.02,
-                bar.get_y() + bar.get_height() / 2,
-                f"${monto:.0f}K",
-                va="center", ha="left",
-                fontsize=9, color=_TEXTO,
-            )
-
-        ax.set_xlabel("Monto estimado (miles MXN)", fontsize=9, color=_GRIS)
-        ax.tick_params(colors=_TEXTO, labelsize=9)
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        ax.spines["left"].set_color("#e2e8f0")
-        ax.spines["bottom"].set_color("#e2e8f0")
-        ax.xaxis.grid(True, color="#f0f2f5", zorder=0)
-        ax.set_axisbelow(True)
-        # Ampliar limite derecho para que quepan las etiquetas
-        ax.set_xlim(0, max(montos) * 1.30 if montos else 1)
-
-        fig.tight_layout(pad=1.2)
-        canvas.draw()
+    def _cargar_grafica_pipeline(self, rows):
+        # montos en miles MXN; sin filas la grafica muestra su texto de vacio
+        self._grafica_pipeline.set_datos(
+            (r["Etapa"], (r["MontoTotal"] or 0) / 1000, _COLORES_PIPELINE[i % len(_COLORES_PIPELINE)])
+            for i, r in enumerate(rows)
+        )
 
     # ------------------------------------------------------------------
     # Grafica 2: Estado de oportunidades (donut)
     # ------------------------------------------------------------------
 
-    def _cargar_grafica_oportunidades(self):
-        try:
-            row = self._repo.get_oportunidades_estado()
-        except Exception:
-            return
-
-        canvas = self._canvas_oportunidades
-        fig = canvas.figure
-        fig.clear()
-
+    def _cargar_grafica_oportunidades(self, row):
         abiertas = int(row["Abiertas"] or 0) if row else 0
         ganadas  = int(row["Ganadas"]  or 0) if row else 0
         perdidas = int(row["Perdidas"] or 0) if row else 0
-        total    = abiertas + ganadas + perdidas
-
-        ax = fig.add_subplot(111)
-        ax.set_facecolor(_FONDO)
-        fig.patch.set_facecolor(_FONDO)
-
-        if total == 0:
-            ax.text(0.5, 0.5, "Sin datos de oportunidades",
-                    ha="center", va="center", color=_GRIS, fontsize=11)
-            ax.axis("off")
-            canvas.draw()
-            return
 
-        valores = [abiertas, ganadas, perdidas]
-        etiquetas = [
-            f"Abiertas\n{abiertas}",
-            f"Ganadas\n{ganadas}",
-            f"Perdidas\n{perdidas}",
+        # Filtrar segmentos con valor 0 para no mostrarlos en la leyenda
+        datos = [
+            (etiqueta, valor, color)
+            for etiqueta, valor, color in (
+                ("Abiertas", abiertas, _AZUL),
+                ("Ganadas", ganadas, _VERDE),
+                ("Perdidas", perdidas, _ROJO),
+            )
+            if valor > 0
         ]
-        colores_donut = [_AZUL, _VERDE, _ROJO]
-
-        # Filtrar segmentos con valor 0 para no mostrar etiquetas vacías
-        datos = [(v, l, c) for v, l, c in zip(valores, etiquetas, colores_donut) if v > 0]
-        valores_f, etiquetas_f, colores_f = zip(*datos) if datos else ([], [], [])
-
-        wedges, texts, autotexts = ax.pie(
-            valores_f,
-            labels=etiquetas_f,
-            colors=colores_f,
-            autopct="%1.0f%%",
-            startangle=90,
-            wedgeprops={"width": 0.55, "edgecolor": _FONDO, "linewidth": 2},
-            textprops={"fontsize": 9, "color": _TEXTO},
-            pctdistance=0.75,
-        )
-
-        for at in autotexts:
-            at.set_fontsize(9)
-            at.set_color(_FONDO)
-            at.set_fontweight("bold")
-
-        # Texto central: total
-        ax.text(0, 0, f"{total}\ntotal", ha="center", va="center",
-                fontsize=11, fontweight="bold", color=_TEXTO)
-
-        fig.tight_layout(pad=1.2)
-        canvas.draw()
+        self._grafica_oportunidades.set_datos(datos)
 
     # ------------------------------------------------------------------
     # Tabla: Actividades recientes
     # ------------------------------------------------------------------
 
-    def _cargar_actividades_recientes(self):
-        try:
-            rows = self._repo.get_actividades_recientes()
-        except Exception:
-            return
-
+    def _cargar_actividades_recientes(self, rows):
         tabla = self.tablaActividadesRecientes
         tabla.setRowCount(0)
 
@@ -286,12 +229,7 @@ class DashboardView(QWidget):
     # Tabla: Recordatorios proximos
     # ------------------------------------------------------------------
 
-    def _cargar_recordatorios_proximos(self):
-        try:
-            rows = self._repo.get_recordatorios_proximos(self._usuario.usuario_id)
-        except Exception:
-            return
-
+    def _cargar_recordatorios_proximos(self, rows):
         tabla = self.tablaRecordatoriosProximos
         tabla.setRowCount(0)
 
@@ -0,0 +1,448 @@
+"""
+Graficas nativas (barras, dona, linea) dibujadas con QPainter.
+
+Reemplazan a matplotlib en el dashboard:
+    - Importar este modulo no carga nada fuera de PyQt5; matplotlib y su
+      backend Qt5Agg agregaban cientos de ms al arranque (MainView importa
+      todas las vistas al inicio).
+    - Cambiar los datos no reconstruye una figura: set_datos() compara con
+      lo que ya se muestra, recalcula la geometria solo si algo cambio y el
+      repintado dibuja unas decenas de primitivas (menos de 1 ms).
+    - Tooltip al pasar el cursor sobre una barra, segmento o punto.
+    - renderizar() / guardar_png() dibujan la misma grafica en una QImage,
+      sin mostrarla (para reportes o adjuntos). Requiere que exista una
+      QApplication (o QGuiApplication), aunque sea con QT_QPA_PLATFORM=offscreen.
+
+La geometria (donde va cada elemento y que hay bajo el cursor) vive en
+app/utils/geometria_graficas.py, sin Qt, para poder probarla.
+
+Uso:
+    grafica = GraficaBarras(formato=lambda v: f"${v:.0f}K")
+    grafica.set_datos([("Prospecto", 120.0), ("Propuesta", 80.5)])
+    grafica.actualizar("Propuesta", 95.0)      # cambia un solo valor
+    grafica.guardar_png("pipeline.png", 800, 400)
+"""
+
+import math
+
+from PyQt5.QtCore import QPointF, QRectF, Qt
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPen
+from PyQt5.QtWidgets import QToolTip, QWidget
+
+from app.utils.geometria_graficas import (
+    barras, escala_bonita, indice_punto, indice_rect, indice_segmento,
+    puntos_linea, segmentos_dona,
+)
+
+FONDO = QColor("#ffffff")
+TEXTO = QColor("#1a1a2e")
+TEXTO_SUAVE = QColor("#95a5a6")
+REJILLA = QColor("#f0f2f5")
+EJE = QColor("#e2e8f0")
+COLORES = [
+    "#3498db", "#2ecc71", "#f39c12",
+    "#e67e22", "#e74c3c", "#27ae60", "#95a5a6",
+]
+
+_MARGEN = 12
+_TAM_FUENTE = 9
+
+
+def _formato_simple(valor):
+    return f"{valor:,.0f}" if float(valor).is_integer() else f"{valor:,.2f}"
+
+
+class _Grafica(QWidget):
+    """
+    Base comun: datos, cache de geometria, tooltip y renderizado a imagen.
+
+    Las subclases implementan _calcular(rect) -> geometria (sin pintar nada),
+    _dibujar(painter, rect, geometria) y _indice_en(geometria, x, y).
+    """
+
+    def __init__(self, parent=None, vacio="Sin datos", formato=None):
+        super().__init__(parent)
+        self.setMouseTracking(True)
+        self.setMinimumSize(120, 100)
+        self._datos = ()
+        self._vacio = vacio
+        self._formato = formato or _formato_simple
+        self._fuente = QFont(self.font())
+        self._fuente.setPointSize(_TAM_FUENTE)
+        # (ancho, alto) -> geometria; se descarta al cambiar datos o tamano
+        self._geometria = None
+        self._resaltado = None
+
+    # ---- datos ----
+
+    @property
+    def datos(self):
+        return self._datos
+
+    def set_datos(self, datos):
+        """Reemplaza los datos. Devuelve False (y no repinta) si no cambiaron."""
+        datos = tuple(tuple(d) for d in datos)
+        if datos == self._datos:
+            return False
+        self._datos = datos
+        self._geometria = None
+        self._resaltado = None
+        self.update()
+        return True
+
+    def actualizar(self, etiqueta, valor):
+        """Cambia el valor de una categoria (o la agrega al final)."""
+        datos = list(self._datos)
+        for i, dato in enumerate(datos):
+            if dato[0] == etiqueta:
+                datos[i] = (etiqueta, valor) + tuple(dato[2:])
+                break
+        else:
+            datos.append((etiqueta, valor))
+        return self.set_datos(datos)
+
+    def _hay_datos(self):
+        return any(d[1] for d in self._datos)
+
+    # ---- pintado ----
+
+    def _geometria_para(self, rect):
+        clave = (rect.width(), rect.height())
+        if self._geometria is None or self._geometria[0] != clave:
+            self._geometria = (clave, self._calcular(rect))
+        return self._geometria[1]
+
+    def paintEvent(self, event):
+        rect = QRectF(self.rect())
+        painter = QPainter(self)
+        try:
+            self._pintar(painter, rect, self._geometria_para(rect) if self._hay_datos() else None)
+        finally:
+            painter.end()
+
+    def _pintar(self, painter, rect, geometria):
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setFont(self._fuente)
+        painter.fillRect(rect, FONDO)
+        if not self._hay_datos():
+            painter.setPen(TEXTO_SUAVE)
+            painter.drawText(rect, Qt.AlignCenter, self._vacio)
+            return
+        self._dibujar(painter, rect, geometria)
+
+    def renderizar(self, ancho, alto):
+        """Dibuja la grafica en una QImage de ancho x alto pixeles."""
+        imagen = QImage(int(ancho), int(alto), QImage.Format_ARGB32_Premultiplied)
+        imagen.fill(FONDO)
+        rect = QRectF(0, 0, ancho, alto)
+        painter = QPainter(imagen)
+        try:
+            # geometria propia: no toca la cache del widget en pantalla
+            self._pintar(painter, rect, self._calcular(rect) if self._hay_datos() else None)
+        finally:
+            painter.end()
+        return imagen
+
+    def guardar_png(self, ruta, ancho=800, alto=400):
+        """Guarda la grafica como PNG. Devuelve True si se pudo escribir."""
+        return self.renderizar(ancho, alto).save(ruta, "PNG")
+
+    # ---- tooltip ----
+
+    def mouseMoveEvent(self, event):
+        indice = None
+        if self._hay_datos():
+            geometria = self._geometria_para(QRectF(self.rect()))
+            indice = self._indice_en(geometria, event.x(), event.y())
+        if indice != self._resaltado:
+            self._resaltado = indice
+            self.update()
+        if indice is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.globalPos(), self._tooltip(indice), self)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        if self._resaltado is not None:
+            self._resaltado = None
+            self.update()
+        super().leaveEvent(event)
+
+    def _tooltip(self, indice):
+        etiqueta, valor = self._datos[indice][:2]
+        return f"{etiqueta}: {self._formato(valor)}"
+
+    # ---- utilidades de dibujo ----
+
+    def _color(self, indice):
+        if len(self._datos[indice]) > 2:
+            return QColor(self._datos[indice][2])
+        return QColor(COLORES[indice % len(COLORES)])
+
+    def _color_relleno(self, indice):
+        color = self._color(indice)
+        return color.lighter(115) if indice == self._resaltado else color
+
+
+class GraficaBarras(_Grafica):
+    """
+    Barras por categoria. datos: [(etiqueta, valor)] o [(etiqueta, valor, color)].
+
+    Args:
+        horizontal:  True = una barra por renglon (etiquetas a la izquierda).
+        titulo_eje:  texto bajo el eje de valores.
+        formato:     funcion valor -> texto para etiquetas y tooltip.
+    """
+
+    def __init__(self, parent=None, horizontal=True, titulo_eje="", vacio="Sin datos", formato=None):
+        super().__init__(parent, vacio=vacio, formato=formato)
+        self._horizontal = horizontal
+        self._titulo_eje = titulo_eje
+
+    def _calcular(self, rect):
+        metricas = QFontMetrics(self._fuente)
+        alto_texto = metricas.height()
+        valores = [d[1] for d in self._datos]
+        tope, paso = escala_bonita(max(valores, default=0))
+        etiquetas_valor = [self._formato(v) for v in valores]
+        ancho_valor = max((metricas.horizontalAdvance(t) for t in etiquetas_valor), default=0) + 6
+        abajo = alto_texto + 4 + (alto_texto + 2 if self._titulo_eje else 0)
+
+        if self._horizontal:
+            izquierda = max(metricas.horizontalAdvance(str(d[0])) for d in self._datos) + 8
+            area = (
+                rect.x() + _MARGEN + izquierda, rect.y() + _MARGEN,
+                rect.width() - 2 * _MARGEN - izquierda - ancho_valor, rect.height() - 2 * _MARGEN - abajo,
+            )
+        else:
+            area = (
+                rect.x() + _MARGEN + ancho_valor, rect.y() + _MARGEN + alto_texto + 2,
+                rect.width() - 2 * _MARGEN - ancho_valor, rect.height() - 2 * _MARGEN - abajo - alto_texto - 2,
+            )
+        area = (area[0], area[1], max(area[2], 1), max(area[3], 1))
+        return {
+            "area": area,
+            "tope": tope,
+            "marcas": [paso * i for i in range(int(round(tope / paso)) + 1)],
+            "rects": barras(valores, area, tope, self._horizontal),
+            "etiquetas_valor": etiquetas_valor,
+        }
+
+    def _dibujar(self, painter, rect, g):
+        x, y, ancho, alto = g["area"]
+        metricas = QFontMetrics(self._fuente)
+        alto_texto = metricas.height()
+
+        # rejilla y marcas del eje de valores
+        painter.setPen(QPen(REJILLA, 1))
+        for marca in g["marcas"]:
+            if self._horizontal:
+                mx = x + ancho * marca / g["tope"]
+                painter.drawLine(QPointF(mx, y), QPointF(mx, y + alto))
+            else:
+                my = y + alto - alto * marca / g["tope"]
+                painter.drawLine(QPointF(x, my), QPointF(x + ancho, my))
+        painter.setPen(TEXTO_SUAVE)
+        for marca in g["marcas"]:
+            texto = self._formato(marca)
+            if self._horizontal:
+                mx = x + ancho * marca / g["tope"]
+                painter.drawText(QRectF(mx - 40, y + alto + 2, 80, alto_texto), Qt.AlignHCenter | Qt.AlignTop, texto)
+            else:
+                my = y + alto - alto * marca / g["tope"]
+                painter.drawText(QRectF(rect.x(), my - alto_texto / 2, x - rect.x() - 4, alto_texto),
+                                 Qt.AlignRight | Qt.AlignVCenter, texto)
+        if self._titulo_eje:
+            painter.drawText(QRectF(x, rect.bottom() - _MARGEN - alto_texto, ancho, alto_texto),
+                             Qt.AlignHCenter | Qt.AlignBottom, self._titulo_eje)
+
+        # ejes
+        painter.setPen(QPen(EJE, 1))
+        painter.drawLine(QPointF(x, y + alto), QPointF(x + ancho, y + alto))
+        painter.drawLine(QPointF(x, y), QPointF(x, y + alto))
+
+        # barras, categoria y valor
+        painter.setPen(Qt.NoPen)
+        for i, (bx, by, b_ancho, b_alto) in enumerate(g["rects"]):
+            painter.setBrush(self._color_relleno(i))
+            painter.drawRect(QRectF(bx, by, b_ancho, b_alto))
+        painter.setPen(TEXTO)
+        for i, (bx, by, b_ancho, b_alto) in enumerate(g["rects"]):
+            etiqueta = str(self._datos[i][0])
+            valor = g["etiquetas_valor"][i]
+            if self._horizontal:
+                painter.drawText(QRectF(rect.x(), by, x - rect.x() - 8, b_alto),
+                                 Qt.AlignRight | Qt.AlignVCenter, etiqueta)
+                painter.drawText(QRectF(bx + b_ancho + 4, by, rect.right() - bx - b_ancho, b_alto),
+                                 Qt.AlignLeft | Qt.AlignVCenter, valor)
+            else:
+                painter.drawText(QRectF(bx - b_ancho, y + alto + 2, 3 * b_ancho, alto_texto),
+                                 Qt.AlignHCenter | Qt.AlignTop, etiqueta)
+                painter.drawText(QRectF(bx - b_ancho, by - alto_texto - 2, 3 * b_ancho, alto_texto),
+                                 Qt.AlignHCenter | Qt.AlignBottom, valor)
+        painter.setBrush(Qt.NoBrush)
+
+    def _indice_en(self, g, px, py):
+        return indice_rect(g["rects"], px, py, self._horizontal, area=g["area"])
+
+
+class GraficaDona(_Grafica):
+    """
+    Dona con leyenda a la derecha y el total al centro.
+    datos: [(etiqueta, valor)] o [(etiqueta, valor, color)].
+    """
+
+    GROSOR = 0.55   # fraccion del radio que ocupa el anillo
+
+    def _calcular(self, rect):
+        metricas = QFontMetrics(self._fuente)
+        ancho_leyenda = max(
+            metricas.horizontalAdvance(f"{d[0]}  {self._formato(d[1])}") for d in self._datos
+        ) + 24
+        disponible_ancho = rect.width() - 2 * _MARGEN - ancho_leyenda
+        radio = max(min(disponible_ancho, rect.height() - 2 * _MARGEN) / 2, 10)
+        centro = (rect.x() + _MARGEN + radio, rect.y() + rect.height() / 2)
+        return {
+            "centro": centro,
+            "radio": radio,
+            "segmentos": segmentos_dona([d[1] for d in self._datos]),
+            "leyenda_x": centro[0] + radio + 16,
+            "total": sum(max(d[1], 0) for d in self._datos),
+        }
+
+    def _dibujar(self, painter, rect, g):
+        cx, cy = g["centro"]
+        radio = g["radio"]
+        interior = radio * (1 - self.GROSOR)
+        caja = QRectF(cx - radio, cy - radio, 2 * radio, 2 * radio)
+        metricas = QFontMetrics(self._fuente)
+
+        painter.setPen(QPen(FONDO, 2))
+        for i, (inicio, barrido) in enumerate(g["segmentos"]):
+            if barrido <= 0:
+                continue
+            painter.setBrush(self._color_relleno(i))
+            painter.drawPie(caja, int(inicio * 16), int(round(barrido * 16)))
+        painter.setBrush(FONDO)
+        painter.setPen(Qt.NoPen)
+        painter.drawEllipse(QPointF(cx, cy), interior, interior)
+
+        # porcentaje dentro de cada segmento que tenga espacio
+        fuente_negrita = QFont(self._fuente)
+        fuente_negrita.setBold(True)
+        painter.setFont(fuente_negrita)
+        painter.setPen(FONDO)
+        medio = (radio + interior) / 2
+        for inicio, barrido in g["segmentos"]:
+            if barrido < 18:
+                continue
+            angulo = math.radians(inicio + barrido / 2)
+            px, py = cx + medio * math.cos(angulo), cy - medio * math.sin(angulo)
+            painter.drawText(QRectF(px - 25, py - 10, 50, 20), Qt.AlignCenter, f"{barrido / 3.6:.0f}%")
+
+        # total al centro
+        painter.setPen(TEXTO)
+        painter.drawText(QRectF(cx - interior, cy - interior, 2 * interior, 2 * interior),
+                         Qt.AlignCenter, f"{self._formato(g['total'])}\ntotal")
+        painter.setFont(self._fuente)
+
+        # leyenda
+        alto_texto = metricas.height() + 6
+        y = cy - alto_texto * len(self._datos) / 2
+        for i, dato in enumerate(self._datos):
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(self._color(i))
+            painter.drawRect(QRectF(g["leyenda_x"], y + 4, 10, 10))
+            painter.setPen(TEXTO)
+            painter.drawText(QRectF(g["leyenda_x"] + 16, y, rect.right() - g["leyenda_x"] - 16, alto_texto),
+                             Qt.AlignLeft | Qt.AlignTop, f"{dato[0]}  {self._formato(dato[1])}")
+            y += alto_texto
+        painter.setBrush(Qt.NoBrush)
+
+    def _indice_en(self, g, px, py):
+        radio = g["radio"]
+        return indice_segmento(g["segmentos"], g["centro"], radio, radio * (1 - self.GROSOR), px, py)
+
+    def _tooltip(self, indice):
+        etiqueta, valor = self._datos[indice][:2]
+        total = sum(max(d[1], 0) for d in self._datos)
+        return f"{etiqueta}: {self._formato(valor)} ({100 * valor / total:.0f}%)"
+
+
+class GraficaLinea(_Grafica):
+    """
+    Serie de puntos unidos. datos: [(etiqueta, valor)] en orden.
+
+    agregar_punto() anade al final y, con maximo, descarta los mas viejos
+    (para series que crecen, como ingresos por mes).
+    """
+
+    def __init__(self, parent=None, color=COLORES[0], vacio="Sin datos", formato=None):
+        super().__init__(parent, vacio=vacio, formato=formato)
+        self._color_linea = QColor(color)
+
+    def agregar_punto(self, etiqueta, valor, maximo=None):
+        datos = self._datos + ((etiqueta, valor),)
+        if maximo is not None:
+            datos = datos[-maximo:]
+        return self.set_datos(datos)
+
+    def _hay_datos(self):
+        return bool(self._datos)
+
+    def _calcular(self, rect):
+        metricas = QFontMetrics(self._fuente)
+        alto_texto = metricas.height()
+        valores = [d[1] for d in self._datos]
+        tope, paso = escala_bonita(max(valores, default=0))
+        marcas = [paso * i for i in range(int(round(tope / paso)) + 1)]
+        izquierda = max(metricas.horizontalAdvance(self._formato(m)) for m in marcas) + 8
+        area = (
+            rect.x() + _MARGEN + izquierda, rect.y() + _MARGEN,
+            max(rect.width() - 2 * _MARGEN - izquierda, 1), max(rect.height() - 2 * _MARGEN - alto_texto - 4, 1),
+        )
+        # una etiqueta del eje x cada cierto numero de puntos para que no se encimen
+        ancho_etiqueta = max(metricas.horizontalAdvance(str(d[0])) for d in self._datos) + 8
+        cada = max(1, int(ancho_etiqueta * len(valores) / area[2]) + 1)
+        return {
+            "area": area, "tope": tope, "marcas": marcas, "cada": cada,
+            "puntos": puntos_linea(valores, area, tope),
+        }
+
+    def _dibujar(self, painter, rect, g):
+        x, y, ancho, alto = g["area"]
+        alto_texto = QFontMetrics(self._fuente).height()
+
+        for marca in g["marcas"]:
+            my = y + alto - alto * marca / g["tope"]
+            painter.setPen(QPen(REJILLA, 1))
+            painter.drawLine(QPointF(x, my), QPointF(x + ancho, my))
+            painter.setPen(TEXTO_SUAVE)
+            painter.drawText(QRectF(rect.x(), my - alto_texto / 2, x - rect.x() - 6, alto_texto),
+                             Qt.AlignRight | Qt.AlignVCenter, self._formato(marca))
+        painter.setPen(QPen(EJE, 1))
+        painter.drawLine(QPointF(x, y + alto), QPointF(x + ancho, y + alto))
+
+        puntos = [QPointF(px, py) for px, py in g["puntos"]]
+        painter.setPen(QPen(self._color_linea, 2))
+        if len(puntos) > 1:
+            painter.drawPolyline(*puntos)
+        painter.setBrush(self._color_linea)
+        for i, punto in enumerate(puntos):
+            r = 5 if i == self._resaltado else 3
+            painter.drawEllipse(punto, r, r)
+        painter.setBrush(Qt.NoBrush)
+
+        painter.setPen(TEXTO_SUAVE)
+        for i, punto in enumerate(puntos):
+            if i % g["cada"] == 0:
+                painter.drawText(QRectF(punto.x() - 40, y + alto + 2, 80, alto_texto),
+                                 Qt.AlignHCenter | Qt.AlignTop, str(self._datos[i][0]))
+
+    def _indice_en(self, g, px, py):
+        if len(g["puntos"]) > 1:
+            radio = (g["puntos"][1][0] - g["puntos"][0][0]) / 2
+        else:
+            radio = g["area"][2] / 2
+        return indice_punto(g["puntos"], px, radio)
@@ -8,24 +8,41 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtGui import QIcon, QColor
 from PyQt5.QtCore import QSize, QEvent, QTimer
 from PyQt5 import uic
+from app.config.settings import SECCIONES_MAX_VIVAS, SECCIONES_INACTIVAS_MIN, SECCIONES_PRECARGA
 from app.services.usuario_service import UsuarioService
 from app.repositories.rol_repository import RolRepository
-from app.views.configuracion_view import ConfiguracionView
-from app.views.clientes_view import ClientesView
-from app.views.ventas_view import VentasView
-from app.views.actividades_view import ActividadesView
-from app.views.segmentacion_view import SegmentacionView
-from app.views.comunicacion_view import ComunicacionView
-from app.views.reportes_view import ReportesView
-from app.views.notificaciones_view import NotificacionesView
 from app.views.notificacion_popup import NotificacionPopup
 from app.services.notificacion_service import NotificacionService
-from app.views.dashboard_view import DashboardView
 from app.services.permission_service import tiene_acceso
+from app.utils.ejecutor import obtener_ejecutor
+from app.utils.secciones import RegistroSecciones, Seccion, importar_seccion
+from app.utils.tareas import PRIORIDAD_BAJA
 
 UI_PATH = os.path.join(os.path.dirname(__file__), "ui", "main", "main_view.ui")
 ASSETS_PATH = os.path.join(os.path.dirname(__file__), "..", "assets")
 
+# Las vistas de cada seccion se importan y construyen al abrirlas por primera
+# vez (ver app/utils/secciones.py); aqui solo se dice donde vive cada una.
+SECCIONES = (
+    Seccion("dashboard", "app.views.dashboard_view", "DashboardView", "Dashboard",
+            descartable=False, prefijos_tareas=("dashboard",)),
+    Seccion("clientes", "app.views.clientes_view", "ClientesView", "Clientes",
+            prefijos_tareas=("clientes.",)),
+    Seccion("ventas", "app.views.ventas_view", "VentasView", "Ventas"),
+    Seccion("actividades", "app.views.actividades_view", "ActividadesView", "Actividades"),
+    Seccion("segmentacion", "app.views.segmentacion_view", "SegmentacionView", "Segmentacion"),
+    # sin prefijos: los envios corren en el pool de GestorEnvios y no dependen de la vista
+    Seccion("comunicacion", "app.views.comunicacion_view", "ComunicacionView", "Comunicación"),
+    Seccion("reportes", "app.views.reportes_view", "ReportesView", "Reportes",
+            prefijos_tareas=("reportes.", "exportar.")),
+    Seccion("notificaciones", "app.views.notificaciones_view", "NotificacionesView", "Notificaciones"),
+    Seccion("configuracion", "app.views.configuracion_view", "ConfiguracionView", "Configuracion",
+            con_usuario=False, cargar_al_mostrar=False),
+)
+
+# espera tras mostrar la ventana antes de precargar secciones
+_PRECARGA_DELAY_MS = 1500
+
 
 class MainView(QMainWindow):
 
@@ -38,22 +55,14 @@ class MainView(QMainWindow):
         self._usuario_editando = None  # None = modo crear, Usuario = modo editar
         self._notif_service = NotificacionService()
         self._popup_abierto = False
+        self.lista_usuarios_widget = None
+        self.form_usuarios_widget = None
         self._setup_icons()
         self._set_user_data(usuario)
+        self._setup_secciones()
         self._setup_navigation()
-        self._create_dashboard()
-        self._create_lista_usuarios()
-        self._create_form_usuarios()
-        self._create_clientes()
-        self._create_ventas()
-        self._create_actividades()
-        self._create_segmentacion()
-        self._create_comunicacion()
-        self._create_reportes()
-        self._create_notificaciones()
-        self._create_configuracion()
         self._setup_notif_timer()
-        self._mostrar_seccion_dashboard()
+        self._mostrar_seccion("dashboard")
 
     def closeEvent(self, event: QEvent):
         # terminar el proceso completamente al cerrar la ventana principal
@@ -83,45 +92,28 @@ class MainView(QMainWindow):
         self.welcomeTitle.setText(f"Bienvenido, {usuario.nombre}")
 
     def _setup_navigation(self):
-        self.sidebar_buttons = [
-            self.btnDashboard,
-            self.btnClientes,
-            self.btnVentas,
-            self.btnActividades,
-            self.btnSegmentacion,
-            self.btnComunicacion,
-            self.btnReportes,
-            self.btnNotificaciones,
-            self.btnUsuarios,
-            self.btnConfiguracion,
-        ]
+        self._botones_seccion = {
+            "dashboard":      self.btnDashboard,
+            "clientes":       self.btnClientes,
+            "ventas":         self.btnVentas,
+            "actividades":    self.btnActividades,
+            "segmentacion":   self.btnSegmentacion,
+            "comunicacion":   self.btnComunicacion,
+            "reportes":       self.btnReportes,
+            "notificaciones": self.btnNotificaciones,
+            "usuarios":       self.btnUsuarios,
+            "configuracion":  self.btnConfiguracion,
+        }
+        self.sidebar_buttons = list(self._botones_seccion.values())
 
-        self.btnDashboard.clicked.connect(self._mostrar_seccion_dashboard)
-        self.btnClientes.clicked.connect(self._mostrar_seccion_clientes)
-        self.btnVentas.clicked.connect(self._mostrar_seccion_ventas)
-        self.btnActividades.clicked.connect(self._mostrar_seccion_actividades)
-        self.btnSegmentacion.clicked.connect(self._mostrar_seccion_segmentacion)
-        self.btnComunicacion.clicked.connect(self._mostrar_seccion_comunicacion)
-        self.btnReportes.clicked.connect(self._mostrar_seccion_reportes)
-        self.btnNotificaciones.clicked.connect(self._mostrar_seccion_notificaciones)
+        for nombre, boton in self._botones_seccion.items():
+            if nombre in self._secciones:
+                boton.clicked.connect(lambda _=False, n=nombre: self._mostrar_seccion(n))
         self.btnUsuarios.clicked.connect(self._mostrar_seccion_usuarios)
-        self.btnConfiguracion.clicked.connect(self._mostrar_seccion_configuracion)
         self._aplicar_permisos()
 
     def _aplicar_permisos(self):
-        mapa = {
-            self.btnDashboard:      "dashboard",
-            self.btnClientes:       "clientes",
-            self.btnVentas:         "ventas",
-            self.btnActividades:    "actividades",
-            self.btnSegmentacion:   "segmentacion",
-            self.btnComunicacion:   "comunicacion",
-            self.btnReportes:       "reportes",
-            self.btnNotificaciones: "notificaciones",
-            self.btnUsuarios:       "usuarios",
-            self.btnConfiguracion:  "configuracion",
-        }
-        for boton, seccion in mapa.items():
+        for seccion, boton in self._botones_seccion.items():
             if not tiene_acceso(self._usuario_actual, seccion):
                 boton.hide()
 
@@ -160,22 +152,76 @@ class MainView(QMainWindow):
         if boton_activo:
             boton_activo.setStyleSheet(estilo_activo)
 
-    def _create_dashboard(self):
-        self.dashboard_widget = DashboardView(self._usuario_actual)
-        self.dashboard_widget.hide()
+    # ==========================================
+    # SECCIONES (se construyen al abrirlas)
+    # ==========================================
 
-    def _mostrar_seccion_dashboard(self):
-        self._ocultar_contenido_actual()
+    def _setup_secciones(self):
+        self._secciones = RegistroSecciones(
+            SECCIONES, self._construir_seccion, self._liberar_seccion,
+            max_vivas=SECCIONES_MAX_VIVAS, ocupada=self._seccion_ocupada,
+        )
+        self._precarga_pendiente = [
+            nombre for nombre in SECCIONES_PRECARGA
+            if nombre in self._secciones and tiene_acceso(self._usuario_actual, nombre)
+        ]
+        if self._precarga_pendiente:
+            QTimer.singleShot(_PRECARGA_DELAY_MS, self._precargar_siguiente)
+
+        # liberar secciones que no se abren hace tiempo
+        self._secciones_timer = QTimer(self)
+        self._secciones_timer.setInterval(60_000)
+        self._secciones_timer.timeout.connect(
+            lambda: self._secciones.descartar_inactivas(SECCIONES_INACTIVAS_MIN * 60)
+        )
+        self._secciones_timer.start()
+
+    def _construir_seccion(self, seccion, clase):
+        widget = clase(self._usuario_actual) if seccion.con_usuario else clase()
+        widget.hide()
+        return widget
 
-        if self.dashboard_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.dashboard_widget)
+    def _liberar_seccion(self, seccion, widget):
+        self.contentLayout.removeWidget(widget)
+        widget.hide()
+        widget.deleteLater()
 
-        self.dashboard_widget.show()
-        self.dashboard_widget.cargar_datos()
-        self.headerPageTitle.setText("Dashboard")
+    def _seccion_ocupada(self, seccion):
+        ejecutor = obtener_ejecutor()
+        return any(ejecutor.en_curso_con_prefijo(p) for p in seccion.prefijos_tareas)
+
+    def _mostrar_seccion(self, nombre):
+        self._ocultar_contenido_actual()
+
+        widget = self._secciones.activar(nombre)
+        if widget.parent() != self.contentArea:
+            self.contentLayout.addWidget(widget)
+
+        seccion = self._secciones.seccion(nombre)
+        widget.show()
+        if seccion.cargar_al_mostrar:
+            widget.cargar_datos()
+        self.headerPageTitle.setText(seccion.titulo)
+
+        self._resaltar_boton_activo(self._botones_seccion[nombre])
+
+    def _precargar_siguiente(self):
+        # una seccion a la vez: el import corre en segundo plano y la
+        # construccion (que toca widgets) en el hilo de la GUI al terminar
+        while self._precarga_pendiente:
+            nombre = self._precarga_pendiente.pop(0)
+            if self._secciones.viva(nombre) is None:
+                obtener_ejecutor().ejecutar(
+                    f"secciones.precarga.{nombre}", importar_seccion,
+                    args=(self._secciones.seccion(nombre),), prioridad=PRIORIDAD_BAJA,
+                    al_terminar=lambda _clase, n=nombre: self._on_seccion_importada(n),
+                    al_fallar=lambda _error: self._precargar_siguiente(),
+                )
+                return
 
-        if hasattr(self, 'btnDashboard'):
-            self._resaltar_boton_activo(self.btnDashboard)
+    def _on_seccion_importada(self, nombre):
+        self._secciones.precargar(nombre)
+        QTimer.singleShot(0, self._precargar_siguiente)
 
     def _create_lista_usuarios(self):
         # cargar la lista de usuarios desde el archivo .ui (editable con Qt Designer)
@@ -278,9 +324,17 @@ class MainView(QMainWindow):
                 f"No se pudieron cargar los usuarios: {str(e)}"
             )
 
+    def _asegurar_usuarios(self):
+        # la lista y el formulario de usuarios se crean la primera vez que se abren
+        if self.lista_usuarios_widget is None:
+            self._create_lista_usuarios()
+            self._create_form_usuarios()
+
     def _mostrar_seccion_usuarios(self):
         # mostrar la lista de usuarios y ocultar otras vistas
+        self._asegurar_usuarios()
         self._ocultar_contenido_actual()
+        self._secciones.activar(None)
 
         # agregar y mostrar la lista de usuarios
         if self.lista_usuarios_widget.parent() != self.contentArea:
@@ -548,125 +602,6 @@ class MainView(QMainWindow):
         # enfocar el primer campo
         self.input_nombre.setFocus()
 
-    def _create_clientes(self):
-        self.clientes_widget = ClientesView(self._usuario_actual)
-        self.clientes_widget.hide()
-
-    def _mostrar_seccion_clientes(self):
-        self._ocultar_contenido_actual()
-
-        if self.clientes_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.clientes_widget)
-
-        self.clientes_widget.show()
-        self.clientes_widget.cargar_datos()
-        self.headerPageTitle.setText("Clientes")
-
-        if hasattr(self, 'btnClientes'):
-            self._resaltar_boton_activo(self.btnClientes)
-
-    def _create_ventas(self):
-        self.ventas_widget = VentasView(self._usuario_actual)
-        self.ventas_widget.hide()
-
-    def _mostrar_seccion_ventas(self):
-        self._ocultar_contenido_actual()
-
-        if self.ventas_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.ventas_widget)
-
-        self.ventas_widget.show()
-        self.ventas_widget.cargar_datos()
-        self.headerPageTitle.setText("Ventas")
-
-        if hasattr(self, 'btnVentas'):
-            self._resaltar_boton_activo(self.btnVentas)
-
-    def _create_actividades(self):
-        self.actividades_widget = ActividadesView(self._usuario_actual)
-        self.actividades_widget.hide()
-
-    def _mostrar_seccion_actividades(self):
-        self._ocultar_contenido_actual()
-
-        if self.actividades_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.actividades_widget)
-
-        self.actividades_widget.show()
-        self.actividades_widget.cargar_datos()
-        self.headerPageTitle.setText("Actividades")
-
-        if hasattr(self, 'btnActividades'):
-            self._resaltar_boton_activo(self.btnActividades)
-
-    def _create_segmentacion(self):
-        self.segmentacion_widget = SegmentacionView(self._usuario_actual)
-        self.segmentacion_widget.hide()
-
-    def _mostrar_seccion_segmentacion(self):
-        self._ocultar_contenido_actual()
-
-        if self.segmentacion_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.segmentacion_widget)
-
-        self.segmentacion_widget.show()
-        self.segmentacion_widget.cargar_datos()
-        self.headerPageTitle.setText("Segmentacion")
-
-        if hasattr(self, 'btnSegmentacion'):
-            self._resaltar_boton_activo(self.btnSegmentacion)
-
-    def _create_comunicacion(self):
-        self.comunicacion_widget = ComunicacionView(self._usuario_actual)
-        self.comunicacion_widget.hide()
-
-    def _mostrar_seccion_comunicacion(self):
-        self._ocultar_contenido_actual()
-
-        if self.comunicacion_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.comunicacion_widget)
-
-        self.comunicacion_widget.show()
-        self.comunicacion_widget.cargar_datos()
-        self.headerPageTitle.setText("Comunicación")
-
-        if hasattr(self, 'btnComunicacion'):
-            self._resaltar_boton_activo(self.btnComunicacion)
-
-    def _create_reportes(self):
-        self.reportes_widget = ReportesView(self._usuario_actual)
-        self.reportes_widget.hide()
-
-    def _mostrar_seccion_reportes(self):
-        self._ocultar_contenido_actual()
-
-        if self.reportes_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.reportes_widget)
-
-        self.reportes_widget.show()
-        self.reportes_widget.cargar_datos()
-        self.headerPageTitle.setText("Reportes")
-
-        if hasattr(self, 'btnReportes'):
-            self._resaltar_boton_activo(self.btnReportes)
-
-    def _create_notificaciones(self):
-        self.notificaciones_widget = NotificacionesView(self._usuario_actual)
-        self.notificaciones_widget.hide()
-
-    def _mostrar_seccion_notificaciones(self):
-        self._ocultar_contenido_actual()
-
-        if self.notificaciones_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.notificaciones_widget)
-
-        self.notificaciones_widget.show()
-        self.notificaciones_widget.cargar_datos()
-        self.headerPageTitle.setText("Notificaciones")
-
-        if hasattr(self, 'btnNotificaciones'):
-            self._resaltar_boton_activo(self.btnNotificaciones)
-
     # ==========================================
     # TIMER DE NOTIFICACIONES AUTOMATICAS
     # ==========================================
@@ -700,9 +635,7 @@ class MainView(QMainWindow):
             )
             if procesados:
                 # Recargar la vista si está abierta
-                if (hasattr(self, 'notificaciones_widget') and
-                        self.notificaciones_widget.isVisible()):
-                    self.notificaciones_widget.cargar_datos()
+                self._recargar_notificaciones_visibles()
         except Exception:
             pass
 
@@ -720,25 +653,12 @@ class MainView(QMainWindow):
         popup.show()
 
         # Actualizar label del sidebar si la sección está visible
-        if (hasattr(self, 'notificaciones_widget') and
-                self.notificaciones_widget.isVisible()):
-            self.notificaciones_widget.cargar_datos()
+        self._recargar_notificaciones_visibles()
+
+    def _recargar_notificaciones_visibles(self):
+        vista = self._secciones.viva("notificaciones")
+        if vista is not None and vista.isVisible():
+            vista.cargar_datos()
 
     def _on_popup_cerrado(self):
         self._popup_abierto = False
-
-    def _create_configuracion(self):
-        self.configuracion_widget = ConfiguracionView()
-        self.configuracion_widget.hide()
-
-    def _mostrar_seccion_configuracion(self):
-        self._ocultar_contenido_actual()
-
-        if self.configuracion_widget.parent() != self.contentArea:
-            self.contentLayout.addWidget(self.configuracion_widget)
-
-        self.configuracion_widget.show()
-        self.headerPageTitle.setText("Configuracion")
-
-        if hasattr(self, 'btnConfiguracion'):
-            self._resaltar_boton_activo(self.btnConfiguracion)
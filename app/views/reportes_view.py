@@ -12,6 +12,8 @@ from PyQt5.QtCore import Qt, QDate
 from PyQt5 import uic
 
 from app.services.reporte_service import ReporteService, REPORTES
+from app.utils.ejecutor import obtener_ejecutor
+from app.utils.tareas import PRIORIDAD_BAJA
 
 # Reportes que admiten filtro de fecha.
 # vendedores y etapas son agregados sin columna de fecha directa.
@@ -166,7 +168,7 @@ class ReportesView(QWidget):
     def __init__(self, usuario, parent=None):
         super().__init__(parent)
         self._usuario = usuario
-        self._service = ReporteService()
+        self._service = ReporteService(alcance=usuario.usuario_id)
         self._datos_cache = {k: [] for k in REPORTES}
         self._cargados = set()   # claves de reportes ya consultados al menos una vez
 
@@ -347,14 +349,29 @@ class ReportesView(QWidget):
             "actividad":  self._service.obtener_actividad_contactos,
         }
 
-        # Pasar fechas a los reportes que admiten filtro temporal
-        kwargs = {}
-        if clave in _REPORTES_CON_FECHA:
-            kwargs["fecha_desde"] = self.dtDesde.date().toPyDate()
-            kwargs["fecha_hasta"] = self.dtHasta.date().toPyDate()
+        kwargs = self._rango_fechas(clave)
+
+        # la consulta corre en segundo plano; si cambian las fechas antes de
+        # que termine, la solicitud nueva reemplaza (y cancela) a la anterior
+        self._tab_data[clave]["btn_refresh"].setEnabled(False)
+        obtener_ejecutor().ejecutar(
+            f"reportes.{clave}", metodos[clave], kwargs=kwargs,
+            al_terminar=lambda resultado, c=clave: self._on_reporte_cargado(c, resultado),
+            al_fallar=lambda error, c=clave: self._on_reporte_cargado(c, (None, error)),
+        )
+
+    def _rango_fechas(self, clave):
+        """Fechas activas como kwargs, solo para los reportes que admiten filtro temporal."""
+        if clave not in _REPORTES_CON_FECHA:
+            return {}
+        return {
+            "fecha_desde": self.dtDesde.date().toPyDate(),
+            "fecha_hasta": self.dtHasta.date().toPyDate(),
+        }
 
-        datos, error = metodos[clave](**kwargs)
-        tab = self._tab_data[clave]
+    def _on_reporte_cargado(self, clave, resultado):
+        datos, error = resultado
+        self._tab_data[clave]["btn_refresh"].setEnabled(True)
 
         if error:
             QMessageBox.warning(self, "Error al cargar reporte", error)
@@ -441,9 +458,7 @@ class ReportesView(QWidget):
     # ---------------------------------------------------------------- #
 
     def _exportar(self, clave, formato):
-        # exportar exactamente lo que está visible (datos del rango activo)
-        datos = self._datos_cache.get(clave, [])
-        if not datos:
+        if not self._datos_cache.get(clave):
             QMessageBox.information(
                 self, "Sin datos",
                 "No hay datos para exportar. Haz clic en Actualizar primero."
@@ -462,7 +477,7 @@ class ReportesView(QWidget):
             )
             if not ruta:
                 return
-            ok, error = self._service.exportar_excel(clave, datos, ruta)
+            exportar = self._service.exportar_excel_desde_bd
         else:
             ruta, _ = QFileDialog.getSaveFileName(
                 self,
@@ -472,8 +487,24 @@ class ReportesView(QWidget):
             )
             if not ruta:
                 return
-            ok, error = self._service.exportar_pdf(clave, datos, ruta)
-
+            exportar = self._service.exportar_pdf_desde_bd
+
+        # la exportacion escribe el archivo en segundo plano con el mismo rango
+        # de fechas que la tabla; las filas pasan del cursor al archivo sin
+        # armar otra lista completa
+        boton = self._tab_data[clave]["btn_excel" if formato == "excel" else "btn_pdf"]
+        boton.setEnabled(False)
+        obtener_ejecutor().ejecutar(
+            f"exportar.{clave}.{formato}", exportar,
+            args=(clave, ruta), kwargs=self._rango_fechas(clave),
+            prioridad=PRIORIDAD_BAJA, interrumpible=False,
+            al_terminar=lambda resultado: self._on_exportado(boton, ruta, resultado),
+            al_fallar=lambda error: self._on_exportado(boton, ruta, (None, error)),
+        )
+
+    def _on_exportado(self, boton, ruta, resultado):
+        _, error = resultado
+        boton.setEnabled(True)
         if error:
             QMessageBox.critical(self, "Error al exportar", error)
         else:
@@ -0,0 +1,211 @@
+# Modelo de tabla paginada - QAbstractTableModel alimentado por paginas keyset
+#
+# En lugar de crear un QTableWidgetItem por celda para todos los registros,
+# la vista (QTableView) le pide al modelo solo las celdas visibles. El modelo
+# carga los datos en bloques de N filas usando obtener_pagina() del servicio
+# y conserva en memoria solo los ultimos bloques usados (cache LRU).
+#
+# - canFetchMore/fetchMore: la vista pide el siguiente bloque al acercarse al
+#   final del scroll, asi rowCount crece a medida que el usuario avanza.
+# - De cada bloque se guarda solo el token de inicio (unos bytes). Si un
+#   bloque salio del cache y vuelve a ser visible, se recarga con ese token
+#   en tiempo constante (seek por indice, sin OFFSET). Esa recarga ocurre
+#   dentro de data(), en pleno pintado: si falla, el bloque no se guarda (se
+#   reintenta en el siguiente pintado) y el error se avisa una sola vez hasta
+#   la siguiente carga correcta. La vista debe conectar errorCarga con
+#   Qt.QueuedConnection para no abrir un dialogo modal dentro de paintEvent.
+# - sort() y set_filtros() no ordenan ni filtran en Python: reinician el
+#   modelo y la consulta se repite con ORDER BY / WHERE en SQL.
+
+from collections import OrderedDict
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt, QTimer, pyqtSignal
+from PyQt5.QtGui import QColor
+
+
+class ColumnaTabla:
+    """
+    Definicion de una columna del modelo.
+
+    Args:
+        titulo: texto del encabezado.
+        valor:  funcion objeto -> texto de la celda.
+        orden:  clave de ordenamiento del repositorio (None = no ordenable).
+        color:  funcion opcional objeto -> QColor para el texto.
+    """
+
+    def __init__(self, titulo, valor, orden=None, color=None):
+        self.titulo = titulo
+        self.valor = valor
+        self.orden = orden
+        self.color = color
+
+
+class TablaPaginadaModel(QAbstractTableModel):
+
+    # mensaje de error al cargar un bloque (la vista decide como mostrarlo;
+    # puede emitirse durante el pintado, conectar con Qt.QueuedConnection)
+    errorCarga = pyqtSignal(str)
+
+    def __init__(self, columnas, fuente, tam_bloque=100, max_bloques=8,
+                 orden="fecha", descendente=True, parent=None):
+        """
+        Args:
+            columnas:    lista de ColumnaTabla.
+            fuente:      funcion(limit, token, filtros, orden, descendente)
+                         -> (Pagina, error), normalmente service.obtener_pagina.
+            tam_bloque:  filas por consulta.
+            max_bloques: bloques que se conservan en memoria.
+        """
+        super().__init__(parent)
+        self._columnas = columnas
+        self._fuente = fuente
+        self._tam_bloque = tam_bloque
+        self._max_bloques = max(2, max_bloques)
+        self._orden = orden
+        self._descendente = descendente
+        self._filtros = {}
+        self._reiniciar_estado()
+
+    def _reiniciar_estado(self):
+        self._filas = 0
+        # _tokens[i] es el token para cargar el bloque i (None = primera pagina)
+        self._tokens = [None]
+        self._bloques = OrderedDict()
+        self._hay_mas = True
+        # bloques cuya recarga fallo en este ciclo de eventos (no se reintentan
+        # por cada celda del mismo pintado)
+        self._fallidos = set()
+        self._error_avisado = False
+
+    # ==========================================
+    # API DE QAbstractTableModel
+    # ==========================================
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._filas
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columnas)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._columnas[section].titulo
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role not in (Qt.DisplayRole, Qt.ForegroundRole):
+            return None
+
+        obj = self.objeto_en(index.row())
+        if obj is None:
+            return None
+        columna = self._columnas[index.column()]
+        if role == Qt.DisplayRole:
+            return columna.valor(obj)
+        if columna.color is not None:
+            color = columna.color(obj)
+            return QColor(color) if color is not None else None
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._hay_mas
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or not self._hay_mas:
+            return
+        indice = len(self._tokens) - 1
+        items, siguiente = self._consultar(self._tokens[indice])
+        if items is None or not items:
+            self._hay_mas = False
+            return
+
+        self.beginInsertRows(QModelIndex(), self._filas, self._filas + len(items) - 1)
+        self._guardar_bloque(indice, items)
+        self._filas += len(items)
+        if siguiente and len(items) == self._tam_bloque:
+            self._tokens.append(siguiente)
+        else:
+            self._hay_mas = False
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # column = -1 llega cuando la vista activa el ordenamiento sin indicador
+        if column < 0 or column >= len(self._columnas):
+            return
+        clave = self._columnas[column].orden
+        if clave is None:
+            return
+        self._orden = clave
+        self._descendente = order == Qt.DescendingOrder
+        self.recargar()
+
+    # ==========================================
+    # API PROPIA
+    # ==========================================
+
+    def set_filtros(self, filtros):
+        """Reemplaza los filtros (se aplican en SQL) y recarga desde el inicio."""
+        self._filtros = {k: v for k, v in (filtros or {}).items() if v not in (None, "")}
+        self.recargar()
+
+    def recargar(self):
+        """Descarta el cache y vuelve a cargar el primer bloque."""
+        self.beginResetModel()
+        self._reiniciar_estado()
+        self.endResetModel()
+        self.fetchMore()
+
+    def objeto_en(self, fila):
+        """Devuelve el objeto del modelo (Contacto, Empresa...) de una fila."""
+        if fila < 0 or fila >= self._filas:
+            return None
+        bloque = self._obtener_bloque(fila // self._tam_bloque)
+        posicion = fila % self._tam_bloque
+        return bloque[posicion] if posicion < len(bloque) else None
+
+    def bloques_en_memoria(self):
+        return len(self._bloques)
+
+    # ==========================================
+    # CACHE DE BLOQUES
+    # ==========================================
+
+    def _consultar(self, token):
+        pagina, error = self._fuente(
+            limit=self._tam_bloque, token=token, filtros=self._filtros,
+            orden=self._orden, descendente=self._descendente,
+        )
+        if error:
+            if not self._error_avisado:
+                self._error_avisado = True
+                self.errorCarga.emit(error)
+            return None, None
+        self._error_avisado = False
+        return pagina.items, pagina.siguiente
+
+    def _obtener_bloque(self, indice):
+        bloque = self._bloques.get(indice)
+        if bloque is not None:
+            self._bloques.move_to_end(indice)
+            return bloque
+        if indice in self._fallidos:
+            return []
+        # el bloque salio del cache: se recarga desde su token de inicio
+        items, _ = self._consultar(self._tokens[indice])
+        if items is None:
+            # no se guarda vacio: el siguiente pintado lo vuelve a intentar
+            if not self._fallidos:
+                QTimer.singleShot(0, self._fallidos.clear)
+            self._fallidos.add(indice)
+            return []
+        self._guardar_bloque(indice, items)
+        return items
+
+    def _guardar_bloque(self, indice, items):
+        self._bloques[indice] = items
+        self._bloques.move_to_end(indice)
+        while len(self._bloques) > self._max_bloques:
+            self._bloques.popitem(last=False)
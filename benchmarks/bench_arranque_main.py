@@ -0,0 +1,106 @@
+"""
+Benchmark: tiempo del login a la ventana principal lista (MainView).
+
+Mide en un proceso nuevo por medicion (para incluir las importaciones, que
+es donde se iba buena parte del tiempo):
+    1. diferida: MainView tal cual; solo se importa y construye el dashboard
+       y las demas secciones esperan a que se abran.
+    2. completa: ademas se construyen todas las secciones y la pantalla de
+       usuarios al inicio, como hacia MainView antes del registro de
+       secciones.
+
+El tiempo va desde antes de importar app.views.main_view hasta que la
+ventana se mostro y proceso sus eventos pendientes (primer pintado), con
+una BD temporal con el esquema y los datos de ejemplo.
+
+Usa QT_QPA_PLATFORM=offscreen si no se indica otra plataforma.
+
+Uso:
+    python benchmarks/bench_arranque_main.py
+    python benchmarks/bench_arranque_main.py --repeticiones 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def _medir(modo, ruta):
+    # corre en el proceso hijo e imprime "segundos secciones_construidas"
+    from PyQt5.QtWidgets import QApplication
+    from app.config import settings
+    from app.database import connection
+    from app.repositories.usuario_repository import UsuarioRepository
+
+    connection.DB_PATH = ruta
+    app = QApplication([])
+    usuario = UsuarioRepository().find_all()[0]
+
+    if modo == "completa":
+        # sin limite, para que todas las secciones sigan vivas al final
+        settings.SECCIONES_MAX_VIVAS = None
+
+    inicio = time.perf_counter()
+    from app.views.main_view import MainView, SECCIONES
+    ventana = MainView(usuario)
+    if modo == "completa":
+        for seccion in SECCIONES:
+            ventana._secciones.precargar(seccion.nombre)
+        ventana._asegurar_usuarios()
+    ventana.show()
+    app.processEvents()
+    print(f"{time.perf_counter() - inicio} {len(ventana._secciones.vivas)}")
+
+
+def _preparar_bd(ruta):
+    from app.config.settings import SCHEMA_PATH
+    from app.database import connection
+    from app.database.connection import get_connection, close_connection
+
+    connection.DB_PATH = ruta
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.commit()
+    close_connection()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--medir", choices=["diferida", "completa"], help=argparse.SUPPRESS)
+    parser.add_argument("--ruta", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        _medir(args.medir, args.ruta)
+        return
+
+    print(f"{'modo':<10} {'mediana':>10} {'minimo':>10} {'secciones':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        ruta = os.path.join(tmp, "arranque.db")
+        _preparar_bd(ruta)
+        for modo in ("diferida", "completa"):
+            tiempos, vivas = [], 0
+            for _ in range(args.repeticiones):
+                salida = subprocess.run(
+                    [sys.executable, __file__, "--medir", modo, "--ruta", ruta],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                tiempos.append(float(salida[-2]))
+                vivas = int(salida[-1])
+            print(
+                f"{modo:<10} {statistics.median(tiempos) * 1000:>7.0f} ms "
+                f"{min(tiempos) * 1000:>7.0f} ms {vivas:>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: latencia de BusquedaService.buscar() sobre el indice FTS5.
+
+Crea una BD temporal con el esquema completo, carga N filas repartidas
+entre contactos, empresas y notas (los triggers llenan BusquedaGlobal) y
+mide la latencia de varias busquedas tipicas: nombre completo, prefijo
+corto, palabra sin acentos y termino muy comun.
+
+Uso:
+    python benchmarks/bench_busqueda.py                 # 1000000 filas
+    python benchmarks/bench_busqueda.py --filas 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection, close_pool
+from app.services.busqueda_service import BusquedaService
+
+_NOMBRES = ["José", "María", "Ana", "Luis", "Sofía", "Andrés", "Lucía", "Jorge", "Elena", "Raúl"]
+_APELLIDOS = ["González", "Pérez", "López", "Martínez", "Hernández", "Ramírez", "Núñez", "Díaz"]
+_PALABRAS = ["propuesta", "llamada", "seguimiento", "contrato", "renovación", "descuento", "reunión"]
+# vocabulario de relleno para que la frecuencia de cada palabra sea realista
+# (con solo 7 palabras cada una apareceria en casi todas las notas)
+_VOCABULARIO = _PALABRAS + [f"{s}{i}" for s in ("cliente", "pedido", "factura") for i in range(2000)]
+
+_CONSULTAS = ["jose gonzalez", "ma", "nunez", "renovacion contrato", "seguimiento", "empresa 4242"]
+
+
+def _preparar_bd(ruta, filas):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+
+    rnd = random.Random(42)
+    n_empresas = filas // 10
+    n_contactos = filas // 2
+    n_notas = filas - n_empresas - n_contactos
+    conn.executemany(
+        "INSERT INTO Empresas (RazonSocial, Email) VALUES (?, ?)",
+        ((f"Empresa {i} SA de CV", f"contacto{i}@empresa{i}.mx") for i in range(n_empresas)),
+    )
+    conn.executemany(
+        "INSERT INTO Contactos (Nombre, ApellidoPaterno, ApellidoMaterno, Email) VALUES (?, ?, ?, ?)",
+        (
+            (rnd.choice(_NOMBRES), rnd.choice(_APELLIDOS), rnd.choice(_APELLIDOS), f"c{i}@correo.mx")
+            for i in range(n_contactos)
+        ),
+    )
+    conn.executemany(
+        "INSERT INTO NotasContacto (ContactoID, Contenido, CreadoPor) VALUES (?, ?, 1)",
+        (
+            (rnd.randint(1, n_contactos), " ".join(rnd.choices(_VOCABULARIO, k=12)))
+            for _ in range(n_notas)
+        ),
+    )
+    conn.commit()
+    conn.execute("INSERT INTO BusquedaGlobal (BusquedaGlobal) VALUES ('optimize')")
+    conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=1000000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        inicio = time.perf_counter()
+        _preparar_bd(os.path.join(tmp, "bench.db"), args.filas)
+        print(f"carga de {args.filas} filas: {time.perf_counter() - inicio:.1f} s")
+
+        servicio = BusquedaService()
+        for consulta in _CONSULTAS:
+            servicio.buscar(consulta)  # calentar cache de paginas
+            tiempos = []
+            for _ in range(args.repeticiones):
+                t0 = time.perf_counter()
+                resultados, error = servicio.buscar(consulta)
+                tiempos.append((time.perf_counter() - t0) * 1000)
+            tiempos.sort()
+            print(
+                f"{consulta!r:<24} {len(resultados or []):>3} resultados  "
+                f"p50 {tiempos[len(tiempos) // 2]:7.2f} ms  max {tiempos[-1]:7.2f} ms"
+            )
+        close_pool()
+        close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Benchmark: latencia de ReporteService con y sin el cache de resultados.
+
+Crea una BD temporal con el esquema completo, carga N oportunidades y mide
+cada reporte de la pestana Reportes en tres situaciones:
+    1. sin cache: la consulta al repositorio (lo que se hacia siempre).
+    2. con cache: la misma consulta repetida sin escrituras de por medio.
+    3. tras escribir: un UPDATE en Oportunidades invalida la entrada y la
+       siguiente consulta vuelve a la BD.
+
+Uso:
+    python benchmarks/bench_cache_reportes.py                   # 50000 oportunidades
+    python benchmarks/bench_cache_reportes.py --filas 200000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection, close_pool
+from app.services.reporte_service import ReporteService
+
+_REPORTES = {
+    "pipeline": lambda s: s.obtener_pipeline_ventas("2000-01-01", "2100-12-31"),
+    "vendedores": lambda s: s.obtener_rendimiento_vendedores(),
+    "etapas": lambda s: s.obtener_conversion_etapas(),
+    "actividad": lambda s: s.obtener_actividad_contactos("2000-01-01", "2100-12-31"),
+}
+
+
+def _preparar_bd(ruta, filas):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+
+    rnd = random.Random(42)
+    etapas = [r[0] for r in conn.execute("SELECT EtapaID FROM EtapasVenta")]
+    usuarios = [r[0] for r in conn.execute("SELECT UsuarioID FROM Usuarios")]
+    n_empresas = max(filas // 10, 1)
+    conn.executemany(
+        "INSERT INTO Empresas (RazonSocial) VALUES (?)",
+        ((f"Empresa {i} SA de CV",) for i in range(n_empresas)),
+    )
+    conn.executemany(
+        "INSERT INTO Oportunidades (Nombre, EmpresaID, EtapaID, MontoEstimado, ProbabilidadCierre,"
+        " FechaCierreEstimada, PropietarioID) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            (
+                f"Oportunidad {i}", rnd.randint(1, n_empresas), rnd.choice(etapas),
+                rnd.uniform(1000, 100000), rnd.randint(0, 100),
+                f"2026-{rnd.randint(1, 12):02d}-15", rnd.choice(usuarios),
+            )
+            for i in range(filas)
+        ),
+    )
+    conn.commit()
+    return conn
+
+
+def _ms(funcion, repeticiones):
+    tiempos = []
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        funcion()
+        tiempos.append((time.perf_counter() - t0) * 1000)
+    tiempos.sort()
+    return tiempos[len(tiempos) // 2]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = _preparar_bd(os.path.join(tmp, "bench.db"), args.filas)
+        servicio = ReporteService(alcance=1)
+        repo = servicio._repo
+
+        print(f"{'reporte':<12} {'filas':>7} {'sin cache':>12} {'con cache':>12} {'tras escribir':>14}")
+        for clave, consultar in _REPORTES.items():
+            datos, error = consultar(servicio)
+            if error:
+                raise SystemExit(error)
+            # sin cache: el repositorio directo con los mismos argumentos
+            directo = {
+                "pipeline": lambda: repo.get_pipeline_ventas("2000-01-01", "2100-12-31"),
+                "vendedores": repo.get_rendimiento_vendedores,
+                "etapas": repo.get_conversion_por_etapa,
+                "actividad": lambda: repo.get_actividad_contactos("2000-01-01", "2100-12-31"),
+            }[clave]
+            sin_cache = _ms(directo, max(args.repeticiones // 4, 3))
+            con_cache = _ms(lambda: consultar(servicio), args.repeticiones)
+
+            def escribir_y_consultar():
+                conn.execute("UPDATE Oportunidades SET MontoEstimado = MontoEstimado WHERE OportunidadID = 1")
+                conn.execute("UPDATE Contactos SET Nombre = Nombre WHERE ContactoID = 1")
+                conn.commit()
+                consultar(servicio)
+
+            tras_escribir = _ms(escribir_y_consultar, max(args.repeticiones // 4, 3))
+            print(
+                f"{clave:<12} {len(datos):>7} {sin_cache:>9.2f} ms {con_cache * 1000:>9.1f} us "
+                f"{tras_escribir:>11.2f} ms"
+            )
+        close_pool()
+        close_connection()
+
+
+if __name__ == "__main__":
+    main()
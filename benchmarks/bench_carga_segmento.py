@@ -0,0 +1,113 @@
+"""
+Benchmark: cargar los contactos de un segmento grande como destinatarios.
+
+Crea una BD temporal con el esquema completo (db/database_query.sql) y un
+segmento de N contactos (algunos inactivos, con NoContactar o sin email).
+Se mide:
+    1. Por fila: SELECT de los contactos a Python, un INSERT OR IGNORE por
+       fila y despues sincronizar_metricas para recontar (como antes).
+    2. INSERT ... SELECT: CampanaRepository.cargar_destinatarios_desde_segmento,
+       que filtra y cuenta en la misma sentencia.
+
+Uso:
+    python benchmarks/bench_carga_segmento.py                  # 100000 contactos
+    python benchmarks/bench_carga_segmento.py --contactos 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection
+from app.repositories.campana_repository import CampanaRepository
+
+
+def _preparar_bd(ruta, n):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    primero = conn.execute("SELECT COALESCE(MAX(ContactoID), 0) + 1 FROM Contactos").fetchone()[0]
+    # 1 de cada 10 inactivo, 1 de cada 15 con NoContactar, 1 de cada 20 sin email
+    conn.executemany(
+        "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email, Activo, NoContactar) VALUES ('N', 'A', ?, ?, ?)",
+        (
+            (None if i % 20 == 0 else f"contacto{i}@bench.local", int(i % 10 != 0), int(i % 15 == 0))
+            for i in range(n)
+        ),
+    )
+    segmento_id = conn.execute(
+        "INSERT INTO Segmentos (Nombre, TipoEntidad, CreadoPor) VALUES ('Bench', 'Contacto', 1)"
+    ).lastrowid
+    conn.execute(
+        "INSERT INTO SegmentoContactos (SegmentoID, ContactoID) SELECT ?, ContactoID FROM Contactos WHERE ContactoID >= ?",
+        (segmento_id, primero),
+    )
+    campana_id = conn.execute(
+        "INSERT INTO Campanas (Nombre, Estado, SegmentoID, PropietarioID) VALUES ('Bench', 'Borrador', ?, 1)",
+        (segmento_id,),
+    ).lastrowid
+    conn.commit()
+    return campana_id, segmento_id
+
+
+def _por_fila(repo, campana_id, segmento_id):
+    conn = get_connection()
+    filas = conn.execute(
+        """
+        SELECT c.ContactoID, c.Email
+        FROM SegmentoContactos sc
+        INNER JOIN Contactos c ON sc.ContactoID = c.ContactoID
+        WHERE sc.SegmentoID = ? AND c.Email IS NOT NULL AND c.Email != ''
+        """,
+        (segmento_id,),
+    ).fetchall()
+    for fila in filas:
+        conn.execute(
+            "INSERT OR IGNORE INTO CampanaDestinatarios (CampanaID, ContactoID, EmailDestino, EstadoEnvio) "
+            "VALUES (?, ?, ?, 'Pendiente')",
+            (campana_id, fila["ContactoID"], fila["Email"]),
+        )
+    conn.commit()
+    repo.sincronizar_metricas(campana_id)
+    return len(filas)
+
+
+def _en_bloque(repo, campana_id, segmento_id):
+    insertados, _ = repo.cargar_destinatarios_desde_segmento(campana_id, segmento_id)
+    return insertados
+
+
+def _medir(directorio, etiqueta, funcion, n):
+    campana_id, segmento_id = _preparar_bd(os.path.join(directorio, f"{etiqueta}.db"), n)
+    inicio = time.perf_counter()
+    cargados = funcion(CampanaRepository(), campana_id, segmento_id)
+    duracion = time.perf_counter() - inicio
+    close_connection()
+    return duracion, cargados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--contactos", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        por_fila, n_fila = _medir(directorio, "por_fila", _por_fila, args.contactos)
+        en_bloque, n_bloque = _medir(directorio, "en_bloque", _en_bloque, args.contactos)
+
+    print(f"segmento de {args.contactos} contactos")
+    print(f"  por fila:          {por_fila:8.3f} s  ({n_fila} cargados, sin filtrar inactivos ni NoContactar)")
+    print(f"  INSERT ... SELECT: {en_bloque:8.3f} s  ({n_bloque} cargados)")
+    print(f"  mejora:            {por_fila / en_bloque:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
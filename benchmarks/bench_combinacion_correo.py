@@ -0,0 +1,101 @@
+"""
+Benchmark: mensajes renderizados por segundo al armar los correos de una campana.
+
+Compara, para N destinatarios con nombre y empresa:
+    1. MIME por destinatario: MIMEMultipart + MIMEText(..., "utf-8") +
+       as_string() por cada correo, como se armaban antes (los campos se
+       sustituyen con str.replace para que ambos den el mismo contenido).
+    2. PlantillaCompilada: el esqueleto MIME se codifica una vez y por
+       destinatario solo se codifican e intercalan sus valores.
+
+Solo mide el armado del mensaje; no abre conexiones SMTP.
+
+Uso:
+    python benchmarks/bench_combinacion_correo.py
+    python benchmarks/bench_combinacion_correo.py --destinatarios 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+from app.models.Plantilla import Plantilla
+from app.utils.combinacion_correo import PlantillaCompilada
+
+_REMITENTE = "Avisos <avisos@bench.mx>"
+
+_PLANTILLA = Plantilla(
+    nombre="bench",
+    asunto="{{Nombre}}, novedades del mes para {{Empresa}}",
+    contenido_texto=(
+        "Hola {{Nombre}},\n\n"
+        + "Estas son las novedades del mes para {{Empresa}}. " * 30
+        + "\n\nSaludos,\nEl equipo comercial"
+    ),
+    contenido_html=(
+        "<html><body><h1>Hola {{Nombre}}</h1>"
+        + "<p>Estas son las <b>novedades</b> del mes para {{Empresa}}.</p>" * 30
+        + "<p>Saludos,<br>El equipo comercial</p></body></html>"
+    ),
+)
+
+
+def _destinatarios(n):
+    return [
+        {"DestinatarioID": i, "EmailDestino": f"dest{i}@bench.mx",
+         "Nombre": f"Cliente {i}", "Empresa": f"Distribuidora Ñandú {i % 50}"}
+        for i in range(n)
+    ]
+
+
+def _sustituir(texto, dest):
+    return texto.replace("{{Nombre}}", dest["Nombre"]).replace("{{Empresa}}", dest["Empresa"])
+
+
+def _mime_por_destinatario(destinatarios):
+    for dest in destinatarios:
+        msg = MIMEMultipart("alternative")
+        msg["Subject"] = _sustituir(_PLANTILLA.asunto, dest)
+        msg["From"] = _REMITENTE
+        msg["To"] = dest["EmailDestino"]
+        msg.attach(MIMEText(_sustituir(_PLANTILLA.contenido_texto, dest), "plain", "utf-8"))
+        msg.attach(MIMEText(_sustituir(_PLANTILLA.contenido_html, dest), "html", "utf-8"))
+        msg.as_string()
+
+
+def _compilada(destinatarios):
+    renderizar = PlantillaCompilada(_PLANTILLA, _REMITENTE).renderizar
+    for dest in destinatarios:
+        renderizar(dest)
+
+
+def _medir(funcion, destinatarios):
+    inicio = time.perf_counter()
+    funcion(destinatarios)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--destinatarios", type=int, default=5000)
+    args = parser.parse_args()
+
+    destinatarios = _destinatarios(args.destinatarios)
+    antes = _medir(_mime_por_destinatario, destinatarios)
+    despues = _medir(_compilada, destinatarios)
+
+    n = args.destinatarios
+    print(f"{n} destinatarios")
+    print(f"  MIME por destinatario: {antes:8.3f} s  ({n / antes:10.0f} msg/s)")
+    print(f"  PlantillaCompilada:    {despues:8.3f} s  ({n / despues:10.0f} msg/s)")
+    print(f"  mejora:                {antes / despues:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Benchmark: correos por segundo al enviar una campana con 1 y N sesiones SMTP.
+
+Envia contra un servidor SMTP falso en el mismo proceso (tests/smtp_falso.py),
+sin red externa. La latencia simula la ida y vuelta de cada comando (MAIL,
+RCPT, DATA) a un servidor real, que es lo que limitaba el envio con una sola
+conexion. Cada mensaje se arma con la misma PlantillaCompilada que enviar_campana.
+
+Sin tope de mensajes por segundo, para medir solo el efecto de las sesiones.
+
+Uso:
+    python benchmarks/bench_envio_smtp.py
+    python benchmarks/bench_envio_smtp.py --mensajes 500 --latencia 0.02 --sesiones 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.models.ConfiguracionCorreo import ConfiguracionCorreo
+from app.models.Plantilla import Plantilla
+from app.utils.combinacion_correo import PlantillaCompilada
+from app.utils.envio_smtp import MensajeSmtp, PoolSmtp
+from tests.smtp_falso import ServidorSmtpFalso
+
+
+def _medir(servidor, sesiones, cantidad):
+    config = ConfiguracionCorreo(
+        nombre="bench", host=servidor.host, puerto=servidor.puerto,
+        usar_tls=0, usar_ssl=0, email_remitente="avisos@bench.mx",
+    )
+    plantilla = Plantilla(
+        nombre="bench", asunto="Novedades del mes",
+        contenido_texto="Hola, estas son las novedades. " * 20,
+        contenido_html="<p>Hola, estas son las <b>novedades</b>.</p>" * 20,
+    )
+    compilada = PlantillaCompilada(plantilla, "Bench <avisos@bench.mx>")
+    mensajes = (
+        MensajeSmtp(i, "avisos@bench.mx", f"dest{i}@bench.mx",
+                    lambda i=i: compilada.renderizar({"EmailDestino": f"dest{i}@bench.mx"}))
+        for i in range(cantidad)
+    )
+    enviados = []
+    inicio = time.perf_counter()
+    error = PoolSmtp(config, sesiones=sesiones, por_segundo=0).enviar(
+        mensajes, al_resultado=lambda r: enviados.append(r.enviado),
+    )
+    duracion = time.perf_counter() - inicio
+    if error or not all(enviados) or len(enviados) != cantidad:
+        raise SystemExit(f"envio incompleto con {sesiones} sesiones: {error}")
+    return duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mensajes", type=int, default=200)
+    parser.add_argument("--latencia", type=float, default=0.01,
+                        help="segundos por comando MAIL/RCPT/DATA (default 0.01)")
+    parser.add_argument("--sesiones", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{args.mensajes} mensajes, latencia {args.latencia * 1000:.0f} ms por comando")
+    print(f"{'sesiones':>8} {'tiempo':>10} {'msg/s':>10} {'mejora':>8}")
+    base = None
+    for sesiones in args.sesiones:
+        with ServidorSmtpFalso(latencia=args.latencia) as servidor:
+            duracion = _medir(servidor, sesiones, args.mensajes)
+        base = base or duracion
+        print(
+            f"{sesiones:>8} {duracion:>8.2f} s {args.mensajes / duracion:>10.1f} "
+            f"{base / duracion:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark: guardar el estado de los destinatarios al enviar una campana.
+
+Crea una BD temporal con el esquema completo (db/database_query.sql) y una
+campana con N destinatarios pendientes, y simula los resultados del envio
+sin servidor SMTP. Se mide:
+    1. Por fila: un UPDATE con COMMIT por destinatario y, al cerrar,
+       sincronizar_metricas + releer todos los destinatarios (como antes).
+    2. EscritorEstados: executemany cada ENVIO_ESCRITURA_FILAS resultados y
+       cierre con una sola sentencia (CampanaRepository.cerrar_envio).
+
+Uso:
+    python benchmarks/bench_estados_envio.py                 # 5000 destinatarios
+    python benchmarks/bench_estados_envio.py --destinatarios 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection
+from app.repositories.campana_repository import CampanaRepository
+from app.services.campana_service import EscritorEstados
+from app.utils.envio_smtp import ResultadoEnvio
+
+
+def _preparar_bd(ruta, n):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    campana_id = conn.execute(
+        "INSERT INTO Campanas (Nombre, Estado, PropietarioID) VALUES ('Bench', 'Borrador', 1)"
+    ).lastrowid
+    conn.executemany(
+        "INSERT INTO CampanaDestinatarios (CampanaID, ContactoID, EmailDestino) VALUES (?, 1, ?)",
+        [(campana_id, f"dest{i}@bench.local") for i in range(n)],
+    )
+    conn.commit()
+    ids = [fila[0] for fila in conn.execute(
+        "SELECT DestinatarioID FROM CampanaDestinatarios WHERE CampanaID = ? ORDER BY DestinatarioID",
+        (campana_id,),
+    )]
+    return campana_id, ids
+
+
+def _resultados(ids):
+    # uno de cada 20 rebota
+    for i, destinatario_id in enumerate(ids):
+        yield ResultadoEnvio(destinatario_id, f"dest{i}@bench.local", i % 20 != 0)
+
+
+def _por_fila(repo, campana_id, ids):
+    conn = get_connection()
+    enviados = 0
+    for resultado in _resultados(ids):
+        conn.execute(
+            "UPDATE CampanaDestinatarios SET EstadoEnvio = ?, FechaEnvio = datetime('now', 'localtime') "
+            "WHERE DestinatarioID = ?",
+            ("Enviado" if resultado.enviado else "Fallido", resultado.clave),
+        )
+        conn.commit()
+        enviados += resultado.enviado
+    repo.sincronizar_metricas(campana_id)
+    todos = repo.get_destinatarios(campana_id)
+    if not any(d.get("EstadoEnvio") == "Pendiente" for d in todos):
+        repo.update_estado(campana_id, "Completada")
+    return enviados
+
+
+def _en_bloque(repo, campana_id, ids):
+    escritor = EscritorEstados(repo, campana_id)
+    for resultado in _resultados(ids):
+        escritor.agregar(resultado)
+    escritor.vaciar()
+    repo.cerrar_envio(campana_id, escritor.enviados)
+    return escritor.enviados
+
+
+def _medir(directorio, etiqueta, funcion, n):
+    campana_id, ids = _preparar_bd(os.path.join(directorio, f"{etiqueta}.db"), n)
+    repo = CampanaRepository()
+    inicio = time.perf_counter()
+    enviados = funcion(repo, campana_id, ids)
+    duracion = time.perf_counter() - inicio
+    estado, total = get_connection().execute(
+        "SELECT Estado, TotalEnviados FROM Campanas WHERE CampanaID = ?", (campana_id,)
+    ).fetchone()
+    if (estado, total) != ("Completada", enviados):
+        raise SystemExit(f"{etiqueta}: resultado inesperado {estado} / {total}")
+    close_connection()
+    return duracion
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--destinatarios", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        por_fila = _medir(directorio, "por_fila", _por_fila, args.destinatarios)
+        en_bloque = _medir(directorio, "en_bloque", _en_bloque, args.destinatarios)
+
+    print(f"{args.destinatarios} destinatarios")
+    print(f"  por fila:         {por_fila:8.3f} s  ({args.destinatarios / por_fila:10.0f} filas/s)")
+    print(f"  EscritorEstados:  {en_bloque:8.3f} s  ({args.destinatarios / en_bloque:10.0f} filas/s)")
+    print(f"  mejora:           {por_fila / en_bloque:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: exportacion de reportes a Excel con N filas.
+
+Genera N filas sinteticas del reporte "pipeline" (10 columnas) y mide
+tiempo y memoria maxima (RSS) de:
+    1. streaming: ReporteService.exportar_excel (write_only, estilos con
+       nombre, ancho por muestra). Las filas vienen de un generador, como
+       las entrega ReporteRepository.iterar.
+    2. anterior: el Workbook en memoria de la version previa (un objeto de
+       estilo por celda y una segunda pasada para los anchos). Solo hasta
+       --max-anterior filas: con 500k tarda minutos y varios GB.
+
+Cada medicion corre en un proceso nuevo para que el RSS maximo de una no
+contamine a la siguiente.
+
+Uso:
+    python benchmarks/bench_exportacion_excel.py                   # 10k, 100k, 500k
+    python benchmarks/bench_exportacion_excel.py --filas 10000 50000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.reporte_service import ReporteService, REPORTES
+
+_ETAPAS = ["Prospecto", "Calificado", "Propuesta", "Negociacion"]
+
+
+def _filas(n):
+    for i in range(n):
+        yield {
+            "NombreOportunidad": f"Oportunidad {i}",
+            "Empresa": f"Empresa {i % 5000} S.A. de C.V.",
+            "Contacto": f"Contacto {i % 20000}",
+            "Etapa": _ETAPAS[i % len(_ETAPAS)],
+            "MontoEstimado": 1000.0 + i,
+            "ProbabilidadCierre": (i * 7) % 100,
+            "ValorPonderado": (1000.0 + i) * ((i * 7) % 100) / 100,
+            "FechaCierreEstimada": f"2026-{(i % 12) + 1:02d}-15",
+            "Vendedor": f"Vendedor {i % 12}",
+            "DiasEnPipeline": i % 365,
+        }
+
+
+def _exportar_anterior(datos, ruta):
+    # copia de la exportacion previa: Workbook en memoria con estilo por celda
+    from openpyxl import Workbook
+    from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+    from openpyxl.utils import get_column_letter
+
+    cfg = REPORTES["pipeline"]
+    columnas, cabeceras = cfg["columnas"], cfg["cabeceras"]
+    datos = list(datos)
+    wb = Workbook()
+    ws = wb.active
+    ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(columnas))
+    ws.cell(row=1, column=1, value=cfg["titulo"]).font = Font(bold=True, size=14)
+    thin = Side(style="thin", color="CBD5E0")
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    for col_idx, cabecera in enumerate(cabeceras, start=1):
+        cell = ws.cell(row=3, column=col_idx, value=cabecera)
+        cell.fill = PatternFill("solid", fgColor="4a90d9")
+        cell.border = border
+    fill_par = PatternFill("solid", fgColor="EBF4FF")
+    fill_impar = PatternFill("solid", fgColor="FFFFFF")
+    for row_idx, fila in enumerate(datos, start=4):
+        fill = fill_par if row_idx % 2 == 0 else fill_impar
+        for col_idx, col_key in enumerate(columnas, start=1):
+            cell = ws.cell(row=row_idx, column=col_idx, value=fila.get(col_key, "") or "")
+            cell.fill = fill
+            cell.border = border
+            cell.alignment = Alignment(vertical="center")
+    for col_idx, col_key in enumerate(columnas, start=1):
+        max_len = len(str(cabeceras[col_idx - 1]))
+        for fila in datos:
+            max_len = max(max_len, len(str(fila.get(col_key, "") or "")))
+        ws.column_dimensions[get_column_letter(col_idx)].width = min(max_len + 4, 40)
+    ws.freeze_panes = "A4"
+    wb.save(ruta)
+
+
+def _rss_max_mb():
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / 2**20 if sys.platform == "darwin" else maximo / 1024
+
+
+def _medir(modo, n, ruta):
+    # corre en el proceso hijo e imprime "segundos rss_inicial rss_max"
+    rss_inicial = _rss_max_mb()
+    inicio = time.perf_counter()
+    if modo == "streaming":
+        _, error = ReporteService().exportar_excel("pipeline", _filas(n), ruta)
+        if error:
+            raise SystemExit(error)
+    else:
+        _exportar_anterior(_filas(n), ruta)
+    print(f"{time.perf_counter() - inicio} {rss_inicial} {_rss_max_mb()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--max-anterior", type=int, default=100000)
+    parser.add_argument("--medir", choices=["streaming", "anterior"], help=argparse.SUPPRESS)
+    parser.add_argument("--ruta", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        _medir(args.medir, args.filas[0], args.ruta)
+        return
+
+    print(f"{'modo':<10} {'filas':>8} {'segundos':>9} {'filas/s':>10} {'RSS max':>10} {'archivo':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.filas:
+            for modo in ("streaming", "anterior"):
+                if modo == "anterior" and n > args.max_anterior:
+                    continue
+                ruta = os.path.join(tmp, f"{modo}_{n}.xlsx")
+                salida = subprocess.run(
+                    [sys.executable, __file__, "--medir", modo, "--filas", str(n), "--ruta", ruta],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                segundos, rss_inicial, rss_max = map(float, salida[-3:])
+                print(
+                    f"{modo:<10} {n:>8} {segundos:>9.2f} {n / segundos:>10.0f} "
+                    f"{rss_max - rss_inicial:>7.0f} MB {os.path.getsize(ruta) / 2**20:>7.1f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
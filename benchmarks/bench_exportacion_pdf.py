@@ -0,0 +1,142 @@
+"""
+Benchmark: exportacion de reportes a PDF con N filas.
+
+Genera N filas sinteticas del reporte "pipeline" (10 columnas, 1 de cada 7
+con un nombre largo que obliga a partir la celda) y mide paginas por
+segundo y memoria maxima (RSS) de:
+    1. canvas: ReporteService.exportar_pdf (tabla dibujada pagina por
+       pagina, texto simple salvo en celdas que no caben).
+    2. anterior: la version previa (un Paragraph por celda y una sola
+       Table en SimpleDocTemplate). Solo hasta --max-anterior filas.
+
+Cada medicion corre en un proceso nuevo para que el RSS maximo de una no
+contamine a la siguiente.
+
+Uso:
+    python benchmarks/bench_exportacion_pdf.py                     # 10k, 100k
+    python benchmarks/bench_exportacion_pdf.py --filas 5000 20000
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.services.reporte_service import REPORTES, _escribir_pdf
+
+_ETAPAS = ["Prospecto", "Calificado", "Propuesta", "Negociacion"]
+
+
+def _filas(n):
+    for i in range(n):
+        nombre = f"Oportunidad {i}"
+        if i % 7 == 0:
+            nombre += " con alcance ampliado a todas las sucursales de la region norte"
+        yield {
+            "NombreOportunidad": nombre,
+            "Empresa": f"Empresa {i % 5000} S.A. de C.V.",
+            "Contacto": f"Contacto {i % 20000}",
+            "Etapa": _ETAPAS[i % len(_ETAPAS)],
+            "MontoEstimado": 1000.0 + i,
+            "ProbabilidadCierre": (i * 7) % 100,
+            "ValorPonderado": (1000.0 + i) * ((i * 7) % 100) / 100,
+            "FechaCierreEstimada": f"2026-{(i % 12) + 1:02d}-15",
+            "Vendedor": f"Vendedor {i % 12}",
+            "DiasEnPipeline": i % 365,
+        }
+
+
+def _exportar_anterior(datos, ruta):
+    # copia de la exportacion previa: Paragraph por celda dentro de una Table
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.lib.units import cm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph
+
+    cfg = REPORTES["pipeline"]
+    columnas, cabeceras = cfg["columnas"], cfg["cabeceras"]
+    datos = list(datos)
+    pagesize = landscape(A4)
+    doc = SimpleDocTemplate(ruta, pagesize=pagesize, leftMargin=1.5 * cm, rightMargin=1.5 * cm,
+                            topMargin=1.5 * cm, bottomMargin=1.5 * cm)
+    style_hdr = ParagraphStyle("th", fontSize=9, leading=11, fontName="Helvetica-Bold")
+    style_cel = ParagraphStyle("td", fontSize=8, leading=10, fontName="Helvetica")
+    filas_tabla = [[Paragraph(h, style_hdr) for h in cabeceras]]
+    for fila in datos:
+        filas_tabla.append([Paragraph(str(fila.get(col, "") or ""), style_cel) for col in columnas])
+    page_w = pagesize[0] - 3 * cm
+    max_lens = []
+    for col_key, cabecera in zip(columnas, cabeceras):
+        max_len = len(str(cabecera))
+        for fila in datos[:100]:
+            max_len = max(max_len, len(str(fila.get(col_key, "") or "")))
+        max_lens.append(max(max_len, 4))
+    col_widths = [max(l / sum(max_lens) * page_w, 1.5 * cm) for l in max_lens]
+    col_widths = [w * page_w / sum(col_widths) for w in col_widths]
+    tabla = Table(filas_tabla, colWidths=col_widths, repeatRows=1)
+    tabla.setStyle(TableStyle([
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#4a90d9")),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("ROWBACKGROUND", (0, 1), (-1, -1), [colors.white, colors.HexColor("#EBF4FF")]),
+        ("GRID", (0, 0), (-1, -1), 0.5, colors.HexColor("#CBD5E0")),
+        ("TOPPADDING", (0, 0), (-1, -1), 5),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 5),
+    ]))
+    doc.build([tabla])
+    return doc.page
+
+
+def _rss_max_mb():
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo / 2**20 if sys.platform == "darwin" else maximo / 1024
+
+
+def _medir(modo, n, ruta):
+    # corre en el proceso hijo e imprime "segundos paginas rss_inicial rss_max"
+    rss_inicial = _rss_max_mb()
+    inicio = time.perf_counter()
+    if modo == "canvas":
+        _, paginas = _escribir_pdf(REPORTES["pipeline"], _filas(n), ruta)
+    else:
+        paginas = _exportar_anterior(_filas(n), ruta)
+    print(f"{time.perf_counter() - inicio} {paginas} {rss_inicial} {_rss_max_mb()}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10000, 100000])
+    parser.add_argument("--max-anterior", type=int, default=10000)
+    parser.add_argument("--medir", choices=["canvas", "anterior"], help=argparse.SUPPRESS)
+    parser.add_argument("--ruta", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir:
+        _medir(args.medir, args.filas[0], args.ruta)
+        return
+
+    print(f"{'modo':<10} {'filas':>8} {'paginas':>8} {'segundos':>9} {'pag/s':>8} {'RSS max':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.filas:
+            for modo in ("canvas", "anterior"):
+                if modo == "anterior" and n > args.max_anterior:
+                    continue
+                ruta = os.path.join(tmp, f"{modo}_{n}.pdf")
+                salida = subprocess.run(
+                    [sys.executable, __file__, "--medir", modo, "--filas", str(n), "--ruta", ruta],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                segundos, paginas, rss_inicial, rss_max = map(float, salida[-4:])
+                print(
+                    f"{modo:<10} {n:>8} {paginas:>8.0f} {segundos:>9.2f} "
+                    f"{paginas / segundos:>8.1f} {rss_max - rss_inicial:>7.0f} MB"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: graficas del dashboard con matplotlib vs QPainter (app.views.graficas).
+
+Mide, para la grafica de pipeline (barras horizontales) y la dona de estado:
+    1. importacion en frio: lo que agrega importar cada opcion cuando PyQt5
+       ya esta cargado (es lo que pagaba el arranque, porque MainView importa
+       DashboardView al inicio). Cada importacion corre en un proceso nuevo.
+    2. redibujado: un cambio de datos hasta tener los pixeles listos.
+       matplotlib: fig.clear() + replot + canvas.draw() (lo que hacia la
+       vista). QPainter: set_datos() + renderizar() del mismo tamano.
+
+Usa QT_QPA_PLATFORM=offscreen si no se indica otra plataforma.
+
+Uso:
+    python benchmarks/bench_graficas.py
+    python benchmarks/bench_graficas.py --repeticiones 5 --redibujos 200
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_ANCHO, _ALTO = 600, 300
+_ETAPAS = ["Prospecto", "Calificacion", "Presentacion", "Propuesta", "Negociacion"]
+_COLORES = ["#3498db", "#2ecc71", "#f39c12", "#e67e22", "#e74c3c"]
+
+_IMPORTS = {
+    "matplotlib": (
+        "import matplotlib; matplotlib.use('Qt5Agg'); "
+        "from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg; "
+        "from matplotlib.figure import Figure"
+    ),
+    "qpainter": "from app.views.graficas import GraficaBarras, GraficaDona",
+}
+
+
+def _medir_import(modo):
+    # corre en el proceso hijo e imprime los segundos de la importacion
+    import PyQt5.QtWidgets  # noqa: F401  (ya cargado en la app real)
+    inicio = time.perf_counter()
+    exec(_IMPORTS[modo])
+    print(time.perf_counter() - inicio)
+
+
+def _montos(i):
+    return [200 + (i * 37 + k * 91) % 300 for k in range(len(_ETAPAS))]
+
+
+def _redibujos_matplotlib(n):
+    import matplotlib
+    matplotlib.use("Qt5Agg")
+    from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+    from matplotlib.figure import Figure
+
+    canvas = FigureCanvasQTAgg(Figure(facecolor="#ffffff", tight_layout=True))
+    canvas.resize(_ANCHO, _ALTO)
+    tiempos = []
+    for i in range(n):
+        montos = _montos(i)
+        inicio = time.perf_counter()
+        fig = canvas.figure
+        fig.clear()
+        ax = fig.add_subplot(111)
+        bars = ax.barh(_ETAPAS, montos, color=_COLORES, height=0.55, zorder=2)
+        for bar, monto in zip(bars, montos):
+            ax.text(bar.get_width() + max(montos) * 0.02, bar.get_y() + bar.get_height() / 2,
+                    f"${monto:.0f}K", va="center", ha="left", fontsize=9)
+        ax.set_xlabel("Monto estimado (miles MXN)", fontsize=9)
+        ax.xaxis.grid(True, color="#f0f2f5", zorder=0)
+        ax.set_xlim(0, max(montos) * 1.30)
+        fig.tight_layout(pad=1.2)
+        canvas.draw()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def _redibujos_qpainter(n):
+    from app.views.graficas import GraficaBarras
+
+    grafica = GraficaBarras(titulo_eje="Monto estimado (miles MXN)", formato=lambda v: f"${v:.0f}K")
+    tiempos = []
+    for i in range(n):
+        montos = _montos(i)
+        inicio = time.perf_counter()
+        grafica.set_datos(zip(_ETAPAS, montos, _COLORES))
+        grafica.renderizar(_ANCHO, _ALTO)
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeticiones", type=int, default=5, help="procesos por importacion")
+    parser.add_argument("--redibujos", type=int, default=100)
+    parser.add_argument("--medir-import", choices=list(_IMPORTS), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.medir_import:
+        _medir_import(args.medir_import)
+        return
+
+    print(f"{'importacion en frio':<22} {'mediana':>10} {'minimo':>10}")
+    for modo in _IMPORTS:
+        tiempos = [
+            float(subprocess.run(
+                [sys.executable, __file__, "--medir-import", modo],
+                check=True, capture_output=True, text=True,
+            ).stdout.split()[-1])
+            for _ in range(args.repeticiones)
+        ]
+        print(f"{modo:<22} {statistics.median(tiempos) * 1000:>7.1f} ms {min(tiempos) * 1000:>7.1f} ms")
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])  # noqa: F841
+
+    print(f"\n{'redibujado ' + str(_ANCHO) + 'x' + str(_ALTO):<22} {'mediana':>10} {'p95':>10}")
+    for modo, medir in (("matplotlib", _redibujos_matplotlib), ("qpainter", _redibujos_qpainter)):
+        tiempos = sorted(medir(args.redibujos))
+        p95 = tiempos[int(len(tiempos) * 0.95) - 1]
+        print(f"{modo:<22} {statistics.median(tiempos) * 1000:>7.2f} ms {p95 * 1000:>7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
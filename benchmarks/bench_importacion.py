@@ -0,0 +1,96 @@
+"""
+Benchmark: importacion masiva de contactos desde CSV.
+
+Crea una BD temporal con el esquema completo (db/database_query.sql) y un
+CSV de N contactos con catalogos por nombre (ciudad, origen, propietario) y
+un 1% de filas invalidas. Se mide:
+    1. ImportacionService.importar_contactos (streaming, lotes con executemany).
+    2. Como referencia, ContactoService.crear_contacto fila por fila sobre
+       una muestra, extrapolado al total.
+
+Uso:
+    python benchmarks/bench_importacion.py                # 100000 filas
+    python benchmarks/bench_importacion.py --filas 20000
+"""
+
+import argparse
+import csv
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection
+from app.services.contacto_service import ContactoService
+from app.services.importacion_service import ImportacionService
+
+_MUESTRA_FILA_POR_FILA = 2000
+
+
+def _preparar_bd(ruta):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.commit()
+
+
+def _generar_csv(ruta, n):
+    ciudades = ["Monterrey", "Guadalajara", "San Pedro Garza García", "Saltillo"]
+    origenes = ["Sitio Web", "Referido", "Redes Sociales"]
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        escritor = csv.writer(f)
+        escritor.writerow([
+            "Nombre", "Apellido Paterno", "Email", "Telefono Celular",
+            "Puesto", "Ciudad", "Origen", "Propietario",
+        ])
+        for i in range(n):
+            # 1 de cada 100 con un email invalido, para que haya rechazos
+            email = f"contacto{i}@bench.local" if i % 100 else f"contacto{i}-sin-arroba"
+            escritor.writerow([
+                f"Nombre{i}", "Bench", email, f"81{i:08d}"[-10:], "Compras",
+                ciudades[i % len(ciudades)], origenes[i % len(origenes)], "Admin Sistema",
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _preparar_bd(os.path.join(tmp, "bench.db"))
+        ruta_csv = os.path.join(tmp, "contactos.csv")
+        _generar_csv(ruta_csv, args.filas)
+
+        resumen, error = ImportacionService().importar_contactos(ruta_csv, usuario_actual_id=1)
+        if error:
+            raise SystemExit(error)
+        print(
+            f"importacion       {resumen.procesadas:>7} filas  {resumen.segundos:8.2f} s  "
+            f"{resumen.procesadas / resumen.segundos:12.0f} filas/s  "
+            f"({resumen.insertadas} insertadas, {resumen.rechazadas} rechazadas)"
+        )
+
+        muestra = min(_MUESTRA_FILA_POR_FILA, args.filas)
+        service = ContactoService()
+        inicio = time.perf_counter()
+        for i in range(muestra):
+            service.crear_contacto(
+                {"nombre": f"Uno{i}", "apellido_paterno": "PorUno", "email": f"uno{i}@bench.local"},
+                usuario_actual_id=1,
+            )
+        por_fila = (time.perf_counter() - inicio) / muestra
+        estimado = por_fila * args.filas
+        print(f"fila_por_fila     {args.filas:>7} filas  {estimado:8.2f} s  (estimado con {muestra})")
+        close_connection()
+    print(f"aceleracion: x{estimado / resumen.segundos:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Benchmark: costo por fila de convertir filas SQLite en modelos.
+
+Crea una BD temporal con el esquema completo, inserta N contactos y mide
+el listado completo (SELECT del listado + conversion a Contacto) con:
+    1. sqlite3.Row + busqueda por nombre + try/except por columna opcional
+       (la forma anterior de _row_to_contacto, reproducida aqui).
+    2. MapeadorFilas: tuplas simples + funcion compilada por indices
+       (ContactoRepository.find_all).
+
+Se reporta el tiempo total y los microsegundos por fila de cada variante,
+y aparte el costo de solo mapear (con las filas ya en memoria).
+
+Uso:
+    python benchmarks/bench_mapeo.py                # 100000 filas
+    python benchmarks/bench_mapeo.py --filas 20000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection
+from app.models.Contacto import Contacto
+from app.repositories.contacto_repository import ContactoRepository
+
+
+def _preparar_bd(ruta, filas):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email, EmpresaID, PropietarioID) VALUES (?, ?, ?, ?, ?)",
+        ((f"Nombre{i}", "Bench", f"c{i}@bench.local", (i % 8) + 1, 1) for i in range(filas)),
+    )
+    conn.commit()
+
+
+def _row_to_contacto_anterior(row):
+    # copia de la conversion previa: nombre por columna y try/except por opcional
+    opcionales = {}
+    for clave in ("NombreEmpresa", "NombreCiudad", "NombreOrigen", "NombrePropietario"):
+        try:
+            opcionales[clave] = row[clave]
+        except (KeyError, IndexError):
+            opcionales[clave] = None
+    return Contacto(
+        contacto_id=row["ContactoID"], nombre=row["Nombre"],
+        apellido_paterno=row["ApellidoPaterno"], apellido_materno=row["ApellidoMaterno"],
+        email=row["Email"], email_secundario=row["EmailSecundario"],
+        telefono_oficina=row["TelefonoOficina"], telefono_celular=row["TelefonoCelular"],
+        puesto=row["Puesto"], departamento=row["Departamento"], empresa_id=row["EmpresaID"],
+        direccion=row["Direccion"], ciudad_id=row["CiudadID"], codigo_postal=row["CodigoPostal"],
+        fecha_nacimiento=row["FechaNacimiento"], linkedin_url=row["LinkedInURL"],
+        origen_id=row["OrigenID"], propietario_id=row["PropietarioID"],
+        es_contacto_principal=row["EsContactoPrincipal"], no_contactar=row["NoContactar"],
+        activo=row["Activo"], foto_url=row["FotoURL"], fecha_creacion=row["FechaCreacion"],
+        fecha_modificacion=row["FechaModificacion"], creado_por=row["CreadoPor"],
+        modificado_por=row["ModificadoPor"],
+        nombre_empresa=opcionales["NombreEmpresa"], nombre_ciudad=opcionales["NombreCiudad"],
+        nombre_origen=opcionales["NombreOrigen"], nombre_propietario=opcionales["NombrePropietario"],
+    )
+
+
+def _medir(etiqueta, n, funcion):
+    inicio = time.perf_counter()
+    resultado = funcion()
+    segundos = time.perf_counter() - inicio
+    print(f"{etiqueta:<28} {segundos * 1000:9.1f} ms  {segundos / n * 1e6:7.2f} us/fila")
+    assert len(resultado) == n
+    return segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _preparar_bd(os.path.join(tmp, "bench.db"), args.filas)
+        conn = get_connection()
+        repo = ContactoRepository()
+        query = ContactoRepository._SELECT_LISTADO + " ORDER BY ct.FechaCreacion DESC"
+        total = conn.execute("SELECT COUNT(*) FROM Contactos").fetchone()[0]
+        repo.find_all()  # calentar cache de paginas y compilar el mapeo
+
+        print("-- consulta + mapeo (find_all)")
+        antes = _medir(
+            "Row + try/except",
+            total, lambda: [_row_to_contacto_anterior(r) for r in conn.execute(query).fetchall()],
+        )
+        despues = _medir("MapeadorFilas", total, repo.find_all)
+        print(f"aceleracion: x{antes / despues:.2f}")
+
+        print("-- solo mapeo (filas ya leidas)")
+        filas_row = conn.execute(query).fetchall()
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        filas_tupla = cursor.execute(query).fetchall()
+        mapear = ContactoRepository._MAPEO.para(query, cursor.description)
+        antes = _medir("Row + try/except", total, lambda: [_row_to_contacto_anterior(r) for r in filas_row])
+        despues = _medir("MapeadorFilas", total, lambda: list(map(mapear, filas_tupla)))
+        print(f"aceleracion: x{antes / despues:.2f}")
+        close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: memoria de los modelos al cargar N contactos.
+
+Crea una BD temporal con el esquema completo, inserta N contactos y mide:
+    1. Bytes por instancia de Contacto con __slots__ contra la misma clase
+       sin slots (con __dict__, construida con los mismos valores).
+       Se mide con tracemalloc: solo cuenta lo que asigna el objeto en si,
+       no las cadenas que comparte con la fila leida.
+    2. RSS del proceso antes y despues de cargar las N filas con
+       ContactoRepository.find_all(), cada variante en un proceso nuevo
+       (en el mismo proceso la segunda carga reutiliza la memoria que
+       libero la primera y el RSS no la refleja).
+
+El RSS se lee de /proc/self/statm (Linux) o, si no existe, del maximo
+que reporta resource.getrusage (solo crece, asi que es aproximado).
+
+Uso:
+    python benchmarks/bench_memoria_modelos.py                # 100000 filas
+    python benchmarks/bench_memoria_modelos.py --filas 20000
+"""
+
+import argparse
+import gc
+import os
+import sys
+import subprocess
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection
+from app.models.Contacto import Contacto
+from app.repositories.contacto_repository import ContactoRepository
+from app.utils.mapeo import MapeadorFilas
+
+
+# la misma clase sin __slots__ (un modelo como era antes): mismo __init__,
+# atributos guardados en el __dict__ de cada instancia
+ContactoConDict = type("ContactoConDict", (), {"__init__": Contacto.__init__})
+
+
+def _preparar_bd(ruta, filas):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.executemany(
+        "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email, EmpresaID, PropietarioID) VALUES (?, ?, ?, ?, ?)",
+        ((f"Nombre{i}", "Bench", f"c{i}@bench.local", (i % 8) + 1, 1) for i in range(filas)),
+    )
+    conn.commit()
+
+
+def _rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError):
+        import resource
+        maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maximo / 2**20 if sys.platform == "darwin" else maximo / 1024
+
+
+def _bytes_por_instancia(filas, mapear):
+    # las filas ya estan en memoria: solo se cuentan los objetos nuevos
+    gc.collect()
+    tracemalloc.start()
+    objetos = list(map(mapear, filas))
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    # fecha_creacion viene de la fila, asi que no se crean cadenas nuevas;
+    # la lista en si (8 bytes por elemento) se descuenta
+    return (actual - sys.getsizeof(objetos)) / len(objetos)
+
+
+def _rss_carga(ruta, variante):
+    # se ejecuta en un proceso hijo: imprime "filas antes despues"
+    connection.DB_PATH = ruta
+    if variante == "dict":
+        mapeo = ContactoRepository._MAPEO
+        ContactoRepository._MAPEO = MapeadorFilas(ContactoConDict, mapeo._campos, opcionales=mapeo._opcionales)
+    repo = ContactoRepository()
+    repo.count_all()  # abrir la conexion antes de medir
+    gc.collect()
+    antes = _rss_mb()
+    objetos = repo.find_all()
+    print(len(objetos), antes, _rss_mb())
+    close_connection()
+
+
+def _medir_rss(ruta, variante):
+    salida = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--rss", variante, "--bd", ruta],
+        capture_output=True, text=True, check=True,
+    ).stdout.split()
+    return int(salida[0]), float(salida[1]), float(salida[2])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=100000)
+    parser.add_argument("--rss", choices=("slots", "dict"), help=argparse.SUPPRESS)
+    parser.add_argument("--bd", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.rss:
+        _rss_carga(args.bd, args.rss)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _preparar_bd(os.path.join(tmp, "bench.db"), args.filas)
+        conn = get_connection()
+        query = ContactoRepository._SELECT_LISTADO + " ORDER BY ct.FechaCreacion DESC"
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        filas = cursor.execute(query).fetchall()
+
+        mapeo_slots = ContactoRepository._MAPEO
+        mapeo_dict = MapeadorFilas(ContactoConDict, mapeo_slots._campos, opcionales=mapeo_slots._opcionales)
+
+        print(f"-- bytes por instancia ({len(filas)} filas, tracemalloc)")
+        con_dict = _bytes_por_instancia(filas, mapeo_dict.compilar(cursor.description))
+        con_slots = _bytes_por_instancia(filas, mapeo_slots.compilar(cursor.description))
+        print(f"{'con __dict__':<16} {con_dict:8.1f} B")
+        print(f"{'con __slots__':<16} {con_slots:8.1f} B")
+        print(f"reduccion: {100 * (1 - con_slots / con_dict):.0f}%")
+        del filas
+        close_connection()
+
+        print("-- RSS al cargar find_all() (proceso nuevo por variante)")
+        for etiqueta, variante in (("con __dict__", "dict"), ("con __slots__", "slots")):
+            total, antes, despues = _medir_rss(os.path.join(tmp, "bench.db"), variante)
+            mb = despues - antes
+            print(f"{etiqueta:<16} +{mb:7.1f} MB  ({mb * 2**20 / total:6.0f} B/fila)  RSS total {despues:7.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
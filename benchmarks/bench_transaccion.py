@@ -0,0 +1,77 @@
+"""
+Benchmark: inserciones masivas con y sin transaction().
+
+Crea una BD temporal con el esquema completo (db/database_query.sql) e
+inserta N contactos usando ContactoRepository.create, que hace su propio
+commit. Se mide:
+    1. Sin transaccion: un COMMIT (y un fsync) por fila.
+    2. Con transaction(): los commits se difieren y hay un solo COMMIT.
+
+Uso:
+    python benchmarks/bench_transaccion.py            # 10000 filas
+    python benchmarks/bench_transaccion.py --filas 2000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection, transaction
+from app.models.Contacto import Contacto
+from app.repositories.contacto_repository import ContactoRepository
+
+
+def _preparar_bd(ruta):
+    connection.DB_PATH = ruta
+    close_connection()
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.commit()
+
+
+def _contactos(prefijo, n):
+    for i in range(n):
+        yield Contacto(
+            nombre=f"Nombre{i}",
+            apellido_paterno="Bench",
+            email=f"{prefijo}{i}@bench.local",
+        )
+
+
+def _medir(etiqueta, n, usar_transaccion):
+    repo = ContactoRepository()
+    inicio = time.perf_counter()
+    if usar_transaccion:
+        with transaction():
+            for contacto in _contactos(etiqueta, n):
+                repo.create(contacto)
+    else:
+        for contacto in _contactos(etiqueta, n):
+            repo.create(contacto)
+    segundos = time.perf_counter() - inicio
+    print(f"{etiqueta:<16} {n:>7} filas  {segundos:8.2f} s  {n / segundos:12.0f} filas/s")
+    return segundos
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filas", type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        _preparar_bd(os.path.join(tmp, "bench.db"))
+        antes = _medir("sin_transaccion", args.filas, usar_transaccion=False)
+        despues = _medir("con_transaccion", args.filas, usar_transaccion=True)
+        close_connection()
+    print(f"aceleracion: x{antes / despues:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,12 +17,21 @@ a = Analysis(
         ('db/database_query.sql', 'db'),
     ],
     hiddenimports=[
+        # Section views: MainView imports them by name with importlib
+        # (SECCIONES in app/views/main_view.py), so the analysis can't see them.
+        # Keep in sync: tests/test_utils/test_secciones.py checks the list.
+        'app.views.dashboard_view',
+        'app.views.clientes_view',
+        'app.views.ventas_view',
+        'app.views.actividades_view',
+        'app.views.segmentacion_view',
+        'app.views.comunicacion_view',
+        'app.views.reportes_view',
+        'app.views.notificaciones_view',
+        'app.views.configuracion_view',
         # PyQt5 plugins needed at runtime
         'PyQt5.QtPrintSupport',
         'PyQt5.sip',
-        # matplotlib backend for PyQt5
-        'matplotlib.backends.backend_qt5agg',
-        'matplotlib.backends.backend_agg',
         # openpyxl internals
         'openpyxl.cell._writer',
         # reportlab internals
@@ -43,6 +52,8 @@ a = Analysis(
     excludes=[
         'tkinter',
         'xmlrpc',
+        # dashboard charts are drawn with QPainter (app/views/graficas.py)
+        'matplotlib',
     ],
     win_no_prefer_redirects=False,
     win_private_assemblies=False,
@@ -634,24 +634,7 @@ SELECT
 FROM Campanas c
     INNER JOIN Usuarios u ON c.PropietarioID = u.UsuarioID;
 
--- Vista: Actividad reciente por contacto
-CREATE VIEW IF NOT EXISTS vw_ActividadRecienteContacto AS
-SELECT 
-    co.ContactoID,
-    (co.Nombre || ' ' || co.ApellidoPaterno) AS NombreContacto,
-    e.RazonSocial AS Empresa,
-    COUNT(a.ActividadID) AS TotalActividades,
-    MAX(a.FechaCreacion) AS UltimaActividad,
-    CAST(julianday('now', 'localtime') - julianday(MAX(a.FechaCreacion)) AS INTEGER) AS DiasSinContacto,
-    SUM(CASE WHEN ta.Nombre = 'Llamada' THEN 1 ELSE 0 END) AS TotalLlamadas,
-    SUM(CASE WHEN ta.Nombre = 'Reunión' THEN 1 ELSE 0 END) AS TotalReuniones,
-    SUM(CASE WHEN ta.Nombre = 'Correo' THEN 1 ELSE 0 END) AS TotalCorreos
-FROM Contactos co
-    LEFT JOIN Empresas e ON co.EmpresaID = e.EmpresaID
-    LEFT JOIN Actividades a ON co.ContactoID = a.ContactoID
-    LEFT JOIN TiposActividad ta ON a.TipoActividadID = ta.TipoActividadID
-WHERE co.Activo = 1
-GROUP BY co.ContactoID, co.Nombre, co.ApellidoPaterno, e.RazonSocial;
+-- Vista vw_ActividadRecienteContacto: se define al final, sobre ResumenActividadContacto
 
 -- Vista: Subtotal calculado de productos en oportunidad
 CREATE VIEW IF NOT EXISTS vw_OportunidadProductosDetalle AS
@@ -1416,27 +1399,7 @@ END;
 
 --- VISTA DASHBOARD (Módulo 8) ---
 
--- Vista: KPIs ejecutivos consolidados para el dashboard
-CREATE VIEW IF NOT EXISTS vw_ResumenEjecutivo AS
-SELECT
-    (SELECT COUNT(*) FROM Contactos WHERE Activo = 1)                    AS ContactosActivos,
-    (SELECT COUNT(*) FROM Empresas  WHERE Activo = 1)                    AS EmpresasActivas,
-    (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NULL)          AS OportunidadesAbiertas,
-    (SELECT IFNULL(SUM(MontoEstimado), 0)
-       FROM Oportunidades WHERE EsGanada IS NULL)                        AS ValorPipeline,
-    (SELECT IFNULL(SUM(MontoEstimado), 0)
-       FROM Oportunidades
-      WHERE EsGanada = 1
-        AND substr(FechaCierreReal, 1, 7) = strftime('%Y-%m', 'now', 'localtime')) AS RevenueEsteMes,
-    (SELECT COUNT(*) FROM Actividades WHERE EstadoActividadID IN (1, 2)) AS ActividadesPendientes,
-    (SELECT COUNT(*) FROM Campanas   WHERE Estado = 'Enviada')           AS CampanasEnviadas,
-    CASE
-        WHEN (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NOT NULL) > 0
-        THEN ROUND(
-            CAST((SELECT COUNT(*) FROM Oportunidades WHERE EsGanada = 1) AS REAL) /
-            (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NOT NULL) * 100, 1)
-        ELSE 0
-    END AS TasaConversionGlobal;
+-- Vista vw_ResumenEjecutivo: se define al final, sobre la tabla ResumenKPI
 CREATE INDEX IF NOT EXISTS idx_oportunidades_activo_fecha ON Oportunidades(FechaCreacion DESC);
 CREATE INDEX IF NOT EXISTS idx_usuarios_activo_rol ON Usuarios(Activo, RolID);
 
@@ -1464,3 +1427,1048 @@ CREATE INDEX IF NOT EXISTS idx_notificaciones_usuario_leida ON Notificaciones(Us
 -- Indices para auditoria
 CREATE INDEX IF NOT EXISTS idx_log_auditoria_fecha ON LogAuditoria(FechaAccion);
 CREATE INDEX IF NOT EXISTS idx_log_auditoria_entidad ON LogAuditoria(EntidadTipo, EntidadID);
+
+-- Indices para paginacion por cursor (keyset) sobre (FechaCreacion, ID)
+-- Oportunidades ya queda cubierta por idx_oportunidades_activo_fecha
+CREATE INDEX IF NOT EXISTS idx_contactos_fecha_id ON Contactos(FechaCreacion, ContactoID);
+CREATE INDEX IF NOT EXISTS idx_empresas_fecha_id ON Empresas(FechaCreacion, EmpresaID);
+CREATE INDEX IF NOT EXISTS idx_actividades_fecha_id ON Actividades(FechaCreacion, ActividadID);
+CREATE INDEX IF NOT EXISTS idx_cotizaciones_fecha_id ON Cotizaciones(FechaCreacion, CotizacionID);
+
+-- Busqueda de texto completo (FTS5) sobre contactos, empresas y notas
+-- Un solo indice para todas las entidades: rowid = ID * 4 + tipo
+-- (0 contacto, 1 empresa, 2 nota de contacto, 3 nota de empresa), asi los
+-- triggers actualizan una fila por rowid sin recorrer el indice.
+-- remove_diacritics 2: "jose" encuentra "José"; prefix: acelera "ana*".
+CREATE VIRTUAL TABLE IF NOT EXISTS BusquedaGlobal USING fts5(
+    Titulo, Detalle, Contenido,
+    PadreID UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+);
+
+-- Las notas privadas se excluyen por rowid consultando estas tablas al
+-- buscar (asi un cambio de EsPrivada aplica al instante sin reindexar)
+CREATE INDEX IF NOT EXISTS idx_notascontacto_privadas ON NotasContacto(CreadoPor) WHERE EsPrivada = 1;
+CREATE INDEX IF NOT EXISTS idx_notasempresa_privadas ON NotasEmpresa(CreadoPor) WHERE EsPrivada = 1;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaInsert
+AFTER INSERT ON Contactos
+BEGIN
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.ContactoID * 4,
+        NEW.Nombre || ' ' || NEW.ApellidoPaterno || ' ' || IFNULL(NEW.ApellidoMaterno, ''),
+        IFNULL(NEW.Email, '') || ' ' || IFNULL(NEW.EmailSecundario, '') || ' ' ||
+        IFNULL(NEW.TelefonoOficina, '') || ' ' || IFNULL(NEW.TelefonoCelular, '') || ' ' ||
+        IFNULL(NEW.Puesto, '') || ' ' || IFNULL(NEW.Departamento, ''),
+        '', NEW.EmpresaID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaUpdate
+AFTER UPDATE OF Nombre, ApellidoPaterno, ApellidoMaterno, Email, EmailSecundario,
+                TelefonoOficina, TelefonoCelular, Puesto, Departamento, EmpresaID ON Contactos
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.ContactoID * 4;
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.ContactoID * 4,
+        NEW.Nombre || ' ' || NEW.ApellidoPaterno || ' ' || IFNULL(NEW.ApellidoMaterno, ''),
+        IFNULL(NEW.Email, '') || ' ' || IFNULL(NEW.EmailSecundario, '') || ' ' ||
+        IFNULL(NEW.TelefonoOficina, '') || ' ' || IFNULL(NEW.TelefonoCelular, '') || ' ' ||
+        IFNULL(NEW.Puesto, '') || ' ' || IFNULL(NEW.Departamento, ''),
+        '', NEW.EmpresaID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_BusquedaDelete
+AFTER DELETE ON Contactos
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.ContactoID * 4;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaInsert
+AFTER INSERT ON Empresas
+BEGIN
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.EmpresaID * 4 + 1,
+        NEW.RazonSocial || ' ' || IFNULL(NEW.NombreComercial, ''),
+        IFNULL(NEW.RFC, '') || ' ' || IFNULL(NEW.Email, '') || ' ' ||
+        IFNULL(NEW.Telefono, '') || ' ' || IFNULL(NEW.SitioWeb, ''),
+        IFNULL(NEW.Descripcion, ''), NULL
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaUpdate
+AFTER UPDATE OF RazonSocial, NombreComercial, RFC, Email, Telefono, SitioWeb, Descripcion ON Empresas
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.EmpresaID * 4 + 1;
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.EmpresaID * 4 + 1,
+        NEW.RazonSocial || ' ' || IFNULL(NEW.NombreComercial, ''),
+        IFNULL(NEW.RFC, '') || ' ' || IFNULL(NEW.Email, '') || ' ' ||
+        IFNULL(NEW.Telefono, '') || ' ' || IFNULL(NEW.SitioWeb, ''),
+        IFNULL(NEW.Descripcion, ''), NULL
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_BusquedaDelete
+AFTER DELETE ON Empresas
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.EmpresaID * 4 + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaInsert
+AFTER INSERT ON NotasContacto
+BEGIN
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.NotaID * 4 + 2, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.ContactoID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaUpdate
+AFTER UPDATE OF Titulo, Contenido, ContactoID ON NotasContacto
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 2;
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.NotaID * 4 + 2, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.ContactoID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasContacto_BusquedaDelete
+AFTER DELETE ON NotasContacto
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 2;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaInsert
+AFTER INSERT ON NotasEmpresa
+BEGIN
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.NotaID * 4 + 3, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.EmpresaID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaUpdate
+AFTER UPDATE OF Titulo, Contenido, EmpresaID ON NotasEmpresa
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 3;
+    INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+    VALUES (
+        NEW.NotaID * 4 + 3, IFNULL(NEW.Titulo, ''), '', NEW.Contenido, NEW.EmpresaID
+    );
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_NotasEmpresa_BusquedaDelete
+AFTER DELETE ON NotasEmpresa
+BEGIN
+    DELETE FROM BusquedaGlobal WHERE rowid = OLD.NotaID * 4 + 3;
+END;
+
+-- Carga inicial del indice con los datos semilla (mismas expresiones que los triggers)
+INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+SELECT ContactoID * 4,
+       Nombre || ' ' || ApellidoPaterno || ' ' || IFNULL(ApellidoMaterno, ''),
+       IFNULL(Email, '') || ' ' || IFNULL(EmailSecundario, '') || ' ' ||
+       IFNULL(TelefonoOficina, '') || ' ' || IFNULL(TelefonoCelular, '') || ' ' ||
+       IFNULL(Puesto, '') || ' ' || IFNULL(Departamento, ''),
+       '', EmpresaID
+FROM Contactos;
+
+INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+SELECT EmpresaID * 4 + 1,
+       RazonSocial || ' ' || IFNULL(NombreComercial, ''),
+       IFNULL(RFC, '') || ' ' || IFNULL(Email, '') || ' ' ||
+       IFNULL(Telefono, '') || ' ' || IFNULL(SitioWeb, ''),
+       IFNULL(Descripcion, ''), NULL
+FROM Empresas;
+
+INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+SELECT NotaID * 4 + 2, IFNULL(Titulo, ''), '', Contenido, ContactoID
+FROM NotasContacto;
+
+INSERT INTO BusquedaGlobal (rowid, Titulo, Detalle, Contenido, PadreID)
+SELECT NotaID * 4 + 3, IFNULL(Titulo, ''), '', Contenido, EmpresaID
+FROM NotasEmpresa;
+
+-- ============================================================
+-- Versiones de catalogos (invalidacion de CatalogCache)
+-- ============================================================
+-- Cada INSERT/UPDATE/DELETE en una tabla de catalogo incrementa su fila.
+-- CatalogCache lee esta tabla (unas 14 filas) para saber que catalogos
+-- cambiaron desde que los cargo, sin importar que conexion hizo el cambio.
+CREATE TABLE IF NOT EXISTS VersionCatalogos (
+    Tabla           TEXT PRIMARY KEY,
+    Version         INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO VersionCatalogos (Tabla) VALUES
+('Industrias'),
+('TamanosEmpresa'),
+('OrigenesContacto'),
+('Monedas'),
+('Paises'),
+('Estados'),
+('Ciudades'),
+('Usuarios'),
+('EtapasVenta'),
+('MotivosPerdida'),
+('TiposActividad'),
+('EstadosActividad'),
+('Etiquetas'),
+('Prioridades');
+
+CREATE TRIGGER IF NOT EXISTS trg_Industrias_VersionInsert
+AFTER INSERT ON Industrias
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Industrias';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Industrias_VersionUpdate
+AFTER UPDATE ON Industrias
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Industrias';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Industrias_VersionDelete
+AFTER DELETE ON Industrias
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Industrias';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TamanosEmpresa_VersionInsert
+AFTER INSERT ON TamanosEmpresa
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TamanosEmpresa';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TamanosEmpresa_VersionUpdate
+AFTER UPDATE ON TamanosEmpresa
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TamanosEmpresa';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TamanosEmpresa_VersionDelete
+AFTER DELETE ON TamanosEmpresa
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TamanosEmpresa';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_OrigenesContacto_VersionInsert
+AFTER INSERT ON OrigenesContacto
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'OrigenesContacto';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_OrigenesContacto_VersionUpdate
+AFTER UPDATE ON OrigenesContacto
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'OrigenesContacto';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_OrigenesContacto_VersionDelete
+AFTER DELETE ON OrigenesContacto
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'OrigenesContacto';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Monedas_VersionInsert
+AFTER INSERT ON Monedas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Monedas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Monedas_VersionUpdate
+AFTER UPDATE ON Monedas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Monedas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Monedas_VersionDelete
+AFTER DELETE ON Monedas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Monedas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Paises_VersionInsert
+AFTER INSERT ON Paises
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Paises';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Paises_VersionUpdate
+AFTER UPDATE ON Paises
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Paises';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Paises_VersionDelete
+AFTER DELETE ON Paises
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Paises';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Estados_VersionInsert
+AFTER INSERT ON Estados
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Estados';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Estados_VersionUpdate
+AFTER UPDATE ON Estados
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Estados';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Estados_VersionDelete
+AFTER DELETE ON Estados
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Estados';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Ciudades_VersionInsert
+AFTER INSERT ON Ciudades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Ciudades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Ciudades_VersionUpdate
+AFTER UPDATE ON Ciudades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Ciudades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Ciudades_VersionDelete
+AFTER DELETE ON Ciudades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Ciudades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionInsert
+AFTER INSERT ON Usuarios
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionUpdate
+AFTER UPDATE OF Nombre, ApellidoPaterno, Activo ON Usuarios
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionDelete
+AFTER DELETE ON Usuarios
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionInsert
+AFTER INSERT ON EtapasVenta
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionUpdate
+AFTER UPDATE ON EtapasVenta
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionDelete
+AFTER DELETE ON EtapasVenta
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_MotivosPerdida_VersionInsert
+AFTER INSERT ON MotivosPerdida
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'MotivosPerdida';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_MotivosPerdida_VersionUpdate
+AFTER UPDATE ON MotivosPerdida
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'MotivosPerdida';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_MotivosPerdida_VersionDelete
+AFTER DELETE ON MotivosPerdida
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'MotivosPerdida';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionInsert
+AFTER INSERT ON TiposActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionUpdate
+AFTER UPDATE ON TiposActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionDelete
+AFTER DELETE ON TiposActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EstadosActividad_VersionInsert
+AFTER INSERT ON EstadosActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EstadosActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EstadosActividad_VersionUpdate
+AFTER UPDATE ON EstadosActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EstadosActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EstadosActividad_VersionDelete
+AFTER DELETE ON EstadosActividad
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'EstadosActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Etiquetas_VersionInsert
+AFTER INSERT ON Etiquetas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Etiquetas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Etiquetas_VersionUpdate
+AFTER UPDATE ON Etiquetas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Etiquetas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Etiquetas_VersionDelete
+AFTER DELETE ON Etiquetas
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Etiquetas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Prioridades_VersionInsert
+AFTER INSERT ON Prioridades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Prioridades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Prioridades_VersionUpdate
+AFTER UPDATE ON Prioridades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Prioridades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Prioridades_VersionDelete
+AFTER DELETE ON Prioridades
+BEGIN
+    UPDATE VersionCatalogos SET Version = Version + 1 WHERE Tabla = 'Prioridades';
+END;
+
+-- ============================================================
+-- Resumen de KPIs del dashboard (vw_ResumenEjecutivo)
+-- ============================================================
+-- Contadores que mantienen los triggers de abajo en cada INSERT/UPDATE/
+-- DELETE, para que el dashboard lea una fila en lugar de recorrer
+-- Contactos, Empresas, Oportunidades, Actividades y Campanas completas.
+-- Las expresiones (X IS 1) valen 0 o 1 (nunca NULL), asi que cada trigger
+-- suma lo que aporta la fila nueva y resta lo que aportaba la anterior.
+-- Recalcular todo: python -m app.database.recalcular_kpis
+CREATE TABLE IF NOT EXISTS ResumenKPI (
+    ResumenID               INTEGER PRIMARY KEY CHECK (ResumenID = 1),
+    ContactosActivos        INTEGER NOT NULL DEFAULT 0,
+    EmpresasActivas         INTEGER NOT NULL DEFAULT 0,
+    OportunidadesAbiertas   INTEGER NOT NULL DEFAULT 0,
+    ValorPipeline           REAL NOT NULL DEFAULT 0,
+    OportunidadesGanadas    INTEGER NOT NULL DEFAULT 0,
+    OportunidadesCerradas   INTEGER NOT NULL DEFAULT 0,
+    ActividadesPendientes   INTEGER NOT NULL DEFAULT 0,
+    CampanasEnviadas        INTEGER NOT NULL DEFAULT 0
+);
+
+-- Revenue ganado por mes de cierre ('YYYY-MM'). El dashboard consulta la
+-- fila del mes en curso, asi que el cambio de mes no requiere reiniciar nada.
+CREATE TABLE IF NOT EXISTS RevenueMensual (
+    Mes             TEXT PRIMARY KEY,
+    Monto           REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO ResumenKPI
+SELECT 1,
+    (SELECT COUNT(*) FROM Contactos WHERE Activo = 1),
+    (SELECT COUNT(*) FROM Empresas WHERE Activo = 1),
+    (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NULL),
+    (SELECT IFNULL(SUM(MontoEstimado), 0) FROM Oportunidades WHERE EsGanada IS NULL),
+    (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada = 1),
+    (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NOT NULL),
+    (SELECT COUNT(*) FROM Actividades WHERE EstadoActividadID IN (1, 2)),
+    (SELECT COUNT(*) FROM Campanas WHERE Estado = 'Enviada');
+
+INSERT OR IGNORE INTO RevenueMensual (Mes, Monto)
+SELECT substr(FechaCierreReal, 1, 7), SUM(IFNULL(MontoEstimado, 0))
+FROM Oportunidades
+WHERE EsGanada = 1 AND FechaCierreReal IS NOT NULL
+GROUP BY substr(FechaCierreReal, 1, 7);
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIInsert
+AFTER INSERT ON Contactos
+BEGIN
+    UPDATE ResumenKPI SET ContactosActivos = ContactosActivos + (NEW.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIUpdate
+AFTER UPDATE OF Activo ON Contactos
+BEGIN
+    UPDATE ResumenKPI
+    SET ContactosActivos = ContactosActivos + (NEW.Activo IS 1) - (OLD.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_KPIDelete
+AFTER DELETE ON Contactos
+BEGIN
+    UPDATE ResumenKPI SET ContactosActivos = ContactosActivos - (OLD.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIInsert
+AFTER INSERT ON Empresas
+BEGIN
+    UPDATE ResumenKPI SET EmpresasActivas = EmpresasActivas + (NEW.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIUpdate
+AFTER UPDATE OF Activo ON Empresas
+BEGIN
+    UPDATE ResumenKPI
+    SET EmpresasActivas = EmpresasActivas + (NEW.Activo IS 1) - (OLD.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_KPIDelete
+AFTER DELETE ON Empresas
+BEGIN
+    UPDATE ResumenKPI SET EmpresasActivas = EmpresasActivas - (OLD.Activo IS 1)
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIInsert
+AFTER INSERT ON Oportunidades
+BEGIN
+    UPDATE ResumenKPI
+    SET OportunidadesAbiertas = OportunidadesAbiertas + (NEW.EsGanada IS NULL),
+        ValorPipeline = ValorPipeline + (NEW.EsGanada IS NULL) * IFNULL(NEW.MontoEstimado, 0),
+        OportunidadesGanadas = OportunidadesGanadas + (NEW.EsGanada IS 1),
+        OportunidadesCerradas = OportunidadesCerradas + (NEW.EsGanada IS NOT NULL)
+    WHERE ResumenID = 1;
+    INSERT INTO RevenueMensual (Mes, Monto)
+    SELECT substr(NEW.FechaCierreReal, 1, 7), IFNULL(NEW.MontoEstimado, 0)
+    WHERE NEW.EsGanada IS 1 AND NEW.FechaCierreReal IS NOT NULL
+    ON CONFLICT (Mes) DO UPDATE SET Monto = Monto + excluded.Monto;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIUpdate
+AFTER UPDATE OF EsGanada, MontoEstimado, FechaCierreReal ON Oportunidades
+BEGIN
+    UPDATE ResumenKPI
+    SET OportunidadesAbiertas = OportunidadesAbiertas
+            + (NEW.EsGanada IS NULL) - (OLD.EsGanada IS NULL),
+        ValorPipeline = ValorPipeline
+            + (NEW.EsGanada IS NULL) * IFNULL(NEW.MontoEstimado, 0)
+            - (OLD.EsGanada IS NULL) * IFNULL(OLD.MontoEstimado, 0),
+        OportunidadesGanadas = OportunidadesGanadas
+            + (NEW.EsGanada IS 1) - (OLD.EsGanada IS 1),
+        OportunidadesCerradas = OportunidadesCerradas
+            + (NEW.EsGanada IS NOT NULL) - (OLD.EsGanada IS NOT NULL)
+    WHERE ResumenID = 1;
+    UPDATE RevenueMensual SET Monto = Monto - IFNULL(OLD.MontoEstimado, 0)
+    WHERE OLD.EsGanada IS 1 AND Mes = substr(OLD.FechaCierreReal, 1, 7);
+    INSERT INTO RevenueMensual (Mes, Monto)
+    SELECT substr(NEW.FechaCierreReal, 1, 7), IFNULL(NEW.MontoEstimado, 0)
+    WHERE NEW.EsGanada IS 1 AND NEW.FechaCierreReal IS NOT NULL
+    ON CONFLICT (Mes) DO UPDATE SET Monto = Monto + excluded.Monto;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_KPIDelete
+AFTER DELETE ON Oportunidades
+BEGIN
+    UPDATE ResumenKPI
+    SET OportunidadesAbiertas = OportunidadesAbiertas - (OLD.EsGanada IS NULL),
+        ValorPipeline = ValorPipeline - (OLD.EsGanada IS NULL) * IFNULL(OLD.MontoEstimado, 0),
+        OportunidadesGanadas = OportunidadesGanadas - (OLD.EsGanada IS 1),
+        OportunidadesCerradas = OportunidadesCerradas - (OLD.EsGanada IS NOT NULL)
+    WHERE ResumenID = 1;
+    UPDATE RevenueMensual SET Monto = Monto - IFNULL(OLD.MontoEstimado, 0)
+    WHERE OLD.EsGanada IS 1 AND Mes = substr(OLD.FechaCierreReal, 1, 7);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIInsert
+AFTER INSERT ON Actividades
+BEGIN
+    UPDATE ResumenKPI
+    SET ActividadesPendientes = ActividadesPendientes + (NEW.EstadoActividadID IN (1, 2))
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIUpdate
+AFTER UPDATE OF EstadoActividadID ON Actividades
+BEGIN
+    UPDATE ResumenKPI
+    SET ActividadesPendientes = ActividadesPendientes
+        + (NEW.EstadoActividadID IN (1, 2)) - (OLD.EstadoActividadID IN (1, 2))
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_KPIDelete
+AFTER DELETE ON Actividades
+BEGIN
+    UPDATE ResumenKPI
+    SET ActividadesPendientes = ActividadesPendientes - (OLD.EstadoActividadID IN (1, 2))
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIInsert
+AFTER INSERT ON Campanas
+BEGIN
+    UPDATE ResumenKPI SET CampanasEnviadas = CampanasEnviadas + (NEW.Estado IS 'Enviada')
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIUpdate
+AFTER UPDATE OF Estado ON Campanas
+BEGIN
+    UPDATE ResumenKPI
+    SET CampanasEnviadas = CampanasEnviadas + (NEW.Estado IS 'Enviada') - (OLD.Estado IS 'Enviada')
+    WHERE ResumenID = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_KPIDelete
+AFTER DELETE ON Campanas
+BEGIN
+    UPDATE ResumenKPI SET CampanasEnviadas = CampanasEnviadas - (OLD.Estado IS 'Enviada')
+    WHERE ResumenID = 1;
+END;
+
+-- Vista: KPIs ejecutivos consolidados para el dashboard (una fila, O(1))
+CREATE VIEW IF NOT EXISTS vw_ResumenEjecutivo AS
+SELECT
+    r.ContactosActivos,
+    r.EmpresasActivas,
+    r.OportunidadesAbiertas,
+    r.ValorPipeline,
+    IFNULL(m.Monto, 0)                                                   AS RevenueEsteMes,
+    r.ActividadesPendientes,
+    r.CampanasEnviadas,
+    CASE
+        WHEN r.OportunidadesCerradas > 0
+        THEN ROUND(CAST(r.OportunidadesGanadas AS REAL) / r.OportunidadesCerradas * 100, 1)
+        ELSE 0
+    END AS TasaConversionGlobal
+FROM ResumenKPI r
+LEFT JOIN RevenueMensual m ON m.Mes = strftime('%Y-%m', 'now', 'localtime')
+WHERE r.ResumenID = 1;
+
+-- ============================================================
+-- Resumen de actividad por contacto (vw_ActividadRecienteContacto)
+-- ============================================================
+-- Una fila por contacto con el total de actividades y la fecha de la
+-- ultima, y una fila por (contacto, tipo de actividad) con su total. Los
+-- mantienen los triggers de abajo, asi el reporte "actividad" ya no agrupa
+-- todas las Actividades y los filtros por UltimaActividad recorren el
+-- indice idx_resumen_actividad_ultima por rango.
+-- Recalcular todo: python -m app.database.recalcular_kpis
+CREATE TABLE IF NOT EXISTS ResumenActividadContacto (
+    ContactoID          INTEGER PRIMARY KEY,
+    TotalActividades    INTEGER NOT NULL DEFAULT 0,
+    UltimaActividad     TEXT
+);
+
+CREATE TABLE IF NOT EXISTS ResumenActividadContactoTipo (
+    ContactoID          INTEGER NOT NULL,
+    TipoActividadID     INTEGER NOT NULL,
+    Total               INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (ContactoID, TipoActividadID)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_resumen_actividad_ultima ON ResumenActividadContacto(UltimaActividad);
+-- para recalcular la ultima actividad de un contacto al borrar o mover una
+CREATE INDEX IF NOT EXISTS idx_actividades_contacto_fecha ON Actividades(ContactoID, FechaCreacion);
+
+INSERT OR IGNORE INTO ResumenActividadContacto (ContactoID, TotalActividades, UltimaActividad)
+SELECT co.ContactoID, COUNT(a.ActividadID), MAX(a.FechaCreacion)
+FROM Contactos co
+    LEFT JOIN Actividades a ON a.ContactoID = co.ContactoID
+GROUP BY co.ContactoID;
+
+INSERT OR IGNORE INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+SELECT ContactoID, TipoActividadID, COUNT(*)
+FROM Actividades
+WHERE ContactoID IS NOT NULL
+GROUP BY ContactoID, TipoActividadID;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_ResumenActividadInsert
+AFTER INSERT ON Contactos
+BEGIN
+    INSERT OR IGNORE INTO ResumenActividadContacto (ContactoID) VALUES (NEW.ContactoID);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_ResumenActividadDelete
+AFTER DELETE ON Contactos
+BEGIN
+    DELETE FROM ResumenActividadContacto WHERE ContactoID = OLD.ContactoID;
+    DELETE FROM ResumenActividadContactoTipo WHERE ContactoID = OLD.ContactoID;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoInsert
+AFTER INSERT ON Actividades
+WHEN NEW.ContactoID IS NOT NULL
+BEGIN
+    UPDATE ResumenActividadContacto
+    SET TotalActividades = TotalActividades + 1,
+        UltimaActividad = CASE
+            WHEN UltimaActividad IS NULL OR NEW.FechaCreacion > UltimaActividad
+            THEN NEW.FechaCreacion ELSE UltimaActividad
+        END
+    WHERE ContactoID = NEW.ContactoID;
+    INSERT INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+    VALUES (NEW.ContactoID, NEW.TipoActividadID, 1)
+    ON CONFLICT (ContactoID, TipoActividadID) DO UPDATE SET Total = Total + 1;
+END;
+
+-- cambiar de contacto, de tipo o de fecha: se quita del resumen anterior y
+-- se suma al nuevo; la ultima actividad se relee del indice (contacto, fecha)
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoUpdate
+AFTER UPDATE OF ContactoID, TipoActividadID, FechaCreacion ON Actividades
+BEGIN
+    UPDATE ResumenActividadContacto SET TotalActividades = TotalActividades - 1
+    WHERE ContactoID = OLD.ContactoID;
+    UPDATE ResumenActividadContacto SET TotalActividades = TotalActividades + 1
+    WHERE ContactoID = NEW.ContactoID;
+    UPDATE ResumenActividadContacto
+    SET UltimaActividad = (
+        SELECT MAX(a.FechaCreacion) FROM Actividades a
+        WHERE a.ContactoID = ResumenActividadContacto.ContactoID
+    )
+    WHERE ContactoID IN (OLD.ContactoID, NEW.ContactoID);
+    UPDATE ResumenActividadContactoTipo SET Total = Total - 1
+    WHERE ContactoID = OLD.ContactoID AND TipoActividadID = OLD.TipoActividadID;
+    INSERT INTO ResumenActividadContactoTipo (ContactoID, TipoActividadID, Total)
+    SELECT NEW.ContactoID, NEW.TipoActividadID, 1
+    WHERE NEW.ContactoID IS NOT NULL
+    ON CONFLICT (ContactoID, TipoActividadID) DO UPDATE SET Total = Total + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_ResumenContactoDelete
+AFTER DELETE ON Actividades
+WHEN OLD.ContactoID IS NOT NULL
+BEGIN
+    UPDATE ResumenActividadContacto
+    SET TotalActividades = TotalActividades - 1,
+        UltimaActividad = (
+            SELECT MAX(FechaCreacion) FROM Actividades WHERE ContactoID = OLD.ContactoID
+        )
+    WHERE ContactoID = OLD.ContactoID;
+    UPDATE ResumenActividadContactoTipo SET Total = Total - 1
+    WHERE ContactoID = OLD.ContactoID AND TipoActividadID = OLD.TipoActividadID;
+END;
+
+-- Vista: Actividad reciente por contacto (lee los resumenes, sin GROUP BY).
+-- CROSS JOIN fija el orden: se parte del resumen para que un filtro por
+-- UltimaActividad use su indice y cada contacto se busque por su PK.
+CREATE VIEW IF NOT EXISTS vw_ActividadRecienteContacto AS
+SELECT
+    co.ContactoID,
+    (co.Nombre || ' ' || co.ApellidoPaterno) AS NombreContacto,
+    e.RazonSocial AS Empresa,
+    r.TotalActividades,
+    r.UltimaActividad,
+    CAST(julianday('now', 'localtime') - julianday(r.UltimaActividad) AS INTEGER) AS DiasSinContacto,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Llamada')), 0) AS TotalLlamadas,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Reunión')), 0) AS TotalReuniones,
+    IFNULL((SELECT t.Total FROM ResumenActividadContactoTipo t
+            WHERE t.ContactoID = r.ContactoID
+              AND t.TipoActividadID = (SELECT TipoActividadID FROM TiposActividad WHERE Nombre = 'Correo')), 0) AS TotalCorreos
+FROM ResumenActividadContacto r
+    CROSS JOIN Contactos co ON co.ContactoID = r.ContactoID
+    LEFT JOIN Empresas e ON co.EmpresaID = e.EmpresaID
+WHERE co.Activo = 1;
+
+-- ============================================================
+-- Versiones de tablas de datos (cache de resultados de reportes)
+-- ============================================================
+-- Igual que VersionCatalogos, para las tablas que leen los reportes.
+-- ReporteService compara estas versiones para saber si un resultado en
+-- cache sigue vigente (ver app/utils/cache_resultados.py).
+CREATE TABLE IF NOT EXISTS VersionTablas (
+    Tabla           TEXT PRIMARY KEY,
+    Version         INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+INSERT OR IGNORE INTO VersionTablas (Tabla) VALUES
+('Oportunidades'),
+('Contactos'),
+('Empresas'),
+('Actividades'),
+('Campanas'),
+('Usuarios'),
+('Roles'),
+('EtapasVenta'),
+('TiposActividad');
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_VersionTablaInsert
+AFTER INSERT ON Oportunidades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Oportunidades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_VersionTablaUpdate
+AFTER UPDATE ON Oportunidades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Oportunidades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Oportunidades_VersionTablaDelete
+AFTER DELETE ON Oportunidades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Oportunidades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_VersionTablaInsert
+AFTER INSERT ON Contactos
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Contactos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_VersionTablaUpdate
+AFTER UPDATE ON Contactos
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Contactos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Contactos_VersionTablaDelete
+AFTER DELETE ON Contactos
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Contactos';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_VersionTablaInsert
+AFTER INSERT ON Empresas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Empresas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_VersionTablaUpdate
+AFTER UPDATE ON Empresas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Empresas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Empresas_VersionTablaDelete
+AFTER DELETE ON Empresas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Empresas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_VersionTablaInsert
+AFTER INSERT ON Actividades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Actividades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_VersionTablaUpdate
+AFTER UPDATE ON Actividades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Actividades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Actividades_VersionTablaDelete
+AFTER DELETE ON Actividades
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Actividades';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_VersionTablaInsert
+AFTER INSERT ON Campanas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Campanas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_VersionTablaUpdate
+AFTER UPDATE ON Campanas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Campanas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Campanas_VersionTablaDelete
+AFTER DELETE ON Campanas
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Campanas';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionTablaInsert
+AFTER INSERT ON Usuarios
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionTablaUpdate
+AFTER UPDATE OF Nombre, ApellidoPaterno, RolID, Activo ON Usuarios
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Usuarios_VersionTablaDelete
+AFTER DELETE ON Usuarios
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Usuarios';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Roles_VersionTablaInsert
+AFTER INSERT ON Roles
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Roles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Roles_VersionTablaUpdate
+AFTER UPDATE ON Roles
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Roles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_Roles_VersionTablaDelete
+AFTER DELETE ON Roles
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'Roles';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionTablaInsert
+AFTER INSERT ON EtapasVenta
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionTablaUpdate
+AFTER UPDATE ON EtapasVenta
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_EtapasVenta_VersionTablaDelete
+AFTER DELETE ON EtapasVenta
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'EtapasVenta';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionTablaInsert
+AFTER INSERT ON TiposActividad
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionTablaUpdate
+AFTER UPDATE ON TiposActividad
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_TiposActividad_VersionTablaDelete
+AFTER DELETE ON TiposActividad
+BEGIN
+    UPDATE VersionTablas SET Version = Version + 1 WHERE Tabla = 'TiposActividad';
+END;
+
+
+-- ============================================================================
+-- Indices para filtros por rango de fechas y listados por entidad
+-- ============================================================================
+-- Los reportes filtran con rangos semiabiertos sobre la columna
+-- (Col >= date(?) AND Col < date(?, '+1 day')) en lugar de date(Col) BETWEEN,
+-- asi SQLite recorre solo el tramo del indice. tests/test_database/
+-- test_planes_consulta.py revisa el plan de cada reporte y listado.
+
+-- vw_PipelineVentas: abiertas (EsGanada IS NULL) creadas en el rango
+CREATE INDEX IF NOT EXISTS idx_oportunidades_abiertas_fecha ON Oportunidades(EsGanada, FechaCreacion);
+-- vw_AnalisisCampanas filtra y ordena por FechaEnvio; el listado de campanas por FechaCreacion
+CREATE INDEX IF NOT EXISTS idx_campanas_fecha_envio ON Campanas(FechaEnvio);
+CREATE INDEX IF NOT EXISTS idx_campanas_fecha ON Campanas(FechaCreacion);
+-- notas e historial de una entidad, del mas reciente al mas antiguo
+CREATE INDEX IF NOT EXISTS idx_notascontacto_contacto_fecha ON NotasContacto(ContactoID, FechaCreacion);
+CREATE INDEX IF NOT EXISTS idx_notasempresa_empresa_fecha ON NotasEmpresa(EmpresaID, FechaCreacion);
+CREATE INDEX IF NOT EXISTS idx_historial_etapas_oportunidad ON HistorialEtapas(OportunidadID, FechaCambio);
+
+
+-- ============================================================================
+-- Trabajos de envio de campanas
+-- ============================================================================
+-- Cada envio de campana es un trabajo que corre en segundo plano por lotes
+-- de destinatarios. UltimoDestinatarioID es el punto de control: se guarda
+-- al terminar cada lote junto con los contadores, asi un envio que se corta
+-- (cierre de la app, caida) sigue desde ahi en el siguiente arranque.
+-- Estados: Pendiente, En Curso, Pausado, Completado, Cancelado, Error.
+CREATE TABLE IF NOT EXISTS TrabajosEnvio (
+    TrabajoID            INTEGER PRIMARY KEY AUTOINCREMENT,
+    CampanaID            INTEGER NOT NULL,
+    Estado               TEXT NOT NULL DEFAULT 'Pendiente',
+    TotalDestinatarios   INTEGER NOT NULL DEFAULT 0,
+    Enviados             INTEGER NOT NULL DEFAULT 0,
+    Fallidos             INTEGER NOT NULL DEFAULT 0,
+    UltimoDestinatarioID INTEGER NOT NULL DEFAULT 0,
+    Error                TEXT,
+    CreadoPor            INTEGER,
+    FechaCreacion        TEXT DEFAULT (datetime('now', 'localtime')),
+    FechaInicio          TEXT,
+    FechaActualizacion   TEXT DEFAULT (datetime('now', 'localtime')),
+    FechaFin             TEXT,
+    FOREIGN KEY (CampanaID) REFERENCES Campanas(CampanaID),
+    FOREIGN KEY (CreadoPor) REFERENCES Usuarios(UsuarioID)
+);
+-- un solo trabajo vivo por campana
+CREATE UNIQUE INDEX IF NOT EXISTS idx_trabajos_envio_campana_vivo ON TrabajosEnvio(CampanaID)
+    WHERE Estado IN ('Pendiente', 'En Curso', 'Pausado');
+-- trabajos por reanudar al arrancar
+CREATE INDEX IF NOT EXISTS idx_trabajos_envio_estado ON TrabajosEnvio(Estado);
+-- lotes: pendientes de una campana en orden de DestinatarioID
+CREATE INDEX IF NOT EXISTS idx_campana_dest_estado ON CampanaDestinatarios(CampanaID, EstadoEnvio, DestinatarioID);
+
+
+-- ============================================================================
+-- Lista de supresion de correos
+-- ============================================================================
+-- Correos que nunca deben recibir campanas (desuscritos, rebotes, bajas
+-- pedidas a mano). La carga de destinatarios desde un segmento los omite.
+CREATE TABLE IF NOT EXISTS CorreosSuprimidos (
+    Email               TEXT PRIMARY KEY COLLATE NOCASE,
+    Motivo              TEXT,
+    FechaAlta           TEXT DEFAULT (datetime('now', 'localtime'))
+);
+-- quien se desuscribe de una campana queda suprimido para las siguientes
+CREATE TRIGGER IF NOT EXISTS trg_CampanaDestinatarios_Desuscripcion
+AFTER UPDATE OF SeDesuscribio ON CampanaDestinatarios
+WHEN NEW.SeDesuscribio = 1 AND TRIM(COALESCE(NEW.EmailDestino, '')) != ''
+BEGIN
+    INSERT OR IGNORE INTO CorreosSuprimidos (Email, Motivo)
+    VALUES (TRIM(NEW.EmailDestino), 'Desuscrito');
+END;
+-- desuscripciones registradas antes de existir la lista
+INSERT OR IGNORE INTO CorreosSuprimidos (Email, Motivo)
+SELECT TRIM(EmailDestino), 'Desuscrito' FROM CampanaDestinatarios
+WHERE SeDesuscribio = 1 AND TRIM(COALESCE(EmailDestino, '')) != '';
+-- carga desde segmento: correos que ya estan en la campana
+CREATE INDEX IF NOT EXISTS idx_campana_dest_email ON CampanaDestinatarios(CampanaID, EmailDestino COLLATE NOCASE);
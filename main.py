@@ -2,15 +2,33 @@ import sys
 import os
 import signal
 from typing import Optional
+
+# primero la traza de arranque: mide desde aqui (y, si esta activada la
+# captura, cada importacion que sigue)
+from app.utils.arranque import traza_arranque
+traza = traza_arranque()
+
+from PyQt5.QtCore import QTimer
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon, QPixmap, QPainter, QColor
 from PyQt5.QtSvg import QSvgRenderer
 
+from app.database.connection import close_pool
 from app.database.initializer import initialize_database, has_users
+from app.utils.catalog_cache import CatalogCache
+from app.utils.cola_envios import apagar_gestor_envios, obtener_gestor_envios
+from app.utils.ejecutor import apagar_ejecutor
+from app.utils.logger import AppLogger
 from app.views.setup_view import SetupView
 from app.controllers.login_controller import LoginController
 from app.controllers.main_controller import MainController
 
+traza.marcar("imports")
+
+# espera tras abrir la ventana principal antes de reanudar los envios de
+# campanas que quedaron a medias (para no competir con el primer pintado)
+_REANUDAR_ENVIOS_MS = 3000
+
 
 class CRMApp:
     """
@@ -41,12 +59,19 @@ class CRMApp:
         - signal.SIG_IGN: Ignora Ctrl+C desde consola para prevenir cierre abrupto.
           El usuario debe cerrar la app desde la ventana principal.
         """
-        self._app = QApplication(sys.argv)
-        self._app.setWindowIcon(self._load_icon())
+        with traza.fase("qapplication"):
+            self._app = QApplication(sys.argv)
+            self._app.setWindowIcon(self._load_icon())
         # no cerrar la app cuando se cierra el login (aun falta abrir el menu)
         self._app.setQuitOnLastWindowClosed(False)
         # ignorar Ctrl+C en consola para evitar cierre sin limpiar recursos
         signal.signal(signal.SIGINT, signal.SIG_IGN)
+        # al salir: primero detener las tareas en segundo plano (usan el pool)
+        # y despues cerrar los lectores del pool; los envios de campanas se
+        # interrumpen antes para que guarden su lote
+        self._app.aboutToQuit.connect(apagar_gestor_envios)
+        self._app.aboutToQuit.connect(apagar_ejecutor)
+        self._app.aboutToQuit.connect(close_pool)
         # referencias a las ventanas activas (None hasta que se necesiten)
         self._setup_view: Optional[SetupView] = None
         self._login_controller: Optional[LoginController] = None
@@ -73,10 +98,13 @@ class CRMApp:
         4. Bloquea en app.exec_() hasta que el usuario cierra la aplicacion
         """
         # crear tablas del schema SQL si la base de datos no existe aun
-        initialize_database()
+        with traza.fase("initialize_database"):
+            initialize_database()
 
         # decidir que pantalla mostrar segun si ya hay usuarios en el sistema
-        if not has_users():
+        with traza.fase("has_users"):
+            hay_usuarios = has_users()
+        if not hay_usuarios:
             # primer uso del sistema: crear administrador inicial
             self._show_setup()
         else:
@@ -108,10 +136,12 @@ class CRMApp:
         (bcrypt es intencionalmente lento como medida de seguridad).
         La senal 'login_successful' se emite con el objeto Usuario cuando el login es exitoso.
         """
-        self._login_controller = LoginController()
-        # conectar la senal de login exitoso a nuestra funcion de transicion
-        self._login_controller.login_successful.connect(self._on_login_success)
-        self._login_controller.show()
+        with traza.fase("login"):
+            self._login_controller = LoginController()
+            # conectar la senal de login exitoso a nuestra funcion de transicion
+            self._login_controller.login_successful.connect(self._on_login_success)
+            self._login_controller.show()
+        traza.marcar("login_mostrado")
 
     def _on_login_success(self, usuario):
         """
@@ -128,13 +158,25 @@ class CRMApp:
             usuario (Usuario): Objeto con los datos del usuario autenticado.
                 Viene del AuthService tras validar email y contrasenia.
         """
+        traza.marcar("login_exitoso")
         # cerrar la ventana de login antes de abrir el menu
         if self._login_controller:
             self._login_controller.close()
+        try:
+            # todos los catalogos de los formularios en una sola consulta;
+            # si falla, cada ComboBox los carga por su cuenta al abrirse
+            with traza.fase("catalogos"):
+                CatalogCache.precargar()
+        except Exception:
+            AppLogger.log_exception(AppLogger.get_logger(__name__), "No se pudieron precargar los catalogos")
         try:
             # crear y mostrar el menu principal con el usuario autenticado
-            self._main_controller = MainController(usuario)
-            self._main_controller.show()  # showMaximized() se llama internamente
+            with traza.fase("main_view"):
+                self._main_controller = MainController(usuario)
+                self._main_controller.show()  # showMaximized() se llama internamente
+            # el timer corre cuando el event loop ya proceso el show y el pintado
+            QTimer.singleShot(0, self._on_primer_pintado)
+            QTimer.singleShot(_REANUDAR_ENVIOS_MS, self._reanudar_envios)
         except Exception as e:
             # si falla al abrir el menu, avisar y volver al login
             QMessageBox.critical(
@@ -145,6 +187,29 @@ class CRMApp:
             self._show_login()
 
 
+    def _on_primer_pintado(self):
+        """
+        Cierra la traza de arranque y escribe logs/arranque.json.
+
+        Solo el primer login de la sesion cuenta como arranque.
+        """
+        if traza.marca("primer_pintado") is not None:
+            return
+        traza.marcar("primer_pintado")
+        traza.detener_imports()
+        traza.guardar()
+
+    def _reanudar_envios(self):
+        """
+        Retoma los envios de campanas que quedaron encolados o cortados
+        (cierre o caida de la app) desde su ultimo lote guardado.
+        """
+        try:
+            obtener_gestor_envios().reanudar_pendientes()
+        except Exception:
+            AppLogger.log_exception(AppLogger.get_logger(__name__), "No se pudieron reanudar los envios pendientes")
+
+
 if __name__ == "__main__":
     try:
         app = CRMApp()
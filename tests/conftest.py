@@ -0,0 +1,28 @@
+# fixtures compartidos: BD temporal en lugar de db/crm.db
+
+import pytest
+from unittest.mock import patch
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import get_connection, close_connection, close_pool
+
+
+@pytest.fixture
+def db_vacia(tmp_path):
+    # redirige la conexion del hilo y el pool a un archivo temporal sin tablas
+    close_connection()
+    close_pool()
+    with patch.object(connection, "DB_PATH", str(tmp_path / "crm.db")):
+        yield
+        close_pool()
+        close_connection()
+
+
+@pytest.fixture
+def db_temporal(db_vacia):
+    # BD temporal con el esquema completo (incluye datos semilla)
+    conn = get_connection()
+    with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+        conn.executescript(f.read())
+    conn.commit()
+    return conn
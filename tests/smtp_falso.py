@@ -0,0 +1,158 @@
+"""
+Servidor SMTP falso, en el mismo proceso, para pruebas y benchmarks de envio.
+
+Habla lo minimo de SMTP para que smtplib envie (EHLO/HELO, AUTH, MAIL, RCPT,
+DATA, RSET, NOOP, QUIT) y guarda cada mensaje recibido. No toca la red
+externa: escucha en 127.0.0.1 con un puerto libre.
+
+Uso:
+    with ServidorSmtpFalso(latencia=0.01) as servidor:
+        config.host, config.puerto = servidor.host, servidor.puerto
+        ...
+        assert servidor.recibidos == 10
+"""
+
+import socketserver
+import threading
+import time
+
+
+class _Manejador(socketserver.StreamRequestHandler):
+
+    def _responder(self, linea):
+        self.wfile.write(f"{linea}\r\n".encode("ascii"))
+
+    def _esperar(self):
+        if self.server.latencia:
+            time.sleep(self.server.latencia)
+
+    def handle(self):
+        servidor = self.server.falso
+        servidor._conexion_abierta()
+        self._responder("220 smtp-falso listo")
+        destinos = []
+        while True:
+            linea = self.rfile.readline()
+            if not linea:
+                return
+            comando = linea.decode("ascii", "replace").strip()
+            verbo = comando[:4].upper()
+
+            if verbo in ("EHLO", "HELO"):
+                self._responder("250-smtp-falso")
+                self._responder("250 AUTH PLAIN LOGIN")
+            elif verbo == "AUTH":
+                if servidor.rechazar_auth:
+                    self._responder("535 autenticacion rechazada")
+                else:
+                    self._responder("235 autenticado")
+            elif verbo == "MAIL":
+                destinos = []
+                self._esperar()
+                self._responder("250 ok")
+            elif verbo == "RCPT":
+                self._esperar()
+                destino = comando.split(":", 1)[1].strip().strip("<>")
+                if destino in servidor.rechazados:
+                    self._responder("550 buzon inexistente")
+                else:
+                    destinos.append(destino)
+                    self._responder("250 ok")
+            elif verbo == "DATA":
+                self._responder("354 terminar con .")
+                partes = []
+                while True:
+                    linea = self.rfile.readline()
+                    if not linea or linea in (b".\r\n", b".\n"):
+                        break
+                    partes.append(linea)
+                self._esperar()
+                if not servidor._registrar(destinos, b"".join(partes)):
+                    # simula una caida: se corta sin responder
+                    return
+                self._responder("250 aceptado")
+            elif verbo == "RSET":
+                destinos = []
+                self._responder("250 ok")
+            elif verbo == "NOOP":
+                self._responder("250 ok")
+            elif verbo == "QUIT":
+                self._responder("221 adios")
+                return
+            else:
+                self._responder("502 no implementado")
+
+
+class _Servidor(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+class ServidorSmtpFalso:
+    """
+    Args:
+        latencia:       segundos que tarda en responder MAIL, RCPT y DATA
+                        (simula la ida y vuelta a un servidor real).
+        rechazados:     destinos a los que responde 550 en RCPT.
+        cortar_cada:    corta la conexion al recibir el mensaje numero N de
+                        cada conexion, sin aceptarlo (None = nunca).
+        rechazar_auth:  responde 535 a AUTH.
+    """
+
+    def __init__(self, latencia=0.0, rechazados=(), cortar_cada=None, rechazar_auth=False):
+        self.rechazados = set(rechazados)
+        self.cortar_cada = cortar_cada
+        self.rechazar_auth = rechazar_auth
+        self.mensajes = []          # [(destinos, datos)]
+        self.conexiones = 0
+        self._por_hilo = threading.local()
+        self._lock = threading.Lock()
+        self._servidor = _Servidor(("127.0.0.1", 0), _Manejador)
+        self._servidor.latencia = latencia
+        self._servidor.falso = self
+        self._hilo = None
+
+    @property
+    def host(self):
+        return self._servidor.server_address[0]
+
+    @property
+    def puerto(self):
+        return self._servidor.server_address[1]
+
+    @property
+    def recibidos(self):
+        with self._lock:
+            return len(self.mensajes)
+
+    def destinos(self):
+        with self._lock:
+            return [d for destinos, _ in self.mensajes for d in destinos]
+
+    def _conexion_abierta(self):
+        self._por_hilo.recibidos = 0
+        with self._lock:
+            self.conexiones += 1
+
+    def _registrar(self, destinos, datos):
+        self._por_hilo.recibidos += 1
+        if self.cortar_cada and self._por_hilo.recibidos >= self.cortar_cada:
+            return False
+        with self._lock:
+            self.mensajes.append((list(destinos), datos))
+        return True
+
+    def iniciar(self):
+        self._hilo = threading.Thread(target=self._servidor.serve_forever, daemon=True)
+        self._hilo.start()
+        return self
+
+    def detener(self):
+        self._servidor.shutdown()
+        self._servidor.server_close()
+
+    def __enter__(self):
+        return self.iniciar()
+
+    def __exit__(self, *exc):
+        self.detener()
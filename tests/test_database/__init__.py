@@ -0,0 +1 @@
+# tests de base de datos
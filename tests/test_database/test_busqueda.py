@@ -0,0 +1,141 @@
+# tests del indice de busqueda FTS5 (triggers, migracion y BusquedaService)
+
+import pytest
+from app.database.initializer import apply_migrations
+from app.repositories.busqueda_repository import BusquedaRepository
+from app.services.busqueda_service import (
+    BusquedaService, construir_consulta_fts, generar_fragmento,
+)
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestBusqueda:
+
+    @staticmethod
+    def _crear_contacto(conn, nombre, apellido, email=None):
+        cursor = conn.execute(
+            "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email) VALUES (?, ?, ?)",
+            (nombre, apellido, email),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+    @staticmethod
+    def _ids(resultados, tipo):
+        return [r["entidad_id"] for r in resultados if r["tipo"] == tipo]
+
+    def test_consulta_fts_escapa_sintaxis(self):
+        # las palabras se citan y los operadores de FTS5 se descartan
+        assert construir_consulta_fts('ana "OR" g*') == '"ana" "OR" "g"'
+        assert construir_consulta_fts("  ;; ") == ""
+
+    def test_solo_la_ultima_palabra_es_prefijo(self):
+        # un prefijo sin indice propio junta todos los terminos que empiezan igual
+        assert construir_consulta_fts("jose gonz") == '"jose" "gonz"*'
+        assert construir_consulta_fts("gonzalez j") == '"gonzalez" "j"'
+
+    def test_fragmento_marca_coincidencias(self):
+        # el fragmento respeta el texto original y marca prefijos sin acentos
+        texto = "Se acordo una reunión con Núñez para revisar la renovación del contrato"
+        fragmento = generar_fragmento(texto, ["nunez", "renov"], ancho=40)
+        assert "[Núñez]" in fragmento and "[renovación]" in fragmento
+        assert fragmento.startswith("...")
+        assert generar_fragmento(texto, ["inexistente"]) == ""
+
+    def test_prefijo_sin_acentos(self, db_temporal):
+        # "jose gonz" encuentra "José González" recien insertado (trigger)
+        cid = self._crear_contacto(db_temporal, "José", "Zúñiga-González")
+        resultados, error = BusquedaService().buscar("jose gonz")
+        assert error is None
+        assert cid in self._ids(resultados, "contacto")
+
+    def test_update_y_delete_sincronizan(self, db_temporal):
+        cid = self._crear_contacto(db_temporal, "Xiomara", "Quintanilla")
+        db_temporal.execute("UPDATE Contactos SET Nombre = 'Yolotl' WHERE ContactoID = ?", (cid,))
+        db_temporal.commit()
+        servicio = BusquedaService()
+        assert self._ids(servicio.buscar("xiomara")[0], "contacto") == []
+        assert self._ids(servicio.buscar("yolotl")[0], "contacto") == [cid]
+
+        db_temporal.execute("DELETE FROM Contactos WHERE ContactoID = ?", (cid,))
+        db_temporal.commit()
+        assert self._ids(servicio.buscar("yolotl")[0], "contacto") == []
+
+    def test_resultados_mixtos_ordenados(self, db_temporal):
+        # un acierto en el nombre gana a uno en el cuerpo de una nota
+        cid = self._crear_contacto(db_temporal, "Zacarias", "Prueba")
+        db_temporal.execute(
+            "INSERT INTO NotasContacto (ContactoID, Contenido, CreadoPor) VALUES (?, ?, 1)",
+            (cid, "Llamar de nuevo a zacarias la proxima semana por la propuesta"),
+        )
+        db_temporal.commit()
+        resultados, _ = BusquedaService().buscar("zacarias")
+        assert [r["tipo"] for r in resultados] == ["contacto", "nota_contacto"]
+        assert resultados[1]["padre_id"] == cid
+        assert "[zacarias]" in resultados[1]["fragmento"]
+
+    def test_ranking_sobre_todas_las_coincidencias(self, db_temporal):
+        # un contacto viejo con el termino en el nombre gana aunque miles de
+        # notas mas recientes tambien coincidan
+        cid = self._crear_contacto(db_temporal, "Teodosio", "Prueba")
+        db_temporal.executemany(
+            "INSERT INTO NotasContacto (ContactoID, Contenido, CreadoPor) VALUES (?, ?, 1)",
+            [(cid, f"seguimiento {i} con teodosio sobre la propuesta") for i in range(6000)],
+        )
+        db_temporal.commit()
+        resultados, error = BusquedaService().buscar("teodosio")
+        assert error is None
+        assert (resultados[0]["tipo"], resultados[0]["entidad_id"]) == ("contacto", cid)
+
+    def test_notas_privadas(self, db_temporal):
+        # una nota privada solo la encuentra su autor
+        cid = self._crear_contacto(db_temporal, "Wenceslao", "Prueba")
+        db_temporal.execute(
+            "INSERT INTO NotasContacto (ContactoID, Contenido, EsPrivada, CreadoPor) VALUES (?, ?, 1, 1)",
+            (cid, "confidencial quetzalcoatl"),
+        )
+        db_temporal.commit()
+        servicio = BusquedaService()
+        assert servicio.buscar("quetzalcoatl", usuario_id=2)[0] == []
+        assert len(servicio.buscar("quetzalcoatl", usuario_id=1)[0]) == 1
+
+    def test_filtro_por_tipo(self, db_temporal):
+        resultados, error = BusquedaService().buscar("a", tipos=["invalido"])
+        assert resultados is None and "no permitido" in error
+
+    def test_migracion_llena_indice_existente(self, db_temporal):
+        # una BD anterior (sin FTS) queda indexada al aplicar migraciones
+        total = db_temporal.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0]
+        assert total > 0
+        db_temporal.execute("DROP TABLE BusquedaGlobal")
+        db_temporal.commit()
+        apply_migrations(db_temporal)
+        assert db_temporal.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0] == total
+
+    def test_migracion_interrumpida_se_repite(self, db_temporal, monkeypatch):
+        # si el llenado falla, la tabla nueva no queda creada y vacia: el
+        # siguiente arranque la vuelve a crear y llenar
+        total = db_temporal.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0]
+        db_temporal.execute("DROP TABLE BusquedaGlobal")
+        db_temporal.commit()
+
+        def cierre_inesperado(self, conn=None):
+            raise RuntimeError("cierre inesperado")
+
+        with monkeypatch.context() as m:
+            m.setattr(BusquedaRepository, "reconstruir", cierre_inesperado)
+            with pytest.raises(RuntimeError):
+                apply_migrations(db_temporal)
+        assert db_temporal.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'BusquedaGlobal'"
+        ).fetchone() is None
+
+        apply_migrations(db_temporal)
+        assert db_temporal.execute("SELECT COUNT(*) FROM BusquedaGlobal").fetchone()[0] == total
+
+    def test_reconstruir(self, db_temporal):
+        db_temporal.execute("DELETE FROM BusquedaGlobal")
+        db_temporal.commit()
+        total, error = BusquedaService().reconstruir_indice()
+        assert error is None
+        assert total == BusquedaRepository().count() > 0
@@ -0,0 +1,102 @@
+# tests unitarios para el pool de conexiones de solo lectura
+
+import sqlite3
+import threading
+import pytest
+from app.database.connection import ConnectionPool, PoolTimeoutError
+
+
+class TestConnectionPool:
+    # tests del pool de conexiones
+
+    @pytest.fixture
+    def pool(self, tmp_path):
+        # pool sobre una BD temporal con una tabla de prueba
+        db_path = str(tmp_path / "pool.db")
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE Items (ItemID INTEGER PRIMARY KEY, Nombre TEXT)")
+        conn.commit()
+        conn.close()
+        pool = ConnectionPool(db_path, size=2, checkout_timeout=0.2)
+        yield pool
+        pool.close()
+
+    def test_lector_es_solo_lectura(self, pool):
+        # los lectores tienen query_only activo
+        with pool.reader() as conn:
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+            assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+            with pytest.raises(sqlite3.OperationalError):
+                conn.execute("INSERT INTO Items (Nombre) VALUES ('x')")
+
+    def test_lector_ve_escrituras_confirmadas(self, pool, tmp_path):
+        # lo que confirma otra conexion es visible para los lectores
+        conn = sqlite3.connect(str(tmp_path / "pool.db"))
+        conn.execute("INSERT INTO Items (Nombre) VALUES ('Uno')")
+        conn.commit()
+        conn.close()
+        with pool.reader() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM Items").fetchone()[0] == 1
+
+    def test_lectores_se_reutilizan(self, pool):
+        # devolver un lector permite reutilizarlo sin abrir otro
+        with pool.reader() as c1:
+            pass
+        with pool.reader() as c2:
+            assert c1 is c2
+        assert pool.metrics()["lectores_creados"] == 1
+
+    def test_timeout_con_pool_agotado(self, pool):
+        # sin lectores libres se lanza PoolTimeoutError (tratado como "busy")
+        c1 = pool.acquire_reader()
+        c2 = pool.acquire_reader()
+        with pytest.raises(PoolTimeoutError) as exc:
+            pool.acquire_reader()
+        assert "busy" in str(exc.value)
+        assert pool.metrics()["timeouts"] == 1
+        pool.release_reader(c1)
+        pool.release_reader(c2)
+
+    def test_espera_hasta_que_se_libera_lector(self, pool):
+        # un hilo en espera recibe el lector que devuelve otro hilo
+        c1 = pool.acquire_reader()
+        c2 = pool.acquire_reader()
+        resultado = {}
+
+        def esperar():
+            conn = pool.acquire_reader()
+            resultado["conn"] = conn
+            pool.release_reader(conn)
+
+        hilo = threading.Thread(target=esperar)
+        hilo.start()
+        pool.release_reader(c1)
+        hilo.join(timeout=1)
+        pool.release_reader(c2)
+        assert resultado["conn"] in (c1, c2)
+        assert pool.metrics()["esperas_lector"] == 1
+
+    def test_health_check_reemplaza_conexion_rota(self, pool):
+        # una conexion cerrada se detecta y reemplaza
+        with pool.reader() as conn:
+            pass
+        conn.close()
+        resultado = pool.health_check()
+        assert resultado["lectores_reemplazados"] == 1
+        with pool.reader() as nueva:
+            assert nueva is not conn
+            assert nueva.execute("SELECT 1").fetchone()[0] == 1
+
+    def test_metricas(self, pool):
+        # las metricas reflejan checkouts y estado actual
+        with pool.reader():
+            assert pool.metrics()["lectores_en_uso"] == 1
+        datos = pool.metrics()
+        assert datos["checkouts_lector"] == 1
+        assert datos["lectores_libres"] == 1
+
+    def test_pool_cerrado(self, pool):
+        # despues de cerrar no se entregan conexiones
+        pool.close()
+        with pytest.raises(sqlite3.ProgrammingError):
+            pool.acquire_reader()
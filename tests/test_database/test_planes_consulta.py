@@ -0,0 +1,210 @@
+# tests de regresion de planes de consulta: cada reporte y listado se ejecuta
+# sobre una BD sembrada, se capturan sus SELECT y ninguno puede recorrer
+# completa (SCAN sin indice) una tabla que crece con el uso
+
+import re
+import pytest
+from unittest.mock import patch
+from app.config.settings import SCHEMA_PATH
+from app.database import connection
+from app.database.connection import ConnectionPool, get_connection, close_connection, close_pool
+from app.repositories.actividad_repository import ActividadRepository
+from app.repositories.auditoria_repository import AuditoriaRepository
+from app.repositories.campana_repository import CampanaRepository
+from app.repositories.contacto_repository import ContactoRepository
+from app.repositories.cotizacion_repository import CotizacionRepository
+from app.repositories.dashboard_repository import DashboardRepository
+from app.repositories.empresa_repository import EmpresaRepository
+from app.repositories.historial_etapas_repository import HistorialEtapasRepository
+from app.repositories.nota_contacto_repository import NotaContactoRepository
+from app.repositories.nota_empresa_repository import NotaEmpresaRepository
+from app.repositories.notificacion_repository import NotificacionRepository
+from app.repositories.oportunidad_repository import OportunidadRepository
+from app.repositories.recordatorio_repository import RecordatorioRepository
+from app.repositories.reporte_repository import ReporteRepository
+
+# tablas cuyo tamano crece con el uso; catalogos, usuarios y configuracion
+# pueden recorrerse completos sin problema
+_TABLAS_CALIENTES = {
+    "Contactos", "Empresas", "Oportunidades", "Actividades", "Cotizaciones",
+    "Campanas", "CampanaDestinatarios", "NotasContacto", "NotasEmpresa",
+    "Notificaciones", "Recordatorios", "LogAuditoria", "HistorialEtapas",
+}
+
+_ALIAS = re.compile(r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_PALABRAS_SQL = {"ON", "WHERE", "LEFT", "INNER", "CROSS", "JOIN", "GROUP", "ORDER", "LIMIT", "USING"}
+
+_DESDE, _HASTA = "2026-01-01", "2026-03-31"
+
+
+def _sembrar(conn):
+    # volumen suficiente para recorrer varias paginas en cada listado
+    conn.executemany(
+        "INSERT INTO Empresas (RazonSocial, FechaCreacion) VALUES (?, ?)",
+        ((f"Empresa {i}", f"2026-{i % 12 + 1:02d}-10 09:00:00") for i in range(300)),
+    )
+    conn.executemany(
+        "INSERT INTO Contactos (Nombre, ApellidoPaterno, EmpresaID, FechaCreacion) VALUES (?, ?, ?, ?)",
+        ((f"Nombre {i}", f"Apellido {i}", i % 300 + 1, f"2026-{i % 12 + 1:02d}-11 09:00:00") for i in range(600)),
+    )
+    conn.executemany(
+        "INSERT INTO Oportunidades (Nombre, EmpresaID, ContactoID, EtapaID, MontoEstimado,"
+        " ProbabilidadCierre, PropietarioID, FechaCreacion) VALUES (?, ?, ?, 1, 1000, 50, 1, ?)",
+        ((f"Oportunidad {i}", i % 300 + 1, i % 600 + 1, f"2026-{i % 12 + 1:02d}-12 09:00:00") for i in range(600)),
+    )
+    conn.executemany(
+        "INSERT INTO Actividades (TipoActividadID, EstadoActividadID, Asunto, ContactoID, PropietarioID, FechaCreacion)"
+        " VALUES (1, 1, ?, ?, 1, ?)",
+        ((f"Llamada {i}", i % 600 + 1, f"2026-{i % 12 + 1:02d}-13 09:00:00") for i in range(1200)),
+    )
+    conn.executemany(
+        "INSERT INTO Campanas (Nombre, Tipo, Estado, PropietarioID, FechaEnvio) VALUES (?, 'Email', 'Enviada', 1, ?)",
+        ((f"Campana {i}", f"2026-{i % 12 + 1:02d}-14 09:00:00") for i in range(60)),
+    )
+    conn.commit()
+
+
+@pytest.fixture(scope="module")
+def db_sembrada(tmp_path_factory):
+    close_connection()
+    close_pool()
+    ruta = str(tmp_path_factory.mktemp("planes") / "planes.db")
+    with patch.object(connection, "DB_PATH", ruta):
+        conn = get_connection()
+        with open(SCHEMA_PATH, "r", encoding="utf-8") as f:
+            conn.executescript(f.read())
+        _sembrar(conn)
+        yield conn
+        close_pool()
+        close_connection()
+
+
+@pytest.fixture
+def sentencias(db_sembrada):
+    # captura (con parametros ya sustituidos) todo lo que ejecutan la conexion
+    # principal y los lectores del pool
+    capturadas = []
+    abrir_original = ConnectionPool._open_reader
+
+    def abrir_con_traza(pool):
+        lector = abrir_original(pool)
+        lector.set_trace_callback(capturadas.append)
+        return lector
+
+    close_pool()
+    db_sembrada.set_trace_callback(capturadas.append)
+    with patch.object(ConnectionPool, "_open_reader", abrir_con_traza):
+        yield capturadas
+    db_sembrada.set_trace_callback(None)
+    close_pool()
+
+
+def _tablas_por_alias(conn, sql):
+    # alias -> tablas posibles, incluyendo los alias usados dentro de las vistas
+    textos = [sql] + [fila[0] for fila in conn.execute("SELECT sql FROM sqlite_master WHERE type = 'view'")]
+    alias = {}
+    for texto in textos:
+        for tabla, nombre in _ALIAS.findall(texto):
+            alias.setdefault(tabla, set()).add(tabla)
+            if nombre and nombre.upper() not in _PALABRAS_SQL:
+                alias.setdefault(nombre, set()).add(tabla)
+    return alias
+
+
+def _recorridos_completos(conn, sql):
+    """Lineas del plan que recorren completa una tabla caliente, sin indice."""
+    alias = _tablas_por_alias(conn, sql)
+    malas = []
+    for fila in conn.execute(f"EXPLAIN QUERY PLAN {sql}"):
+        detalle = fila[3]
+        encontrado = re.fullmatch(r"SCAN (\w+)", detalle)
+        if encontrado and alias.get(encontrado.group(1), set()) & _TABLAS_CALIENTES:
+            malas.append(detalle)
+    return malas
+
+
+def _segunda_pagina(repo, **kwargs):
+    return repo.find_page(limit=20, token=repo.find_page(limit=20, **kwargs).siguiente, **kwargs)
+
+
+_REPORTES = {
+    f"{clave}-{'fechas' if fechas else 'todo'}": (
+        lambda clave=clave, fechas=fechas: list(
+            ReporteRepository().iterar(clave, *((_DESDE, _HASTA) if fechas else ()))
+        )
+    )
+    for clave in ReporteRepository._CONSULTAS
+    for fechas in (False, True)
+}
+
+_LISTADOS = {
+    "empresas": lambda: _segunda_pagina(EmpresaRepository()),
+    "empresas-nombre": lambda: _segunda_pagina(EmpresaRepository(), orden="razon_social"),
+    "empresas-filtro": lambda: _segunda_pagina(EmpresaRepository(), filtros={"activo": 1}),
+    "contactos": lambda: _segunda_pagina(ContactoRepository()),
+    "contactos-empresa": lambda: _segunda_pagina(ContactoRepository(), filtros={"empresa_id": 1}),
+    "contactos-resumen": lambda: ContactoRepository().count_resumen(),
+    "oportunidades": lambda: _segunda_pagina(OportunidadRepository()),
+    "oportunidades-etapa": lambda: _segunda_pagina(OportunidadRepository(), filtros={"etapa_id": 1}),
+    "actividades": lambda: _segunda_pagina(ActividadRepository()),
+    "actividades-contacto": lambda: _segunda_pagina(ActividadRepository(), filtros={"contacto_id": 1}),
+    "cotizaciones": lambda: _segunda_pagina(CotizacionRepository()),
+    "campanas": lambda: CampanaRepository().find_all(),
+    "notas-contacto": lambda: NotaContactoRepository().find_by_contacto(1),
+    "notas-empresa": lambda: NotaEmpresaRepository().find_by_empresa(1),
+    "historial-etapas": lambda: HistorialEtapasRepository().find_by_oportunidad(1),
+    "notificaciones": lambda: NotificacionRepository().find_by_usuario(1),
+    "notificaciones-no-leidas": lambda: NotificacionRepository().count_unread(1),
+    "recordatorios": lambda: RecordatorioRepository().find_pending(1),
+    "recordatorios-vencidos": lambda: RecordatorioRepository().find_due(1),
+    "auditoria": lambda: AuditoriaRepository().obtener_logs(),
+    "dashboard-kpis": lambda: DashboardRepository().get_kpis(),
+    "dashboard-actividades": lambda: DashboardRepository().get_actividades_recientes(),
+    "dashboard-pipeline": lambda: DashboardRepository().get_pipeline_por_etapa(),
+    "dashboard-oportunidades": lambda: DashboardRepository().get_oportunidades_estado(),
+    "dashboard-recordatorios": lambda: DashboardRepository().get_recordatorios_proximos(1),
+}
+
+
+@pytest.mark.parametrize("consulta", list(_REPORTES) + list(_LISTADOS))
+def test_sin_recorridos_completos(consulta, db_sembrada, sentencias):
+    (_REPORTES.get(consulta) or _LISTADOS[consulta])()
+
+    selects = [s for s in sentencias if re.match(r"\s*(SELECT|WITH)\b", s, re.IGNORECASE)]
+    assert selects, f"{consulta}: no se capturo ninguna consulta"
+    for sql in selects:
+        assert _recorridos_completos(db_sembrada, sql) == [], sql
+
+
+def test_detector_reconoce_un_recorrido_completo(db_sembrada):
+    # control del propio test: un filtro con date() sobre la columna no usa indice
+    sql = "SELECT * FROM Contactos WHERE date(FechaCreacion) >= '2026-01-01'"
+    assert _recorridos_completos(db_sembrada, sql) == ["SCAN Contactos"]
+
+
+def test_filtro_de_fechas_equivale_al_anterior(db_sembrada):
+    # el rango semiabierto devuelve lo mismo que date(col) BETWEEN ...
+    repo = ReporteRepository()
+    casos = [
+        ("pipeline", "vw_PipelineVentas", "FechaCreacion", ""),
+        ("campanas", "vw_AnalisisCampanas", "FechaEnvio", "FechaEnvio IS NULL OR "),
+    ]
+    for clave, vista, columna, extra in casos:
+        nuevo = list(repo.iterar(clave, _DESDE, _HASTA))
+        anterior = db_sembrada.execute(
+            f"SELECT * FROM {vista} WHERE {extra}date({columna}) BETWEEN date(?) AND date(?)",
+            (_DESDE, _HASTA),
+        ).fetchall()
+        assert 0 < len(nuevo) == len(anterior)
+
+
+@pytest.mark.parametrize("clave, columna", [
+    ("pipeline", "FechaCreacion"),
+    ("campanas", "FechaEnvio"),
+    ("actividad", "UltimaActividad"),
+])
+def test_filtro_de_fechas_busca_el_rango_en_el_indice(clave, columna, db_sembrada):
+    repo = ReporteRepository()
+    query, params = getattr(repo, ReporteRepository._CONSULTAS[clave])(_DESDE, _HASTA)
+    plan = " | ".join(fila[3] for fila in db_sembrada.execute(f"EXPLAIN QUERY PLAN {query}", params))
+    assert f"{columna}>? AND {columna}<?" in plan
@@ -0,0 +1,135 @@
+# tests del resumen de actividad por contacto (triggers, plan de consulta y migracion)
+
+import pytest
+from app.database.initializer import apply_migrations
+from app.repositories.reporte_repository import ReporteRepository
+
+# definicion anterior de vw_ActividadRecienteContacto: agrupa todas las Actividades
+_ACTIVIDAD_DIRECTA = """
+SELECT
+    co.ContactoID,
+    (co.Nombre || ' ' || co.ApellidoPaterno) AS NombreContacto,
+    e.RazonSocial AS Empresa,
+    COUNT(a.ActividadID) AS TotalActividades,
+    MAX(a.FechaCreacion) AS UltimaActividad,
+    CAST(julianday('now', 'localtime') - julianday(MAX(a.FechaCreacion)) AS INTEGER) AS DiasSinContacto,
+    SUM(CASE WHEN ta.Nombre = 'Llamada' THEN 1 ELSE 0 END) AS TotalLlamadas,
+    SUM(CASE WHEN ta.Nombre = 'Reunión' THEN 1 ELSE 0 END) AS TotalReuniones,
+    SUM(CASE WHEN ta.Nombre = 'Correo' THEN 1 ELSE 0 END) AS TotalCorreos
+FROM Contactos co
+    LEFT JOIN Empresas e ON co.EmpresaID = e.EmpresaID
+    LEFT JOIN Actividades a ON co.ContactoID = a.ContactoID
+    LEFT JOIN TiposActividad ta ON a.TipoActividadID = ta.TipoActividadID
+WHERE co.Activo = 1
+GROUP BY co.ContactoID, co.Nombre, co.ApellidoPaterno, e.RazonSocial
+"""
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestResumenActividad:
+
+    def _comparar(self, conn):
+        esperado = sorted(map(tuple, conn.execute(_ACTIVIDAD_DIRECTA)))
+        assert sorted(map(tuple, conn.execute("SELECT * FROM vw_ActividadRecienteContacto"))) == esperado
+
+    @staticmethod
+    def _crear_actividad(conn, contacto_id, tipo_id, fecha):
+        return conn.execute(
+            "INSERT INTO Actividades (TipoActividadID, Asunto, ContactoID, PropietarioID, "
+            "EstadoActividadID, FechaCreacion) VALUES (?, 'Prueba', ?, 1, 1, ?)",
+            (tipo_id, contacto_id, fecha),
+        ).lastrowid
+
+    def test_semilla_coincide_con_consulta_completa(self, db_temporal):
+        self._comparar(db_temporal)
+
+    def test_triggers_mantienen_resumen(self, db_temporal):
+        conn = db_temporal
+        nuevo = conn.execute(
+            "INSERT INTO Contactos (Nombre, ApellidoPaterno) VALUES ('Sin', 'Actividad')"
+        ).lastrowid
+        a1 = self._crear_actividad(conn, 1, 1, "2026-03-01 09:00:00")
+        a2 = self._crear_actividad(conn, 1, 2, "2026-03-05 09:00:00")
+        self._crear_actividad(conn, nuevo, 3, "2026-02-01")
+        self._crear_actividad(conn, None, 1, "2026-03-09")
+        conn.commit()
+        self._comparar(conn)
+
+        # borrar la mas reciente: la ultima actividad se relee
+        conn.execute("DELETE FROM Actividades WHERE ActividadID = ?", (a2,))
+        # mover de contacto, cambiar tipo y fecha
+        conn.execute("UPDATE Actividades SET ContactoID = ?, TipoActividadID = 3 WHERE ActividadID = ?", (nuevo, a1))
+        conn.execute("UPDATE Actividades SET FechaCreacion = '2024-01-01' WHERE ContactoID = 2")
+        conn.execute("UPDATE Actividades SET ContactoID = NULL WHERE ContactoID = 3")
+        conn.commit()
+        self._comparar(conn)
+
+        fila = conn.execute(
+            "SELECT TotalActividades, UltimaActividad, TotalCorreos FROM vw_ActividadRecienteContacto "
+            "WHERE ContactoID = ?", (nuevo,)
+        ).fetchone()
+        assert tuple(fila) == (2, "2026-03-01 09:00:00", 2)
+
+    def test_filtro_de_fechas(self, db_temporal):
+        conn = db_temporal
+        self._crear_actividad(conn, 1, 1, "2026-03-31 23:59:59")
+        self._crear_actividad(conn, 2, 1, "2026-04-01 00:00:00")
+        conn.commit()
+
+        datos = ReporteRepository().get_actividad_contactos("2026-01-01", "2026-03-31")
+
+        esperado = conn.execute(
+            f"SELECT ContactoID FROM ({_ACTIVIDAD_DIRECTA}) WHERE UltimaActividad IS NULL "
+            "OR date(UltimaActividad) BETWEEN date('2026-01-01') AND date('2026-03-31')"
+        ).fetchall()
+        assert sorted(d["ContactoID"] for d in datos) == sorted(r[0] for r in esperado)
+        assert 1 in {d["ContactoID"] for d in datos}
+        assert 2 not in {d["ContactoID"] for d in datos}
+
+    def test_filtros_usan_indice_de_ultima_actividad(self, db_temporal):
+        repo = ReporteRepository()
+        query, params = repo._sql_actividad_contactos("2026-01-01", "2026-03-31")
+        consultas = [
+            (query, params),
+            ("SELECT * FROM vw_ActividadRecienteContacto WHERE UltimaActividad < date('now', '-30 days')", []),
+        ]
+        for sql, args in consultas:
+            plan = " | ".join(r[3] for r in db_temporal.execute(f"EXPLAIN QUERY PLAN {sql}", args))
+            assert "idx_resumen_actividad_ultima (UltimaActividad" in plan
+            assert "SCAN r" not in plan and "Actividades" not in plan
+
+    def test_migracion_reemplaza_vista_anterior(self, db_temporal):
+        conn = db_temporal
+        # simular una BD creada antes del resumen
+        for (nombre,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%ResumenActividad%'"
+            " OR name LIKE '%ResumenContacto%'"
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {nombre}")
+        conn.execute("DROP VIEW vw_ActividadRecienteContacto")
+        conn.execute("DROP TABLE ResumenActividadContacto")
+        conn.execute("DROP TABLE ResumenActividadContactoTipo")
+        conn.execute(f"CREATE VIEW vw_ActividadRecienteContacto AS {_ACTIVIDAD_DIRECTA}")
+        self._crear_actividad(conn, 4, 2, "2026-05-01")
+        conn.commit()
+
+        apply_migrations(conn)
+
+        vista = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'vw_ActividadRecienteContacto'"
+        ).fetchone()[0]
+        assert "ResumenActividadContacto" in vista
+        self._comparar(conn)
+        self._crear_actividad(conn, 4, 1, "2026-05-02")
+        conn.commit()
+        self._comparar(conn)
+
+    def test_reconstruir(self, db_temporal):
+        conn = db_temporal
+        conn.execute("UPDATE ResumenActividadContacto SET TotalActividades = 99, UltimaActividad = NULL")
+        conn.execute("DELETE FROM ResumenActividadContactoTipo")
+        conn.commit()
+
+        ReporteRepository().reconstruir_actividad_contactos()
+
+        self._comparar(conn)
@@ -0,0 +1,138 @@
+# tests de ResumenKPI: triggers, cambio de mes, migracion y reconstruccion
+
+import pytest
+from app.database.initializer import apply_migrations
+from app.repositories.dashboard_repository import DashboardRepository
+
+# definicion anterior de vw_ResumenEjecutivo: recorre las tablas completas
+_KPIS_DIRECTOS = """
+SELECT
+    (SELECT COUNT(*) FROM Contactos WHERE Activo = 1)                    AS ContactosActivos,
+    (SELECT COUNT(*) FROM Empresas  WHERE Activo = 1)                    AS EmpresasActivas,
+    (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NULL)          AS OportunidadesAbiertas,
+    (SELECT IFNULL(SUM(MontoEstimado), 0)
+       FROM Oportunidades WHERE EsGanada IS NULL)                        AS ValorPipeline,
+    (SELECT IFNULL(SUM(MontoEstimado), 0)
+       FROM Oportunidades
+      WHERE EsGanada = 1
+        AND substr(FechaCierreReal, 1, 7) = strftime('%Y-%m', 'now', 'localtime')) AS RevenueEsteMes,
+    (SELECT COUNT(*) FROM Actividades WHERE EstadoActividadID IN (1, 2)) AS ActividadesPendientes,
+    (SELECT COUNT(*) FROM Campanas   WHERE Estado = 'Enviada')           AS CampanasEnviadas,
+    CASE
+        WHEN (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NOT NULL) > 0
+        THEN ROUND(
+            CAST((SELECT COUNT(*) FROM Oportunidades WHERE EsGanada = 1) AS REAL) /
+            (SELECT COUNT(*) FROM Oportunidades WHERE EsGanada IS NOT NULL) * 100, 1)
+        ELSE 0
+    END AS TasaConversionGlobal
+"""
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestResumenKPI:
+
+    @staticmethod
+    def _mes(conn, desplazamiento="+0 months"):
+        return conn.execute(
+            "SELECT strftime('%Y-%m', 'now', 'localtime', 'start of month', ?)", (desplazamiento,)
+        ).fetchone()[0]
+
+    def _comparar(self, conn):
+        esperado = dict(conn.execute(_KPIS_DIRECTOS).fetchone())
+        kpis = DashboardRepository().get_kpis()
+        assert kpis == pytest.approx(esperado)
+        return kpis
+
+    def test_semilla_coincide_con_consulta_completa(self, db_temporal):
+        self._comparar(db_temporal)
+
+    def test_triggers_mantienen_contadores(self, db_temporal):
+        conn = db_temporal
+        mes = self._mes(conn)
+        cid = conn.execute(
+            "INSERT INTO Contactos (Nombre, ApellidoPaterno) VALUES ('Kpi', 'Uno')"
+        ).lastrowid
+        conn.execute("INSERT INTO Contactos (Nombre, ApellidoPaterno, Activo) VALUES ('Kpi', 'Dos', 0)")
+        conn.execute("UPDATE Contactos SET Activo = 0 WHERE ContactoID = 1")
+        conn.execute("DELETE FROM Contactos WHERE ContactoID = ?", (cid,))
+        conn.execute("UPDATE Empresas SET Activo = 0 WHERE EmpresaID = 2")
+
+        oid = conn.execute(
+            "INSERT INTO Oportunidades (Nombre, EtapaID, MontoEstimado, PropietarioID) "
+            "VALUES ('Kpi abierta', 1, 1000.5, 1)"
+        ).lastrowid
+        conn.execute("UPDATE Oportunidades SET MontoEstimado = 2500 WHERE OportunidadID = ?", (oid,))
+        # se gana este mes y luego cambia el monto; otra ganada se elimina
+        conn.execute(
+            "UPDATE Oportunidades SET EsGanada = 1, FechaCierreReal = ? WHERE OportunidadID = ?",
+            (f"{mes}-02", oid),
+        )
+        conn.execute("UPDATE Oportunidades SET MontoEstimado = 3000 WHERE OportunidadID = ?", (oid,))
+        conn.execute("UPDATE Oportunidades SET EsGanada = 0 WHERE OportunidadID = 1")
+        otra = conn.execute(
+            "INSERT INTO Oportunidades (Nombre, EtapaID, MontoEstimado, PropietarioID, "
+            "EsGanada, FechaCierreReal) VALUES ('Kpi ganada', 6, 400, 1, 1, ?)",
+            (f"{mes}-03",),
+        ).lastrowid
+        conn.execute("DELETE FROM Oportunidades WHERE OportunidadID = ?", (otra,))
+        conn.execute("INSERT INTO Oportunidades (Nombre, EtapaID, PropietarioID) VALUES ('Sin monto', 1, 1)")
+
+        conn.execute("UPDATE Actividades SET EstadoActividadID = 1 WHERE ActividadID IN (1, 2)")
+        conn.execute("DELETE FROM Actividades WHERE ActividadID = 3")
+        conn.execute("UPDATE Campanas SET Estado = 'Enviada' WHERE CampanaID = 1")
+        conn.commit()
+
+        kpis = self._comparar(conn)
+        assert kpis["RevenueEsteMes"] == 3000
+
+    def test_revenue_por_mes_de_cierre(self, db_temporal):
+        conn = db_temporal
+        for mes, monto in ((self._mes(conn, "-1 months"), 700), (self._mes(conn), 300)):
+            conn.execute(
+                "INSERT INTO Oportunidades (Nombre, EtapaID, MontoEstimado, PropietarioID, "
+                "EsGanada, FechaCierreReal) VALUES ('Ganada', 6, ?, 1, 1, ?)",
+                (monto, f"{mes}-15 10:00:00"),
+            )
+        conn.commit()
+
+        # el mes anterior queda en su propia fila; al cambiar de mes se lee otra
+        assert self._comparar(conn)["RevenueEsteMes"] == 300
+        assert conn.execute(
+            "SELECT Monto FROM RevenueMensual WHERE Mes = ?", (self._mes(conn, "-1 months"),)
+        ).fetchone()[0] == 700
+
+    def test_migracion_reemplaza_vista_anterior(self, db_temporal):
+        conn = db_temporal
+        # simular una BD creada antes de ResumenKPI
+        for (nombre,) in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '%_KPI%'"
+        ).fetchall():
+            conn.execute(f"DROP TRIGGER {nombre}")
+        conn.execute("DROP VIEW vw_ResumenEjecutivo")
+        conn.execute("DROP TABLE ResumenKPI")
+        conn.execute("DROP TABLE RevenueMensual")
+        conn.execute(f"CREATE VIEW vw_ResumenEjecutivo AS {_KPIS_DIRECTOS}")
+        conn.execute("INSERT INTO Contactos (Nombre, ApellidoPaterno) VALUES ('Antes', 'Migracion')")
+        conn.commit()
+
+        apply_migrations(conn)
+
+        vista = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'vw_ResumenEjecutivo'"
+        ).fetchone()[0]
+        assert "ResumenKPI" in vista
+        self._comparar(conn)
+        conn.execute("INSERT INTO Contactos (Nombre, ApellidoPaterno) VALUES ('Despues', 'Migracion')")
+        conn.commit()
+        self._comparar(conn)
+
+    def test_reconstruir(self, db_temporal):
+        conn = db_temporal
+        conn.execute("UPDATE ResumenKPI SET ContactosActivos = 999, ValorPipeline = -1")
+        conn.execute("DELETE FROM RevenueMensual")
+        conn.commit()
+
+        DashboardRepository().reconstruir_resumen_kpi()
+
+        self._comparar(conn)
+        assert conn.execute("SELECT COUNT(*) FROM RevenueMensual").fetchone()[0] > 0
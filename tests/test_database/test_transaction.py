@@ -0,0 +1,148 @@
+# tests unitarios para la unidad de trabajo transaction()
+
+import threading
+import pytest
+from app.database.connection import close_connection, get_connection, get_writer, transaction
+
+
+class TestTransaction:
+    # tests de transaction() sobre la conexion thread-local
+
+    @pytest.fixture(autouse=True)
+    def tabla_items(self, db_vacia):
+        # la conexion del hilo apunta a una BD temporal con una sola tabla
+        conn = get_connection()
+        conn.execute("CREATE TABLE Items (ItemID INTEGER PRIMARY KEY, Nombre TEXT UNIQUE)")
+        conn.commit()
+
+    @staticmethod
+    def _insertar(nombre):
+        # imita un metodo de repositorio que hace su propio commit
+        conn = get_connection()
+        conn.execute("INSERT INTO Items (Nombre) VALUES (?)", (nombre,))
+        conn.commit()
+
+    @staticmethod
+    def _total():
+        return get_connection().execute("SELECT COUNT(*) FROM Items").fetchone()[0]
+
+    def test_commit_sin_transaccion(self):
+        # fuera de transaction() el commit del repositorio sigue funcionando
+        self._insertar("a")
+        assert not get_connection().in_transaction
+        assert self._total() == 1
+
+    def test_commits_diferidos(self):
+        # dentro del bloque los commits no cierran la transaccion
+        with transaction() as conn:
+            self._insertar("a")
+            self._insertar("b")
+            assert conn.in_transaction
+        assert not get_connection().in_transaction
+        assert self._total() == 2
+
+    def test_rollback_en_error(self):
+        # una excepcion deshace todo el lote
+        with pytest.raises(RuntimeError):
+            with transaction():
+                self._insertar("a")
+                raise RuntimeError("fallo")
+        assert self._total() == 0
+
+    def test_savepoint_anidado(self):
+        # un error en el bloque anidado solo deshace su parte
+        with transaction():
+            self._insertar("a")
+            with pytest.raises(RuntimeError):
+                with transaction():
+                    self._insertar("b")
+                    raise RuntimeError("fallo interno")
+            self._insertar("c")
+        nombres = [r[0] for r in get_connection().execute("SELECT Nombre FROM Items ORDER BY Nombre")]
+        assert nombres == ["a", "c"]
+
+    def test_error_de_restriccion_anidado(self):
+        # un UNIQUE fallido en un savepoint no invalida la transaccion externa
+        with transaction():
+            self._insertar("a")
+            with pytest.raises(Exception):
+                with transaction():
+                    self._insertar("a")
+        assert self._total() == 1
+
+    def test_confirma_pendientes_previos(self):
+        # cambios sin confirmar previos al bloque no se pierden
+        get_connection().execute("INSERT INTO Items (Nombre) VALUES ('previo')")
+        with transaction():
+            self._insertar("a")
+        assert self._total() == 2
+
+
+class TestGetWriter:
+    # tests de get_writer(): conexion del hilo con acceso exclusivo
+
+    @pytest.fixture(autouse=True)
+    def tabla_items(self, db_vacia):
+        conn = get_connection()
+        conn.execute("CREATE TABLE Items (ItemID INTEGER PRIMARY KEY, Nombre TEXT UNIQUE)")
+        conn.commit()
+
+    def test_entrega_la_conexion_del_hilo(self):
+        # misma conexion que los repositorios, con synchronous = NORMAL (1)
+        with get_writer() as conn:
+            assert conn is get_connection()
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+
+    def test_rollback_en_error(self):
+        # un bloque que falla sin commit no deja la transaccion abierta
+        with pytest.raises(RuntimeError):
+            with get_writer() as conn:
+                conn.execute("INSERT INTO Items (Nombre) VALUES ('a')")
+                raise RuntimeError("fallo")
+        conn = get_connection()
+        assert not conn.in_transaction
+        assert conn.execute("SELECT COUNT(*) FROM Items").fetchone()[0] == 0
+
+    def test_dentro_de_transaction(self):
+        # anidado en transaction() el commit sigue diferido hasta el final
+        with transaction():
+            with get_writer() as conn:
+                conn.execute("INSERT INTO Items (Nombre) VALUES ('a')")
+                conn.commit()
+                assert conn.in_transaction
+        assert get_connection().execute("SELECT COUNT(*) FROM Items").fetchone()[0] == 1
+
+    def test_serializa_escritores(self):
+        # un segundo hilo espera a que el primero suelte el escritor
+        orden = []
+        dentro = threading.Event()
+        soltar = threading.Event()
+
+        def escritor_lento():
+            with get_writer() as conn:
+                conn.execute("INSERT INTO Items (Nombre) VALUES ('a')")
+                dentro.set()
+                soltar.wait(5)
+                orden.append("a")
+                conn.commit()
+            close_connection()
+
+        def escritor_rapido():
+            dentro.wait(5)
+            with get_writer() as conn:
+                orden.append("b")
+                conn.execute("INSERT INTO Items (Nombre) VALUES ('b')")
+                conn.commit()
+            close_connection()
+
+        hilos = [threading.Thread(target=escritor_lento), threading.Thread(target=escritor_rapido)]
+        for hilo in hilos:
+            hilo.start()
+        dentro.wait(5)
+        hilos[1].join(0.2)
+        assert hilos[1].is_alive()  # bloqueado en el candado, no en SQLite
+        soltar.set()
+        for hilo in hilos:
+            hilo.join(5)
+        assert orden == ["a", "b"]
+        assert get_connection().execute("SELECT COUNT(*) FROM Items").fetchone()[0] == 2
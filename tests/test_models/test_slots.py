@@ -0,0 +1,41 @@
+# tests de los __slots__ de los modelos
+
+import importlib
+import pkgutil
+import pytest
+import app.models
+from app.models.Catalogo import Catalogo
+
+
+def _modelos():
+    modelos = []
+    for info in pkgutil.iter_modules(app.models.__path__):
+        modulo = importlib.import_module(f"app.models.{info.name}")
+        modelos.append(getattr(modulo, info.name))
+    return modelos
+
+
+_CON_SLOTS = [m for m in _modelos() if m is not Catalogo]
+
+
+class TestSlotsModelos:
+
+    def test_todos_los_modelos_descubiertos(self):
+        assert len(_CON_SLOTS) >= 17
+
+    @pytest.mark.parametrize("modelo", _CON_SLOTS, ids=lambda m: m.__name__)
+    def test_sin_dict_y_slots_inicializados(self, modelo):
+        # el constructor por defecto llena cada slot (ninguno queda sin asignar)
+        instancia = modelo()
+        assert not hasattr(instancia, "__dict__")
+        for nombre in modelo.__slots__:
+            getattr(instancia, nombre)
+
+    @pytest.mark.parametrize("modelo", _CON_SLOTS, ids=lambda m: m.__name__)
+    def test_atributo_no_declarado(self, modelo):
+        with pytest.raises(AttributeError):
+            modelo().atributo_inexistente = 1
+
+    def test_catalogo_conserva_kwargs(self):
+        item = Catalogo(3, Nombre="Mexico", CodigoISO="MX")
+        assert (item.id, item.Nombre, item.CodigoISO) == (3, "Mexico", "MX")
@@ -0,0 +1,157 @@
+# tests unitarios para el envio de campanas contra un servidor SMTP falso
+
+import pytest
+from unittest.mock import MagicMock, patch
+from app.services.campana_service import CampanaService, EscritorEstados
+from app.utils.envio_smtp import ResultadoEnvio
+from app.models.Campana import Campana
+from app.models.Plantilla import Plantilla
+from app.models.ConfiguracionCorreo import ConfiguracionCorreo
+from tests.smtp_falso import ServidorSmtpFalso
+
+
+def _destinatarios(cantidad, estado="Pendiente"):
+    return [
+        {"DestinatarioID": i, "EmailDestino": f"dest{i}@test.mx", "EstadoEnvio": estado}
+        for i in range(1, cantidad + 1)
+    ]
+
+
+class TestEnviarCampana:
+
+    @pytest.fixture
+    def mock_repos(self):
+        with patch('app.services.campana_service.PlantillaRepository') as mock_plantilla, \
+             patch('app.services.campana_service.CampanaRepository') as mock_campana, \
+             patch('app.services.campana_service.ConfigCorreoRepository') as mock_config:
+            yield mock_plantilla.return_value, mock_campana.return_value, mock_config.return_value
+
+    @pytest.fixture
+    def service(self, mock_repos):
+        return CampanaService()
+
+    def _preparar(self, mock_repos, servidor, destinatarios):
+        plantilla_repo, campana_repo, config_repo = mock_repos
+        campana_repo.find_by_id.return_value = Campana(campana_id=1, nombre="Promo", plantilla_id=1)
+        plantilla_repo.find_by_id.return_value = Plantilla(
+            plantilla_id=1, nombre="Promo", asunto="Hola", contenido_texto="Texto", contenido_html="<p>Hola</p>",
+        )
+        config_repo.find_activa.return_value = ConfiguracionCorreo(
+            nombre="Local", host=servidor.host, puerto=servidor.puerto, usar_tls=0, usar_ssl=0,
+            email_remitente="avisos@test.mx", nombre_remitente="Avisos",
+        )
+        campana_repo.tomar_pendientes.return_value = [d for d in destinatarios if d["EstadoEnvio"] == "Pendiente"]
+        return campana_repo
+
+    def test_envia_pendientes_y_marca_resultados(self, service, mock_repos):
+        with ServidorSmtpFalso(rechazados={"dest2@test.mx"}) as servidor:
+            campana_repo = self._preparar(mock_repos, servidor, _destinatarios(5))
+
+            enviados, fallidos, error = service.enviar_campana(1)
+
+            assert error is None
+            assert (enviados, fallidos) == (4, 1)
+            # un solo executemany con todos los estados; sin recontar al cerrar
+            campana_repo.marcar_estados.assert_called_once()
+            campana_id, cambios = campana_repo.marcar_estados.call_args.args
+            assert campana_id == 1
+            assert sorted(cambios, key=lambda c: c[1]) == [
+                ("Enviado", 1), ("Fallido", 2), ("Enviado", 3), ("Enviado", 4), ("Enviado", 5),
+            ]
+            campana_repo.cerrar_envio.assert_called_once_with(1, 4)
+            campana_repo.sincronizar_metricas.assert_not_called()
+            assert sorted(servidor.destinos()) == ["dest1@test.mx", "dest3@test.mx", "dest4@test.mx", "dest5@test.mx"]
+            assert b"Subject: Hola" in servidor.mensajes[0][1]
+
+    def test_error_de_conexion(self, service, mock_repos):
+        with ServidorSmtpFalso(rechazar_auth=True) as servidor:
+            campana_repo = self._preparar(mock_repos, servidor, _destinatarios(3))
+            mock_repos[2].find_activa.return_value.usuario = "avisos@test.mx"
+            mock_repos[2].find_activa.return_value.contrasena = "mala"
+
+            enviados, fallidos, error = service.enviar_campana(1)
+
+            assert (enviados, fallidos) == (0, 0)
+            assert error.startswith("Error de conexión SMTP")
+            campana_repo.marcar_estados.assert_not_called()
+            campana_repo.cerrar_envio.assert_not_called()
+
+    def test_sin_pendientes(self, service, mock_repos):
+        with ServidorSmtpFalso() as servidor:
+            self._preparar(mock_repos, servidor, _destinatarios(2, estado="Enviado"))
+            enviados, fallidos, error = service.enviar_campana(1)
+        assert (enviados, fallidos) == (0, 0)
+        assert "Pendiente" in error
+
+    def test_personaliza_cada_correo(self, service, mock_repos):
+        destinatarios = _destinatarios(2)
+        destinatarios[0].update(Nombre="Ana", Empresa="Acme")
+        destinatarios[1].update(Nombre="Luis", Empresa=None)
+        with ServidorSmtpFalso() as servidor:
+            plantilla_repo = mock_repos[0]
+            self._preparar(mock_repos, servidor, destinatarios)
+            plantilla_repo.find_by_id.return_value = Plantilla(
+                plantilla_id=1, nombre="Promo", asunto="Hola {{Nombre}}",
+                contenido_texto="Saludos a {{Empresa}}", contenido_html="<p>{{Nombre}}</p>",
+            )
+            service.enviar_campana(1)
+            mensajes = {destinos[0]: datos for destinos, datos in servidor.mensajes}
+
+        assert b"Subject: Hola Ana" in mensajes["dest1@test.mx"]
+        assert b"Acme" in mensajes["dest1@test.mx"]
+        assert b"Subject: Hola Luis" in mensajes["dest2@test.mx"]
+        assert b"Acme" not in mensajes["dest2@test.mx"]
+
+    def test_rechaza_campos_desconocidos(self, service, mock_repos):
+        _, error = service.crear_plantilla(
+            {"nombre": "Promo", "asunto": "Hola {{Nombre}}", "contenido_html": "<p>{{Telefono}}</p>"}, 1,
+        )
+        assert "{{Telefono}}" in error
+        mock_repos[0].create.assert_not_called()
+
+
+class TestEscritorEstados:
+
+    class _Reloj:
+        def __init__(self):
+            self.ahora = 0.0
+
+        def __call__(self):
+            return self.ahora
+
+    def _resultado(self, clave, enviado=True):
+        return ResultadoEnvio(clave, f"dest{clave}@test.mx", enviado, None if enviado else "rechazado")
+
+    def test_escribe_cada_n_resultados(self):
+        repo = MagicMock()
+        escritor = EscritorEstados(repo, 7, cada=3, cada_ms=60_000, reloj=self._Reloj())
+
+        for clave in range(1, 8):
+            escritor.agregar(self._resultado(clave, enviado=clave != 5))
+
+        assert [c.args for c in repo.marcar_estados.call_args_list] == [
+            (7, [("Enviado", 1), ("Enviado", 2), ("Enviado", 3)]),
+            (7, [("Enviado", 4), ("Fallido", 5), ("Enviado", 6)]),
+        ]
+        assert escritor.en_espera == 1
+        escritor.vaciar()
+        assert repo.marcar_estados.call_args.args == (7, [("Enviado", 7)])
+        assert (escritor.enviados, escritor.fallidos, escritor.en_espera) == (6, 1, 0)
+
+    def test_escribe_al_pasar_el_intervalo(self):
+        repo = MagicMock()
+        reloj = self._Reloj()
+        escritor = EscritorEstados(repo, 1, enviados=10, cada=100, cada_ms=500, reloj=reloj)
+
+        escritor.agregar(self._resultado(1))
+        repo.marcar_estados.assert_not_called()
+        reloj.ahora = 0.6
+        escritor.agregar(self._resultado(2))
+
+        repo.marcar_estados.assert_called_once_with(1, [("Enviado", 1), ("Enviado", 2)])
+        assert escritor.enviados == 12
+
+    def test_vaciar_sin_resultados_no_escribe(self):
+        repo = MagicMock()
+        EscritorEstados(repo, 1).vaciar()
+        repo.marcar_estados.assert_not_called()
@@ -0,0 +1,105 @@
+# tests de la carga de destinatarios desde un segmento (INSERT ... SELECT)
+
+import pytest
+from app.database.initializer import apply_migrations
+from app.services.campana_service import CampanaService
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestCargarDesdeSegmento:
+
+    def _segmento(self, conn, contactos):
+        """contactos: lista de (email, activo, no_contactar). Devuelve (campana_id, segmento_id, ids)."""
+        segmento_id = conn.execute(
+            "INSERT INTO Segmentos (Nombre, TipoEntidad, CreadoPor) VALUES ('Prueba', 'Contacto', 1)"
+        ).lastrowid
+        ids = []
+        for email, activo, no_contactar in contactos:
+            contacto_id = conn.execute(
+                "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email, Activo, NoContactar) VALUES ('N', 'A', ?, ?, ?)",
+                (email, activo, no_contactar),
+            ).lastrowid
+            conn.execute(
+                "INSERT INTO SegmentoContactos (SegmentoID, ContactoID) VALUES (?, ?)", (segmento_id, contacto_id)
+            )
+            ids.append(contacto_id)
+        campana_id = conn.execute(
+            "INSERT INTO Campanas (Nombre, Estado, SegmentoID, PropietarioID) VALUES ('Prueba', 'Borrador', ?, 1)",
+            (segmento_id,),
+        ).lastrowid
+        conn.commit()
+        return campana_id, segmento_id, ids
+
+    def _destinatarios(self, conn, campana_id):
+        return conn.execute(
+            "SELECT ContactoID, EmailDestino FROM CampanaDestinatarios WHERE CampanaID = ? ORDER BY ContactoID",
+            (campana_id,),
+        ).fetchall()
+
+    def test_filtra_y_cuenta_en_una_carga(self, db_temporal):
+        conn = db_temporal
+        conn.execute("INSERT INTO CorreosSuprimidos (Email, Motivo) VALUES ('baja@test.mx', 'Manual')")
+        campana_id, segmento_id, ids = self._segmento(conn, [
+            ("ana@test.mx", 1, 0),
+            (" ANA@test.mx ", 1, 0),     # mismo email que el anterior
+            ("luis@test.mx", 0, 0),      # inactivo
+            ("eva@test.mx", 1, 1),       # no contactar
+            ("", 1, 0),                  # sin email
+            (None, 1, 0),
+            ("Baja@Test.mx", 1, 0),      # en la lista de supresion
+            (" sol@test.mx", 1, 0),
+        ])
+
+        resultado, error = CampanaService().cargar_desde_segmento(campana_id, segmento_id)
+
+        assert error is None
+        assert resultado == (2, 6)
+        assert [tuple(f) for f in self._destinatarios(conn, campana_id)] == [
+            (ids[0], "ana@test.mx"), (ids[7], "sol@test.mx"),
+        ]
+        total = conn.execute("SELECT TotalDestinatarios FROM Campanas WHERE CampanaID = ?", (campana_id,)).fetchone()[0]
+        assert total == 2
+
+    def test_volver_a_cargar_no_duplica(self, db_temporal):
+        campana_id, segmento_id, _ = self._segmento(db_temporal, [("ana@test.mx", 1, 0), ("sol@test.mx", 1, 0)])
+        service = CampanaService()
+
+        assert service.cargar_desde_segmento(campana_id, segmento_id) == ((2, 0), None)
+        assert service.cargar_desde_segmento(campana_id, segmento_id) == ((0, 2), None)
+        assert len(self._destinatarios(db_temporal, campana_id)) == 2
+
+    def test_desuscrito_queda_suprimido(self, db_temporal):
+        conn = db_temporal
+        campana_id, segmento_id, _ = self._segmento(conn, [("ana@test.mx", 1, 0), ("sol@test.mx", 1, 0)])
+        service = CampanaService()
+        service.cargar_desde_segmento(campana_id, segmento_id)
+        conn.execute("UPDATE CampanaDestinatarios SET SeDesuscribio = 1 WHERE EmailDestino = 'ana@test.mx'")
+        conn.commit()
+
+        otra = conn.execute(
+            "INSERT INTO Campanas (Nombre, Estado, SegmentoID, PropietarioID) VALUES ('Otra', 'Borrador', ?, 1)",
+            (segmento_id,),
+        ).lastrowid
+        conn.commit()
+
+        assert service.cargar_desde_segmento(otra, segmento_id) == ((1, 1), None)
+        assert [f["EmailDestino"] for f in self._destinatarios(conn, otra)] == ["sol@test.mx"]
+
+    def test_migracion_llena_la_lista_una_sola_vez(self, db_temporal):
+        conn = db_temporal
+        campana_id, segmento_id, _ = self._segmento(conn, [("ana@test.mx", 1, 0), ("sol@test.mx", 1, 0)])
+        CampanaService().cargar_desde_segmento(campana_id, segmento_id)
+        # simular una BD creada antes de la lista de supresion
+        conn.execute("DROP TRIGGER trg_CampanaDestinatarios_Desuscripcion")
+        conn.execute("DROP TABLE CorreosSuprimidos")
+        conn.execute("UPDATE CampanaDestinatarios SET SeDesuscribio = 1 WHERE EmailDestino = 'ana@test.mx'")
+        conn.commit()
+
+        apply_migrations(conn)
+        assert "ana@test.mx" in [f[0] for f in conn.execute("SELECT Email FROM CorreosSuprimidos")]
+
+        # ya existe la tabla: en el siguiente arranque no se vuelve a llenar
+        conn.execute("DELETE FROM CorreosSuprimidos")
+        conn.commit()
+        apply_migrations(conn)
+        assert conn.execute("SELECT COUNT(*) FROM CorreosSuprimidos").fetchone()[0] == 0
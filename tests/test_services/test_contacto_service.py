@@ -4,6 +4,7 @@ import pytest
 from unittest.mock import Mock, patch
 from app.services.contacto_service import ContactoService
 from app.models.Contacto import Contacto
+from app.utils.paginacion import Pagina
 
 
 class TestContactoService:
@@ -208,3 +209,34 @@ class TestContactoService:
         total, error = service.contar_total()
         assert total is None
         assert error is not None
+
+    # ==========================================
+    # PAGINACION POR CURSOR
+    # ==========================================
+
+    def test_obtener_pagina_exitoso(self, service, mock_repo):
+        mock_repo.find_page.return_value = Pagina([Contacto(contacto_id=1, nombre="Juan")], siguiente="tok")
+        pagina, error = service.obtener_pagina(limit=50, filtros={"activo": 1})
+        assert error is None
+        assert pagina.siguiente == "tok"
+        mock_repo.find_page.assert_called_once_with(
+            limit=50, token=None, filtros={"activo": 1}, orden="fecha", descendente=True
+        )
+
+    def test_obtener_pagina_token_invalido(self, service, mock_repo):
+        mock_repo.find_page.side_effect = ValueError("Token de paginacion invalido")
+        pagina, error = service.obtener_pagina(token="xxx")
+        assert pagina is None
+        assert error == "Token de paginacion invalido"
+
+    def test_obtener_pagina_error_bd(self, service, mock_repo):
+        mock_repo.find_page.side_effect = Exception("no such table: Contactos")
+        pagina, error = service.obtener_pagina()
+        assert pagina is None
+        assert error == "Error de configuracion de base de datos"
+
+    def test_contar_resumen_exitoso(self, service, mock_repo):
+        mock_repo.count_resumen.return_value = (10, 7)
+        resumen, error = service.contar_resumen()
+        assert error is None
+        assert resumen == (10, 7)
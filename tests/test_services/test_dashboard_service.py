@@ -0,0 +1,78 @@
+# tests del servicio del dashboard: snapshot en una transaccion (BD temporal real)
+
+import pytest
+from unittest.mock import patch
+from app.repositories.dashboard_repository import DashboardRepository
+from app.services.dashboard_service import DashboardService, PANELES
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestDashboardService:
+
+    @pytest.fixture
+    def service(self):
+        return DashboardService()
+
+    def _nueva_oportunidad(self, conn, monto=5000):
+        conn.execute(
+            "INSERT INTO Oportunidades (Nombre, EtapaID, MontoEstimado, PropietarioID) VALUES (?, 1, ?, 1)",
+            ("Nueva", monto),
+        )
+        conn.commit()
+
+    def test_snapshot_trae_todos_los_paneles_en_orden(self, service):
+        avisos = []
+
+        snapshot, error = service.obtener_snapshot(1, al_panel=avisos.append)
+
+        assert error is None
+        assert [p.nombre for p in avisos] == list(PANELES)
+        assert [p.nombre for p in snapshot] == list(PANELES)
+        assert snapshot["kpis"].datos["ContactosActivos"] == DashboardRepository().get_kpis()["ContactosActivos"]
+
+    def test_snapshot_es_de_solo_lectura(self, service):
+        snapshot, _ = service.obtener_snapshot(1)
+        panel = snapshot["pipeline"]
+
+        with pytest.raises(AttributeError):
+            panel.datos = ()
+        with pytest.raises(AttributeError):
+            snapshot.otro = 1
+        with pytest.raises(TypeError):
+            panel.datos[0]["MontoTotal"] = 0
+        assert isinstance(panel.datos, tuple)
+
+    def test_todos_los_paneles_ven_la_misma_foto(self, service, db_temporal):
+        # una escritura confirmada a mitad de la lectura no aparece en los
+        # paneles que se leen despues
+        def escribir_tras_kpis(panel):
+            if panel.nombre == "kpis":
+                self._nueva_oportunidad(db_temporal)
+
+        antes = DashboardRepository().get_pipeline_por_etapa()
+        snapshot, _ = service.obtener_snapshot(1, al_panel=escribir_tras_kpis)
+
+        total = sum(r["TotalOportunidades"] for r in snapshot["pipeline"].datos)
+        assert total == sum(r["TotalOportunidades"] for r in antes)
+        despues = DashboardRepository().get_pipeline_por_etapa()
+        assert sum(r["TotalOportunidades"] for r in despues) == total + 1
+
+    def test_huella_cambia_solo_en_paneles_afectados(self, service, db_temporal):
+        primero, _ = service.obtener_snapshot(1)
+        repetido, _ = service.obtener_snapshot(1)
+        assert repetido.huellas == primero.huellas
+
+        db_temporal.execute("UPDATE Oportunidades SET MontoEstimado = MontoEstimado + 1 WHERE EsGanada IS NULL")
+        db_temporal.commit()
+        nuevo, _ = service.obtener_snapshot(1)
+
+        cambiados = {n for n in PANELES if nuevo.huellas[n] != primero.huellas[n]}
+        assert cambiados == {"kpis", "pipeline"}
+
+    def test_panel_que_falla_se_omite(self, service):
+        with patch.object(service._repo, "get_actividades_recientes", side_effect=RuntimeError("boom")):
+            snapshot, error = service.obtener_snapshot(1)
+
+        assert error is None
+        assert "actividades" not in snapshot
+        assert len(snapshot) == len(PANELES) - 1
@@ -0,0 +1,137 @@
+# tests de importacion masiva de contactos y empresas (BD temporal real)
+
+import csv
+import pytest
+from app.services.importacion_service import ImportacionService, normalizar
+from app.utils.catalog_cache import CatalogCache
+
+
+def _escribir_csv(ruta, filas, delimitador=","):
+    with open(ruta, "w", encoding="utf-8", newline="") as f:
+        csv.writer(f, delimiter=delimitador).writerows(filas)
+    return str(ruta)
+
+
+def _leer_rechazos(ruta):
+    with open(ruta, encoding="utf-8-sig", newline="") as f:
+        return list(csv.reader(f))
+
+
+class TestImportacionService:
+
+    @pytest.fixture(autouse=True)
+    def catalogos_vacios(self, db_temporal):
+        CatalogCache.invalidate_all()
+        yield
+        CatalogCache.invalidate_all()
+
+    @pytest.fixture
+    def service(self):
+        return ImportacionService()
+
+    @staticmethod
+    def _contar(conn, tabla):
+        return conn.execute(f"SELECT COUNT(*) FROM {tabla}").fetchone()[0]
+
+    def test_normalizar(self):
+        assert normalizar("  San  Nicolás de los GARZA ") == "san nicolas de los garza"
+
+    def test_importar_contactos(self, db_temporal, service, tmp_path):
+        db_temporal.execute("INSERT INTO Empresas (RazonSocial) VALUES ('Acme S.A.')")
+        db_temporal.execute(
+            "INSERT INTO Contactos (Nombre, ApellidoPaterno, Email) VALUES ('Ya', 'Existe', 'ya@existe.com')"
+        )
+        db_temporal.commit()
+        antes = self._contar(db_temporal, "Contactos")
+
+        ruta = _escribir_csv(tmp_path / "contactos.csv", [
+            ["Nombre", "Apellido Paterno", "Correo", "Celular", "Empresa", "Ciudad", "Origen", "Propietario", "Extra"],
+            ["Ana", "López", "Ana@Mail.com", "81 1234-5678", "acme s.a.", "san nicolas de los garza", "Referido", "María González", "x"],
+            ["", "SinNombre", "", "", "", "", "", "", ""],
+            ["Luis", "Pérez", "no-es-email", "", "", "", "", "", ""],
+            ["Eva", "Ruiz", "YA@existe.com", "", "", "", "", "", ""],
+            ["Otra", "Ana", "ana@mail.com", "", "", "", "", "", ""],
+            ["Raul", "Díaz", "", "", "", "Atlantida", "", "", ""],
+            ["", "", "", "", "", "", "", "", ""],
+            ["Sol", "Mar", "", "123", "", "", "", "", ""],
+            ["Teo", "Gil", "", "", "", "", "", "", ""],
+        ])
+        resumen, error = service.importar_contactos(ruta, usuario_actual_id=1)
+
+        assert error is None
+        assert (resumen.procesadas, resumen.insertadas, resumen.rechazadas) == (8, 2, 6)
+        assert self._contar(db_temporal, "Contactos") == antes + 2
+
+        ana = db_temporal.execute(
+            "SELECT c.Email, c.TelefonoCelular, e.RazonSocial, ci.Nombre AS Ciudad, c.PropietarioID, c.CreadoPor "
+            "FROM Contactos c JOIN Empresas e ON e.EmpresaID = c.EmpresaID "
+            "JOIN Ciudades ci ON ci.CiudadID = c.CiudadID WHERE c.Nombre = 'Ana'"
+        ).fetchone()
+        assert ana["Email"] == "ana@mail.com" and ana["TelefonoCelular"] == "8112345678"
+        assert ana["RazonSocial"] == "Acme S.A." and ana["Ciudad"] == "San Nicolás de los Garza"
+        assert ana["PropietarioID"] == 2 and ana["CreadoPor"] == 1
+
+        rechazos = _leer_rechazos(resumen.ruta_rechazos)
+        assert rechazos[0] == ["Fila", "Motivo", "Nombre", "Apellido Paterno", "Correo", "Celular",
+                               "Empresa", "Ciudad", "Origen", "Propietario", "Extra"]
+        motivos = {int(f[0]): f[1] for f in rechazos[1:]}
+        assert motivos == {
+            3: "El nombre es requerido",
+            4: "El formato del email no es valido",
+            5: "Este email ya esta registrado",
+            6: "Este email ya esta registrado",
+            7: "Ciudad no encontrada: Atlantida",
+            9: "El teléfono debe contener exactamente 10 dígitos",
+        }
+
+    def test_lotes_y_progreso(self, db_temporal, service, tmp_path):
+        filas = [["nombre", "apellido_paterno"]] + [[f"N{i}", "Lote"] for i in range(5)]
+        ruta = _escribir_csv(tmp_path / "lotes.csv", filas, delimitador=";")
+        avance = []
+        resumen, error = service.importar_contactos(
+            ruta, 1, al_progreso=lambda *a: avance.append(a), tamano_lote=2
+        )
+        assert error is None and resumen.insertadas == 5
+        assert resumen.ruta_rechazos is None
+        assert not (tmp_path / "lotes_rechazos.csv").exists()
+        assert avance == [(2, 2, 0), (4, 4, 0), (5, 5, 0)]
+
+    def test_columna_requerida_faltante(self, service, tmp_path):
+        ruta = _escribir_csv(tmp_path / "incompleto.csv", [["nombre", "email"], ["Ana", "a@b.com"]])
+        resumen, error = service.importar_contactos(ruta, 1)
+        assert resumen is None
+        assert error == "Faltan columnas requeridas: apellido_paterno"
+
+    def test_formato_no_soportado(self, service, tmp_path):
+        ruta = tmp_path / "datos.txt"
+        ruta.write_text("nombre\n")
+        resumen, error = service.importar_empresas(str(ruta), 1)
+        assert resumen is None and "no soportado" in error
+
+    def test_importar_empresas(self, db_temporal, service, tmp_path):
+        db_temporal.execute("INSERT INTO Empresas (RazonSocial, RFC) VALUES ('Vieja', 'VIE010101AAA')")
+        db_temporal.commit()
+        ruta = _escribir_csv(tmp_path / "empresas.csv", [
+            ["Razón Social", "RFC", "Industria", "Tamaño", "Moneda", "Empleados", "Ingreso Anual"],
+            ["Nueva SA", "nue010101bbb", "tecnologia", "Pequeña", "Peso Mexicano", "25", "1,500,000.50"],
+            ["Repetida", "VIE010101AAA", "", "", "", "", ""],
+            ["Negativa", "", "", "", "", "-3", ""],
+            ["Sin industria", "", "Astronautica", "", "", "", ""],
+        ])
+        resumen, error = service.importar_empresas(ruta, 1, ruta_rechazos=str(tmp_path / "r.csv"))
+
+        assert error is None
+        assert (resumen.insertadas, resumen.rechazadas) == (1, 3)
+        nueva = db_temporal.execute(
+            "SELECT e.RFC, i.Nombre AS Industria, e.NumEmpleados, e.IngresoAnualEstimado "
+            "FROM Empresas e JOIN Industrias i ON i.IndustriaID = e.IndustriaID "
+            "WHERE e.RazonSocial = 'Nueva SA'"
+        ).fetchone()
+        assert nueva["RFC"] == "NUE010101BBB" and nueva["Industria"] == "Tecnología"
+        assert nueva["NumEmpleados"] == 25 and nueva["IngresoAnualEstimado"] == 1500000.5
+        motivos = [f[1] for f in _leer_rechazos(resumen.ruta_rechazos)[1:]]
+        assert motivos == [
+            "Este RFC ya esta registrado",
+            "El numero de empleados no puede ser negativo",
+            "Industria no encontrada: Astronautica",
+        ]
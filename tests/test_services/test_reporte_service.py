@@ -0,0 +1,208 @@
+# tests de consulta (con cache) y exportacion de reportes a Excel y PDF (BD temporal real)
+
+import re
+from datetime import date
+import pytest
+from unittest.mock import patch
+from app.repositories.reporte_repository import ReporteRepository
+from app.services import reporte_service
+from app.services.reporte_service import ReporteService, REPORTES, _lineas_celda
+
+
+def _filas_pipeline(n):
+    for i in range(n):
+        yield {
+            "NombreOportunidad": f"Oportunidad {i}",
+            "Empresa": "Acme S.A.",
+            "Etapa": "Propuesta",
+            "MontoEstimado": 1000.0 + i,
+            "DiasEnPipeline": i,
+        }
+
+
+@pytest.fixture
+def openpyxl():
+    return pytest.importorskip("openpyxl")
+
+
+def _paginas_pdf(ruta):
+    with open(ruta, "rb") as f:
+        return len(re.findall(rb"/Type /Page\b(?!s)", f.read()))
+
+
+class TestExportarExcel:
+
+    @pytest.fixture
+    def service(self):
+        return ReporteService()
+
+    def test_exportar_desde_generador(self, service, tmp_path, openpyxl):
+        ruta = str(tmp_path / "pipeline.xlsx")
+        avisos = []
+
+        ok, error = service.exportar_excel("pipeline", _filas_pipeline(12), ruta, avisos.append)
+
+        assert error is None and ok is True
+        assert avisos == [12]
+        ws = openpyxl.load_workbook(ruta).active
+        assert ws.max_row == 3 + 12
+        assert ws["A1"].value == REPORTES["pipeline"]["titulo"]
+        assert "A1:J1" in {str(r) for r in ws.merged_cells.ranges}
+        assert ws["A3"].value == "Oportunidad"
+        assert ws["A3"].style == "crm_cabecera"
+        assert ws.freeze_panes == "A4"
+        # las columnas que faltan en el dict quedan vacias
+        assert ws["A4"].value == "Oportunidad 0"
+        assert ws["C4"].value is None
+        assert ws["E15"].value == 1011.0
+
+    def test_ancho_de_columna_por_muestra(self, service, tmp_path, openpyxl):
+        ruta = str(tmp_path / "pipeline.xlsx")
+        filas = list(_filas_pipeline(300))
+        # un valor largo fuera de la muestra no cambia el ancho
+        filas[-1]["Empresa"] = "X" * 80
+
+        service.exportar_excel("pipeline", iter(filas), ruta)
+
+        ws = openpyxl.load_workbook(ruta).active
+        assert ws.column_dimensions["B"].width == len("Acme S.A.") + 4
+        assert ws["B303"].value == "X" * 80
+
+    def test_clave_invalida_devuelve_error(self, service, tmp_path):
+        ok, error = service.exportar_excel("no_existe", [], str(tmp_path / "x.xlsx"))
+        assert ok is None
+        assert error
+
+
+class TestExportarPdf:
+
+    @pytest.fixture(autouse=True)
+    def reportlab(self):
+        return pytest.importorskip("reportlab")
+
+    def test_texto_que_cabe_no_se_parte(self):
+        assert _lineas_celda("Acme", 100, "Helvetica", 8, 6) == "Acme"
+
+    def test_texto_largo_se_parte_y_se_corta(self):
+        lineas = _lineas_celda("palabra " * 100, 60, "Helvetica", 8, 6)
+        assert isinstance(lineas, list)
+        assert len(lineas) == 6
+        assert lineas[-1].endswith("...")
+
+    def test_exportar_varias_paginas_desde_generador(self, tmp_path):
+        ruta = str(tmp_path / "pipeline.pdf")
+        avisos = []
+
+        ok, error = ReporteService().exportar_pdf("pipeline", _filas_pipeline(100), ruta, avisos.append)
+
+        assert error is None and ok is True
+        # un aviso por pagina cerrada con filas y el total al final
+        assert _paginas_pdf(ruta) == len(avisos) > 1
+        assert avisos == sorted(avisos)
+        assert avisos[-1] == 100
+
+    def test_pagina_llena_no_repite_la_rejilla_en_la_del_total(self, tmp_path):
+        from reportlab.pdfgen.canvas import Canvas
+
+        # cuantas filas llenan justo la ultima pagina y mandan el total a
+        # una pagina aparte
+        for n in range(1, 200):
+            trazos, avisos = [], []
+            with patch.object(Canvas, "lines", autospec=True,
+                              side_effect=lambda lienzo, lineas: trazos.append(lineas)):
+                ReporteService().exportar_pdf("pipeline", _filas_pipeline(n), str(tmp_path / "lleno.pdf"), avisos.append)
+            # hay un aviso por pagina con filas: la de mas solo lleva el total
+            if _paginas_pdf(tmp_path / "lleno.pdf") > len(avisos):
+                break
+        else:
+            pytest.fail("ningun tamano llena la ultima pagina")
+
+        # un separador horizontal por fila, ninguno repetido
+        horizontales = [l for trazo in trazos for l in trazo if l[1] == l[3]]
+        assert len(horizontales) == n
+
+    def test_reporte_vacio(self, tmp_path):
+        ruta = str(tmp_path / "vacio.pdf")
+        ok, error = ReporteService().exportar_pdf("vendedores", [], ruta)
+        assert error is None and ok is True
+        assert _paginas_pdf(ruta) == 1
+
+
+@pytest.mark.usefixtures("db_temporal")
+class TestExportarDesdeBD:
+
+    def test_iterar_devuelve_lo_mismo_que_la_consulta_completa(self):
+        repo = ReporteRepository()
+        assert list(repo.iterar("pipeline", tamano_bloque=2)) == repo.get_pipeline_ventas()
+
+    def test_exportar_excel_desde_bd(self, tmp_path, openpyxl):
+        ruta = str(tmp_path / "actividad.xlsx")
+        esperadas = len(ReporteRepository().get_actividad_contactos())
+
+        ok, error = ReporteService().exportar_excel_desde_bd("actividad", ruta)
+
+        assert error is None and ok is True
+        assert esperadas > 0
+        assert openpyxl.load_workbook(ruta).active.max_row == 3 + esperadas
+
+    def test_exportar_pdf_desde_bd(self, tmp_path):
+        pytest.importorskip("reportlab")
+        ruta = str(tmp_path / "pipeline.pdf")
+
+        ok, error = ReporteService().exportar_pdf_desde_bd("pipeline", ruta)
+
+        assert error is None and ok is True
+        assert _paginas_pdf(ruta) == 1
+
+
+class TestCacheDeReportes:
+
+    @pytest.fixture(autouse=True)
+    def cache_vacio(self, db_temporal):
+        reporte_service._cache.invalidar_todo()
+        yield
+        reporte_service._cache.invalidar_todo()
+
+    def test_misma_consulta_no_vuelve_a_la_bd(self):
+        service = ReporteService(alcance=1)
+        with patch.object(service._repo, "get_pipeline_ventas", wraps=service._repo.get_pipeline_ventas) as repo:
+            primero, _ = service.obtener_pipeline_ventas("2020-01-01", "2030-12-31")
+            segundo, error = service.obtener_pipeline_ventas("2020-01-01", "2030-12-31")
+
+        assert error is None
+        assert segundo is primero
+        assert repo.call_count == 1
+
+    def test_fechas_y_alcance_son_parte_de_la_clave(self):
+        service = ReporteService(alcance=1)
+        with patch.object(service._repo, "get_pipeline_ventas", return_value=[]) as repo:
+            service.obtener_pipeline_ventas("2020-01-01", "2030-12-31")
+            service.obtener_pipeline_ventas("2021-01-01", "2030-12-31")
+            otro = ReporteService(alcance=2)
+            otro._repo = service._repo
+            otro.obtener_pipeline_ventas("2020-01-01", "2030-12-31")
+
+        assert repo.call_count == 3
+
+    def test_reportes_con_dias_se_recalculan_al_cambiar_el_dia(self):
+        service = ReporteService()
+        with patch.object(service._repo, "get_pipeline_ventas", return_value=[]) as repo, \
+                patch.object(reporte_service, "date") as fecha:
+            fecha.today.return_value = date(2026, 1, 1)
+            service.obtener_pipeline_ventas()
+            service.obtener_pipeline_ventas()
+            fecha.today.return_value = date(2026, 1, 2)
+            service.obtener_pipeline_ventas()
+
+        assert repo.call_count == 2
+
+    def test_escritura_en_oportunidades_refresca_el_reporte(self, db_temporal):
+        service = ReporteService()
+        antes, _ = service.obtener_conversion_etapas()
+
+        db_temporal.execute("UPDATE Oportunidades SET MontoEstimado = MontoEstimado + 1000")
+        db_temporal.commit()
+        despues, _ = service.obtener_conversion_etapas()
+
+        assert despues is not antes
+        assert despues == ReporteRepository().get_conversion_por_etapa()
@@ -0,0 +1,179 @@
+# tests de los trabajos de envio: lotes, punto de control, pausa y reanudacion
+
+import pytest
+from unittest.mock import patch
+from app.services.trabajo_envio_service import TrabajoEnvioService
+from tests.smtp_falso import ServidorSmtpFalso
+
+
+class TestTrabajoEnvioService:
+
+    @pytest.fixture(autouse=True)
+    def sin_limite_de_envio(self, db_temporal):
+        with patch("app.services.campana_service.SMTP_MENSAJES_POR_SEGUNDO", 0):
+            yield
+
+    @pytest.fixture
+    def servidor(self):
+        with ServidorSmtpFalso() as servidor:
+            yield servidor
+
+    def _campana(self, conn, servidor, destinatarios=25, usuario=None):
+        conn.execute(
+            "UPDATE ConfiguracionCorreo SET Host = ?, Puerto = ?, UsarTLS = 0, UsarSSL = 0, "
+            "Usuario = ?, Contrasena = ? WHERE Activa = 1",
+            (servidor.host, servidor.puerto, usuario, "secreta" if usuario else None),
+        )
+        campana_id = conn.execute(
+            "INSERT INTO Campanas (Nombre, Estado, PlantillaID, PropietarioID) VALUES ('Prueba', 'Borrador', 1, 1)"
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO CampanaDestinatarios (CampanaID, ContactoID, EmailDestino) VALUES (?, 1, ?)",
+            [(campana_id, f"dest{i}@test.mx") for i in range(destinatarios)],
+        )
+        conn.commit()
+        return campana_id
+
+    def _estados(self, conn, campana_id):
+        filas = conn.execute(
+            "SELECT EstadoEnvio, COUNT(*) FROM CampanaDestinatarios WHERE CampanaID = ? GROUP BY EstadoEnvio",
+            (campana_id,),
+        ).fetchall()
+        return {estado: n for estado, n in filas}
+
+    def test_envia_por_lotes_y_guarda_punto_de_control(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        trabajo, error = service.crear_trabajo(campana_id, 1)
+        assert error is None and trabajo.total_destinatarios == 25
+
+        avances = []
+        estado, error = service.procesar(
+            trabajo.trabajo_id, al_progreso=lambda *a: avances.append(a), tamano_lote=10,
+        )
+
+        assert (estado, error) == ("Completado", None)
+        assert [a[1] for a in avances] == [10, 20, 25]
+        final, _ = service.obtener_trabajo(trabajo.trabajo_id)
+        ultimo = db_temporal.execute(
+            "SELECT MAX(DestinatarioID) FROM CampanaDestinatarios WHERE CampanaID = ?", (campana_id,)
+        ).fetchone()[0]
+        assert (final.enviados, final.fallidos, final.ultimo_destinatario_id) == (25, 0, ultimo)
+        assert final.fecha_fin is not None
+        assert self._estados(db_temporal, campana_id) == {"Enviado": 25}
+        assert servidor.recibidos == 25
+        estado_campana = db_temporal.execute(
+            "SELECT Estado, TotalEnviados FROM Campanas WHERE CampanaID = ?", (campana_id,)
+        ).fetchone()
+        assert tuple(estado_campana) == ("Completada", 25)
+
+    def test_un_solo_trabajo_vivo_por_campana(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        service.crear_trabajo(campana_id)
+        trabajo, error = service.crear_trabajo(campana_id)
+        assert trabajo is None
+        assert "ya tiene un envío" in error
+
+    def test_pausar_y_reanudar(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        trabajo, _ = service.crear_trabajo(campana_id)
+        trabajo_id = trabajo.trabajo_id
+
+        # la pausa llega mientras corre: el lote en curso termina y se guarda
+        estado, _ = service.procesar(
+            trabajo_id, al_progreso=lambda *a: service.pausar(trabajo_id), tamano_lote=10,
+        )
+        assert estado == "Pausado"
+        assert self._estados(db_temporal, campana_id) == {"Enviado": 10, "Pendiente": 15}
+        assert service.trabajos_para_reanudar()[0] == []
+
+        assert service.reanudar(trabajo_id) == (True, None)
+        estado, _ = service.procesar(trabajo_id, tamano_lote=10)
+        assert estado == "Completado"
+        assert service.obtener_trabajo(trabajo_id)[0].enviados == 25
+        assert sorted(servidor.destinos()) == sorted(f"dest{i}@test.mx" for i in range(25))
+
+    def test_interrumpido_se_reanuda_sin_repetir(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        trabajo, _ = service.crear_trabajo(campana_id)
+        trabajo_id = trabajo.trabajo_id
+
+        # cierre de la app despues del primer lote
+        estado, _ = service.procesar(
+            trabajo_id, al_progreso=lambda *a: TrabajoEnvioService.interrumpir_todos(), tamano_lote=10,
+        )
+        assert estado == "En Curso"
+        pendientes, _ = service.trabajos_para_reanudar()
+        assert [t.trabajo_id for t in pendientes] == [trabajo_id]
+        assert pendientes[0].enviados == 10
+
+        # siguiente arranque
+        estado, _ = service.procesar(trabajo_id, tamano_lote=10)
+        assert estado == "Completado"
+        destinos = servidor.destinos()
+        assert len(destinos) == len(set(destinos)) == 25
+
+    def test_error_de_conexion_deja_pendientes(self, db_temporal):
+        service = TrabajoEnvioService()
+        with ServidorSmtpFalso(rechazar_auth=True) as servidor:
+            campana_id = self._campana(db_temporal, servidor, destinatarios=5, usuario="avisos@test.mx")
+            trabajo, _ = service.crear_trabajo(campana_id)
+            estado, error = service.procesar(trabajo.trabajo_id)
+
+        assert estado == "Error"
+        assert error.startswith("Error de conexión SMTP")
+        assert self._estados(db_temporal, campana_id) == {"Pendiente": 5}
+        assert service.obtener_trabajo(trabajo.trabajo_id)[0].error
+        assert service.reanudar(trabajo.trabajo_id) == (True, None)
+
+    def test_cancelar_trabajo_pausado(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        trabajo, _ = service.crear_trabajo(campana_id)
+
+        assert service.pausar(trabajo.trabajo_id) == (True, None)
+        assert service.cancelar(trabajo.trabajo_id) == (True, None)
+        assert service.obtener_trabajo(trabajo.trabajo_id)[0].estado == "Cancelado"
+        assert service.procesar(trabajo.trabajo_id) == ("Cancelado", None)
+        assert servidor.recibidos == 0
+        # ya no hay trabajo vivo: se puede crear otro
+        assert service.crear_trabajo(campana_id)[1] is None
+
+    def test_estados_y_avance_se_escriben_juntos(self, db_temporal, servidor):
+        service = TrabajoEnvioService()
+        campana_id = self._campana(db_temporal, servidor)
+        trabajo, _ = service.crear_trabajo(campana_id)
+        escrituras = []
+        original = service._campana_service.escritor_estados
+
+        def escritor_chico(*args, **kwargs):
+            escritor = original(*args, **kwargs)
+            escritor._cada = 4
+            return escritor
+
+        def espiar_avance(trabajo_id, enviados, fallidos, ultimo_id):
+            marcados = db_temporal.execute(
+                "SELECT COUNT(*) FROM CampanaDestinatarios WHERE CampanaID = ? AND EstadoEnvio = 'Enviado'",
+                (campana_id,),
+            ).fetchone()[0]
+            escrituras.append((enviados, marcados))
+            guardar(trabajo_id, enviados, fallidos, ultimo_id)
+
+        guardar = service._repo.guardar_avance
+        with patch.object(service._campana_service, "escritor_estados", escritor_chico), \
+             patch.object(service._repo, "guardar_avance", espiar_avance):
+            estado, _ = service.procesar(trabajo.trabajo_id, tamano_lote=10)
+
+        assert estado == "Completado"
+        # cada 4 resultados y al cierre de cada lote, nunca uno por correo
+        assert len(escrituras) < 25
+        assert escrituras[-1][0] == 25
+        # el contador del trabajo nunca queda detras de los estados guardados
+        assert all(enviados == marcados for enviados, marcados in escrituras)
+        total = db_temporal.execute(
+            "SELECT TotalEnviados FROM Campanas WHERE CampanaID = ?", (campana_id,)
+        ).fetchone()[0]
+        assert total == 25
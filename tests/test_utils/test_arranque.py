@@ -0,0 +1,131 @@
+# tests de la traza de arranque y presupuesto de importacion de main.py
+
+import json
+import os
+import subprocess
+import sys
+import pytest
+from app.config.settings import BASE_DIR, PRESUPUESTO_IMPORTS_ARRANQUE_MS
+from app.utils.arranque import TrazaArranque
+
+# modulos pesados que no deben cargarse antes del primer pintado: solo los
+# usan secciones que se abren despues (reportes, importacion, graficas viejas)
+_PROHIBIDOS_AL_ARRANQUE = ("matplotlib", "openpyxl", "reportlab", "pandas", "numpy")
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 10.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestTrazaArranque:
+
+    def test_fases_marcas_y_vistas(self):
+        reloj = _Reloj()
+        traza = TrazaArranque(reloj=reloj)
+
+        reloj.ahora = 10.5
+        with traza.fase("initialize_database"):
+            reloj.ahora = 10.75
+        traza.marcar("login_mostrado")
+        reloj.ahora = 11.0
+        traza.registrar_vista("dashboard", 0.125)
+
+        reporte = traza.reporte()
+        assert reporte["fases"] == [{"nombre": "initialize_database", "inicio_ms": 500.0, "duracion_ms": 250.0}]
+        assert reporte["marcas"] == {"login_mostrado": 750.0}
+        assert reporte["vistas"] == [{"nombre": "dashboard", "inicio_ms": 875.0, "duracion_ms": 125.0}]
+        assert "imports" not in reporte
+
+    def test_fase_se_registra_aunque_falle(self):
+        traza = TrazaArranque()
+        with pytest.raises(RuntimeError):
+            with traza.fase("has_users"):
+                raise RuntimeError("boom")
+        assert [f["nombre"] for f in traza.reporte()["fases"]] == ["has_users"]
+
+    def test_captura_imports_anidados(self, tmp_path, monkeypatch):
+        # paquete propio: padre importa a hijo, asi el propio del padre
+        # es su acumulado menos el del hijo
+        paquete = tmp_path / "pkg_traza"
+        paquete.mkdir()
+        (paquete / "__init__.py").write_text("")
+        (paquete / "hijo.py").write_text("import time\ntime.sleep(0.02)\n")
+        (paquete / "padre.py").write_text("import time\nfrom pkg_traza import hijo\ntime.sleep(0.01)\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+
+        traza = TrazaArranque()
+        traza.capturar_imports()
+        try:
+            import pkg_traza.padre as padre
+        finally:
+            traza.detener_imports()
+            for nombre in ("pkg_traza.padre", "pkg_traza.hijo", "pkg_traza"):
+                sys.modules.pop(nombre, None)
+
+        medidos = {i["modulo"]: i for i in traza.imports}
+        assert [i["modulo"] for i in traza.imports] == ["pkg_traza", "pkg_traza.hijo", "pkg_traza.padre"]
+        hijo, padre_ = medidos["pkg_traza.hijo"], medidos["pkg_traza.padre"]
+        assert hijo["nivel"] == 1 and padre_["nivel"] == 0
+        assert hijo["acumulado_ms"] >= 20
+        assert padre_["acumulado_ms"] >= hijo["acumulado_ms"] + 10
+        assert padre_["propio_ms"] == pytest.approx(padre_["acumulado_ms"] - hijo["acumulado_ms"], abs=0.01)
+        # el loader original vuelve al modulo al terminar
+        assert type(padre.__loader__).__name__ != "_CargadorCronometrado"
+        assert not traza.capturando_imports
+
+    def test_guardar_escribe_json(self, tmp_path):
+        traza = TrazaArranque()
+        traza.marcar("primer_pintado")
+        ruta = str(tmp_path / "logs" / "arranque.json")
+
+        assert traza.guardar(ruta) == ruta
+        with open(ruta, encoding="utf-8") as f:
+            assert "primer_pintado" in json.load(f)["marcas"]
+
+
+def _importtime(codigo):
+    # -X importtime de un proceso nuevo: {modulo: (propio_us, acumulado_us, nivel)}
+    salida = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", codigo],
+        cwd=BASE_DIR, capture_output=True, text=True, check=True,
+    ).stderr
+    modulos = {}
+    for linea in salida.splitlines():
+        if not linea.startswith("import time:") or "self [us]" in linea:
+            continue
+        propio, acumulado, nombre = linea[len("import time:"):].split("|")
+        modulos[nombre.strip()] = (int(propio), int(acumulado), (len(nombre) - len(nombre.lstrip())) // 2)
+    return modulos
+
+
+class TestPresupuestoImportacion:
+    """
+    Lo que main.py importa antes del primer pintado: main y la unica vista
+    que MainView construye al iniciar (el dashboard). El presupuesto se
+    cambia con CRM_PRESUPUESTO_IMPORTS_MS para maquinas lentas.
+    """
+
+    @pytest.fixture(scope="class")
+    def modulos(self):
+        pytest.importorskip("PyQt5.QtWidgets")
+        pytest.importorskip("bcrypt")
+        # la mejor de tres, para no fallar por un proceso vecino
+        corridas = [_importtime("import main, app.views.dashboard_view") for _ in range(3)]
+        return min(corridas, key=lambda m: sum(a for _, a, nivel in m.values() if nivel == 0))
+
+    def test_dentro_del_presupuesto(self, modulos):
+        presupuesto = float(os.environ.get("CRM_PRESUPUESTO_IMPORTS_MS", PRESUPUESTO_IMPORTS_ARRANQUE_MS))
+        total_ms = sum(a for _, a, nivel in modulos.values() if nivel == 0) / 1000
+        mas_lentos = sorted(modulos.items(), key=lambda m: m[1][0], reverse=True)[:10]
+        detalle = ", ".join(f"{n} {p / 1000:.0f} ms" for n, (p, _, _) in mas_lentos)
+        assert total_ms <= presupuesto, f"imports {total_ms:.0f} ms > {presupuesto:.0f} ms ({detalle})"
+
+    def test_sin_modulos_pesados(self, modulos):
+        cargados = sorted(
+            m for m in modulos if m.split(".")[0] in _PROHIBIDOS_AL_ARRANQUE
+        )
+        assert not cargados, f"se importan antes del primer pintado: {cargados[:5]}"
@@ -0,0 +1,86 @@
+# tests del cache de resultados invalidado por version de tabla (BD temporal real)
+
+from unittest.mock import Mock
+from app.utils.cache_resultados import CacheResultados, estimar_bytes
+
+
+def _filas(n, texto="x"):
+    return [{"Id": i, "Nombre": texto * 20} for i in range(n)]
+
+
+class TestCacheResultados:
+
+    def test_segunda_consulta_usa_cache(self, db_temporal):
+        cache = CacheResultados(1)
+        cargar = Mock(return_value=_filas(3))
+
+        primero = cache.obtener(("r",), ("Contactos",), cargar)
+        segundo = cache.obtener(("r",), ("Contactos",), cargar)
+
+        assert cargar.call_count == 1
+        assert segundo is primero
+        assert (cache.aciertos, cache.fallos) == (1, 1)
+
+    def test_escritura_en_tabla_dependiente_invalida(self, db_temporal):
+        cache = CacheResultados(1)
+        cargar = Mock(return_value=_filas(3))
+        cache.obtener(("r",), ("Empresas",), cargar)
+
+        db_temporal.execute("INSERT INTO Empresas (RazonSocial) VALUES ('Nueva S.A.')")
+        db_temporal.commit()
+        cache.obtener(("r",), ("Empresas",), cargar)
+
+        assert cargar.call_count == 2
+
+    def test_escritura_en_otra_tabla_no_invalida(self, db_temporal):
+        cache = CacheResultados(1)
+        cargar = Mock(return_value=_filas(3))
+        cache.obtener(("r",), ("Campanas",), cargar)
+
+        db_temporal.execute("UPDATE Empresas SET RazonSocial = RazonSocial || '.'")
+        db_temporal.commit()
+        cache.obtener(("r",), ("Campanas",), cargar)
+
+        assert cargar.call_count == 1
+
+    def test_claves_distintas_no_se_mezclan(self, db_temporal):
+        cache = CacheResultados(1)
+        cache.obtener(("r", 1), ("Contactos",), lambda: _filas(1))
+
+        assert cache.obtener(("r", 2), ("Contactos",), lambda: _filas(2)) == _filas(2)
+        assert len(cache) == 2
+
+    def test_presupuesto_descarta_la_menos_usada(self, db_temporal):
+        tamano = estimar_bytes(_filas(100))
+        cache = CacheResultados(2.5 * tamano / 2**20)
+        cache.obtener("a", ("Contactos",), lambda: _filas(100))
+        cache.obtener("b", ("Contactos",), lambda: _filas(100))
+        # "a" pasa a ser la mas reciente
+        cache.obtener("a", ("Contactos",), Mock())
+
+        cache.obtener("c", ("Contactos",), lambda: _filas(100))
+
+        assert len(cache) == 2
+        assert cache.bytes_usados <= 2.5 * tamano
+        recargar = Mock(return_value=[])
+        cache.obtener("b", ("Contactos",), recargar)
+        assert recargar.call_count == 1
+
+    def test_resultado_mas_grande_que_el_presupuesto_no_se_guarda(self, db_temporal):
+        cache = CacheResultados(estimar_bytes(_filas(10)) / 2**20)
+        datos = cache.obtener("grande", ("Contactos",), lambda: _filas(1000))
+
+        assert len(datos) == 1000
+        assert len(cache) == 0
+        assert cache.bytes_usados == 0
+
+    def test_sin_tabla_de_versiones_no_guarda(self, db_temporal):
+        db_temporal.execute("DROP TABLE VersionTablas")
+        db_temporal.commit()
+        cache = CacheResultados(1)
+        cargar = Mock(return_value=_filas(1))
+
+        cache.obtener("r", ("Contactos",), cargar)
+        cache.obtener("r", ("Contactos",), cargar)
+
+        assert cargar.call_count == 2
@@ -1,7 +1,10 @@
 # tests unitarios para sistema de cache de catalogos
 
+import sqlite3
 import pytest
 from unittest.mock import Mock, patch
+from app.database import connection
+from app.database.initializer import apply_migrations
 from app.utils.catalog_cache import CatalogCache
 
 
@@ -96,3 +99,99 @@ class TestCatalogCache:
         assert CatalogCache._ttl_seconds == 600
 
         CatalogCache.set_ttl(300)  # restaurar valor por defecto
+
+
+class TestCatalogCacheBD:
+    # precarga e invalidacion por version contra una BD real
+
+    @pytest.fixture(autouse=True)
+    def catalogos_vacios(self, db_temporal):
+        CatalogCache.invalidate_all()
+        ttl = CatalogCache._ttl_seconds
+        yield
+        CatalogCache.invalidate_all()
+        CatalogCache.set_ttl(ttl)
+
+    @staticmethod
+    def _contar_consultas(conn):
+        consultas = []
+        conn.set_trace_callback(consultas.append)
+        return consultas
+
+    def test_precarga_una_consulta_y_cascada_en_memoria(self, db_temporal):
+        consultas = self._contar_consultas(db_temporal)
+        filas = CatalogCache.precargar()
+        assert filas > 0
+        assert len(consultas) == 2  # versiones + UNION ALL
+
+        consultas.clear()
+        paises = CatalogCache.get_paises()
+        mexico = next(pid for pid, nombre in paises if nombre == 'México')
+        estados = CatalogCache.get_estados(mexico)
+        assert estados and estados == sorted(estados, key=lambda e: e[1])
+        ciudades = CatalogCache.get_ciudades(estados[0][0])
+        assert CatalogCache.get_estados(999999) == []
+        CatalogCache.get_etapas_venta()
+        CatalogCache.get_prioridades()
+        assert consultas == []
+
+        # la cascada coincide con la consulta filtrada
+        esperado = db_temporal.execute(
+            "SELECT CiudadID, Nombre FROM Ciudades WHERE EstadoID = ? ORDER BY Nombre",
+            (estados[0][0],),
+        ).fetchall()
+        assert ciudades == [tuple(f) for f in esperado]
+
+    def test_orden_de_etapas_y_prioridades(self, db_temporal):
+        CatalogCache.precargar()
+        etapas = db_temporal.execute(
+            "SELECT EtapaID, Nombre FROM EtapasVenta ORDER BY Orden, Nombre"
+        ).fetchall()
+        assert CatalogCache.get_etapas_venta() == [tuple(f) for f in etapas]
+        prioridades = db_temporal.execute(
+            "SELECT PrioridadID, Nombre FROM Prioridades ORDER BY Nivel"
+        ).fetchall()
+        assert CatalogCache.get_prioridades() == [tuple(f) for f in prioridades]
+
+    def test_escritura_invalida_solo_su_tabla(self, db_temporal):
+        CatalogCache.set_ttl(0)
+        CatalogCache.precargar()
+        paises = CatalogCache.get_paises()
+
+        # escritura desde otra conexion (otro proceso u otro hilo)
+        with sqlite3.connect(connection.DB_PATH) as otra:
+            otra.execute("INSERT INTO Industrias (Nombre) VALUES ('Astilleros')")
+        assert 'Astilleros' in [n for _, n in CatalogCache.get_industrias()]
+        assert CatalogCache._cache['paises'] is paises
+
+        # escritura desde la misma conexion de la GUI
+        db_temporal.execute("UPDATE Paises SET Nombre = 'Canadá' WHERE Nombre = 'Estados Unidos'")
+        db_temporal.commit()
+        assert 'Canadá' in [n for _, n in CatalogCache.get_paises()]
+
+    def test_sin_cambios_no_recarga(self, db_temporal):
+        CatalogCache.set_ttl(0)
+        CatalogCache.precargar()
+        consultas = self._contar_consultas(db_temporal)
+        CatalogCache.get_industrias()
+        CatalogCache.get_estados(1)
+        # solo la lectura de versiones
+        assert all('VersionCatalogos' in c for c in consultas)
+
+    def test_filtro_sin_precarga_usa_parametro(self, db_temporal):
+        consultas = self._contar_consultas(db_temporal)
+        CatalogCache.get_estados(pais_id=1)
+        # el trace muestra el valor ya enlazado; la clave identifica la ruta filtrada
+        assert len(consultas) == 1 and 'PaisID = 1' in consultas[0]
+        assert 'estados_pais_1' in CatalogCache._cache
+
+    def test_migracion_crea_versiones(self, db_temporal):
+        db_temporal.execute("DROP TABLE VersionCatalogos")
+        db_temporal.commit()
+        apply_migrations(db_temporal)
+        versiones = dict(db_temporal.execute("SELECT Tabla, Version FROM VersionCatalogos").fetchall())
+        assert versiones['Industrias'] == 0
+        db_temporal.execute("INSERT INTO Industrias (Nombre) VALUES ('Nueva')")
+        assert db_temporal.execute(
+            "SELECT Version FROM VersionCatalogos WHERE Tabla = 'Industrias'"
+        ).fetchone()[0] == 1
@@ -0,0 +1,67 @@
+# tests del gestor de envios: pool de hilos propio, separado del ejecutor global
+
+import os
+import threading
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from app.config.settings import ENVIO_HILOS
+from app.utils.cola_envios import GestorEnvios
+from app.utils.ejecutor import obtener_ejecutor
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+class ServicioLento:
+    # imita TrabajoEnvioService: procesar() ocupa el hilo hasta que se suelta
+
+    def __init__(self):
+        self.soltar = threading.Event()
+        self.lock = threading.Lock()
+        self.corriendo = 0
+        self.maximo = 0
+
+    def procesar(self, trabajo_id, al_progreso=None):
+        with self.lock:
+            self.corriendo += 1
+            self.maximo = max(self.maximo, self.corriendo)
+        self.soltar.wait(5)
+        with self.lock:
+            self.corriendo -= 1
+        return "Completado", None
+
+
+@pytest.fixture
+def gestor(qapp):
+    gestor = GestorEnvios()
+    gestor._service = ServicioLento()
+    # sin BD: los avisos de estado no hacen falta aqui
+    gestor._avisar_estado = lambda trabajo_id, estado: None
+    yield gestor
+    gestor._service.soltar.set()
+    gestor._ejecutor.apagar()
+
+
+class TestPoolDeEnvios:
+
+    def test_no_ocupa_el_ejecutor_global(self, gestor):
+        for trabajo_id in (1, 2, 3):
+            gestor._lanzar(trabajo_id, campana_id=10)
+        assert gestor.en_curso(1) and gestor.en_curso(3)
+        assert not obtener_ejecutor().en_curso_con_prefijo("envios.")
+        assert obtener_ejecutor()._pool.activeThreadCount() == 0
+
+    def test_limita_los_envios_simultaneos(self, gestor):
+        for trabajo_id in (1, 2, 3):
+            gestor._lanzar(trabajo_id, campana_id=10)
+        assert gestor._ejecutor._pool.maxThreadCount() == ENVIO_HILOS
+        gestor._service.soltar.set()
+        gestor._ejecutor._pool.waitForDone(5000)
+        assert gestor._service.maximo == ENVIO_HILOS
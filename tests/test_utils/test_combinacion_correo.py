@@ -0,0 +1,89 @@
+# tests de la combinacion de correspondencia (plantillas compiladas)
+
+import email
+from email import policy
+
+from app.models.Plantilla import Plantilla
+from app.utils.combinacion_correo import PlantillaCompilada, campos_de, campos_desconocidos
+
+
+def _leer(datos):
+    mensaje = email.message_from_bytes(datos, policy=policy.default)
+    partes = {p.get_content_type(): p.get_content() for p in mensaje.iter_parts()}
+    return mensaje, partes
+
+
+def _destinatario(**campos):
+    return {"DestinatarioID": 1, "EmailDestino": "ana@test.mx", **campos}
+
+
+class TestCampos:
+
+    def test_campos_de(self):
+        assert campos_de("Hola {{Nombre}} de {{ Empresa }}, {{Nombre}}") == ["Nombre", "Empresa"]
+        assert campos_de(None) == []
+
+    def test_campos_desconocidos(self):
+        assert campos_desconocidos("{{Nombre}} {{Telefono}}", "{{empresa}}") == ["Telefono"]
+
+
+class TestPlantillaCompilada:
+
+    def test_sustituye_campos_en_asunto_texto_y_html(self):
+        compilada = PlantillaCompilada(
+            Plantilla(
+                asunto="Hola {{Nombre}}",
+                contenido_texto="Hola {{Nombre}},\ngracias a {{Empresa}}.",
+                contenido_html="<p>Hola <b>{{nombre}}</b> de {{EMPRESA}}</p>",
+            ),
+            "Avisos <avisos@test.mx>",
+        )
+        mensaje, partes = _leer(compilada.renderizar(_destinatario(Nombre="José", Empresa="A&B Ñandú")))
+
+        assert mensaje["Subject"] == "Hola José"
+        assert mensaje["From"] == "Avisos <avisos@test.mx>"
+        assert mensaje["To"] == "ana@test.mx"
+        assert partes["text/plain"] == "Hola José,\r\ngracias a A&B Ñandú."
+        # los valores van escapados en el HTML, el HTML de la plantilla no
+        assert partes["text/html"] == "<p>Hola <b>José</b> de A&amp;B Ñandú</p>"
+
+    def test_campo_sin_valor_queda_vacio(self):
+        compilada = PlantillaCompilada(
+            Plantilla(asunto="Para {{Empresa}}", contenido_html="<p>{{Puesto}}</p>"), "avisos@test.mx",
+        )
+        mensaje, partes = _leer(compilada.renderizar(_destinatario(Empresa=None)))
+        assert mensaje["Subject"] == "Para"
+        assert partes["text/html"] == "<p></p>"
+
+    def test_lineas_largas_y_no_ascii(self):
+        texto = "ñ" * 300 + " {{Nombre}} " + "x" * 300
+        compilada = PlantillaCompilada(
+            Plantilla(asunto="Promoción para {{Nombre}} " + "ñandú " * 20, contenido_texto=texto),
+            "Ñandú Avisos <avisos@test.mx>",
+        )
+        datos = compilada.renderizar(_destinatario(Nombre="Ana " * 40))
+        mensaje, partes = _leer(datos)
+
+        assert max(len(linea) for linea in datos.split(b"\r\n")) <= 78
+        assert datos.isascii()
+        assert mensaje["Subject"] == " ".join(("Promoción para " + "Ana " * 40 + "ñandú " * 20).split())
+        assert mensaje["From"] == "Ñandú Avisos <avisos@test.mx>"
+        assert partes["text/plain"] == "ñ" * 300 + " " + "Ana " * 40 + " " + "x" * 300
+
+    def test_el_esqueleto_se_reusa(self):
+        compilada = PlantillaCompilada(Plantilla(asunto="Hola", contenido_texto="{{Nombre}}"), "avisos@test.mx")
+        uno = compilada.renderizar(_destinatario(Nombre="Ana"))
+        otro = compilada.renderizar({"EmailDestino": "luis@test.mx", "Nombre": "Luis"})
+        assert _leer(uno)[1]["text/plain"] == "Ana"
+        assert _leer(otro)[1]["text/plain"] == "Luis"
+        assert uno.split(b"\r\n")[0] == otro.split(b"\r\n")[0]
+
+    def test_saltos_de_linea_no_agregan_encabezados(self):
+        compilada = PlantillaCompilada(
+            Plantilla(asunto="Fijo\r\nBcc: espia@test.mx", contenido_texto="Hola"), "avisos@test.mx",
+        )
+        datos = compilada.renderizar(_destinatario(EmailDestino="ana@test.mx\r\nBcc: espia@test.mx"))
+        mensaje, _ = _leer(datos)
+        assert mensaje["Bcc"] is None
+        assert mensaje["Subject"] == "Fijo Bcc: espia@test.mx"
+        assert b"\r\nTo: ana@test.mxBcc:espia@test.mx\r\n\r\n" in datos
@@ -0,0 +1,62 @@
+# tests del pintado por panel del dashboard (offscreen)
+
+import os
+from types import SimpleNamespace
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from app.services.dashboard_service import PanelDashboard
+from app.views.dashboard_view import DashboardView
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+def _kpis(contactos):
+    return {"ContactosActivos": contactos, "ValorPipeline": 0, "TasaConversionGlobal": 0}
+
+
+@pytest.fixture
+def vista(qapp):
+    vista = DashboardView(SimpleNamespace(usuario_id=1))
+    # cuenta las veces que se pinta cada panel sin cambiar lo que hace
+    vista.pintados = []
+    for nombre, pintor in list(vista._pintores.items()):
+        def contar(datos, nombre=nombre, pintor=pintor):
+            vista.pintados.append(nombre)
+            pintor(datos)
+        vista._pintores[nombre] = contar
+    return vista
+
+
+class TestPintarPanel:
+
+    def test_misma_huella_no_repinta(self, vista):
+        vista._pintar_panel(PanelDashboard("kpis", _kpis(5)))
+        assert vista.lblContactosValue.text() == "5"
+        vista.lblContactosValue.setText("sin tocar")
+
+        # otra lectura con los mismos datos: misma huella, no se pinta
+        vista._pintar_panel(PanelDashboard("kpis", _kpis(5)))
+        assert vista.pintados == ["kpis"]
+        assert vista.lblContactosValue.text() == "sin tocar"
+
+    def test_datos_distintos_repintan(self, vista):
+        vista._pintar_panel(PanelDashboard("kpis", _kpis(5)))
+        vista._pintar_panel(PanelDashboard("kpis", _kpis(7)))
+        assert vista.pintados == ["kpis", "kpis"]
+        assert vista.lblContactosValue.text() == "7"
+
+    def test_huella_por_panel(self, vista):
+        # la huella de un panel no evita pintar otro
+        filas = [{"Etapa": "Prospecto", "MontoTotal": 1000.0}]
+        vista._pintar_panel(PanelDashboard("kpis", _kpis(5)))
+        vista._pintar_panel(PanelDashboard("pipeline", filas))
+        vista._pintar_panel(PanelDashboard("pipeline", filas))
+        assert vista.pintados == ["kpis", "pipeline"]
@@ -0,0 +1,125 @@
+# tests del pool de sesiones SMTP contra un servidor SMTP falso local
+
+import threading
+import pytest
+from app.models.ConfiguracionCorreo import ConfiguracionCorreo
+from app.utils.envio_smtp import LimitadorTasa, MensajeSmtp, PoolSmtp
+from tests.smtp_falso import ServidorSmtpFalso
+
+
+def _config(servidor, usuario="avisos@test.mx"):
+    return ConfiguracionCorreo(
+        nombre="Prueba", host=servidor.host, puerto=servidor.puerto,
+        usar_tls=0, usar_ssl=0, email_remitente="avisos@test.mx",
+        usuario=usuario, contrasena="secreta" if usuario else None,
+    )
+
+
+def _mensajes(cantidad, dominio="test.mx"):
+    return [
+        MensajeSmtp(i, "avisos@test.mx", f"dest{i}@{dominio}", f"Subject: hola {i}\r\n\r\ncuerpo {i}")
+        for i in range(cantidad)
+    ]
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+    def dormir(self, segundos):
+        self.ahora += segundos
+
+
+class TestLimitadorTasa:
+
+    def test_respeta_mensajes_por_segundo(self):
+        reloj = _Reloj()
+        limitador = LimitadorTasa(5, rafaga=1, reloj=reloj, dormir=reloj.dormir)
+        for _ in range(11):
+            limitador.esperar()
+        # la primera ficha ya estaba; las otras 10 llegan a 5 por segundo
+        assert reloj.ahora == pytest.approx(2.0)
+
+    def test_cero_es_sin_limite(self):
+        reloj = _Reloj()
+        limitador = LimitadorTasa(0, reloj=reloj, dormir=reloj.dormir)
+        for _ in range(100):
+            limitador.esperar()
+        assert reloj.ahora == 0.0
+
+
+class TestPoolSmtp:
+
+    def test_envia_todos_por_varias_sesiones(self):
+        with ServidorSmtpFalso(latencia=0.005) as servidor:
+            resultados = []
+            hilo_llamador = threading.get_ident()
+
+            def registrar(resultado):
+                assert threading.get_ident() == hilo_llamador
+                resultados.append(resultado)
+
+            error = PoolSmtp(_config(servidor), sesiones=4).enviar(_mensajes(20), al_resultado=registrar)
+
+            assert error is None
+            assert sorted(r.clave for r in resultados) == list(range(20))
+            assert all(r.enviado for r in resultados)
+            assert sorted(servidor.destinos()) == sorted(f"dest{i}@test.mx" for i in range(20))
+            assert servidor.conexiones == 4
+
+    def test_destinatario_rechazado_no_tumba_la_sesion(self):
+        with ServidorSmtpFalso(rechazados={"dest3@test.mx"}) as servidor:
+            resultados = []
+            error = PoolSmtp(_config(servidor), sesiones=1).enviar(_mensajes(6), al_resultado=resultados.append)
+
+            assert error is None
+            fallidos = [r for r in resultados if not r.enviado]
+            assert [r.clave for r in fallidos] == [3]
+            assert fallidos[0].error
+            assert servidor.recibidos == 5
+            assert servidor.conexiones == 1
+
+    def test_reconecta_si_se_cae_la_sesion(self):
+        # cada conexion se corta al recibir su tercer mensaje
+        with ServidorSmtpFalso(cortar_cada=3) as servidor:
+            resultados = []
+            error = PoolSmtp(_config(servidor), sesiones=2, reintentos=2).enviar(
+                _mensajes(10), al_resultado=resultados.append,
+            )
+
+            assert error is None
+            assert all(r.enviado for r in resultados)
+            assert sorted(servidor.destinos()) == sorted(f"dest{i}@test.mx" for i in range(10))
+            assert servidor.conexiones > 2
+
+    def test_sin_conexion_devuelve_error_y_no_marca_nada(self):
+        with ServidorSmtpFalso(rechazar_auth=True) as servidor:
+            resultados = []
+            error = PoolSmtp(_config(servidor), sesiones=3).enviar(_mensajes(5), al_resultado=resultados.append)
+
+            assert error
+            assert resultados == []
+            assert servidor.recibidos == 0
+
+    def test_cancelar_deja_de_tomar_mensajes(self):
+        with ServidorSmtpFalso() as servidor:
+            resultados = []
+            error = PoolSmtp(_config(servidor), sesiones=1).enviar(
+                _mensajes(10), al_resultado=resultados.append,
+                cancelado=lambda: len(resultados) >= 3,
+            )
+
+            assert error is None
+            assert 3 <= len(resultados) < 10
+
+    def test_error_del_callback_sale_de_enviar(self):
+        with ServidorSmtpFalso() as servidor:
+            def registrar(resultado):
+                raise RuntimeError("BD bloqueada")
+
+            with pytest.raises(RuntimeError):
+                PoolSmtp(_config(servidor), sesiones=2).enviar(_mensajes(10), al_resultado=registrar)
+            assert servidor.recibidos < 10
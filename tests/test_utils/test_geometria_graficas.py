@@ -0,0 +1,101 @@
+# tests de la geometria de las graficas (la parte de graficas.py que no depende de Qt)
+
+import pytest
+from app.utils.geometria_graficas import (
+    RELLENO_BARRA, barras, escala_bonita, indice_punto, indice_rect,
+    indice_segmento, puntos_linea, segmentos_dona,
+)
+
+_AREA = (10, 20, 200, 100)
+
+
+class TestEscalaBonita:
+
+    @pytest.mark.parametrize("maximo, esperado", [
+        (873, (1000.0, 250.0)),
+        (450.5, (600.0, 200.0)),
+        (4, (4.0, 1.0)),
+        (0.3, (0.3, 0.1)),
+        (0, (1.0, 0.25)),
+        (-5, (1.0, 0.25)),
+    ])
+    def test_tope_y_paso(self, maximo, esperado):
+        tope, paso = escala_bonita(maximo)
+        assert (tope, paso) == pytest.approx(esperado)
+        assert tope >= maximo
+
+    def test_valor_exacto_no_agrega_una_marca_extra(self):
+        assert escala_bonita(400) == (400.0, 100.0)
+
+
+class TestBarras:
+
+    def test_horizontales_ocupan_su_banda(self):
+        rects = barras([50, 100], _AREA, tope=100)
+
+        assert len(rects) == 2
+        (x0, y0, w0, h0), (x1, y1, w1, h1) = rects
+        assert (x0, x1) == (10, 10)
+        assert (w0, w1) == (100, 200)
+        assert h0 == h1 == pytest.approx(50 * RELLENO_BARRA)
+        assert y0 == pytest.approx(20 + (50 - h0) / 2)
+        assert y1 == pytest.approx(y0 + 50)
+
+    def test_verticales_crecen_desde_abajo(self):
+        (x, y, w, h), = barras([25], _AREA, tope=100, horizontal=False)
+
+        assert h == 25
+        assert y + h == 120
+        assert w == pytest.approx(200 * RELLENO_BARRA)
+
+    def test_sin_datos_o_negativos(self):
+        assert barras([], _AREA, tope=100) == []
+        assert barras([-5], _AREA, tope=100)[0][2] == 0
+
+
+class TestDona:
+
+    def test_segmentos_suman_360_desde_arriba(self):
+        segmentos = segmentos_dona([1, 2, 1])
+
+        assert segmentos[0] == (90.0, 90.0)
+        assert segmentos[1] == (180.0, 180.0)
+        assert segmentos[2] == (0.0, 90.0)
+        assert sum(b for _, b in segmentos) == pytest.approx(360)
+
+    def test_total_cero_no_tiene_segmentos(self):
+        assert segmentos_dona([0, 0]) == []
+
+    @pytest.mark.parametrize("px, py, esperado", [
+        (80, 70, 0),      # arriba a la izquierda
+        (100, 140, 1),    # abajo
+        (130, 80, 2),     # arriba a la derecha
+        (100, 100, None), # en el hueco
+        (100, 0, None),   # fuera del anillo
+    ])
+    def test_indice_segmento(self, px, py, esperado):
+        segmentos = segmentos_dona([1, 2, 1])   # [90,180), [180,360), [0,90)
+        assert indice_segmento(segmentos, (100, 100), 50, 20, px, py) == esperado
+
+
+class TestIndices:
+
+    def test_indice_rect_por_banda(self):
+        rects = barras([1, 100], _AREA, tope=100)
+
+        # a la derecha de la barra corta, pero dentro de su renglon
+        assert indice_rect(rects, 150, 45, area=_AREA) == 0
+        assert indice_rect(rects, 150, 45) is None
+        assert indice_rect(rects, 150, 95, area=_AREA) == 1
+        assert indice_rect(rects, 5, 45, area=_AREA) is None
+
+    def test_puntos_e_indice_mas_cercano(self):
+        puntos = puntos_linea([0, 50, 100], _AREA, tope=100)
+
+        assert puntos == [(10, 120), (110, 70), (210, 20)]
+        assert indice_punto(puntos, 120, radio=50) == 1
+        assert indice_punto(puntos, 170, radio=50) == 2
+        assert indice_punto(puntos, 400, radio=50) is None
+
+    def test_un_solo_punto_va_al_centro(self):
+        assert puntos_linea([50], _AREA, tope=100) == [(110, 70)]
@@ -0,0 +1,46 @@
+# tests de pintado de las graficas del dashboard (widgets QPainter)
+
+import os
+import sys
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication
+
+from app.views.graficas import GraficaBarras, GraficaDona, GraficaLinea
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+@pytest.fixture
+def errores_de_pintado(monkeypatch):
+    # PyQt entrega a sys.excepthook las excepciones de paintEvent
+    errores = []
+    monkeypatch.setattr(sys, "excepthook", lambda tipo, valor, tb: errores.append(valor))
+    return errores
+
+
+@pytest.mark.parametrize("clase", [GraficaBarras, GraficaDona, GraficaLinea])
+class TestGraficaSinDatos:
+
+    def test_pintar_antes_de_set_datos(self, qapp, errores_de_pintado, clase):
+        grafica = clase(vacio="Sin datos")
+        grafica.resize(320, 200)
+        grafica.grab()
+        assert errores_de_pintado == []
+
+    def test_pintar_con_valores_en_cero(self, qapp, errores_de_pintado, clase):
+        grafica = clase()
+        grafica.set_datos([("Enero", 0), ("Febrero", 0)])
+        grafica.resize(320, 200)
+        grafica.grab()
+        assert errores_de_pintado == []
+
+    def test_renderizar_sin_datos(self, qapp, clase):
+        imagen = clase().renderizar(320, 200)
+        assert (imagen.width(), imagen.height()) == (320, 200)
@@ -0,0 +1,47 @@
+# tests del lector en streaming de CSV/XLSX
+
+import pytest
+from app.utils.lector_tabular import LectorTabular
+
+
+class TestLectorTabular:
+
+    def test_csv_punto_y_coma_latin1(self, tmp_path):
+        # CSV de Excel en espanol: separador ';' y codificacion Windows
+        ruta = tmp_path / "datos.csv"
+        ruta.write_bytes("Nombre;Ciudad\nJosé; Monterrey \n;\nAna;León\n".encode("latin-1"))
+        with LectorTabular(str(ruta)) as lector:
+            assert lector.encabezados == ["Nombre", "Ciudad"]
+            # la fila vacia se salta, pero la numeracion sigue la del archivo
+            assert list(lector) == [(2, ["José", "Monterrey"]), (4, ["Ana", "León"])]
+
+    def test_csv_utf8_con_bom(self, tmp_path):
+        ruta = tmp_path / "datos.csv"
+        ruta.write_bytes("\ufeffnombre,email\nAna,a@b.com\n".encode("utf-8"))
+        with LectorTabular(str(ruta)) as lector:
+            assert lector.encabezados == ["nombre", "email"]
+            assert list(lector) == [(2, ["Ana", "a@b.com"])]
+
+    def test_extension_no_soportada(self, tmp_path):
+        with pytest.raises(ValueError):
+            LectorTabular(str(tmp_path / "datos.xls"))
+
+    def test_xlsx_valores_como_texto(self, tmp_path):
+        openpyxl = pytest.importorskip("openpyxl")
+        from datetime import datetime
+
+        libro = openpyxl.Workbook()
+        hoja = libro.active
+        hoja.append(["nombre", "telefono", "fecha"])
+        hoja.append(["Ana", 8112345678, datetime(1990, 5, 1)])
+        hoja.append([None, None, None])
+        hoja.append(["Luis", None, "1985-02-03"])
+        ruta = str(tmp_path / "datos.xlsx")
+        libro.save(ruta)
+
+        with LectorTabular(ruta) as lector:
+            assert lector.encabezados == ["nombre", "telefono", "fecha"]
+            assert list(lector) == [
+                (2, ["Ana", "8112345678", "1990-05-01"]),
+                (4, ["Luis", "", "1985-02-03"]),
+            ]
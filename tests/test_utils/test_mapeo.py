@@ -0,0 +1,86 @@
+# tests unitarios para el mapeo compilado de filas (MapeadorFilas)
+
+import sqlite3
+import pytest
+from app.utils.mapeo import MapeadorFilas
+from app.utils.paginacion import paginar
+
+
+class Item:
+    def __init__(self, item_id=None, nombre=None, grupo=None):
+        self.item_id = item_id
+        self.nombre = nombre
+        self.grupo = grupo
+
+
+class TestMapeadorFilas:
+
+    @pytest.fixture
+    def conn(self):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute("CREATE TABLE Items (ItemID INTEGER PRIMARY KEY, Nombre TEXT, FechaCreacion TEXT)")
+        conn.execute("CREATE TABLE Grupos (ItemID INTEGER, Nombre TEXT)")
+        conn.executemany(
+            "INSERT INTO Items (ItemID, Nombre, FechaCreacion) VALUES (?, ?, '2026-01-01')",
+            [(1, "uno"), (2, "dos"), (3, "tres")],
+        )
+        conn.execute("INSERT INTO Grupos VALUES (2, 'A')")
+        yield conn
+        conn.close()
+
+    @pytest.fixture
+    def mapeo(self):
+        return MapeadorFilas(
+            Item, {"item_id": "ItemID", "nombre": "Nombre", "grupo": "NombreGrupo"},
+            opcionales=("NombreGrupo",),
+        )
+
+    def test_columna_opcional_presente(self, conn, mapeo):
+        # con JOIN la columna opcional se llena, NULL incluido
+        items = mapeo.consultar(
+            conn,
+            "SELECT i.*, g.Nombre AS NombreGrupo FROM Items i "
+            "LEFT JOIN Grupos g ON g.ItemID = i.ItemID ORDER BY i.ItemID",
+        )
+        assert [(i.item_id, i.nombre, i.grupo) for i in items] == [(1, "uno", None), (2, "dos", "A"), (3, "tres", None)]
+
+    def test_columna_opcional_ausente(self, conn, mapeo):
+        item = mapeo.consultar_uno(conn, "SELECT * FROM Items WHERE ItemID = ?", (3,))
+        assert (item.item_id, item.nombre, item.grupo) == (3, "tres", None)
+        assert mapeo.consultar_uno(conn, "SELECT * FROM Items WHERE ItemID = ?", (99,)) is None
+
+    def test_columna_requerida_faltante(self, conn, mapeo):
+        with pytest.raises(KeyError):
+            mapeo.consultar(conn, "SELECT ItemID FROM Items")
+
+    def test_cache_por_sql(self, conn, mapeo):
+        # la funcion se compila una sola vez por texto SQL
+        sql = "SELECT * FROM Items"
+        mapeo.consultar(conn, sql)
+        funcion = mapeo._cache[sql]
+        mapeo.consultar(conn, sql)
+        assert mapeo._cache[sql] is funcion
+        assert len(mapeo._cache) == 1
+
+    def test_no_altera_row_factory(self, conn, mapeo):
+        # consultar usa tuplas en su propio cursor; la conexion sigue con sqlite3.Row
+        mapeo.consultar(conn, "SELECT * FROM Items")
+        assert conn.execute("SELECT Nombre FROM Items").fetchone()["Nombre"] == "uno"
+
+    def test_conversiones(self, conn):
+        mapeo = MapeadorFilas(
+            Item, {"item_id": "ItemID", "nombre": "Nombre"},
+            conversiones={"nombre": str.upper},
+        )
+        assert mapeo.consultar_uno(conn, "SELECT * FROM Items WHERE ItemID = 1").nombre == "UNO"
+
+    def test_con_paginar(self, conn, mapeo):
+        # paginar acepta el mapeador y lo compila sobre filas sqlite3.Row
+        pagina = paginar(conn, "SELECT i.* FROM Items i", "i.FechaCreacion", "i.ItemID", mapeo, limit=2)
+        assert [i.item_id for i in pagina] == [3, 2]
+        siguiente = paginar(
+            conn, "SELECT i.* FROM Items i", "i.FechaCreacion", "i.ItemID", mapeo,
+            limit=2, token=pagina.siguiente,
+        )
+        assert [i.item_id for i in siguiente] == [1]
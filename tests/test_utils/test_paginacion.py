@@ -0,0 +1,130 @@
+# tests unitarios para paginacion por cursor (keyset)
+
+import sqlite3
+import pytest
+from app.utils.paginacion import (
+    paginar, construir_filtros, codificar_token, decodificar_token, Pagina,
+)
+
+SELECT = "SELECT t.* FROM Items t"
+
+
+class TestPaginacion:
+    # tests de paginar() sobre una tabla en memoria
+
+    @pytest.fixture
+    def conn(self):
+        # 25 filas; varias comparten FechaCreacion para probar el desempate por ID
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        conn.execute(
+            "CREATE TABLE Items (ItemID INTEGER PRIMARY KEY, FechaCreacion TEXT, Grupo INTEGER, Nombre TEXT)"
+        )
+        conn.execute("CREATE INDEX idx_items_fecha_id ON Items(FechaCreacion, ItemID)")
+        for i in range(1, 26):
+            conn.execute(
+                "INSERT INTO Items (ItemID, FechaCreacion, Grupo, Nombre) VALUES (?, ?, ?, ?)",
+                (i, f"2026-01-{(i // 3) + 1:02d} 10:00:00", i % 2, f"Item {i}"),
+            )
+        yield conn
+        conn.close()
+
+    @staticmethod
+    def _pagina(conn, token=None, limit=10, condiciones=None, params=None):
+        return paginar(
+            conn, SELECT, "t.FechaCreacion", "t.ItemID", lambda r: r["ItemID"],
+            limit=limit, token=token, condiciones=condiciones, params=params,
+        )
+
+    def test_primera_pagina(self, conn):
+        # la primera pagina trae los mas recientes y no tiene anterior
+        pagina = self._pagina(conn)
+        assert isinstance(pagina, Pagina)
+        assert len(pagina) == 10
+        assert pagina.items[0] == 25
+        assert pagina.anterior is None
+        assert pagina.siguiente is not None
+
+    def test_recorrido_completo_sin_duplicados(self, conn):
+        # avanzar con los tokens recorre todas las filas exactamente una vez
+        vistos, token = [], None
+        while True:
+            pagina = self._pagina(conn, token=token, limit=7)
+            vistos.extend(pagina.items)
+            if pagina.siguiente is None:
+                break
+            token = pagina.siguiente
+        assert vistos == list(range(25, 0, -1))
+
+    def test_pagina_anterior(self, conn):
+        # retroceder devuelve exactamente la pagina previa, en el mismo orden
+        p1 = self._pagina(conn)
+        p2 = self._pagina(conn, token=p1.siguiente)
+        regreso = self._pagina(conn, token=p2.anterior)
+        assert regreso.items == p1.items
+        assert regreso.anterior is None
+        assert regreso.siguiente is not None
+
+    def test_ultima_pagina(self, conn):
+        # la ultima pagina no ofrece siguiente
+        p1 = self._pagina(conn, limit=20)
+        p2 = self._pagina(conn, token=p1.siguiente, limit=20)
+        assert len(p2) == 5
+        assert p2.siguiente is None
+        assert p2.anterior is not None
+
+    def test_con_filtros(self, conn):
+        # las condiciones se combinan con el cursor
+        condiciones, params = construir_filtros({"grupo": 1}, {"grupo": "t.Grupo"})
+        p1 = self._pagina(conn, limit=5, condiciones=condiciones, params=params)
+        p2 = self._pagina(conn, token=p1.siguiente, limit=5, condiciones=condiciones, params=params)
+        assert all(i % 2 == 1 for i in p1.items + p2.items)
+        assert p1.items + p2.items == [25, 23, 21, 19, 17, 15, 13, 11, 9, 7]
+
+    def test_usa_indice(self, conn):
+        # el cursor se resuelve con el indice, no con un SCAN completo
+        plan = conn.execute(
+            "EXPLAIN QUERY PLAN " + SELECT +
+            " WHERE (t.FechaCreacion, t.ItemID) < (?, ?) ORDER BY t.FechaCreacion DESC, t.ItemID DESC LIMIT 11",
+            ("2026-01-05 10:00:00", 12),
+        ).fetchall()
+        detalle = " ".join(fila[3] for fila in plan)
+        assert "SEARCH" in detalle and "idx_items_fecha_id" in detalle
+
+    def test_orden_por_expresion_con_nulos(self, conn):
+        # ordenar por una columna con NULL (via IFNULL) no pierde filas
+        conn.execute("UPDATE Items SET Nombre = NULL WHERE ItemID % 4 = 0")
+        vistos, token = [], None
+        while True:
+            pagina = paginar(
+                conn, SELECT, "IFNULL(t.Nombre, '')", "t.ItemID",
+                lambda r: r["ItemID"], limit=6, token=token,
+                descendente=False, clave_orden="Nombre",
+            )
+            vistos.extend(pagina.items)
+            if pagina.siguiente is None:
+                break
+            token = pagina.siguiente
+        assert sorted(vistos) == list(range(1, 26))
+        assert vistos[:6] == [4, 8, 12, 16, 20, 24]
+
+    def test_token_roundtrip(self):
+        # el token conserva valor, id y direccion
+        token = codificar_token("2026-01-01 10:00:00", 5)
+        assert decodificar_token(token) == ("2026-01-01 10:00:00", 5, "s")
+
+    def test_token_invalido(self, conn):
+        # un token corrupto lanza ValueError
+        with pytest.raises(ValueError):
+            self._pagina(conn, token="no-es-un-token")
+
+    def test_filtro_no_permitido(self):
+        # solo se aceptan claves declaradas
+        with pytest.raises(ValueError):
+            construir_filtros({"Nombre; DROP TABLE": 1}, {"grupo": "t.Grupo"})
+
+    def test_filtro_texto(self):
+        # "texto" genera un LIKE sobre cada columna declarada
+        condiciones, params = construir_filtros({"texto": "ana"}, {}, ("t.Nombre", "t.Email"))
+        assert condiciones == ["(t.Nombre LIKE ? OR t.Email LIKE ?)"]
+        assert params == ["%ana%", "%ana%"]
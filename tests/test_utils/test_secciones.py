@@ -0,0 +1,161 @@
+# tests del registro de secciones de la ventana principal (la parte que no depende de Qt)
+
+import sys
+import types
+import pytest
+from app.utils.secciones import RegistroSecciones, Seccion, importar_seccion
+
+_MODULO = "tests_secciones_falsas"
+
+
+class _Vista:
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+
+@pytest.fixture(autouse=True)
+def modulo_falso():
+    # modulo importable con una clase por seccion
+    modulo = types.ModuleType(_MODULO)
+    for nombre in ("a", "b", "c", "d"):
+        setattr(modulo, nombre.upper(), type(nombre.upper(), (_Vista,), {}))
+    sys.modules[_MODULO] = modulo
+    yield modulo
+    del sys.modules[_MODULO]
+
+
+class _Reloj:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class TestRegistroSecciones:
+
+    @pytest.fixture
+    def reloj(self):
+        return _Reloj()
+
+    @pytest.fixture
+    def registro(self, reloj):
+        self.construidas = []
+        self.liberadas = []
+        self.ocupadas = set()
+        secciones = [
+            Seccion("a", _MODULO, "A", "Seccion A", descartable=False),
+            Seccion("b", _MODULO, "B", "Seccion B"),
+            Seccion("c", _MODULO, "C", "Seccion C"),
+            Seccion("d", _MODULO, "D", "Seccion D"),
+        ]
+
+        def construir(seccion, clase):
+            self.construidas.append(seccion.nombre)
+            return clase(seccion.nombre)
+
+        return RegistroSecciones(
+            secciones, construir,
+            liberar=lambda seccion, vista: self.liberadas.append(vista.nombre),
+            max_vivas=3, ocupada=lambda seccion: seccion.nombre in self.ocupadas,
+            reloj=reloj,
+        )
+
+    def test_construye_solo_al_abrir_y_una_vez(self, registro):
+        assert registro.viva("b") is None
+        assert self.construidas == []
+
+        vista = registro.activar("b")
+
+        assert registro.activar("b") is vista
+        assert self.construidas == ["b"]
+        assert registro.activa == "b"
+
+    def test_limite_descarta_la_menos_usada(self, registro):
+        for nombre in ("b", "c", "d"):
+            registro.activar(nombre)
+        registro.activar("b")    # "c" pasa a ser la menos usada
+
+        registro.activar("a")
+
+        assert self.liberadas == ["c"]
+        assert registro.vivas == ["d", "b", "a"]
+
+    def test_no_descarta_activa_fija_ni_ocupada(self, registro):
+        registro.activar("a")
+        registro.activar("b")
+        self.ocupadas.add("b")
+        registro.activar("c")
+
+        assert registro.descartar("a") is False    # descartable=False
+        assert registro.descartar("b") is False    # con tareas en curso
+        assert registro.descartar("c") is False    # es la activa
+        registro.activar("d")                      # pasa el limite: solo "c" se puede soltar
+        assert self.liberadas == ["c"]
+
+        self.ocupadas.clear()
+        registro.activar(None)
+        assert registro.descartar_todas() == ["b", "d"]
+        assert registro.vivas == ["a"]
+
+    def test_descartar_inactivas(self, registro, reloj):
+        registro.activar("b")
+        reloj.ahora = 100
+        registro.activar("c")
+        reloj.ahora = 130
+
+        assert registro.descartar_inactivas(60) == ["b"]
+        assert registro.vivas == ["c"]
+
+    def test_precargar_no_cambia_la_activa(self, registro):
+        registro.activar("b")
+
+        assert registro.precargar("c") is True
+        assert registro.precargar("c") is False
+        assert registro.activa == "b"
+        assert self.construidas == ["b", "c"]
+
+    def test_liberada_se_reconstruye(self, registro):
+        primera = registro.precargar("b") and registro.viva("b")
+        registro.descartar("b")
+
+        assert registro.obtener("b") is not primera
+        assert self.construidas == ["b", "b"]
+
+
+def test_importar_seccion_devuelve_la_clase(modulo_falso):
+    assert importar_seccion(Seccion("b", _MODULO, "B", "B")) is modulo_falso.B
+
+
+def test_spec_empaqueta_todas_las_secciones():
+    # MainView importa las vistas por nombre: PyInstaller solo las incluye
+    # si estan en hiddenimports
+    import ast
+    import os
+    from app.views.main_view import SECCIONES
+
+    ruta = os.path.join(os.path.dirname(__file__), "..", "..", "crm.spec")
+    with open(ruta, encoding="utf-8") as f:
+        arbol = ast.parse(f.read())
+    ocultos = next(
+        ast.literal_eval(k.value)
+        for nodo in ast.walk(arbol) if isinstance(nodo, ast.Call)
+        for k in nodo.keywords if k.arg == "hiddenimports"
+    )
+    faltan = [s.modulo for s in SECCIONES if s.modulo not in ocultos]
+    assert faltan == []
+
+
+def test_prefijos_de_tareas_existen_en_la_vista():
+    # un prefijo que la vista nunca usa nunca protege nada: cada uno debe
+    # aparecer como clave ("prefijo... o f"prefijo...) en el modulo de la vista
+    import importlib
+    import inspect
+    from app.views.main_view import SECCIONES
+
+    sin_uso = [
+        (s.nombre, prefijo)
+        for s in SECCIONES for prefijo in s.prefijos_tareas
+        if f'"{prefijo}' not in inspect.getsource(importlib.import_module(s.modulo))
+    ]
+    assert sin_uso == []
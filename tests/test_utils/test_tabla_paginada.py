@@ -0,0 +1,162 @@
+# tests del modelo paginado de las tablas de clientes (offscreen)
+
+import os
+
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableView
+
+from app.database.connection import get_connection
+from app.services.empresa_service import EmpresaService
+from app.utils.paginacion import Pagina
+from app.views.tabla_paginada_model import ColumnaTabla, TablaPaginadaModel
+
+
+@pytest.fixture(scope="module")
+def qapp():
+    return QApplication.instance() or QApplication([])
+
+
+class FuenteFalsa:
+    # imita service.obtener_pagina sobre una lista; el token es el indice
+    # de inicio del bloque y cada llamada queda registrada
+
+    def __init__(self, total):
+        self.items = list(range(total))
+        self.llamadas = []
+        self.error = None
+
+    def __call__(self, limit, token, filtros, orden, descendente):
+        self.llamadas.append(token)
+        if self.error:
+            return None, self.error
+        inicio = token or 0
+        items = self.items[inicio:inicio + limit]
+        siguiente = inicio + limit if inicio + limit < len(self.items) else None
+        return Pagina(items, siguiente=siguiente), None
+
+
+_COLUMNAS = [ColumnaTabla("Numero", str)]
+
+
+def _modelo(fuente, **kwargs):
+    modelo = TablaPaginadaModel(_COLUMNAS, fuente, tam_bloque=10, max_bloques=2, **kwargs)
+    modelo.recargar()
+    return modelo
+
+
+class TestCargaPorBloques:
+
+    def test_fetch_more_agrega_bloques(self, qapp):
+        fuente = FuenteFalsa(25)
+        modelo = _modelo(fuente)
+        assert modelo.rowCount() == 10
+        assert modelo.canFetchMore()
+        modelo.fetchMore()
+        modelo.fetchMore()
+        assert modelo.rowCount() == 25
+        assert not modelo.canFetchMore()
+        assert fuente.llamadas == [None, 10, 20]
+
+    def test_lru_descarta_y_recarga(self, qapp):
+        fuente = FuenteFalsa(30)
+        modelo = _modelo(fuente)
+        modelo.fetchMore()
+        modelo.fetchMore()
+        # max_bloques=2: el bloque 0 salio del cache
+        assert modelo.bloques_en_memoria() == 2
+        fuente.llamadas.clear()
+        assert modelo.objeto_en(3) == 3
+        assert fuente.llamadas == [None]  # recargado desde su token
+        assert modelo.objeto_en(4) == 4
+        assert fuente.llamadas == [None]  # ya en cache
+
+    def test_recarga_fallida_no_queda_en_cache(self, qapp):
+        fuente = FuenteFalsa(30)
+        modelo = _modelo(fuente)
+        errores = []
+        modelo.errorCarga.connect(errores.append)
+        modelo.fetchMore()
+        modelo.fetchMore()
+
+        fuente.error = "sin conexion"
+        assert modelo.objeto_en(3) is None
+        assert modelo.objeto_en(5) is None
+        assert errores == ["sin conexion"]  # un solo aviso por fallo
+        QApplication.processEvents()  # termina el ciclo: se permite reintentar
+
+        fuente.error = None
+        assert modelo.objeto_en(3) == 3
+
+    def test_error_durante_el_pintado_no_abre_dialogo_dentro(self, qapp):
+        # con conexion en cola el slot corre despues del pintado, no dentro
+        fuente = FuenteFalsa(30)
+        modelo = _modelo(fuente)
+        avisos = []
+        modelo.errorCarga.connect(avisos.append, Qt.QueuedConnection)
+        tabla = QTableView()
+        tabla.resize(300, 600)
+        tabla.setModel(modelo)
+        modelo.fetchMore()
+        modelo.fetchMore()
+        tabla.scrollToBottom()
+        tabla.grab()
+
+        fuente.error = "sin conexion"
+        tabla.scrollToTop()
+        tabla.grab()
+        assert avisos == []
+        QApplication.processEvents()
+        assert avisos == ["sin conexion"]
+
+        fuente.error = None
+        tabla.grab()
+        assert modelo.data(modelo.index(0, 0)) == "0"
+
+
+class TestOrdenYFiltrosEnSQL:
+
+    @pytest.fixture
+    def modelo(self, qapp, db_temporal):
+        conn = get_connection()
+        conn.executemany(
+            "INSERT INTO Empresas (RazonSocial) VALUES (?)",
+            [(f"Zyx {letra}",) for letra in "CAEBD"],
+        )
+        conn.commit()
+        columnas = [
+            ColumnaTabla("ID", lambda e: str(e.empresa_id), orden="id"),
+            ColumnaTabla("Razon Social", lambda e: e.razon_social, orden="razon_social"),
+            ColumnaTabla("Sin orden", lambda e: ""),
+        ]
+        modelo = TablaPaginadaModel(columnas, EmpresaService().obtener_pagina, tam_bloque=2)
+        # solo las empresas del test, no los datos semilla
+        modelo.set_filtros({"texto": "Zyx"})
+        return modelo
+
+    @staticmethod
+    def _razones(modelo):
+        while modelo.canFetchMore():
+            modelo.fetchMore()
+        return [modelo.data(modelo.index(fila, 1)) for fila in range(modelo.rowCount())]
+
+    def test_sort_reconsulta_con_order_by(self, modelo):
+        modelo.sort(1, Qt.AscendingOrder)
+        assert self._razones(modelo) == [f"Zyx {letra}" for letra in "ABCDE"]
+        modelo.sort(1, Qt.DescendingOrder)
+        assert self._razones(modelo) == [f"Zyx {letra}" for letra in "EDCBA"]
+
+    def test_columna_sin_clave_no_reordena(self, modelo):
+        modelo.sort(1, Qt.AscendingOrder)
+        modelo.sort(2, Qt.DescendingOrder)
+        assert self._razones(modelo) == [f"Zyx {letra}" for letra in "ABCDE"]
+
+    def test_filtro_en_sql(self, modelo):
+        modelo.set_filtros({"texto": "Zyx B"})
+        assert self._razones(modelo) == ["Zyx B"]
+        modelo.set_filtros({"texto": "Zyx"})
+        assert modelo.rowCount() == 2  # vuelve a paginar desde el inicio
+        assert len(self._razones(modelo)) == 5
@@ -0,0 +1,141 @@
+# tests de Tarea y RegistroTareas (la parte del ejecutor que no depende de Qt)
+
+import threading
+import time
+import pytest
+from app.database.connection import get_connection, get_reader, close_connection
+from app.utils.tareas import RegistroTareas, Tarea, TareaCancelada
+
+# consulta que no termina por si sola: solo sale si se interrumpe
+_CONSULTA_INFINITA = (
+    "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c) "
+    "SELECT max(x) FROM c"
+)
+
+
+def _cargar(filtro):
+    return filtro
+
+
+def _otra_carga(filtro):
+    return filtro
+
+
+class TestRegistroTareas:
+
+    def test_solicitud_igual_se_reutiliza(self):
+        # pedir lo mismo dos veces no lanza otra consulta; responde al ultimo
+        registro = RegistroTareas()
+        primero, segundo = object(), object()
+        tarea, _ = registro.registrar(Tarea("lista", _cargar, args=("a",), al_terminar=primero))
+        vigente, reemplazada = registro.registrar(Tarea("lista", _cargar, args=("a",), al_terminar=segundo))
+        assert vigente is tarea and reemplazada is None
+        assert tarea.al_terminar is segundo
+        assert len(registro) == 1
+
+    def test_argumentos_distintos_reemplazan(self):
+        registro = RegistroTareas()
+        vieja, _ = registro.registrar(Tarea("lista", _cargar, args=("a",)))
+        nueva, reemplazada = registro.registrar(Tarea("lista", _cargar, args=("b",)))
+        assert reemplazada is vieja and vieja.cancelada
+        assert nueva is not vieja and not nueva.cancelada
+        # la vieja termina despues, pero ya no es la vigente
+        registro.terminar(vieja)
+        assert registro.activa("lista") is nueva
+
+    def test_funcion_distinta_reemplaza(self):
+        registro = RegistroTareas()
+        registro.registrar(Tarea("lista", _cargar, args=("a",)))
+        _, reemplazada = registro.registrar(Tarea("lista", _otra_carga, args=("a",)))
+        assert reemplazada is not None
+
+    def test_claves_independientes_y_cancelar(self):
+        registro = RegistroTareas()
+        a, _ = registro.registrar(Tarea("a", _cargar, args=(1,)))
+        b, _ = registro.registrar(Tarea("b", _cargar, args=(1,)))
+        assert registro.cancelar("a") is a and a.cancelada
+        assert registro.activa("a") is None and not b.cancelada
+        assert registro.cancelar_todas() == [b] and b.cancelada
+        assert len(registro) == 0
+
+    def test_activas_con_prefijo(self):
+        registro = RegistroTareas()
+        for clave in ("clientes.empresas", "clientes.importar.contactos", "reportes.pipeline"):
+            registro.registrar(Tarea(clave, _cargar, args=(1,)))
+        assert registro.activas_con_prefijo("clientes.") == ["clientes.empresas", "clientes.importar.contactos"]
+        assert registro.activas_con_prefijo("ventas.") == []
+
+
+@pytest.mark.usefixtures("db_vacia")
+class TestTarea:
+
+    @staticmethod
+    def _correr_en_hilo(tarea):
+        # imita un hilo del QThreadPool: conexion propia y resultado o excepcion
+        salida = {}
+
+        def run():
+            try:
+                salida["resultado"] = tarea.ejecutar()
+            except Exception as e:
+                salida["error"] = e
+            finally:
+                close_connection()
+
+        hilo = threading.Thread(target=run)
+        hilo.start()
+        return hilo, salida
+
+    def test_resultado(self):
+        assert Tarea("x", _cargar, args=(7,)).ejecutar() == 7
+
+    def test_cancelada_antes_de_empezar(self):
+        tarea = Tarea("x", _cargar, args=(7,))
+        tarea.cancelar()
+        with pytest.raises(TareaCancelada):
+            tarea.ejecutar()
+
+    @pytest.mark.parametrize("lector", [False, True], ids=["thread_local", "lector_pool"])
+    def test_cancelar_aborta_consulta_en_curso(self, lector):
+        def consulta_larga():
+            if lector:
+                with get_reader() as conn:
+                    return conn.execute(_CONSULTA_INFINITA).fetchone()
+            return get_connection().execute(_CONSULTA_INFINITA).fetchone()
+
+        tarea = Tarea("larga", consulta_larga)
+        hilo, salida = self._correr_en_hilo(tarea)
+        time.sleep(0.1)
+        tarea.cancelar()
+        hilo.join(timeout=5)
+        assert not hilo.is_alive()
+        assert isinstance(salida.get("error"), TareaCancelada)
+
+    def test_no_interrumpible_termina_pero_no_entrega(self):
+        # la consulta llega al final, pero el resultado se descarta
+        avance = threading.Event()
+        terminada = []
+
+        def escritura():
+            avance.wait(5)
+            terminada.append(get_connection().execute("SELECT 1").fetchone()[0])
+            return "ok"
+
+        tarea = Tarea("envio", escritura, interrumpible=False)
+        hilo, salida = self._correr_en_hilo(tarea)
+        tarea.cancelar()
+        avance.set()
+        hilo.join(timeout=5)
+        assert terminada == [1]
+        assert isinstance(salida.get("error"), TareaCancelada)
+
+    def test_progress_handler_se_retira(self):
+        # fuera de la tarea las consultas del hilo ya no se revisan
+        tarea = Tarea("x", _cargar, args=(1,))
+        tarea.ejecutar()
+        tarea.cancelar()
+        assert get_connection().execute("SELECT count(*) FROM (WITH RECURSIVE c(x) AS "
+                                        "(SELECT 1 UNION ALL SELECT x + 1 FROM c LIMIT 50000) "
+                                        "SELECT x FROM c)").fetchone()[0] == 50000
+        with get_reader() as conn:
+            assert conn.execute("SELECT 1").fetchone()[0] == 1